@@ -1,8 +1,18 @@
 import logging
+import sys
 
 from data_ai_bot.cli import main
 
 
+COMPILE_CONFIG_COMMAND = 'compile-config'
+
+
 if __name__ == '__main__':
     logging.basicConfig(level='INFO')
+    if sys.argv[1:2] == [COMPILE_CONFIG_COMMAND]:
+        # imported here, as it is not needed when starting the bot
+        from data_ai_bot.compile_config import (  # pylint: disable=import-outside-toplevel
+            main as compile_config_main
+        )
+        raise SystemExit(0 if compile_config_main(sys.argv[2:]) else 1)
     main()
@@ -1,18 +1,26 @@
 from copy import deepcopy
 from dataclasses import dataclass, field
 from functools import wraps
+import hashlib
+import json
 import logging
+import threading
 import traceback
 from typing import Any, Callable, Literal, Mapping, Protocol, Sequence, TypeVar
 
 import smolagents  # type: ignore
 from smolagents import Tool
 
+from data_ai_bot.config import ResolvedAgentConfig
+from data_ai_bot.models.streaming import is_streaming_supported_by_model
+
 
 LOGGER = logging.getLogger(__name__)
 
 ToolT = TypeVar('ToolT', bound=Callable)
 
+NamedT = TypeVar('NamedT')
+
 
 def do_step_callback(step_log: smolagents.ActionStep):
     LOGGER.info('step_log: %r', step_log)
@@ -109,8 +117,57 @@ def get_wrapped_smolagents_tools(
     ]
 
 
+def get_sorted_by_name(items: Sequence[NamedT]) -> Sequence[NamedT]:
+    # a stable order (e.g. independent of the MCP server), for the prompt prefix caching
+    return sorted(items, key=lambda item: getattr(item, 'name'))
+
+
+def get_system_prompt_inputs_sha256(agent: smolagents.MultiStepAgent) -> str:
+    # much cheaper than rendering the system prompt template
+    return hashlib.sha256(json.dumps(
+        {
+            'agentType': type(agent).__name__,
+            'instructions': agent.instructions,
+            'tools': [
+                [tool.name, tool.description, tool.inputs, tool.output_type]
+                for tool in agent.tools.values()
+            ],
+            'managedAgents': [
+                [managed_agent.name, managed_agent.description]
+                for managed_agent in agent.managed_agents.values()
+            ]
+        },
+        default=str
+    ).encode('utf-8')).hexdigest()
+
+
+def get_resolved_agent_config(agent: smolagents.MultiStepAgent) -> ResolvedAgentConfig:
+    return ResolvedAgentConfig(
+        tool_names=list(agent.tools.keys()),
+        managed_agent_names=list(agent.managed_agents.keys()),
+        rendered_system_prompt=agent.system_prompt,
+        system_prompt_inputs_sha256=get_system_prompt_inputs_sha256(agent)
+    )
+
+
+def use_rendered_system_prompt(
+    agent: smolagents.MultiStepAgent,
+    resolved_agent_config: ResolvedAgentConfig
+) -> bool:
+    if (
+        get_system_prompt_inputs_sha256(agent)
+        != resolved_agent_config.system_prompt_inputs_sha256
+    ):
+        LOGGER.info('Not using the rendered system prompt, tools changed (name=%r)', agent.name)
+        return False
+    rendered_system_prompt = resolved_agent_config.rendered_system_prompt
+    # rather than rendering the system prompt template on every run
+    agent.initialize_system_prompt = lambda: rendered_system_prompt
+    return True
+
+
 @dataclass(frozen=True, kw_only=True)
-class SmolAgentsAgentFactory:
+class SmolAgentsAgentFactory:  # pylint: disable=too-many-instance-attributes
     model: smolagents.Model
     tools: Sequence[Tool]
     managed_agent_factories: Sequence['SmolAgentsManagedAgentFactory'] = field(
@@ -119,22 +176,27 @@ class SmolAgentsAgentFactory:
     system_prompt: str | None = None
     name: str | None = None
     description: str | None = None
+    # streaming model output (token deltas), if supported by the model
+    stream_outputs: bool = True
+    # e.g. from the config snapshot
+    resolved_agent_config: ResolvedAgentConfig | None = None
 
     def __call__(
         self,
         tool_call_event_handler: ToolCallEventHandler | None = None
     ) -> smolagents.MultiStepAgent:
         tools: Sequence[Tool] = get_wrapped_smolagents_tools(
-            self.tools,
+            get_sorted_by_name(self.tools),
             tool_call_event_handler=tool_call_event_handler
         )
         managed_agents: Sequence[smolagents.MultiStepAgent] = [
             managed_agent_factory(
                 tool_call_event_handler=tool_call_event_handler
             )
-            for managed_agent_factory in self.managed_agent_factories
+            for managed_agent_factory in get_sorted_by_name(self.managed_agent_factories)
         ]
         LOGGER.info('Model for agent (name=%r): %r', self.name, self.model.model_id)
+        stream_outputs = self.stream_outputs and is_streaming_supported_by_model(self.model)
         if managed_agents:
             LOGGER.info('Using CodeAgent (name=%r)', self.name)
             agent = smolagents.CodeAgent(
@@ -144,7 +206,10 @@ class SmolAgentsAgentFactory:
                 managed_agents=managed_agents,
                 model=self.model,
                 step_callbacks=[do_step_callback],
-                max_steps=3
+                max_steps=3,
+                stream_outputs=stream_outputs,
+                # within the system prompt, before any of the per-request messages
+                instructions=self.system_prompt or None
             )
         else:
             LOGGER.info('Using ToolCallingAgent (name=%r)', self.name)
@@ -155,14 +220,12 @@ class SmolAgentsAgentFactory:
                 managed_agents=managed_agents,
                 model=self.model,
                 step_callbacks=[do_step_callback],
-                max_steps=3
-            )
-        if self.system_prompt:
-            agent.prompt_templates['system_prompt'] = (
-                agent.prompt_templates['system_prompt']
-                + '\n\n'
-                + self.system_prompt
+                max_steps=3,
+                stream_outputs=stream_outputs,
+                instructions=self.system_prompt or None
             )
+        if self.resolved_agent_config is not None:
+            use_rendered_system_prompt(agent, self.resolved_agent_config)
         return agent
 
 
@@ -178,6 +241,39 @@ class SmolAgentsManagedAgentFactory(SmolAgentsAgentFactory):
             raise TypeError('`description` required')
 
 
+class AgentFactory(Protocol):
+    def __call__(
+        self,
+        tool_call_event_handler: ToolCallEventHandler | None = None
+    ) -> smolagents.MultiStepAgent:
+        pass
+
+
+class ReloadableAgentFactory(AgentFactory):
+    '''
+    Delegates to the current agent factory, which can be replaced (e.g. on config change).
+    Agents already created (i.e. in-flight requests) will continue to use the previous one.
+    '''
+
+    def __init__(self, agent_factory: AgentFactory):
+        self._agent_factory = agent_factory
+        self._lock = threading.Lock()
+
+    def get_agent_factory(self) -> AgentFactory:
+        with self._lock:
+            return self._agent_factory
+
+    def set_agent_factory(self, agent_factory: AgentFactory):
+        with self._lock:
+            self._agent_factory = agent_factory
+
+    def __call__(
+        self,
+        tool_call_event_handler: ToolCallEventHandler | None = None
+    ) -> smolagents.MultiStepAgent:
+        return self.get_agent_factory()(tool_call_event_handler=tool_call_event_handler)
+
+
 def log_agent_info(agent: smolagents.MultiStepAgent):
     LOGGER.info('Agent: %r', agent)
     agent_name = agent.name or '__main__'
@@ -1,10 +1,22 @@
 from dataclasses import dataclass
-from typing import Sequence
+import logging
+from typing import Any, Iterator, Optional, Sequence
+
+import smolagents  # type: ignore
+from smolagents.agents import ToolOutput  # type: ignore
+from smolagents.memory import FinalAnswerStep, PlanningStep, ToolCall  # type: ignore
 
 from data_ai_bot.agent_factory import (
-    SmolAgentsAgentFactory,
+    AgentFactory,
+    ToolCallEvent,
     ToolCallEventHandler
 )
+from data_ai_bot.answer_cache import AnswerCache
+from data_ai_bot.intents import get_intent_response_for_message
+from data_ai_bot.model_routing import get_agent_factories_for_message
+
+
+LOGGER = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -12,24 +24,283 @@ class AgentResponse:
     text: str
 
 
+@dataclass(frozen=True)
+class AgentStepStartedEvent:
+    step_number: int
+
+
+@dataclass(frozen=True)
+class AgentToolCallEvent:
+    tool_call_id: str
+    tool_name: str
+    arguments: Any
+
+
+@dataclass(frozen=True)
+class AgentToolResultEvent:
+    tool_call_id: str
+    tool_name: str
+    observation: Optional[str]
+
+
+@dataclass(frozen=True)
+class AgentTokenDeltaEvent:
+    text: str
+
+
+@dataclass(frozen=True)
+class AgentFinalAnswerEvent:
+    text: str
+
+
+AgentEvent = (
+    AgentStepStartedEvent
+    | AgentToolCallEvent
+    | AgentToolResultEvent
+    | AgentTokenDeltaEvent
+    | AgentFinalAnswerEvent
+)
+
+
+def iter_agent_events_for_smolagents_events(
+    smolagents_events: Iterator[Any]
+) -> Iterator[AgentEvent]:
+    # smolagents yields the (action) step at the end of each step
+    step_number = 0
+    is_step_started = False
+    for smolagents_event in smolagents_events:
+        if isinstance(smolagents_event, FinalAnswerStep):
+            yield AgentFinalAnswerEvent(text=str(smolagents_event.output))
+            continue
+        if isinstance(smolagents_event, smolagents.ActionStep):
+            is_step_started = False
+            continue
+        if isinstance(smolagents_event, PlanningStep):
+            continue
+        if not is_step_started:
+            is_step_started = True
+            step_number += 1
+            yield AgentStepStartedEvent(step_number=step_number)
+        if isinstance(smolagents_event, smolagents.ChatMessageStreamDelta):
+            if smolagents_event.content:
+                yield AgentTokenDeltaEvent(text=smolagents_event.content)
+        elif isinstance(smolagents_event, ToolCall):
+            yield AgentToolCallEvent(
+                tool_call_id=smolagents_event.id,
+                tool_name=smolagents_event.name,
+                arguments=smolagents_event.arguments
+            )
+        elif isinstance(smolagents_event, ToolOutput):
+            yield AgentToolResultEvent(
+                tool_call_id=smolagents_event.id,
+                tool_name=smolagents_event.tool_call.name,
+                observation=smolagents_event.observation
+            )
+
+
+def get_tool_call_event_handler_recording_tool_names(
+    tool_names: set[str],
+    tool_call_event_handler: ToolCallEventHandler | None = None
+) -> ToolCallEventHandler:
+    def wrapper(tool_call_event: ToolCallEvent):
+        if tool_call_event.event_name == 'success':
+            tool_names.add(tool_call_event.tool_call.tool_name)
+        if tool_call_event_handler is not None:
+            tool_call_event_handler(tool_call_event)
+    return wrapper
+
+
+def get_tool_results_from_agent_memory(agent: smolagents.MultiStepAgent) -> Sequence[dict]:
+    tool_results: list[dict] = []
+    for step in agent.memory.steps:
+        if not isinstance(step, smolagents.ActionStep) or not step.observations:
+            continue
+        tool_calls = [
+            {'name': tool_call.name, 'arguments': tool_call.arguments}
+            for tool_call in step.tool_calls or []
+            if tool_call.name != 'final_answer'
+        ]
+        if tool_calls:
+            tool_results.append({
+                'tool_calls': tool_calls,
+                'observations': step.observations
+            })
+    return tool_results
+
+
+def get_agent_additional_args(
+    previous_messages: Sequence[str],
+    previous_tool_results: Sequence[dict]
+) -> dict:
+    additional_args: dict[str, Any] = {
+        'previous_messages': previous_messages
+    }
+    if previous_tool_results:
+        # the results of the previous model tiers, rather than calling the same tools again
+        additional_args['previous_tool_results'] = previous_tool_results
+    return additional_args
+
+
 @dataclass(frozen=True)
 class SmolAgentsAgentSession:
-    agent_factory: SmolAgentsAgentFactory
+    agent_factory: AgentFactory
+    answer_cache: Optional[AnswerCache] = None
 
-    def run(
+    def _get_answer_cache(self, previous_messages: Sequence[str]) -> Optional[AnswerCache]:
+        # only for the first message of a thread, as follow-up questions depend on the context
+        if previous_messages:
+            return None
+        return self.answer_cache
+
+    def _get_cached_answer(
+        self,
+        message: str,
+        previous_messages: Sequence[str]
+    ) -> tuple[str, Optional[str]]:
+        # returns the message (without any fresh answer keyword) and the cached answer
+        answer_cache = self._get_answer_cache(previous_messages)
+        if answer_cache is None:
+            return message, None
+        if answer_cache.is_fresh_answer_requested(message):
+            answer_cache.record_fresh_answer()
+            return answer_cache.get_question_without_fresh_answer_keywords(message), None
+        answer_cache_match = answer_cache.get(message)
+        if answer_cache_match is None:
+            return message, None
+        return message, answer_cache_match.entry.answer
+
+    def _set_cached_answer(
+        self,
+        message: str,
+        previous_messages: Sequence[str],
+        answer: str,
+        tool_names: set[str]
+    ):
+        answer_cache = self._get_answer_cache(previous_messages)
+        if answer_cache is not None:
+            answer_cache.set(message, answer, tool_names=tool_names)
+
+    def _run_agent(
         self,
         message: str,
         previous_messages: Sequence[str],
         tool_call_event_handler: ToolCallEventHandler | None = None
     ) -> AgentResponse:
-        text = self.agent_factory(
+        agent_factories = get_agent_factories_for_message(
+            self.agent_factory,
+            message=message,
+            previous_messages=previous_messages
+        )
+        previous_tool_results: list[dict] = []
+        for agent_factory in agent_factories[:-1]:
+            agent = agent_factory(
+                tool_call_event_handler=tool_call_event_handler
+            )
+            try:
+                run_result = agent.run(
+                    message,
+                    additional_args=get_agent_additional_args(
+                        previous_messages,
+                        previous_tool_results
+                    ),
+                    return_full_result=True
+                )
+                if run_result.state == 'success':
+                    return AgentResponse(
+                        text=run_result.output
+                    )
+                LOGGER.info(
+                    'Agent did not succeed (state: %r), escalating to the next model tier',
+                    run_result.state
+                )
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                LOGGER.warning('Agent failed, escalating to the next model tier: %r', exc)
+            # passed on, so that the next model tier can use the tool results so far
+            previous_tool_results.extend(get_tool_results_from_agent_memory(agent))
+        text = agent_factories[-1](
             tool_call_event_handler=tool_call_event_handler
         ).run(
             message,
-            additional_args={
-                'previous_messages': previous_messages
-            }
+            additional_args=get_agent_additional_args(
+                previous_messages,
+                previous_tool_results
+            )
         )
         return AgentResponse(
             text=text
         )
+
+    def run(
+        self,
+        message: str,
+        previous_messages: Sequence[str],
+        tool_call_event_handler: ToolCallEventHandler | None = None
+    ) -> AgentResponse:
+        message, cached_answer = self._get_cached_answer(message, previous_messages)
+        if cached_answer is not None:
+            return AgentResponse(
+                text=cached_answer
+            )
+        intent_response = get_intent_response_for_message(
+            self.agent_factory,
+            message=message,
+            tool_call_event_handler=tool_call_event_handler
+        )
+        if intent_response is not None:
+            return AgentResponse(
+                text=intent_response
+            )
+        tool_names: set[str] = set()
+        agent_response = self._run_agent(
+            message,
+            previous_messages,
+            tool_call_event_handler=get_tool_call_event_handler_recording_tool_names(
+                tool_names,
+                tool_call_event_handler=tool_call_event_handler
+            )
+        )
+        self._set_cached_answer(message, previous_messages, agent_response.text, tool_names)
+        return agent_response
+
+    def run_stream(
+        self,
+        message: str,
+        previous_messages: Sequence[str],
+        tool_call_event_handler: ToolCallEventHandler | None = None
+    ) -> Iterator[AgentEvent]:
+        message, cached_answer = self._get_cached_answer(message, previous_messages)
+        if cached_answer is not None:
+            yield AgentFinalAnswerEvent(text=cached_answer)
+            return
+        intent_response = get_intent_response_for_message(
+            self.agent_factory,
+            message=message,
+            tool_call_event_handler=tool_call_event_handler
+        )
+        if intent_response is not None:
+            yield AgentFinalAnswerEvent(text=intent_response)
+            return
+        # without escalation, as the events of the first model tier were already streamed
+        agent_factory = get_agent_factories_for_message(
+            self.agent_factory,
+            message=message,
+            previous_messages=previous_messages
+        )[0]
+        tool_names: set[str] = set()
+        for agent_event in iter_agent_events_for_smolagents_events(
+            agent_factory(
+                tool_call_event_handler=get_tool_call_event_handler_recording_tool_names(
+                    tool_names,
+                    tool_call_event_handler=tool_call_event_handler
+                )
+            ).run(
+                message,
+                stream=True,
+                additional_args={
+                    'previous_messages': previous_messages
+                }
+            )
+        ):
+            if isinstance(agent_event, AgentFinalAnswerEvent):
+                self._set_cached_answer(message, previous_messages, agent_event.text, tool_names)
+            yield agent_event
@@ -0,0 +1,212 @@
+from dataclasses import dataclass, replace
+import logging
+import re
+import threading
+import time
+from typing import Callable, Collection, Optional, Sequence
+import zlib
+
+import numpy as np
+
+from data_ai_bot.config import AnswerCacheConfig
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+SLACK_USER_MENTION_PATTERN = r'<@[A-Z0-9]+>'
+
+TOKEN_PATTERN = r'[a-z0-9]+'
+
+
+def get_question_tokens(question: str) -> Sequence[str]:
+    return re.findall(TOKEN_PATTERN, re.sub(SLACK_USER_MENTION_PATTERN, '', question).lower())
+
+
+def get_key_tokens(tokens: Sequence[str]) -> frozenset[str]:
+    # e.g. manuscript ids, which need to match exactly, rather than just being similar
+    return frozenset(token for token in tokens if any(c.isdigit() for c in token))
+
+
+def get_hashed_question_vector(tokens: Sequence[str], feature_count: int) -> np.ndarray:
+    # word unigrams and bigrams, using the signed hashing trick (L2 normalised)
+    vector = np.zeros(feature_count, dtype=np.float32)
+    features = [*tokens, *(f'{a} {b}' for a, b in zip(tokens, tokens[1:]))]
+    for feature in features:
+        feature_hash = zlib.crc32(feature.encode('utf-8'))
+        vector[feature_hash % feature_count] += 1.0 if feature_hash & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+@dataclass(frozen=True)
+class AnswerCacheEntry:
+    question: str
+    answer: str
+    key_tokens: frozenset[str]
+    tool_names: frozenset[str]
+    created_time: float
+    expiry_time: float
+
+
+@dataclass(frozen=True)
+class AnswerCacheMatch:
+    entry: AnswerCacheEntry
+    similarity: float
+
+
+@dataclass
+class AnswerCacheStats:
+    hit_count: int = 0
+    miss_count: int = 0
+    fresh_answer_count: int = 0
+    invalidated_count: int = 0
+    entry_count: int = 0
+
+
+class AnswerCache:
+    '''
+    Returns the cached answer of a similar previous question, using the cosine similarity
+    of hashed word vectors. Questions with different numbers (e.g. ids) never match.
+    '''
+
+    def __init__(
+        self,
+        config: AnswerCacheConfig,
+        clock: Callable[[], float] = time.time
+    ):
+        self.config = config
+        self.clock = clock
+        self.lock = threading.Lock()
+        # one row per entry slot, empty slots are all zero (never similar)
+        self.vectors = np.zeros((config.max_entry_count, config.feature_count), dtype=np.float32)
+        self.entries: list[Optional[AnswerCacheEntry]] = [None] * config.max_entry_count
+        self.stats = AnswerCacheStats()
+
+    def is_fresh_answer_requested(self, question: str) -> bool:
+        words = question.lower().split()
+        return any(keyword.lower() in words for keyword in self.config.fresh_answer_keywords)
+
+    def get_question_without_fresh_answer_keywords(self, question: str) -> str:
+        keywords = {keyword.lower() for keyword in self.config.fresh_answer_keywords}
+        return ' '.join(word for word in question.split() if word.lower() not in keywords)
+
+    def _get_vector(self, tokens: Sequence[str]) -> np.ndarray:
+        return get_hashed_question_vector(tokens, self.config.feature_count)
+
+    def _clear_slot(self, index: int):
+        self.entries[index] = None
+        self.vectors[index] = 0.0
+
+    def get(self, question: str) -> Optional[AnswerCacheMatch]:
+        tokens = get_question_tokens(question)
+        key_tokens = get_key_tokens(tokens)
+        vector = self._get_vector(tokens)
+        now = self.clock()
+        with self.lock:
+            similarities = self.vectors @ vector
+            for index in np.argsort(-similarities).tolist():
+                similarity = float(similarities[index])
+                if similarity < self.config.similarity_threshold:
+                    break
+                entry = self.entries[index]
+                if entry is None or entry.key_tokens != key_tokens:
+                    continue
+                if entry.expiry_time <= now:
+                    self._clear_slot(index)
+                    continue
+                self.stats.hit_count += 1
+                LOGGER.info(
+                    'Answer cache hit (similarity: %.3f): %r',
+                    similarity, entry.question
+                )
+                return AnswerCacheMatch(entry=entry, similarity=similarity)
+            self.stats.miss_count += 1
+            return None
+
+    def _get_ttl(self, tool_names: Collection[str]) -> float:
+        return min([
+            self.config.ttl,
+            *(
+                self.config.ttl_by_tool_name[tool_name]
+                for tool_name in tool_names
+                if tool_name in self.config.ttl_by_tool_name
+            )
+        ])
+
+    def _get_free_slot_index(self, now: float) -> int:
+        # an empty or expired slot, otherwise the oldest entry
+        oldest_index = 0
+        oldest_created_time = float('inf')
+        for index, entry in enumerate(self.entries):
+            if entry is None or entry.expiry_time <= now:
+                return index
+            if entry.created_time < oldest_created_time:
+                oldest_index = index
+                oldest_created_time = entry.created_time
+        return oldest_index
+
+    def set(self, question: str, answer: str, tool_names: Collection[str] = ()):
+        ttl = self._get_ttl(tool_names)
+        if ttl <= 0:
+            return
+        tokens = get_question_tokens(question)
+        vector = self._get_vector(tokens)
+        now = self.clock()
+        entry = AnswerCacheEntry(
+            question=question,
+            answer=answer,
+            key_tokens=get_key_tokens(tokens),
+            tool_names=frozenset(tool_names),
+            created_time=now,
+            expiry_time=now + ttl
+        )
+        with self.lock:
+            # replacing an existing answer of the same question (e.g. a fresh answer)
+            similarities = self.vectors @ vector
+            for index in np.flatnonzero(
+                similarities >= self.config.similarity_threshold
+            ).tolist():
+                existing_entry = self.entries[index]
+                if existing_entry is not None and existing_entry.key_tokens == entry.key_tokens:
+                    self._clear_slot(index)
+            index = self._get_free_slot_index(now)
+            self.entries[index] = entry
+            self.vectors[index] = vector
+
+    def record_fresh_answer(self):
+        with self.lock:
+            self.stats.fresh_answer_count += 1
+
+    def invalidate_tool_name(self, tool_name: str) -> int:
+        # e.g. when the data behind the tool changed
+        with self.lock:
+            indices = [
+                index
+                for index, entry in enumerate(self.entries)
+                if entry is not None and tool_name in entry.tool_names
+            ]
+            for index in indices:
+                self._clear_slot(index)
+            self.stats.invalidated_count += len(indices)
+        LOGGER.info('Invalidated %d cached answers using tool: %r', len(indices), tool_name)
+        return len(indices)
+
+    def clear(self) -> int:
+        # e.g. when the agent or model config changed
+        with self.lock:
+            indices = [index for index, entry in enumerate(self.entries) if entry is not None]
+            for index in indices:
+                self._clear_slot(index)
+            self.stats.invalidated_count += len(indices)
+        LOGGER.info('Invalidated all %d cached answers', len(indices))
+        return len(indices)
+
+    def get_stats(self) -> AnswerCacheStats:
+        with self.lock:
+            return replace(
+                self.stats,
+                entry_count=sum(1 for entry in self.entries if entry is not None)
+            )
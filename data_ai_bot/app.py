@@ -1,14 +1,15 @@
 from dataclasses import dataclass, field
 import logging
-from typing import Sequence
+from typing import Optional, Sequence
 
 import slack_bolt
 from slack_bolt.context.say import Say
 
 from openinference.instrumentation import using_attributes
 
-from data_ai_bot.agent_factory import SmolAgentsAgentFactory, ToolCall, ToolCallEvent
+from data_ai_bot.agent_factory import AgentFactory, ToolCall, ToolCallEvent
 from data_ai_bot.agent_session import SmolAgentsAgentSession
+from data_ai_bot.answer_cache import AnswerCache
 from data_ai_bot.slack import (
     BlockTypedDict,
     ContextBlockTypedDict,
@@ -64,13 +65,14 @@ def get_mrkdwn_formatted_tool_call(tool_call: ToolCall) -> str:
 
 @dataclass(frozen=True)
 class SlackChatAppMessageSession:  # pylint: disable=too-many-instance-attributes
-    agent_factory: SmolAgentsAgentFactory
+    agent_factory: AgentFactory
     slack_app: slack_bolt.App
     message_event_dict: dict
     message_event: SlackMessageEvent
     message_client: SlackMessageClient
     say: Say
     echo_message: bool = False
+    answer_cache: Optional[AnswerCache] = None
     tool_call_str_list: list[str] = field(default_factory=list)
 
     def get_agent_response_message(self) -> str:
@@ -81,7 +83,8 @@ class SlackChatAppMessageSession:  # pylint: disable=too-many-instance-attribute
         if last_word == 'TEST_LONG_CODE':
             return f'```\n{DUMMY_TEXT_4K}\n```'
         agent_response = SmolAgentsAgentSession(
-            agent_factory=self.agent_factory
+            agent_factory=self.agent_factory,
+            answer_cache=self.answer_cache
         ).run(
             message=get_agent_message(
                 message_event=self.message_event
@@ -163,9 +166,10 @@ class SlackChatAppMessageSession:  # pylint: disable=too-many-instance-attribute
 
 @dataclass(frozen=True)
 class SlackChatApp:
-    agent_factory: SmolAgentsAgentFactory
+    agent_factory: AgentFactory
     slack_app: slack_bolt.App
     echo_message: bool = False
+    answer_cache: Optional[AnswerCache] = None
 
     def handle_message(self, event: dict, say: Say):
         try:
@@ -183,7 +187,8 @@ class SlackChatApp:
                     message_event=message_event
                 ),
                 say=say,
-                echo_message=self.echo_message
+                echo_message=self.echo_message,
+                answer_cache=self.answer_cache
             ).handle_message()
         except Exception as exc:  # pylint: disable=broad-exception-caught
             LOGGER.warning('Caught exception: %r', exc, exc_info=True)
@@ -1,6 +1,10 @@
+from dataclasses import dataclass, replace
 import logging
 import os
-from typing import Optional, Sequence
+import signal
+import threading
+import time
+from typing import Callable, Optional, Sequence
 
 import slack_bolt
 from slack_bolt.adapter.socket_mode import SocketModeHandler
@@ -9,25 +13,39 @@ from slack_bolt.context.say import Say
 from cachetools import TTLCache  # type: ignore
 
 from data_ai_bot.agent_factory import (
+    AgentFactory,
+    ReloadableAgentFactory,
     SmolAgentsAgentFactory,
     SmolAgentsManagedAgentFactory,
     check_agent_factory
 )
+from data_ai_bot.answer_cache import AnswerCache
 from data_ai_bot.app import SlackChatApp
 from data_ai_bot.config import (
     AppConfig,
     BaseAgentConfig,
+    EnvironmentVariables,
     FromPythonToolClassConfig,
     FromPythonToolInstanceConfig,
+    IntentConfig,
     ManagedAgentConfig,
+    ModelRoutingConfig,
+    ResolvedAgentConfig,
     ToolDefinitionsConfig,
+    get_app_config_file,
     load_app_config
 )
+from data_ai_bot.config_reload import MAIN_AGENT_NAME, AppConfigReloader, ConfigFileWatcher
+from data_ai_bot.config_snapshot import load_config_snapshot
+from data_ai_bot.intents import Intent, IntentAgentFactory
+from data_ai_bot.model_routing import ModelTier, TieredAgentFactory
 from data_ai_bot.models.registry import SmolAgentsModelRegistry
+from data_ai_bot.models.response_cache import get_model_for_agent
 from data_ai_bot.slack import (
     get_message_age_in_seconds_from_event_dict
 )
 from data_ai_bot.telemetry import configure_otlp_if_enabled
+from data_ai_bot.tools.mcp import McpToolSchemaCache, McpToolSchemaStore
 from data_ai_bot.tools.resolver import ConfigToolResolver
 
 
@@ -64,9 +82,10 @@ def get_required_env(key: str) -> str:
 
 
 def create_bolt_app(
-    agent_factory: SmolAgentsAgentFactory,
+    agent_factory: AgentFactory,
     max_message_age_in_seconds: int = 600,
-    echo_message: bool = False
+    echo_message: bool = False,
+    answer_cache: Optional[AnswerCache] = None
 ):
     check_agent_factory(agent_factory)
     app = slack_bolt.App(
@@ -76,7 +95,8 @@ def create_bolt_app(
     chat_app = SlackChatApp(
         agent_factory=agent_factory,
         slack_app=app,
-        echo_message=echo_message
+        echo_message=echo_message,
+        answer_cache=answer_cache
     )
 
     previous_messages: dict[str, bool] = TTLCache(maxsize=1000, ttl=600)
@@ -118,7 +138,8 @@ def create_bolt_app(
 def get_managed_agent_factory_for_config(
     managed_agent_config: ManagedAgentConfig,
     tool_resolver: ConfigToolResolver,
-    model_registry: SmolAgentsModelRegistry
+    model_registry: SmolAgentsModelRegistry,
+    resolved_agent_config: Optional[ResolvedAgentConfig] = None
 ) -> SmolAgentsManagedAgentFactory:
     LOGGER.info('managed_agent_config: %r', managed_agent_config)
     tools = tool_resolver.get_tools_by_name(
@@ -126,13 +147,17 @@ def get_managed_agent_factory_for_config(
         tool_collection_names=managed_agent_config.tool_collections
     )
     LOGGER.info('Tools (Managed Agent: %s): %r', managed_agent_config.name, tools)
-    model = model_registry.get_model_or_default_model(managed_agent_config.model_name)
+    model = get_model_for_agent(
+        model_registry.get_model_or_default_model(managed_agent_config.model_name),
+        agent_name=managed_agent_config.name
+    )
     return SmolAgentsManagedAgentFactory(
         name=managed_agent_config.name,
         description=managed_agent_config.description,
         model=model,
         tools=tools,
-        system_prompt=managed_agent_config.system_prompt
+        system_prompt=managed_agent_config.system_prompt,
+        resolved_agent_config=resolved_agent_config
     )
 
 
@@ -148,7 +173,8 @@ def get_managed_agent_factory_by_name(
         return get_managed_agent_factory_for_config(
             managed_agent_config=managed_agent_config,
             tool_resolver=tool_resolver,
-            model_registry=model_registry
+            model_registry=model_registry,
+            resolved_agent_config=app_config.resolved_agent_config_by_name.get(name)
         )
     raise ValueError(f'No managed agent config found for: {repr(name)}')
 
@@ -170,24 +196,81 @@ def get_managed_agent_factories(
     ]
 
 
+def get_tiered_agent_factory_for_config(
+    agent_factory: SmolAgentsAgentFactory,
+    model_routing_config: ModelRoutingConfig,
+    model_registry: SmolAgentsModelRegistry
+) -> TieredAgentFactory:
+    LOGGER.info('model_routing_config: %r', model_routing_config)
+    return TieredAgentFactory(
+        default_agent_factory=agent_factory,
+        model_tiers=[
+            ModelTier(
+                config=model_tier_config,
+                agent_factory=replace(
+                    agent_factory,
+                    model=get_model_for_agent(
+                        model_registry.get_model(model_tier_config.model_name),
+                        agent_name=MAIN_AGENT_NAME
+                    )
+                )
+            )
+            for model_tier_config in model_routing_config.tiers
+        ],
+        classifier_model=(
+            model_registry.get_model(model_routing_config.classifier_model_name)
+            if model_routing_config.classifier_model_name
+            else None
+        )
+    )
+
+
+def get_intent_agent_factory_for_config(
+    agent_factory: AgentFactory,
+    intent_configs: Sequence[IntentConfig],
+    tool_resolver: ConfigToolResolver
+) -> IntentAgentFactory:
+    LOGGER.info('Intents (Main Agent): %r', [
+        intent_config.name for intent_config in intent_configs
+    ])
+    return IntentAgentFactory(
+        agent_factory=agent_factory,
+        intents=[
+            Intent(
+                config=intent_config,
+                tool=(
+                    tool_resolver.get_tool_by_name(intent_config.tool)
+                    if intent_config.tool
+                    else None
+                )
+            )
+            for intent_config in intent_configs
+        ]
+    )
+
+
 def get_main_agent_factory_for_config(
     agent_config: BaseAgentConfig,
     tool_resolver: ConfigToolResolver,
     model_registry: SmolAgentsModelRegistry,
     app_config: AppConfig
-) -> SmolAgentsAgentFactory:
+) -> AgentFactory:
     LOGGER.info('agent_config: %r', agent_config)
     tools = tool_resolver.get_tools_by_name(
         tool_names=agent_config.tools,
         tool_collection_names=agent_config.tool_collections
     )
-    model = model_registry.get_model_or_default_model(agent_config.model_name)
+    model = get_model_for_agent(
+        model_registry.get_model_or_default_model(agent_config.model_name),
+        agent_name=MAIN_AGENT_NAME
+    )
     LOGGER.info('Tools (Main Agent): %r', tools)
     LOGGER.info('Managed Agents (Main Agent): %r', agent_config.managed_agent_names)
-    return SmolAgentsAgentFactory(
+    agent_factory = SmolAgentsAgentFactory(
         model=model,
         tools=tools,
         system_prompt=agent_config.system_prompt,
+        resolved_agent_config=app_config.resolved_agent_config_by_name.get(MAIN_AGENT_NAME),
         managed_agent_factories=get_managed_agent_factories(
             managed_agent_names=agent_config.managed_agent_names,
             tool_resolver=tool_resolver,
@@ -195,16 +278,141 @@ def get_main_agent_factory_for_config(
             app_config=app_config
         )
     )
+    routed_agent_factory: AgentFactory = agent_factory
+    if agent_config.model_routing is not None:
+        routed_agent_factory = get_tiered_agent_factory_for_config(
+            agent_factory=agent_factory,
+            model_routing_config=agent_config.model_routing,
+            model_registry=model_registry
+        )
+    if not agent_config.intents:
+        return routed_agent_factory
+    return get_intent_agent_factory_for_config(
+        agent_factory=routed_agent_factory,
+        intent_configs=agent_config.intents,
+        tool_resolver=tool_resolver
+    )
+
+
+def get_all_tool_collection_names(app_config: AppConfig) -> Sequence[str]:
+    return list(dict.fromkeys(
+        tool_collection_name
+        for agent_config in [app_config.agent, *app_config.managed_agents]
+        for tool_collection_name in agent_config.tool_collections
+    ))
+
+
+def get_agent_factory_for_app_config(
+    app_config: AppConfig,
+    tool_resolver: ConfigToolResolver,
+    model_registry: SmolAgentsModelRegistry
+) -> AgentFactory:
+    tool_resolver.start_tool_collections(get_all_tool_collection_names(app_config))
+    agent_factory = get_main_agent_factory_for_config(
+        agent_config=app_config.agent,
+        tool_resolver=tool_resolver,
+        model_registry=model_registry,
+        app_config=app_config
+    )
+    tool_resolver.log_stats()
+    return agent_factory
+
+
+def start_config_file_watcher(
+    config_file: str,
+    app_config_reloader: AppConfigReloader
+) -> ConfigFileWatcher:
+    config_reload_interval = get_optional_env('CONFIG_RELOAD_INTERVAL')
+    config_file_watcher = ConfigFileWatcher(
+        config_file=config_file,
+        on_change=app_config_reloader.reload,
+        poll_interval=float(config_reload_interval) if config_reload_interval else None
+    )
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, lambda *_: config_file_watcher.request_reload())
+    config_file_watcher.start()
+    return config_file_watcher
+
+
+def start_model_registry_warm_up(model_registry: SmolAgentsModelRegistry):
+    # in the background, to not delay the startup
+    def warm_up():
+        try:
+            LOGGER.info('Warmed up model HTTP clients: %r', model_registry.warm_up())
+            model_registry.log_http_client_stats()
+        except Exception:  # pylint: disable=broad-exception-caught
+            LOGGER.exception('Failed to warm up models')
+
+    threading.Thread(target=warm_up, name='model-warm-up', daemon=True).start()
+
+
+def start_model_stats_logger(
+    get_model_registry: Callable[[], SmolAgentsModelRegistry],
+    interval: float
+):
+    def log_stats_periodically():
+        while True:
+            time.sleep(interval)
+            get_model_registry().log_stats()
+
+    threading.Thread(
+        target=log_stats_periodically,
+        name='model-stats-logger',
+        daemon=True
+    ).start()
+
+
+@dataclass(frozen=True)
+class AppConfigSource:
+    config_file: str
+    app_config: AppConfig
+    load_app_config: Callable[[], AppConfig]
+    mcp_tool_schema_cache: Optional[McpToolSchemaStore] = None
+
+
+def get_mcp_tool_schema_cache_from_env() -> Optional[McpToolSchemaStore]:
+    mcp_tool_schema_cache_dir = get_optional_env('MCP_TOOL_SCHEMA_CACHE_DIR')
+    if not mcp_tool_schema_cache_dir:
+        return None
+    return McpToolSchemaCache(mcp_tool_schema_cache_dir)
+
+
+def get_app_config_source() -> AppConfigSource:
+    config_snapshot_file = get_optional_env('CONFIG_SNAPSHOT_FILE')
+    if not config_snapshot_file:
+        return AppConfigSource(
+            config_file=get_app_config_file(),
+            app_config=load_app_config(),
+            load_app_config=load_app_config,
+            mcp_tool_schema_cache=get_mcp_tool_schema_cache_from_env()
+        )
+    config_snapshot = load_config_snapshot(config_snapshot_file)
+    config_file = get_optional_env(EnvironmentVariables.CONFIG_FILE)
+    if config_file and os.path.exists(config_file) and not config_snapshot.is_up_to_date(
+        config_file
+    ):
+        LOGGER.warning('Config snapshot is out of date: %r', config_snapshot_file)
+    return AppConfigSource(
+        config_file=config_snapshot_file,
+        app_config=config_snapshot.get_app_config(),
+        load_app_config=lambda: load_config_snapshot(config_snapshot_file).get_app_config(),
+        mcp_tool_schema_cache=config_snapshot.get_mcp_tool_schema_store()
+    )
 
 
 def main():
     LOGGER.info('Initializing...')
-    app_config = load_app_config()
+    start_time = time.monotonic()
+    app_config_source = get_app_config_source()
+    app_config = app_config_source.app_config
+    LOGGER.info('Loaded config in %.3f seconds', time.monotonic() - start_time)
     LOGGER.info('app_config: %r', app_config)
     configure_otlp_if_enabled(get_optional_env('OTLP_ENDPOINT'))
     model_registry = SmolAgentsModelRegistry(
         app_config.models
     )
+    if get_optional_env('MODEL_WARM_UP_ENABLED') != 'false':
+        start_model_registry_warm_up(model_registry)
     headers = {
         'User-Agent': get_optional_env('USER_AGENT') or 'Data-AI-Bot/1.0'
     }
@@ -216,17 +424,42 @@ def main():
         tool_collection_definitions_config=(
             app_config.tool_collection_definitions
         ),
-        headers=headers
+        headers=headers,
+        mcp_tool_schema_cache=app_config_source.mcp_tool_schema_cache
     ) as tool_resolver:
-        agent_factory = get_main_agent_factory_for_config(
-            agent_config=app_config.agent,
-            tool_resolver=tool_resolver,
-            model_registry=model_registry,
-            app_config=app_config
+        agent_factory = ReloadableAgentFactory(get_agent_factory_for_app_config(
+            app_config,
+            tool_resolver,
+            model_registry
+        ))
+        # created once, i.e. changes to its config require a restart
+        answer_cache = (
+            AnswerCache(app_config.agent.answer_cache)
+            if app_config.agent.answer_cache is not None
+            else None
         )
         app = create_bolt_app(
-            agent_factory=agent_factory
+            agent_factory=agent_factory,
+            answer_cache=answer_cache
+        )
+        LOGGER.info('Initialized in %.3f seconds', time.monotonic() - start_time)
+        app_config_reloader = AppConfigReloader(
+            app_config=app_config,
+            tool_resolver=tool_resolver,
+            model_registry=model_registry,
+            agent_factory=agent_factory,
+            get_agent_factory_for_config=get_agent_factory_for_app_config,
+            load_app_config_fn=app_config_source.load_app_config,
+            default_tool_definitions_config=DEFAULT_TOOL_DEFINITIONS_CONFIG,
+            answer_cache=answer_cache
         )
+        start_config_file_watcher(app_config_source.config_file, app_config_reloader)
+        model_stats_log_interval = get_optional_env('MODEL_STATS_LOG_INTERVAL')
+        if model_stats_log_interval:
+            start_model_stats_logger(
+                lambda: app_config_reloader.model_registry,
+                interval=float(model_stats_log_interval)
+            )
         handler = SocketModeHandler(
             app=app,
             app_token=get_required_env('SLACK_APP_TOKEN')
@@ -0,0 +1,347 @@
+import argparse
+import importlib
+import inspect
+import logging
+import re
+import time
+from typing import Mapping, Optional, Sequence
+
+import smolagents  # type: ignore
+
+from data_ai_bot.agent_factory import get_resolved_agent_config
+from data_ai_bot.cli import DEFAULT_TOOL_DEFINITIONS_CONFIG, get_agent_factory_for_app_config
+from data_ai_bot.config import (
+    AppConfig,
+    FromMcpConfig,
+    FromPythonToolClassConfig,
+    FromPythonToolInstanceConfig,
+    ResolvedAgentConfig,
+    get_eager_tool_definitions_config,
+    load_app_config_from_file,
+    load_yaml_file
+)
+from data_ai_bot.config_reload import MAIN_AGENT_NAME
+from data_ai_bot.config_snapshot import (
+    ConfigSnapshot,
+    get_file_sha256,
+    load_config_snapshot,
+    save_config_snapshot
+)
+from data_ai_bot.models.registry import DEFAULT_MODEL_NAME, SmolAgentsModelRegistry
+from data_ai_bot.tools.mcp import (
+    DEFAULT_MCP_CONNECT_TIMEOUT,
+    McpSessionPool,
+    McpToolSchema,
+    StaticMcpToolSchemaStore
+)
+from data_ai_bot.tools.resolver import ConfigToolResolver
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+# passed in by the resolver, rather than via the init parameters
+RESOLVER_PROVIDED_TOOL_PARAMETER_NAMES = {'name', 'description', 'headers', 'tool_resolver'}
+
+
+class ConfigValidationError(ValueError):
+    def __init__(self, errors: Sequence[str]):
+        super().__init__('Invalid config:\n' + '\n'.join(f'- {error}' for error in errors))
+        self.errors = errors
+
+
+def get_tool_config_validation_errors(
+    tool_config: FromPythonToolInstanceConfig | FromPythonToolClassConfig
+) -> Sequence[str]:
+    try:
+        tool_module = importlib.import_module(tool_config.module)
+    except ImportError as exc:
+        return [f'Tool {repr(tool_config.name)}: failed to import module: {exc}']
+    if isinstance(tool_config, FromPythonToolInstanceConfig):
+        if not isinstance(getattr(tool_module, tool_config.key, None), smolagents.Tool):
+            return [f'Tool {repr(tool_config.name)}: not a tool: {repr(tool_config.key)}']
+        return []
+    tool_class = getattr(tool_module, tool_config.class_name, None)
+    if not isinstance(tool_class, type):
+        return [f'Tool {repr(tool_config.name)}: not a class: {repr(tool_config.class_name)}']
+    errors: list[str] = []
+    parameters = inspect.signature(tool_class).parameters
+    if not any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+        errors.extend(
+            f'Tool {repr(tool_config.name)}: unknown init parameter: {repr(key)}'
+            for key in tool_config.init_parameters
+            if key not in parameters
+        )
+    errors.extend(
+        f'Tool {repr(tool_config.name)}: missing init parameter: {repr(key)}'
+        for key, parameter in parameters.items()
+        if (
+            parameter.default is inspect.Parameter.empty
+            and parameter.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD
+            and key not in tool_config.init_parameters
+            and key not in RESOLVER_PROVIDED_TOOL_PARAMETER_NAMES
+        )
+    )
+    if tool_config.lazy and not (
+        tool_config.description or tool_config.init_parameters.get('description')
+    ):
+        errors.append(f'Tool {repr(tool_config.name)}: lazy tool requires a description')
+    return errors
+
+
+def get_app_config_validation_errors(app_config: AppConfig) -> Sequence[str]:
+    tool_config_by_name = (
+        app_config.tool_definitions or DEFAULT_TOOL_DEFINITIONS_CONFIG
+    ).get_tool_config_by_name()
+    tool_collection_names = {
+        from_mcp_config.name
+        for from_mcp_config in app_config.tool_collection_definitions.from_mcp
+    }
+    managed_agent_names = {
+        managed_agent_config.name
+        for managed_agent_config in app_config.managed_agents
+    }
+    model_names = {
+        model_config.model_name
+        for model_config in app_config.models
+    } | {DEFAULT_MODEL_NAME}
+    errors: list[str] = []
+    for agent_config in [app_config.agent, *app_config.managed_agents]:
+        agent_name = getattr(agent_config, 'name', MAIN_AGENT_NAME)
+        errors.extend(
+            f'Agent {repr(agent_name)}: unknown tool: {repr(tool_name)}'
+            for tool_name in agent_config.tools
+            if tool_name not in tool_config_by_name
+        )
+        errors.extend(
+            f'Agent {repr(agent_name)}: unknown tool collection: {repr(tool_collection_name)}'
+            for tool_collection_name in agent_config.tool_collections
+            if tool_collection_name not in tool_collection_names
+        )
+        errors.extend(
+            f'Agent {repr(agent_name)}: unknown managed agent: {repr(managed_agent_name)}'
+            for managed_agent_name in agent_config.managed_agent_names
+            if managed_agent_name not in managed_agent_names
+        )
+        if agent_config.model_name and agent_config.model_name not in model_names:
+            errors.append(
+                f'Agent {repr(agent_name)}: unknown model: {repr(agent_config.model_name)}'
+            )
+    if app_config.agent.model_routing is not None:
+        errors.extend(
+            f'Agent {repr(MAIN_AGENT_NAME)}: unknown routing model: {repr(model_name)}'
+            for model_name in [
+                *(
+                    model_tier_config.model_name
+                    for model_tier_config in app_config.agent.model_routing.tiers
+                ),
+                *filter(None, [app_config.agent.model_routing.classifier_model_name])
+            ]
+            if model_name not in model_names
+        )
+    for intent_config in app_config.agent.intents:
+        if intent_config.tool and intent_config.tool not in tool_config_by_name:
+            errors.append(
+                f'Intent {repr(intent_config.name)}: unknown tool: {repr(intent_config.tool)}'
+            )
+        if not intent_config.tool and intent_config.response_template is None:
+            errors.append(
+                f'Intent {repr(intent_config.name)}: requires a tool or a response template'
+            )
+        for pattern in intent_config.patterns:
+            try:
+                re.compile(pattern)
+            except re.error as exc:
+                errors.append(
+                    f'Intent {repr(intent_config.name)}: invalid pattern {repr(pattern)}: {exc}'
+                )
+    for model_config in app_config.models:
+        errors.extend(
+            f'Model {repr(model_config.model_name)}: unknown fallback model: {repr(model_name)}'
+            for model_name in model_config.fallback_model_names
+            if model_name not in model_names
+        )
+    for tool_config in tool_config_by_name.values():
+        errors.extend(get_tool_config_validation_errors(tool_config))
+    return errors
+
+
+def fetch_mcp_tool_schemas(
+    from_mcp_config: FromMcpConfig,
+    connect_timeout: float = DEFAULT_MCP_CONNECT_TIMEOUT
+) -> Sequence[McpToolSchema]:
+    session_pool = McpSessionPool(
+        from_mcp_config,
+        connect_timeout=connect_timeout
+    )
+    session_pool.start()
+    try:
+        return [McpToolSchema.from_tool(tool) for tool in session_pool.get_tools()]
+    finally:
+        session_pool.close()
+
+
+def get_mcp_tool_schema_validation_errors(
+    from_mcp_config: FromMcpConfig,
+    tool_schemas: Sequence[McpToolSchema]
+) -> Sequence[str]:
+    tool_names = {tool_schema.name for tool_schema in tool_schemas}
+    return [
+        f'Tool collection {repr(from_mcp_config.name)}: unknown tool: {repr(tool_name)}'
+        for tool_name in from_mcp_config.tools
+        if tool_name not in tool_names
+    ]
+
+
+def get_placeholder_model_registry(app_config: AppConfig) -> SmolAgentsModelRegistry:
+    # the models are only needed to create the agents (without calling the models)
+    model_names = [
+        DEFAULT_MODEL_NAME,
+        *[model_config.model_name for model_config in app_config.models]
+    ]
+    return SmolAgentsModelRegistry(
+        app_config.models,
+        model_instance_by_model_name={
+            model_name: smolagents.Model(model_id=model_name)
+            for model_name in model_names
+        }
+    )
+
+
+def get_resolved_agent_config_by_name(
+    agent: smolagents.MultiStepAgent,
+    agent_name: str = MAIN_AGENT_NAME
+) -> Mapping[str, ResolvedAgentConfig]:
+    return {
+        agent_name: get_resolved_agent_config(agent),
+        **{
+            name: resolved_agent_config
+            for managed_agent_name, managed_agent in agent.managed_agents.items()
+            for name, resolved_agent_config in get_resolved_agent_config_by_name(
+                managed_agent,
+                agent_name=managed_agent_name
+            ).items()
+        }
+    }
+
+
+def get_resolved_agent_config_by_name_for_app_config(
+    app_config: AppConfig,
+    mcp_tool_schemas_by_name: Mapping[str, Sequence[McpToolSchema]]
+) -> Mapping[str, ResolvedAgentConfig]:
+    # creating the agents (e.g. rendering the system prompts), without connecting to MCP servers
+    with ConfigToolResolver(
+        tool_definitions_config=get_eager_tool_definitions_config(
+            app_config.tool_definitions or DEFAULT_TOOL_DEFINITIONS_CONFIG
+        ),
+        tool_collection_definitions_config=app_config.tool_collection_definitions,
+        mcp_tool_schema_cache=StaticMcpToolSchemaStore(mcp_tool_schemas_by_name),
+        start_mcp_sessions=False
+    ) as tool_resolver:
+        try:
+            agent = get_agent_factory_for_app_config(
+                app_config,
+                tool_resolver,
+                get_placeholder_model_registry(app_config)
+            )()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            raise ConfigValidationError([f'Failed to create agents: {repr(exc)}']) from exc
+    return get_resolved_agent_config_by_name(agent)
+
+
+def compile_config_snapshot(
+    config_file: str,
+    fetch_mcp_tool_schemas_enabled: bool = True,
+    mcp_connect_timeout: float = DEFAULT_MCP_CONNECT_TIMEOUT
+) -> ConfigSnapshot:
+    app_config_dict = load_yaml_file(config_file)
+    try:
+        app_config = AppConfig.from_dict(app_config_dict)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ConfigValidationError([f'Invalid config structure: {repr(exc)}']) from exc
+    errors = list(get_app_config_validation_errors(app_config))
+    mcp_tool_schemas_by_name: dict[str, Sequence[McpToolSchema]] = {}
+    for from_mcp_config in app_config.tool_collection_definitions.from_mcp:
+        if not fetch_mcp_tool_schemas_enabled:
+            # creating the agents without the MCP tools
+            mcp_tool_schemas_by_name[from_mcp_config.name] = []
+            continue
+        try:
+            tool_schemas = fetch_mcp_tool_schemas(
+                from_mcp_config,
+                connect_timeout=mcp_connect_timeout
+            )
+        except ConnectionError as exc:
+            errors.append(f'Tool collection {repr(from_mcp_config.name)}: {exc}')
+            continue
+        errors.extend(get_mcp_tool_schema_validation_errors(from_mcp_config, tool_schemas))
+        mcp_tool_schemas_by_name[from_mcp_config.name] = tool_schemas
+    if errors:
+        raise ConfigValidationError(errors)
+    return ConfigSnapshot(
+        app_config_dict=app_config_dict,
+        config_sha256=get_file_sha256(config_file),
+        mcp_tool_schemas_by_name=(
+            mcp_tool_schemas_by_name
+            if fetch_mcp_tool_schemas_enabled
+            else {}
+        ),
+        # (without the MCP tools, the rendered system prompts won't match and won't be used)
+        resolved_agent_config_by_name=get_resolved_agent_config_by_name_for_app_config(
+            app_config,
+            mcp_tool_schemas_by_name
+        )
+    )
+
+
+def log_config_load_times(config_file: str, config_snapshot_file: str):
+    start_time = time.perf_counter()
+    load_app_config_from_file(config_file)
+    config_file_seconds = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    load_config_snapshot(config_snapshot_file).get_app_config()
+    config_snapshot_seconds = time.perf_counter() - start_time
+    LOGGER.info(
+        'Config load time: %.3f seconds (snapshot: %.3f seconds)',
+        config_file_seconds, config_snapshot_seconds
+    )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m data_ai_bot compile-config',
+        description=(
+            'Validates the config and compiles it into a snapshot'
+            ' (to start from via CONFIG_SNAPSHOT_FILE).'
+        )
+    )
+    parser.add_argument('--config-file', required=True)
+    parser.add_argument('--output-file', required=True)
+    parser.add_argument(
+        '--skip-mcp',
+        action='store_true',
+        help='Do not connect to the MCP servers (no MCP tool schemas will be included).'
+    )
+    parser.add_argument(
+        '--mcp-connect-timeout',
+        type=float,
+        default=DEFAULT_MCP_CONNECT_TIMEOUT
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> bool:
+    args = parse_args(argv)
+    try:
+        config_snapshot = compile_config_snapshot(
+            args.config_file,
+            fetch_mcp_tool_schemas_enabled=not args.skip_mcp,
+            mcp_connect_timeout=args.mcp_connect_timeout
+        )
+    except ConfigValidationError as exc:
+        LOGGER.error('%s', exc)
+        return False
+    save_config_snapshot(config_snapshot, args.output_file)
+    LOGGER.info('Saved config snapshot to: %r', args.output_file)
+    log_config_load_times(args.config_file, args.output_file)
+    return True
@@ -1,23 +1,31 @@
+import dataclasses
 from dataclasses import dataclass, field
 import logging
 import os
 from pathlib import Path
 from typing import Any, Mapping, Optional, Sequence
 
-import jinja2
 import yaml
 
 from data_ai_bot.config_typing import (
+    AnswerCacheConfigDict,
     AppConfigDict,
     BaseAgentConfigDict,
     FromMcpConfigDict,
     FromPythonToolClassConfigDict,
     FromPythonToolInstanceConfigDict,
+    IntentConfigDict,
     ManagedAgentConfigDict,
     ModelConfigDict,
+    ModelHedgingConfigDict,
+    ModelRateLimitConfigDict,
+    ModelResponseCacheConfigDict,
+    ModelRoutingConfigDict,
+    ModelTierConfigDict,
     ToolCollectionDefinitionsConfigDict,
     ToolDefinitionsConfigDict
 )
+from data_ai_bot.utils.template import get_compiled_template
 
 
 LOGGER = logging.getLogger(__name__)
@@ -36,11 +44,21 @@ def get_evaluated_template(
     template: str,
     variables: Optional[Mapping[str, Any]] = None
 ) -> Any:
-    env = jinja2.Environment()
-    env.globals['env'] = dict(os.environ)
-    env.globals['read_secret_from_env'] = read_secret_from_env
-    compiled_template = env.from_string(template)
-    return compiled_template.render(variables or {})
+    return get_compiled_template(template).render({
+        'env': os.environ,
+        'read_secret_from_env': read_secret_from_env,
+        **(variables or {})
+    })
+
+
+def get_yaml_loader() -> type:
+    # the C based loader (if available) is significantly faster
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def load_yaml_file(file_path: str) -> Any:
+    with open(file_path, 'r', encoding='utf-8') as fp:
+        return yaml.load(fp, Loader=get_yaml_loader())
 
 
 @dataclass(frozen=True)
@@ -69,6 +87,8 @@ class FromPythonToolClassConfig:
     class_name: str
     init_parameters: Mapping[str, Any] = field(default_factory=dict)
     description: Optional[str] = None
+    per_agent: bool = False
+    lazy: bool = False
 
     @staticmethod
     def from_dict(
@@ -79,7 +99,9 @@ class FromPythonToolClassConfig:
             module=from_python_tool_class_config_dict['module'],
             class_name=from_python_tool_class_config_dict['className'],
             init_parameters=from_python_tool_class_config_dict.get('initParameters', {}),
-            description=from_python_tool_class_config_dict.get('description')
+            description=from_python_tool_class_config_dict.get('description'),
+            per_agent=from_python_tool_class_config_dict.get('perAgent', False),
+            lazy=from_python_tool_class_config_dict.get('lazy', False)
         )
 
 
@@ -103,6 +125,21 @@ class ToolDefinitionsConfig:
             ))
         )
 
+    def get_tool_config_by_name(
+        self
+    ) -> Mapping[str, FromPythonToolInstanceConfig | FromPythonToolClassConfig]:
+        tool_config_by_name: dict[
+            str, FromPythonToolInstanceConfig | FromPythonToolClassConfig
+        ] = {}
+        tool_configs: Sequence[FromPythonToolInstanceConfig | FromPythonToolClassConfig] = [
+            *self.from_python_tool_instance,
+            *self.from_python_tool_class
+        ]
+        # the first definition wins (with tool instances taking precedence)
+        for tool_config in tool_configs:
+            tool_config_by_name.setdefault(tool_config.name, tool_config)
+        return tool_config_by_name
+
     def __bool__(self) -> bool:
         return bool(
             self.from_python_tool_instance
@@ -110,12 +147,27 @@ class ToolDefinitionsConfig:
         )
 
 
+def get_eager_tool_definitions_config(
+    tool_definitions_config: ToolDefinitionsConfig
+) -> ToolDefinitionsConfig:
+    return dataclasses.replace(
+        tool_definitions_config,
+        from_python_tool_class=[
+            dataclasses.replace(tool_config, lazy=False)
+            for tool_config in tool_definitions_config.from_python_tool_class
+        ]
+    )
+
+
 @dataclass(frozen=True)
 class FromMcpConfig:
     name: str
     url: str
     transport: str
     tools: Sequence[str] = field(default_factory=list)
+    session_count: int = 1
+    # the call may have reached the server before a connection error (only for idempotent tools)
+    retry_tool_calls: bool = False
 
     @staticmethod
     def from_dict(
@@ -125,7 +177,9 @@ class FromMcpConfig:
             name=from_mcp_config_dict['name'],
             url=from_mcp_config_dict['url'],
             transport=from_mcp_config_dict.get('transport', 'streamable-http'),
-            tools=from_mcp_config_dict.get('tools', [])
+            tools=from_mcp_config_dict.get('tools', []),
+            session_count=from_mcp_config_dict.get('sessionCount', 1),
+            retry_tool_calls=from_mcp_config_dict.get('retryToolCalls', False)
         )
 
 
@@ -149,36 +203,256 @@ class ToolCollectionDefinitionsConfig:
 
 
 @dataclass(frozen=True)
-class ModelConfig:
+class ModelHedgingConfig:
+    # the hedged request is sent after the given percentile of the primary model latency
+    delay_percentile: float = 95.0
+    # used until there are enough latency samples
+    initial_delay: float = 10.0
+    min_delay: float = 1.0
+    min_sample_count: int = 20
+
+    @staticmethod
+    def from_dict(model_hedging_config_dict: ModelHedgingConfigDict) -> 'ModelHedgingConfig':
+        default_config = ModelHedgingConfig()
+        return ModelHedgingConfig(
+            delay_percentile=model_hedging_config_dict.get(
+                'delay_percentile', default_config.delay_percentile
+            ),
+            initial_delay=model_hedging_config_dict.get(
+                'initial_delay', default_config.initial_delay
+            ),
+            min_delay=model_hedging_config_dict.get(
+                'min_delay', default_config.min_delay
+            ),
+            min_sample_count=model_hedging_config_dict.get(
+                'min_sample_count', default_config.min_sample_count
+            )
+        )
+
+
+@dataclass(frozen=True)
+class ModelResponseCacheConfig:
+    ttl: float = 3600.0
+    max_entry_count: int = 1000
+    # optional on-disk tier, e.g. shared across restarts or test runs
+    cache_dir: Optional[str] = None
+    max_disk_entry_count: int = 10000
+    # by default only deterministic requests (temperature zero) are cached
+    always_enabled: bool = False
+
+    @staticmethod
+    def from_dict(
+        model_response_cache_config_dict: ModelResponseCacheConfigDict
+    ) -> 'ModelResponseCacheConfig':
+        default_config = ModelResponseCacheConfig()
+        return ModelResponseCacheConfig(
+            ttl=model_response_cache_config_dict.get('ttl', default_config.ttl),
+            max_entry_count=model_response_cache_config_dict.get(
+                'max_entry_count', default_config.max_entry_count
+            ),
+            cache_dir=model_response_cache_config_dict.get('cache_dir'),
+            max_disk_entry_count=model_response_cache_config_dict.get(
+                'max_disk_entry_count', default_config.max_disk_entry_count
+            ),
+            always_enabled=model_response_cache_config_dict.get(
+                'always_enabled', default_config.always_enabled
+            )
+        )
+
+
+@dataclass(frozen=True)
+class ModelRateLimitConfig:
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    # the concurrency limit is adapted between the min and max concurrency
+    max_concurrency: int = 16
+    min_concurrency: int = 1
+    # the maximum time a request waits to be sent, before failing
+    queue_timeout: float = 60.0
+
+    @staticmethod
+    def from_dict(
+        model_rate_limit_config_dict: ModelRateLimitConfigDict
+    ) -> 'ModelRateLimitConfig':
+        default_config = ModelRateLimitConfig()
+        return ModelRateLimitConfig(
+            requests_per_minute=model_rate_limit_config_dict.get('requests_per_minute'),
+            tokens_per_minute=model_rate_limit_config_dict.get('tokens_per_minute'),
+            max_concurrency=model_rate_limit_config_dict.get(
+                'max_concurrency', default_config.max_concurrency
+            ),
+            min_concurrency=model_rate_limit_config_dict.get(
+                'min_concurrency', default_config.min_concurrency
+            ),
+            queue_timeout=model_rate_limit_config_dict.get(
+                'queue_timeout', default_config.queue_timeout
+            )
+        )
+
+
+@dataclass(frozen=True)
+class ModelConfig:  # pylint: disable=too-many-instance-attributes
     model_name: str
     base_url: str
     api_key: str = field(repr=False)
+    temperature: Optional[float] = None
+    fallback_model_names: Sequence[str] = field(default_factory=list)
+    hedging: Optional[ModelHedgingConfig] = None
+    response_cache: Optional[ModelResponseCacheConfig] = None
+    rate_limit: Optional[ModelRateLimitConfig] = None
 
     @staticmethod
     def from_dict(model_config_dict: ModelConfigDict) -> 'ModelConfig':
+        hedging_config_dict = model_config_dict.get('hedging')
+        response_cache_config_dict = model_config_dict.get('response_cache')
+        rate_limit_config_dict = model_config_dict.get('rate_limit')
         return ModelConfig(
             model_name=model_config_dict['model_name'],
             base_url=model_config_dict['base_url'],
-            api_key=get_evaluated_template(model_config_dict['api_key'])
+            api_key=get_evaluated_template(model_config_dict['api_key']),
+            temperature=model_config_dict.get('temperature'),
+            fallback_model_names=model_config_dict.get('fallback_model_names', []),
+            hedging=(
+                ModelHedgingConfig.from_dict(hedging_config_dict)
+                if hedging_config_dict is not None
+                else None
+            ),
+            response_cache=(
+                ModelResponseCacheConfig.from_dict(response_cache_config_dict)
+                if response_cache_config_dict is not None
+                else None
+            ),
+            rate_limit=(
+                ModelRateLimitConfig.from_dict(rate_limit_config_dict)
+                if rate_limit_config_dict is not None
+                else None
+            )
         )
 
 
 @dataclass(frozen=True)
-class BaseAgentConfig:
+class ModelTierConfig:
+    model_name: str
+    # used by the classifier model, if configured
+    description: Optional[str] = None
+    # the tier is only considered for requests within these limits
+    max_message_length: Optional[int] = None
+    max_previous_message_count: Optional[int] = None
+
+    @staticmethod
+    def from_dict(model_tier_config_dict: ModelTierConfigDict) -> 'ModelTierConfig':
+        return ModelTierConfig(
+            model_name=model_tier_config_dict['model'],
+            description=model_tier_config_dict.get('description'),
+            max_message_length=model_tier_config_dict.get('maxMessageLength'),
+            max_previous_message_count=model_tier_config_dict.get('maxPreviousMessageCount')
+        )
+
+
+@dataclass(frozen=True)
+class ModelRoutingConfig:
+    # the cheaper tiers, in order, before the model of the agent itself
+    tiers: Sequence[ModelTierConfig]
+    classifier_model_name: Optional[str] = None
+
+    @staticmethod
+    def from_dict(model_routing_config_dict: ModelRoutingConfigDict) -> 'ModelRoutingConfig':
+        return ModelRoutingConfig(
+            tiers=list(map(ModelTierConfig.from_dict, model_routing_config_dict['tiers'])),
+            classifier_model_name=model_routing_config_dict.get('classifierModel')
+        )
+
+
+@dataclass(frozen=True)
+class IntentConfig:
+    name: str
+    # regular expressions, matching the whole message (ignoring case)
+    patterns: Sequence[str]
+    tool: Optional[str] = None
+    # templates, with the captured groups as variables (defaults to the named groups)
+    tool_arguments: Optional[Mapping[str, str]] = None
+    # template, with the captured groups and the tool `result` as variables
+    response_template: Optional[str] = None
+
+    @staticmethod
+    def from_dict(intent_config_dict: IntentConfigDict) -> 'IntentConfig':
+        return IntentConfig(
+            name=intent_config_dict['name'],
+            patterns=intent_config_dict['patterns'],
+            tool=intent_config_dict.get('tool'),
+            tool_arguments=intent_config_dict.get('toolArguments'),
+            response_template=intent_config_dict.get('responseTemplate')
+        )
+
+
+@dataclass(frozen=True)
+class AnswerCacheConfig:
+    # cosine similarity of the normalised questions
+    similarity_threshold: float = 0.9
+    ttl: float = 3600.0
+    # shorter time to live, for answers using any of these tools
+    ttl_by_tool_name: Mapping[str, float] = field(default_factory=dict)
+    max_entry_count: int = 1000
+    # the dimension of the hashed question vectors
+    feature_count: int = 4096
+    fresh_answer_keywords: Sequence[str] = ('!fresh',)
+
+    @staticmethod
+    def from_dict(answer_cache_config_dict: AnswerCacheConfigDict) -> 'AnswerCacheConfig':
+        default_config = AnswerCacheConfig()
+        return AnswerCacheConfig(
+            similarity_threshold=answer_cache_config_dict.get(
+                'similarityThreshold', default_config.similarity_threshold
+            ),
+            ttl=answer_cache_config_dict.get('ttl', default_config.ttl),
+            ttl_by_tool_name=answer_cache_config_dict.get(
+                'ttlByToolName', default_config.ttl_by_tool_name
+            ),
+            max_entry_count=answer_cache_config_dict.get(
+                'maxEntryCount', default_config.max_entry_count
+            ),
+            feature_count=answer_cache_config_dict.get(
+                'featureCount', default_config.feature_count
+            ),
+            fresh_answer_keywords=answer_cache_config_dict.get(
+                'freshAnswerKeywords', default_config.fresh_answer_keywords
+            )
+        )
+
+
+@dataclass(frozen=True)
+class BaseAgentConfig:  # pylint: disable=too-many-instance-attributes
     tools: Sequence[str]
     tool_collections: Sequence[str]
     system_prompt: Optional[str] = None
     managed_agent_names: Sequence[str] = field(default_factory=list)
     model_name: Optional[str] = None
+    # only supported by the main agent
+    model_routing: Optional[ModelRoutingConfig] = None
+    intents: Sequence[IntentConfig] = field(default_factory=list)
+    answer_cache: Optional[AnswerCacheConfig] = None
 
     @staticmethod
     def from_dict(agent_config_dict: BaseAgentConfigDict) -> 'BaseAgentConfig':
+        model_routing_config_dict = agent_config_dict.get('modelRouting')
+        answer_cache_config_dict = agent_config_dict.get('answerCache')
         return BaseAgentConfig(
             tools=agent_config_dict.get('tools', []),
             tool_collections=agent_config_dict.get('toolCollections', []),
             system_prompt=agent_config_dict.get('systemPrompt'),
             managed_agent_names=agent_config_dict.get('managedAgents', []),
-            model_name=agent_config_dict.get('model')
+            model_name=agent_config_dict.get('model'),
+            model_routing=(
+                ModelRoutingConfig.from_dict(model_routing_config_dict)
+                if model_routing_config_dict is not None
+                else None
+            ),
+            intents=list(map(IntentConfig.from_dict, agent_config_dict.get('intents', []))),
+            answer_cache=(
+                AnswerCacheConfig.from_dict(answer_cache_config_dict)
+                if answer_cache_config_dict is not None
+                else None
+            )
         )
 
 
@@ -202,6 +476,28 @@ class ManagedAgentConfig(BaseAgentConfig):
         )
 
 
+@dataclass(frozen=True)
+class ResolvedAgentConfig:
+    '''
+    The agent as resolved when compiling the config (e.g. including the MCP tools),
+    with the system prompt rendered for its tools and managed agents.
+    '''
+    tool_names: Sequence[str]
+    managed_agent_names: Sequence[str]
+    rendered_system_prompt: str
+    # the hash of everything the rendered system prompt depends on
+    system_prompt_inputs_sha256: str
+
+    @staticmethod
+    def from_dict(resolved_agent_config_dict: Mapping[str, Any]) -> 'ResolvedAgentConfig':
+        return ResolvedAgentConfig(
+            tool_names=resolved_agent_config_dict['tools'],
+            managed_agent_names=resolved_agent_config_dict['managedAgents'],
+            rendered_system_prompt=resolved_agent_config_dict['renderedSystemPrompt'],
+            system_prompt_inputs_sha256=resolved_agent_config_dict['systemPromptInputsSha256']
+        )
+
+
 @dataclass(frozen=True)
 class AppConfig:
     tool_definitions: ToolDefinitionsConfig
@@ -209,6 +505,10 @@ class AppConfig:
     models: Sequence[ModelConfig]
     agent: BaseAgentConfig
     managed_agents: Sequence[ManagedAgentConfig]
+    # only available when loaded from a config snapshot
+    resolved_agent_config_by_name: Mapping[str, ResolvedAgentConfig] = field(
+        default_factory=dict
+    )
 
     @staticmethod
     def from_dict(app_config_dict: AppConfigDict) -> 'AppConfig':
@@ -237,10 +537,9 @@ def get_app_config_file() -> str:
 
 def load_app_config_from_file(config_file: str) -> AppConfig:
     LOGGER.info('Loading config from: %r', config_file)
-    with open(config_file, 'r', encoding='utf-8') as config_fp:
-        return AppConfig.from_dict(
-            yaml.safe_load(config_fp)
-        )
+    return AppConfig.from_dict(
+        load_yaml_file(config_file)
+    )
 
 
 def load_app_config() -> AppConfig:
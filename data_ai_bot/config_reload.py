@@ -0,0 +1,249 @@
+from dataclasses import dataclass, field
+import logging
+import os
+import threading
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+from data_ai_bot.agent_factory import AgentFactory, ReloadableAgentFactory, check_agent_factory
+from data_ai_bot.answer_cache import AnswerCache
+from data_ai_bot.config import AppConfig, ToolDefinitionsConfig, load_app_config
+from data_ai_bot.models.registry import SmolAgentsModelRegistry
+from data_ai_bot.tools.mcp import McpSessionPool
+from data_ai_bot.tools.resolver import ConfigToolResolver
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+MAIN_AGENT_NAME = '__main__'
+
+# giving in-flight requests time to complete, before closing MCP sessions no longer used
+DEFAULT_UNUSED_MCP_SESSION_POOL_CLOSE_DELAY = 300.0
+
+
+AgentFactoryForConfig = Callable[
+    [AppConfig, ConfigToolResolver, SmolAgentsModelRegistry],
+    AgentFactory
+]
+
+
+def get_changed_names(
+    previous_by_name: Mapping[str, Any],
+    current_by_name: Mapping[str, Any]
+) -> Sequence[str]:
+    return sorted(
+        name
+        for name in previous_by_name.keys() | current_by_name.keys()
+        if previous_by_name.get(name) != current_by_name.get(name)
+    )
+
+
+@dataclass(frozen=True)
+class AppConfigChanges:
+    tool_names: Sequence[str] = field(default_factory=list)
+    tool_collection_names: Sequence[str] = field(default_factory=list)
+    model_names: Sequence[str] = field(default_factory=list)
+    agent_names: Sequence[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.tool_names
+            or self.tool_collection_names
+            or self.model_names
+            or self.agent_names
+        )
+
+
+def get_app_config_changes(
+    previous_app_config: AppConfig,
+    current_app_config: AppConfig
+) -> AppConfigChanges:
+    return AppConfigChanges(
+        tool_names=get_changed_names(
+            previous_app_config.tool_definitions.get_tool_config_by_name(),
+            current_app_config.tool_definitions.get_tool_config_by_name()
+        ),
+        tool_collection_names=get_changed_names(
+            {c.name: c for c in previous_app_config.tool_collection_definitions.from_mcp},
+            {c.name: c for c in current_app_config.tool_collection_definitions.from_mcp}
+        ),
+        model_names=get_changed_names(
+            {c.model_name: c for c in previous_app_config.models},
+            {c.model_name: c for c in current_app_config.models}
+        ),
+        agent_names=get_changed_names(
+            {
+                MAIN_AGENT_NAME: previous_app_config.agent,
+                **{c.name: c for c in previous_app_config.managed_agents}
+            },
+            {
+                MAIN_AGENT_NAME: current_app_config.agent,
+                **{c.name: c for c in current_app_config.managed_agents}
+            }
+        )
+    )
+
+
+def invalidate_answer_cache_for_changes(
+    answer_cache: AnswerCache,
+    changes: AppConfigChanges
+):
+    # the tool names of MCP tool collections aren't known from the config
+    if changes.agent_names or changes.model_names or changes.tool_collection_names:
+        answer_cache.clear()
+        return
+    for tool_name in changes.tool_names:
+        answer_cache.invalidate_tool_name(tool_name)
+
+
+def close_mcp_session_pools_later(
+    session_pools: Sequence[McpSessionPool],
+    delay: float
+):
+    if not session_pools:
+        return
+
+    def close_session_pools():
+        for session_pool in session_pools:
+            LOGGER.info('Closing MCP session pool no longer used: %r', session_pool.name)
+            session_pool.close()
+
+    timer = threading.Timer(delay, close_session_pools)
+    timer.daemon = True
+    timer.start()
+
+
+class AppConfigReloader:  # pylint: disable=too-many-instance-attributes
+    '''
+    Reloads the config and replaces the agent factory, if the config changed.
+    Tools, MCP session pools and models with an unchanged config are reused.
+    Cached answers affected by the changes are invalidated.
+    '''
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        app_config: AppConfig,
+        tool_resolver: ConfigToolResolver,
+        model_registry: SmolAgentsModelRegistry,
+        agent_factory: ReloadableAgentFactory,
+        get_agent_factory_for_config: AgentFactoryForConfig,
+        load_app_config_fn: Callable[[], AppConfig] = load_app_config,
+        default_tool_definitions_config: ToolDefinitionsConfig = ToolDefinitionsConfig(),
+        unused_mcp_session_pool_close_delay: float = DEFAULT_UNUSED_MCP_SESSION_POOL_CLOSE_DELAY,
+        answer_cache: Optional[AnswerCache] = None
+    ):
+        self.app_config = app_config
+        self.tool_resolver = tool_resolver
+        self.model_registry = model_registry
+        self.agent_factory = agent_factory
+        self.get_agent_factory_for_config = get_agent_factory_for_config
+        self.load_app_config_fn = load_app_config_fn
+        self.default_tool_definitions_config = default_tool_definitions_config
+        self.unused_mcp_session_pool_close_delay = unused_mcp_session_pool_close_delay
+        self.answer_cache = answer_cache
+        self.lock = threading.Lock()
+
+    def _reload_app_config(self, app_config: AppConfig):
+        tool_resolver = self.tool_resolver.get_reloaded_tool_resolver(
+            tool_definitions_config=(
+                app_config.tool_definitions
+                or self.default_tool_definitions_config
+            ),
+            tool_collection_definitions_config=app_config.tool_collection_definitions
+        )
+        model_registry = self.model_registry.get_reloaded_model_registry(app_config.models)
+        agent_factory = self.get_agent_factory_for_config(
+            app_config,
+            tool_resolver,
+            model_registry
+        )
+        check_agent_factory(agent_factory)
+        if agent_factory == self.agent_factory.get_agent_factory():
+            LOGGER.info('Agent factory unchanged')
+        else:
+            LOGGER.info('Replacing agent factory')
+            self.agent_factory.set_agent_factory(agent_factory)
+        close_mcp_session_pools_later(
+            self.tool_resolver.get_mcp_session_pools_not_used_by(tool_resolver),
+            delay=self.unused_mcp_session_pool_close_delay
+        )
+        self.app_config = app_config
+        self.tool_resolver = tool_resolver
+        self.model_registry = model_registry
+
+    def reload(self) -> bool:
+        with self.lock:
+            try:
+                app_config = self.load_app_config_fn()
+                changes = get_app_config_changes(self.app_config, app_config)
+                if not changes:
+                    LOGGER.info('Config unchanged')
+                    return False
+                LOGGER.info('Config changes: %r', changes)
+                self._reload_app_config(app_config)
+                if self.answer_cache is not None:
+                    invalidate_answer_cache_for_changes(self.answer_cache, changes)
+                return True
+            except Exception:  # pylint: disable=broad-exception-caught
+                # keeping the current agent factory, e.g. on an invalid config
+                LOGGER.exception('Failed to reload config')
+                return False
+
+
+def get_file_modified_time(file_path: str) -> Optional[int]:
+    try:
+        return os.stat(file_path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class ConfigFileWatcher:
+    '''
+    Calls `on_change` when the config file was modified (checked every `poll_interval` seconds,
+    if set) or when a reload was requested (e.g. via a signal handler).
+    '''
+
+    def __init__(
+        self,
+        config_file: str,
+        on_change: Callable[[], Any],
+        poll_interval: Optional[float] = None
+    ):
+        self.config_file = config_file
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.modified_time = get_file_modified_time(config_file)
+        self.reload_requested_event = threading.Event()
+        self.stopped_event = threading.Event()
+
+    def request_reload(self):
+        # only sets an event, to be safe to call from a signal handler
+        self.reload_requested_event.set()
+
+    def check_once(self) -> bool:
+        modified_time = get_file_modified_time(self.config_file)
+        is_reload_requested = self.reload_requested_event.is_set()
+        self.reload_requested_event.clear()
+        if modified_time == self.modified_time and not is_reload_requested:
+            return False
+        LOGGER.info(
+            'Reloading config file: %r (requested: %r)',
+            self.config_file, is_reload_requested
+        )
+        self.modified_time = modified_time
+        self.on_change()
+        return True
+
+    def _run(self):
+        while not self.stopped_event.is_set():
+            self.reload_requested_event.wait(self.poll_interval)
+            if self.stopped_event.is_set():
+                return
+            self.check_once()
+
+    def start(self):
+        threading.Thread(target=self._run, name='config-file-watcher', daemon=True).start()
+
+    def stop(self):
+        self.stopped_event.set()
+        self.reload_requested_event.set()
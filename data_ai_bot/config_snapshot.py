@@ -0,0 +1,112 @@
+from dataclasses import asdict, dataclass, field, replace
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from data_ai_bot.config import AppConfig, ResolvedAgentConfig
+from data_ai_bot.config_typing import AppConfigDict
+from data_ai_bot.tools.mcp import McpToolSchema, StaticMcpToolSchemaStore
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+CONFIG_SNAPSHOT_VERSION = 1
+
+
+def get_file_sha256(file_path: str) -> str:
+    return hashlib.sha256(Path(file_path).read_bytes()).hexdigest()
+
+
+def get_resolved_agent_config_dict(resolved_agent_config: ResolvedAgentConfig) -> dict:
+    return {
+        'tools': list(resolved_agent_config.tool_names),
+        'managedAgents': list(resolved_agent_config.managed_agent_names),
+        'renderedSystemPrompt': resolved_agent_config.rendered_system_prompt,
+        'systemPromptInputsSha256': resolved_agent_config.system_prompt_inputs_sha256
+    }
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    '''
+    The validated config, with the MCP tool schemas and the resolved agents
+    (with their rendered system prompts).
+    Templates (i.e. for secrets) are kept as is, and only evaluated when loading the config.
+    '''
+    app_config_dict: AppConfigDict
+    config_sha256: str
+    mcp_tool_schemas_by_name: Mapping[str, Sequence[McpToolSchema]] = field(default_factory=dict)
+    resolved_agent_config_by_name: Mapping[str, ResolvedAgentConfig] = field(
+        default_factory=dict
+    )
+
+    def get_app_config(self) -> AppConfig:
+        return replace(
+            AppConfig.from_dict(self.app_config_dict),
+            resolved_agent_config_by_name=self.resolved_agent_config_by_name
+        )
+
+    def get_mcp_tool_schema_store(self) -> StaticMcpToolSchemaStore:
+        return StaticMcpToolSchemaStore(self.mcp_tool_schemas_by_name)
+
+    def is_up_to_date(self, config_file: str) -> bool:
+        return get_file_sha256(config_file) == self.config_sha256
+
+    def to_dict(self) -> dict:
+        return {
+            'version': CONFIG_SNAPSHOT_VERSION,
+            'configSha256': self.config_sha256,
+            'appConfig': self.app_config_dict,
+            'mcpToolSchemas': {
+                name: [asdict(tool_schema) for tool_schema in tool_schemas]
+                for name, tool_schemas in self.mcp_tool_schemas_by_name.items()
+            },
+            'resolvedAgents': {
+                name: get_resolved_agent_config_dict(resolved_agent_config)
+                for name, resolved_agent_config in self.resolved_agent_config_by_name.items()
+            }
+        }
+
+    @staticmethod
+    def from_dict(config_snapshot_dict: Mapping[str, Any]) -> 'ConfigSnapshot':
+        version = config_snapshot_dict.get('version')
+        if version != CONFIG_SNAPSHOT_VERSION:
+            raise ValueError(f'Unsupported config snapshot version: {repr(version)}')
+        return ConfigSnapshot(
+            app_config_dict=config_snapshot_dict['appConfig'],
+            config_sha256=config_snapshot_dict['configSha256'],
+            mcp_tool_schemas_by_name={
+                name: [
+                    McpToolSchema.from_dict(tool_schema_dict)
+                    for tool_schema_dict in tool_schema_dicts
+                ]
+                for name, tool_schema_dicts in config_snapshot_dict.get(
+                    'mcpToolSchemas', {}
+                ).items()
+            },
+            resolved_agent_config_by_name={
+                name: ResolvedAgentConfig.from_dict(resolved_agent_config_dict)
+                for name, resolved_agent_config_dict in config_snapshot_dict.get(
+                    'resolvedAgents', {}
+                ).items()
+            }
+        )
+
+
+def save_config_snapshot(config_snapshot: ConfigSnapshot, config_snapshot_file: str):
+    temp_config_snapshot_file = Path(config_snapshot_file + '.tmp')
+    temp_config_snapshot_file.write_text(
+        json.dumps(config_snapshot.to_dict(), indent=2),
+        encoding='utf-8'
+    )
+    temp_config_snapshot_file.replace(config_snapshot_file)
+
+
+def load_config_snapshot(config_snapshot_file: str) -> ConfigSnapshot:
+    LOGGER.info('Loading config snapshot from: %r', config_snapshot_file)
+    return ConfigSnapshot.from_dict(
+        json.loads(Path(config_snapshot_file).read_text(encoding='utf-8'))
+    )
@@ -14,6 +14,8 @@ class FromPythonToolClassConfigDict(TypedDict):
     className: str
     initParameters: NotRequired[Mapping[str, Any]]
     description: NotRequired[str]
+    perAgent: NotRequired[bool]
+    lazy: NotRequired[bool]
 
 
 class ToolDefinitionsConfigDict(TypedDict):
@@ -26,16 +28,75 @@ class FromMcpConfigDict(TypedDict):
     url: str
     transport: NotRequired[str]
     tools: NotRequired[Sequence[str]]
+    sessionCount: NotRequired[int]
+    retryToolCalls: NotRequired[bool]
 
 
 class ToolCollectionDefinitionsConfigDict(TypedDict):
     fromMcp: NotRequired[Sequence[FromMcpConfigDict]]
 
 
+class ModelHedgingConfigDict(TypedDict):
+    delay_percentile: NotRequired[float]
+    initial_delay: NotRequired[float]
+    min_delay: NotRequired[float]
+    min_sample_count: NotRequired[int]
+
+
+class ModelResponseCacheConfigDict(TypedDict):
+    ttl: NotRequired[float]
+    max_entry_count: NotRequired[int]
+    cache_dir: NotRequired[str]
+    max_disk_entry_count: NotRequired[int]
+    always_enabled: NotRequired[bool]
+
+
+class ModelRateLimitConfigDict(TypedDict):
+    requests_per_minute: NotRequired[float]
+    tokens_per_minute: NotRequired[float]
+    max_concurrency: NotRequired[int]
+    min_concurrency: NotRequired[int]
+    queue_timeout: NotRequired[float]
+
+
 class ModelConfigDict(TypedDict):
     model_name: str
     base_url: str
     api_key: str
+    temperature: NotRequired[float]
+    fallback_model_names: NotRequired[Sequence[str]]
+    hedging: NotRequired[ModelHedgingConfigDict]
+    response_cache: NotRequired[ModelResponseCacheConfigDict]
+    rate_limit: NotRequired[ModelRateLimitConfigDict]
+
+
+class ModelTierConfigDict(TypedDict):
+    model: str
+    description: NotRequired[str]
+    maxMessageLength: NotRequired[int]
+    maxPreviousMessageCount: NotRequired[int]
+
+
+class ModelRoutingConfigDict(TypedDict):
+    tiers: Sequence[ModelTierConfigDict]
+    classifierModel: NotRequired[str]
+
+
+class IntentConfigDict(TypedDict):
+    name: str
+    patterns: Sequence[str]
+    tool: NotRequired[str]
+    toolArguments: NotRequired[Mapping[str, str]]
+    responseTemplate: NotRequired[str]
+
+
+class AnswerCacheConfigDict(TypedDict):
+    similarityThreshold: NotRequired[float]
+    ttl: NotRequired[float]
+    ttlByToolName: NotRequired[Mapping[str, float]]
+    maxEntryCount: NotRequired[int]
+    featureCount: NotRequired[int]
+    freshAnswerKeywords: NotRequired[Sequence[str]]
 
 
 class BaseAgentConfigDict(TypedDict):
@@ -44,6 +105,9 @@ class BaseAgentConfigDict(TypedDict):
     systemPrompt: NotRequired[str]
     managedAgents: NotRequired[Sequence[str]]
     model: NotRequired[str]
+    modelRouting: NotRequired[ModelRoutingConfigDict]
+    intents: NotRequired[Sequence[IntentConfigDict]]
+    answerCache: NotRequired[AnswerCacheConfigDict]
 
 
 class _ManagedAgentExtraConfigDict(TypedDict):
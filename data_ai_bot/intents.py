@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+import json
+import logging
+import re
+from typing import Any, Mapping, Optional, Sequence
+
+import smolagents  # type: ignore
+from smolagents import Tool
+
+from data_ai_bot.agent_factory import (
+    AgentFactory,
+    ReloadableAgentFactory,
+    ToolCallEventHandler,
+    get_wrapped_smolagents_tool
+)
+from data_ai_bot.config import IntentConfig
+from data_ai_bot.utils.template import get_compiled_template
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+SLACK_USER_MENTION_PATTERN = r'<@[A-Z0-9]+>'
+
+
+def get_normalized_intent_message(message: str) -> str:
+    # e.g. "<@U123> DocMap of 101859" -> "DocMap of 101859"
+    return re.sub(SLACK_USER_MENTION_PATTERN, '', message).strip()
+
+
+def get_tool_argument_value(tool: Tool, name: str, value: str) -> Any:
+    # the captured groups are strings, converting them to the declared input type
+    input_type = tool.inputs.get(name, {}).get('type')
+    if input_type == 'integer':
+        return int(value)
+    if input_type == 'number':
+        return float(value)
+    if input_type == 'boolean':
+        return value.lower() in {'true', 'yes', '1'}
+    return value
+
+
+def get_formatted_tool_result(result: Any) -> str:
+    if isinstance(result, str):
+        return result
+    return json.dumps(result, indent=2, default=str)
+
+
+@dataclass(frozen=True)
+class Intent:
+    config: IntentConfig
+    tool: Optional[Tool] = None
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    def get_variables(self, message: str) -> Optional[Mapping[str, str]]:
+        for pattern in self.config.patterns:
+            match = re.fullmatch(pattern, message, flags=re.IGNORECASE)
+            if match is not None:
+                return {
+                    key: value
+                    for key, value in match.groupdict().items()
+                    if value is not None
+                }
+        return None
+
+    def get_tool_arguments(self, variables: Mapping[str, str]) -> Mapping[str, Any]:
+        assert self.tool is not None
+        if self.config.tool_arguments is None:
+            raw_tool_arguments = dict(variables)
+        else:
+            raw_tool_arguments = {
+                key: get_compiled_template(template).render(variables)
+                for key, template in self.config.tool_arguments.items()
+            }
+        return {
+            key: get_tool_argument_value(self.tool, key, value)
+            for key, value in raw_tool_arguments.items()
+        }
+
+    def get_response(
+        self,
+        variables: Mapping[str, str],
+        tool_call_event_handler: ToolCallEventHandler | None = None
+    ) -> str:
+        result: Any = None
+        if self.tool is not None:
+            tool = get_wrapped_smolagents_tool(
+                self.tool,
+                tool_call_event_handler=tool_call_event_handler
+            )
+            # tool errors are raised, falling back to the agent
+            result = tool(**self.get_tool_arguments(variables))
+        if self.config.response_template is None:
+            return get_formatted_tool_result(result)
+        return get_compiled_template(self.config.response_template).render({
+            **variables,
+            'result': result
+        })
+
+
+@dataclass(frozen=True)
+class IntentAgentFactory(AgentFactory):
+    '''
+    Answers messages matching one of the intents directly (e.g. via a single tool call),
+    without the agent. Called directly, it uses the wrapped agent factory.
+    '''
+
+    agent_factory: AgentFactory
+    intents: Sequence[Intent]
+
+    def __call__(
+        self,
+        tool_call_event_handler: ToolCallEventHandler | None = None
+    ) -> smolagents.MultiStepAgent:
+        return self.agent_factory(tool_call_event_handler=tool_call_event_handler)
+
+    def get_intent_response_for_message(
+        self,
+        message: str,
+        tool_call_event_handler: ToolCallEventHandler | None = None
+    ) -> Optional[str]:
+        normalized_message = get_normalized_intent_message(message)
+        for intent in self.intents:
+            variables = intent.get_variables(normalized_message)
+            if variables is None:
+                continue
+            LOGGER.info('Matched intent %r: %r', intent.name, variables)
+            try:
+                return intent.get_response(
+                    variables,
+                    tool_call_event_handler=tool_call_event_handler
+                )
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                LOGGER.warning('Intent %r failed, using the agent: %r', intent.name, exc)
+                return None
+        return None
+
+
+def get_intent_response_for_message(
+    agent_factory: AgentFactory,
+    message: str,
+    tool_call_event_handler: ToolCallEventHandler | None = None
+) -> Optional[str]:
+    if isinstance(agent_factory, ReloadableAgentFactory):
+        agent_factory = agent_factory.get_agent_factory()
+    if isinstance(agent_factory, IntentAgentFactory):
+        return agent_factory.get_intent_response_for_message(
+            message,
+            tool_call_event_handler=tool_call_event_handler
+        )
+    return None
@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+import logging
+from typing import Optional, Sequence
+
+import smolagents  # type: ignore
+
+from data_ai_bot.agent_factory import (
+    AgentFactory,
+    ReloadableAgentFactory,
+    ToolCallEventHandler
+)
+from data_ai_bot.config import ModelTierConfig
+from data_ai_bot.intents import IntentAgentFactory
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+DEFAULT_TIER_NAME = 'default'
+
+CLASSIFIER_SYSTEM_PROMPT = '\n'.join([
+    'Choose the cheapest model tier, that is able to answer the request of the user.',
+    'The model tiers:',
+    '{tier_descriptions}',
+    f'- {DEFAULT_TIER_NAME}: any other (e.g. complex or multi-step) request',
+    'Reply with the name of the model tier only.'
+])
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    config: ModelTierConfig
+    agent_factory: AgentFactory
+
+    @property
+    def name(self) -> str:
+        return self.config.model_name
+
+
+def is_model_tier_applicable(
+    model_tier_config: ModelTierConfig,
+    message: str,
+    previous_messages: Sequence[str]
+) -> bool:
+    if (
+        model_tier_config.max_message_length is not None
+        and len(message.strip()) > model_tier_config.max_message_length
+    ):
+        return False
+    if (
+        model_tier_config.max_previous_message_count is not None
+        and len(previous_messages) > model_tier_config.max_previous_message_count
+    ):
+        return False
+    return True
+
+
+def get_classifier_messages(
+    model_tiers: Sequence[ModelTier],
+    message: str
+) -> Sequence[smolagents.ChatMessage]:
+    tier_descriptions = '\n'.join(
+        f'- {model_tier.name}: {model_tier.config.description}'
+        if model_tier.config.description
+        else f'- {model_tier.name}'
+        for model_tier in model_tiers
+    )
+    return [
+        smolagents.ChatMessage(
+            role=smolagents.MessageRole.SYSTEM,
+            content=CLASSIFIER_SYSTEM_PROMPT.format(tier_descriptions=tier_descriptions)
+        ),
+        smolagents.ChatMessage(role=smolagents.MessageRole.USER, content=message)
+    ]
+
+
+def get_classified_model_tier(
+    classifier_model: smolagents.Model,
+    model_tiers: Sequence[ModelTier],
+    message: str
+) -> Optional[ModelTier]:
+    try:
+        chat_message = classifier_model.generate(
+            list(get_classifier_messages(model_tiers, message))
+        )
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        LOGGER.warning('Failed to classify request, using default model tier: %r', exc)
+        return None
+    tier_name = str(chat_message.content or '').strip().strip('`\'".').casefold()
+    for model_tier in model_tiers:
+        if model_tier.name.casefold() == tier_name:
+            return model_tier
+    if tier_name != DEFAULT_TIER_NAME:
+        LOGGER.warning('Unexpected model tier from classifier: %r', tier_name)
+    return None
+
+
+@dataclass(frozen=True)
+class TieredAgentFactory(AgentFactory):
+    '''
+    Routes each request to the cheapest applicable model tier, using rules
+    (and optionally a classifier model), and escalates to the default agent factory
+    if that fails or runs out of steps. Called directly, it uses the default agent factory.
+    '''
+
+    default_agent_factory: AgentFactory
+    model_tiers: Sequence[ModelTier]
+    classifier_model: Optional[smolagents.Model] = None
+
+    def __call__(
+        self,
+        tool_call_event_handler: ToolCallEventHandler | None = None
+    ) -> smolagents.MultiStepAgent:
+        return self.default_agent_factory(tool_call_event_handler=tool_call_event_handler)
+
+    def get_model_tier(
+        self,
+        message: str,
+        previous_messages: Sequence[str]
+    ) -> Optional[ModelTier]:
+        model_tiers = [
+            model_tier
+            for model_tier in self.model_tiers
+            if is_model_tier_applicable(model_tier.config, message, previous_messages)
+        ]
+        if not model_tiers:
+            return None
+        if self.classifier_model is None:
+            return model_tiers[0]
+        return get_classified_model_tier(self.classifier_model, model_tiers, message)
+
+    def get_agent_factories_for_message(
+        self,
+        message: str,
+        previous_messages: Sequence[str]
+    ) -> Sequence[AgentFactory]:
+        model_tier = self.get_model_tier(message, previous_messages)
+        LOGGER.info(
+            'Model tier: %r',
+            model_tier.name if model_tier is not None else DEFAULT_TIER_NAME
+        )
+        if model_tier is None:
+            return [self.default_agent_factory]
+        return [model_tier.agent_factory, self.default_agent_factory]
+
+
+def get_agent_factories_for_message(
+    agent_factory: AgentFactory,
+    message: str,
+    previous_messages: Sequence[str]
+) -> Sequence[AgentFactory]:
+    # in escalation order
+    if isinstance(agent_factory, ReloadableAgentFactory):
+        agent_factory = agent_factory.get_agent_factory()
+    if isinstance(agent_factory, IntentAgentFactory):
+        agent_factory = agent_factory.agent_factory
+    if isinstance(agent_factory, TieredAgentFactory):
+        return agent_factory.get_agent_factories_for_message(message, previous_messages)
+    return [agent_factory]
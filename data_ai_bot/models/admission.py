@@ -0,0 +1,318 @@
+from dataclasses import dataclass, replace
+import json
+import logging
+import math
+import threading
+import time
+from typing import Any, Iterator, Optional, Sequence
+
+import openai
+import smolagents  # type: ignore
+from smolagents.models import is_rate_limit_error  # type: ignore
+
+from data_ai_bot.config import ModelRateLimitConfig
+from data_ai_bot.models.response_cache import get_json_value
+from data_ai_bot.models.streaming import is_streaming_supported_by_model
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+# the concurrency limit is multiplied by this factor on overload (e.g. 429 or timeout)
+CONCURRENCY_LIMIT_BACKOFF_FACTOR = 0.5
+
+# the delay before retrying a request after an overload, doubled on each retry
+OVERLOAD_RETRY_INITIAL_DELAY_SECONDS = 1.0
+OVERLOAD_RETRY_MAX_DELAY_SECONDS = 30.0
+
+# rough estimate, only used for the tokens per minute, before the actual usage is known
+ESTIMATED_CHARACTERS_PER_TOKEN = 4
+
+
+class ModelAdmissionTimeoutError(TimeoutError):
+    pass
+
+
+def is_model_overload_error(exc: BaseException) -> bool:
+    return (
+        isinstance(exc, (openai.RateLimitError, openai.APITimeoutError, TimeoutError))
+        and not isinstance(exc, ModelAdmissionTimeoutError)
+    ) or is_rate_limit_error(exc)
+
+
+def get_estimated_token_count(messages: Sequence[Any]) -> int:
+    return math.ceil(
+        len(json.dumps([get_json_value(message) for message in messages], default=str))
+        / ESTIMATED_CHARACTERS_PER_TOKEN
+    )
+
+
+class TokenBucket:
+    '''
+    Not thread-safe, to be used while holding the lock of the caller.
+    The tokens can go negative, when the actual usage exceeded the estimate.
+    '''
+
+    def __init__(self, rate_per_minute: float):
+        self.rate_per_second = rate_per_minute / 60
+        self.capacity = rate_per_minute
+        self.tokens = rate_per_minute
+        self.updated_time = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_time) * self.rate_per_second
+        )
+        self.updated_time = now
+
+    def get_wait_seconds(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # requests larger than the capacity are admitted when the bucket is full
+        missing_tokens = min(amount, self.capacity) - self.tokens
+        return max(missing_tokens, 0) / self.rate_per_second
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= amount
+
+
+@dataclass
+class ModelAdmissionStats:  # pylint: disable=too-many-instance-attributes
+    admitted_count: int = 0
+    rejected_count: int = 0
+    overload_count: int = 0
+    total_queue_wait_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+    concurrency_limit: float = 0.0
+    active_count: int = 0
+    waiting_count: int = 0
+
+    @property
+    def average_queue_wait_seconds(self) -> float:
+        return (
+            self.total_queue_wait_seconds / self.admitted_count
+            if self.admitted_count
+            else 0.0
+        )
+
+
+class ModelAdmissionController:
+    '''
+    Admits requests based on the requests and tokens per minute, and an adaptive
+    concurrency limit: increased additively on success, decreased multiplicatively
+    on overload (AIMD). Callers wait until admitted, or until the queue timeout.
+    '''
+
+    def __init__(self, config: ModelRateLimitConfig, name: str):
+        self.config = config
+        self.name = name
+        self.condition = threading.Condition()
+        self.request_bucket = (
+            TokenBucket(config.requests_per_minute)
+            if config.requests_per_minute
+            else None
+        )
+        self.token_bucket = (
+            TokenBucket(config.tokens_per_minute)
+            if config.tokens_per_minute
+            else None
+        )
+        self.stats = ModelAdmissionStats(concurrency_limit=float(config.max_concurrency))
+
+    def _get_wait_seconds(self, estimated_token_count: int, now: float) -> float:
+        if self.stats.active_count >= max(1, int(self.stats.concurrency_limit)):
+            # waiting to be notified, when a request completes
+            return math.inf
+        wait_seconds = 0.0
+        if self.request_bucket is not None:
+            wait_seconds = max(wait_seconds, self.request_bucket.get_wait_seconds(1, now))
+        if self.token_bucket is not None:
+            wait_seconds = max(
+                wait_seconds,
+                self.token_bucket.get_wait_seconds(estimated_token_count, now)
+            )
+        return wait_seconds
+
+    def acquire(self, estimated_token_count: int = 0, timeout: Optional[float] = None):
+        start_time = time.monotonic()
+        deadline = start_time + (timeout if timeout is not None else self.config.queue_timeout)
+        with self.condition:
+            self.stats.waiting_count += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait_seconds = self._get_wait_seconds(estimated_token_count, now)
+                    if wait_seconds <= 0:
+                        break
+                    remaining_seconds = deadline - now
+                    if remaining_seconds <= 0:
+                        self.stats.rejected_count += 1
+                        raise ModelAdmissionTimeoutError(
+                            f'Timed out waiting to send request to model {repr(self.name)}'
+                        )
+                    self.condition.wait(min(wait_seconds, remaining_seconds))
+            finally:
+                self.stats.waiting_count -= 1
+            if self.request_bucket is not None:
+                self.request_bucket.consume(1, now)
+            if self.token_bucket is not None:
+                self.token_bucket.consume(estimated_token_count, now)
+            self.stats.active_count += 1
+            self.stats.admitted_count += 1
+            queue_wait_seconds = now - start_time
+            self.stats.total_queue_wait_seconds += queue_wait_seconds
+            self.stats.max_queue_wait_seconds = max(
+                self.stats.max_queue_wait_seconds,
+                queue_wait_seconds
+            )
+        if queue_wait_seconds >= 1:
+            LOGGER.info(
+                'Waited %.3f seconds to send request to model %r',
+                queue_wait_seconds, self.name
+            )
+
+    def release(self, is_overloaded: bool = False, additional_token_count: int = 0):
+        with self.condition:
+            self.stats.active_count -= 1
+            if is_overloaded:
+                self.stats.overload_count += 1
+                self.stats.concurrency_limit = max(
+                    float(self.config.min_concurrency),
+                    self.stats.concurrency_limit * CONCURRENCY_LIMIT_BACKOFF_FACTOR
+                )
+                LOGGER.warning(
+                    'Model %r overloaded, reduced concurrency limit to: %.2f',
+                    self.name, self.stats.concurrency_limit
+                )
+            else:
+                self.stats.concurrency_limit = min(
+                    float(self.config.max_concurrency),
+                    self.stats.concurrency_limit + 1 / self.stats.concurrency_limit
+                )
+            if self.token_bucket is not None and additional_token_count:
+                self.token_bucket.consume(additional_token_count, time.monotonic())
+            self.condition.notify_all()
+
+    def get_stats(self) -> ModelAdmissionStats:
+        with self.condition:
+            return replace(self.stats)
+
+
+class RateLimitedModel(smolagents.Model):
+    '''
+    Sends requests via the admission controller. Requests failing with an overload error
+    are retried (unless disabled, e.g. to fail over to fallback models instead),
+    with an increasing delay, until the queue timeout. Streamed requests are only retried
+    before the first chunk was received.
+    '''
+
+    def __init__(
+        self,
+        model: smolagents.Model,
+        admission_controller: ModelAdmissionController,
+        retry_on_overload: bool = True,
+        overload_retry_delay: float = OVERLOAD_RETRY_INITIAL_DELAY_SECONDS
+    ):
+        super().__init__(model_id=model.model_id)
+        self.model = model
+        self.admission_controller = admission_controller
+        self.retry_on_overload = retry_on_overload
+        self.overload_retry_delay = overload_retry_delay
+
+    @property
+    def supports_stop_parameter(self) -> bool:
+        return self.model.supports_stop_parameter
+
+    @property
+    def supports_streaming(self) -> bool:
+        return is_streaming_supported_by_model(self.model)
+
+    def _get_deadline(self) -> float:
+        return time.monotonic() + self.admission_controller.config.queue_timeout
+
+    def _acquire(self, estimated_token_count: int, deadline: float):
+        self.admission_controller.acquire(
+            estimated_token_count,
+            timeout=max(0.0, deadline - time.monotonic())
+        )
+
+    def _is_retryable_error(self, exc: Exception, deadline: float, retry_delay: float) -> bool:
+        return (
+            self.retry_on_overload
+            and is_model_overload_error(exc)
+            and time.monotonic() + retry_delay < deadline
+        )
+
+    def _wait_before_retry(self, exc: Exception, retry_delay: float) -> float:
+        LOGGER.info(
+            'Retrying request to model %r in %.1f seconds after overload: %r',
+            self.admission_controller.name, retry_delay, exc
+        )
+        time.sleep(retry_delay)
+        return min(retry_delay * 2, OVERLOAD_RETRY_MAX_DELAY_SECONDS)
+
+    def generate(self, messages: list, *args, **kwargs) -> smolagents.ChatMessage:
+        estimated_token_count = get_estimated_token_count(messages)
+        deadline = self._get_deadline()
+        retry_delay = self.overload_retry_delay
+        while True:
+            self._acquire(estimated_token_count, deadline)
+            try:
+                chat_message = self.model.generate(messages, *args, **kwargs)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                self.admission_controller.release(is_overloaded=is_model_overload_error(exc))
+                if not self._is_retryable_error(exc, deadline, retry_delay):
+                    raise
+                retry_delay = self._wait_before_retry(exc, retry_delay)
+                continue
+            token_usage = chat_message.token_usage
+            self.admission_controller.release(
+                additional_token_count=(
+                    token_usage.total_tokens - estimated_token_count
+                    if token_usage is not None
+                    else 0
+                )
+            )
+            return chat_message
+
+    def generate_stream(self, messages: list, *args, **kwargs) -> Iterator[Any]:
+        estimated_token_count = get_estimated_token_count(messages)
+        deadline = self._get_deadline()
+        retry_delay = self.overload_retry_delay
+        while True:
+            self._acquire(estimated_token_count, deadline)
+            is_overloaded = False
+            has_received_chunk = False
+            total_token_count: Optional[int] = None
+            try:
+                for stream_delta in self.model.generate_stream(messages, *args, **kwargs):
+                    has_received_chunk = True
+                    token_usage = getattr(stream_delta, 'token_usage', None)
+                    if token_usage is not None:
+                        total_token_count = (total_token_count or 0) + token_usage.total_tokens
+                    yield stream_delta
+                return
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                is_overloaded = is_model_overload_error(exc)
+                if has_received_chunk or not self._is_retryable_error(
+                    exc, deadline, retry_delay
+                ):
+                    raise
+                retry_exc = exc
+            finally:
+                self.admission_controller.release(
+                    is_overloaded=is_overloaded,
+                    additional_token_count=(
+                        total_token_count - estimated_token_count
+                        if total_token_count is not None
+                        else 0
+                    )
+                )
+            retry_delay = self._wait_before_retry(retry_exc, retry_delay)
+
+    def parse_tool_calls(self, message: smolagents.ChatMessage) -> smolagents.ChatMessage:
+        return self.model.parse_tool_calls(message)
+
+    def to_dict(self) -> dict:
+        return self.model.to_dict()
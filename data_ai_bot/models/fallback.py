@@ -0,0 +1,201 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import logging
+import math
+import threading
+import time
+from typing import Any, Iterator, Optional, Sequence
+
+import smolagents  # type: ignore
+
+from data_ai_bot.config import ModelHedgingConfig
+from data_ai_bot.models.streaming import is_streaming_supported_by_model
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_LATENCY_SAMPLE_COUNT = 200
+
+DEFAULT_MAX_HEDGING_WORKERS = 32
+
+
+class LatencyTracker:
+    def __init__(self, max_sample_count: int = DEFAULT_MAX_LATENCY_SAMPLE_COUNT):
+        self.samples: deque[float] = deque(maxlen=max_sample_count)
+        self.lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def get_sample_count(self) -> int:
+        with self.lock:
+            return len(self.samples)
+
+    def get_percentile(self, percentile: float) -> Optional[float]:
+        with self.lock:
+            samples = sorted(self.samples)
+        if not samples:
+            return None
+        index = math.ceil(percentile / 100 * len(samples)) - 1
+        return samples[min(max(index, 0), len(samples) - 1)]
+
+
+def get_hedging_delay(
+    hedging_config: ModelHedgingConfig,
+    latency_tracker: LatencyTracker
+) -> float:
+    if latency_tracker.get_sample_count() < hedging_config.min_sample_count:
+        return hedging_config.initial_delay
+    delay = latency_tracker.get_percentile(hedging_config.delay_percentile)
+    assert delay is not None
+    return max(delay, hedging_config.min_delay)
+
+
+class FallbackModel(smolagents.Model):
+    '''
+    Sends the request to the primary model, failing over to the next model on errors
+    (including rate limits). With hedging, the request is also sent to the next model,
+    if the primary model didn't respond within its (e.g. p95) latency,
+    using whichever response completes first.
+    '''
+
+    def __init__(
+        self,
+        models: Sequence[smolagents.Model],
+        hedging_config: Optional[ModelHedgingConfig] = None,
+        max_hedging_workers: int = DEFAULT_MAX_HEDGING_WORKERS
+    ):
+        assert models
+        super().__init__(model_id=models[0].model_id)
+        self.models = models
+        self.hedging_config = hedging_config
+        self.latency_tracker = LatencyTracker()
+        self.executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(
+                max_workers=max_hedging_workers,
+                thread_name_prefix='model-hedging'
+            )
+            if hedging_config is not None and len(models) > 1
+            else None
+        )
+
+    @property
+    def primary_model(self) -> smolagents.Model:
+        return self.models[0]
+
+    @property
+    def supports_stop_parameter(self) -> bool:
+        return self.primary_model.supports_stop_parameter
+
+    @property
+    def supports_streaming(self) -> bool:
+        return all(is_streaming_supported_by_model(model) for model in self.models)
+
+    def _generate_with_model(
+        self,
+        model: smolagents.Model,
+        *args,
+        **kwargs
+    ) -> smolagents.ChatMessage:
+        start_time = time.monotonic()
+        chat_message = model.generate(*args, **kwargs)
+        if model is self.primary_model:
+            self.latency_tracker.add(time.monotonic() - start_time)
+        return chat_message
+
+    def _generate_without_hedging(self, *args, **kwargs) -> smolagents.ChatMessage:
+        for index, model in enumerate(self.models):
+            try:
+                return self._generate_with_model(model, *args, **kwargs)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                if index == len(self.models) - 1:
+                    raise
+                LOGGER.warning('Model %r failed, failing over: %r', model.model_id, exc)
+        raise AssertionError('unreachable')
+
+    def _generate_with_hedging(
+        self,
+        executor: ThreadPoolExecutor,
+        hedging_config: ModelHedgingConfig,
+        *args,
+        **kwargs
+    ) -> smolagents.ChatMessage:
+        pending_futures: set[Future] = set()
+        model_by_future: dict[Future, smolagents.Model] = {}
+        next_models = list(self.models)
+        last_error: Optional[BaseException] = None
+
+        def submit_next_model():
+            model = next_models.pop(0)
+            future = executor.submit(self._generate_with_model, model, *args, **kwargs)
+            pending_futures.add(future)
+            model_by_future[future] = model
+
+        submit_next_model()
+        is_hedged = False
+        while pending_futures:
+            hedging_delay = (
+                get_hedging_delay(hedging_config, self.latency_tracker)
+                if not is_hedged and next_models
+                else None
+            )
+            done_futures, _ = wait(
+                pending_futures,
+                timeout=hedging_delay,
+                return_when=FIRST_COMPLETED
+            )
+            if not done_futures:
+                LOGGER.info(
+                    'Model %r did not respond within %.3f seconds, hedging with %r',
+                    self.primary_model.model_id, hedging_delay, next_models[0].model_id
+                )
+                is_hedged = True
+                submit_next_model()
+                continue
+            for future in done_futures:
+                pending_futures.remove(future)
+                try:
+                    # any other pending request is left to complete in the background
+                    return future.result()
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    LOGGER.warning(
+                        'Model %r failed, failing over: %r',
+                        model_by_future[future].model_id, exc
+                    )
+                    last_error = exc
+            if not pending_futures and next_models:
+                submit_next_model()
+        assert last_error is not None
+        raise last_error
+
+    def generate(self, *args, **kwargs) -> smolagents.ChatMessage:
+        if self.executor is None or self.hedging_config is None:
+            return self._generate_without_hedging(*args, **kwargs)
+        return self._generate_with_hedging(
+            self.executor,
+            self.hedging_config,
+            *args,
+            **kwargs
+        )
+
+    def generate_stream(self, *args, **kwargs) -> Iterator[Any]:
+        # failing over only before the first event was received (without hedging)
+        for index, model in enumerate(self.models):
+            has_events = False
+            try:
+                for event in model.generate_stream(*args, **kwargs):
+                    has_events = True
+                    yield event
+                return
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                if has_events or index == len(self.models) - 1:
+                    raise
+                LOGGER.warning('Model %r failed, failing over: %r', model.model_id, exc)
+
+    def parse_tool_calls(self, message: smolagents.ChatMessage) -> smolagents.ChatMessage:
+        return self.primary_model.parse_tool_calls(message)
+
+    def to_dict(self) -> dict:
+        return self.primary_model.to_dict()
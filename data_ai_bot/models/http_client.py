@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+import logging
+import threading
+from typing import Optional, Sequence
+
+import httpx2
+import openai
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+
+DEFAULT_WARM_UP_TIMEOUT = 10.0
+
+
+@dataclass(frozen=True)
+class ModelHttpClientStats:
+    base_url: str
+    request_count: int
+    connection_count: int
+    idle_connection_count: int
+
+
+def get_connection_counts(transport: httpx2.HTTPTransport) -> tuple[int, int]:
+    # httpx doesn't expose the connection pool of the transport
+    connection_pool = getattr(transport, '_pool', None)
+    connections = getattr(connection_pool, 'connections', [])
+    return len(connections), sum(1 for connection in connections if connection.is_idle())
+
+
+class ModelHttpClientPool:
+    '''
+    One HTTP client (with its connection pool) per model base url,
+    shared by all of the models using that base url.
+    '''
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+    ):
+        self.limits = httpx2.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self.lock = threading.Lock()
+        self.http_client_by_base_url: dict[str, httpx2.Client] = {}
+        self.transport_by_base_url: dict[str, httpx2.HTTPTransport] = {}
+        self.request_count_by_base_url: dict[str, int] = {}
+
+    def _on_request(self, base_url: str):
+        with self.lock:
+            self.request_count_by_base_url[base_url] = (
+                self.request_count_by_base_url.get(base_url, 0) + 1
+            )
+
+    def get_http_client(self, base_url: str) -> httpx2.Client:
+        with self.lock:
+            http_client = self.http_client_by_base_url.get(base_url)
+            if http_client is not None:
+                return http_client
+            LOGGER.info('Creating model HTTP client for: %r', base_url)
+            transport = httpx2.HTTPTransport(limits=self.limits)
+            # using the same defaults (e.g. timeout) as the OpenAI client
+            http_client = openai.DefaultHttpxClient(
+                transport=transport,
+                event_hooks={'request': [lambda _request: self._on_request(base_url)]}
+            )
+            self.http_client_by_base_url[base_url] = http_client
+            self.transport_by_base_url[base_url] = transport
+            self.request_count_by_base_url[base_url] = 0
+            return http_client
+
+    def warm_up(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        timeout: float = DEFAULT_WARM_UP_TIMEOUT
+    ) -> bool:
+        # opening a connection (DNS, TLS and auth), to be kept alive for the first request
+        try:
+            response = self.get_http_client(base_url).get(
+                base_url.rstrip('/') + '/models',
+                headers={'Authorization': f'Bearer {api_key}'} if api_key else None,
+                timeout=timeout
+            )
+        except httpx2.HTTPError as exc:
+            LOGGER.warning('Failed to warm up model HTTP client for %r: %r', base_url, exc)
+            return False
+        LOGGER.info(
+            'Warmed up model HTTP client for %r (status: %r)',
+            base_url, response.status_code
+        )
+        return True
+
+    def get_stats(self) -> Sequence[ModelHttpClientStats]:
+        with self.lock:
+            transport_by_base_url = dict(self.transport_by_base_url)
+            request_count_by_base_url = dict(self.request_count_by_base_url)
+        stats = []
+        for base_url, transport in transport_by_base_url.items():
+            connection_count, idle_connection_count = get_connection_counts(transport)
+            stats.append(ModelHttpClientStats(
+                base_url=base_url,
+                request_count=request_count_by_base_url[base_url],
+                connection_count=connection_count,
+                idle_connection_count=idle_connection_count
+            ))
+        return stats
+
+    def close(self):
+        with self.lock:
+            http_clients = list(self.http_client_by_base_url.values())
+            self.http_client_by_base_url.clear()
+            self.transport_by_base_url.clear()
+            self.request_count_by_base_url.clear()
+        for http_client in http_clients:
+            http_client.close()
@@ -0,0 +1,99 @@
+from dataclasses import dataclass, replace
+import logging
+import threading
+from typing import Any, Callable, Iterator, Optional
+
+import openai
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_cached_token_count(usage: Any) -> Optional[int]:
+    # not all OpenAI-compatible providers report the cached tokens
+    prompt_tokens_details = getattr(usage, 'prompt_tokens_details', None)
+    return getattr(prompt_tokens_details, 'cached_tokens', None)
+
+
+@dataclass
+class PromptCacheStats:
+    request_count: int = 0
+    # requests whose usage reported the cached tokens
+    reported_request_count: int = 0
+    hit_count: int = 0
+    prompt_token_count: int = 0
+    cached_token_count: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return (
+            self.hit_count / self.reported_request_count
+            if self.reported_request_count
+            else 0.0
+        )
+
+    @property
+    def cached_token_ratio(self) -> float:
+        return (
+            self.cached_token_count / self.prompt_token_count
+            if self.prompt_token_count
+            else 0.0
+        )
+
+
+class PromptCacheStatsRecorder:
+    '''
+    Records the prompt (prefix) cache hits of the provider, from the usage of the responses.
+    '''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = PromptCacheStats()
+
+    def record(self, usage: Any):
+        if usage is None:
+            return
+        cached_token_count = get_cached_token_count(usage)
+        with self.lock:
+            self.stats.request_count += 1
+            if cached_token_count is None:
+                return
+            self.stats.reported_request_count += 1
+            self.stats.prompt_token_count += usage.prompt_tokens or 0
+            self.stats.cached_token_count += cached_token_count
+            if cached_token_count > 0:
+                self.stats.hit_count += 1
+
+    def get_stats(self) -> PromptCacheStats:
+        with self.lock:
+            return replace(self.stats)
+
+
+def iter_stream_events_with_usage_handler(
+    stream_events: Iterator[Any],
+    usage_handler: Callable[[Any], None]
+) -> Iterator[Any]:
+    # the usage is only included in the last event of the stream
+    for stream_event in stream_events:
+        usage = getattr(stream_event, 'usage', None)
+        if usage is not None:
+            usage_handler(usage)
+        yield stream_event
+
+
+def add_chat_completion_usage_handler(
+    client: openai.OpenAI,
+    usage_handler: Callable[[Any], None]
+):
+    # smolagents only keeps the input and output token counts of the usage
+    completions = client.chat.completions
+    create = completions.create
+
+    def wrapped_create(*args, **kwargs):
+        response = create(*args, **kwargs)
+        if kwargs.get('stream'):
+            return iter_stream_events_with_usage_handler(response, usage_handler)
+        usage_handler(getattr(response, 'usage', None))
+        return response
+
+    completions.create = wrapped_create  # type: ignore[method-assign]
@@ -1,11 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 import logging
 import os
-from typing import Sequence
+import threading
+from typing import Any, Mapping, Optional, Sequence
 
+import httpx2
 import smolagents  # type: ignore
 
 from data_ai_bot.config import ModelConfig
+from data_ai_bot.models.admission import (
+    ModelAdmissionController,
+    ModelAdmissionStats,
+    RateLimitedModel
+)
+from data_ai_bot.models.fallback import FallbackModel
+from data_ai_bot.models.http_client import ModelHttpClientPool, ModelHttpClientStats
+from data_ai_bot.models.prompt_cache import (
+    PromptCacheStats,
+    PromptCacheStatsRecorder,
+    add_chat_completion_usage_handler
+)
+from data_ai_bot.models.response_cache import CachingModel, ModelResponseCache
 
 
 LOGGER = logging.getLogger(__name__)
@@ -21,17 +37,32 @@ def get_required_env(key: str) -> str:
     return value
 
 
-def get_model(
+def get_model(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     model_id: str,
     api_base: str,
     api_key: str,
+    http_client: Optional[httpx2.Client] = None,
+    retry: bool = True,
+    model_parameters: Optional[Mapping[str, Any]] = None,
+    prompt_cache_stats_recorder: Optional[PromptCacheStatsRecorder] = None
 ) -> smolagents.Model:
     LOGGER.info('model_id: %r', model_id)
-    return smolagents.OpenAIServerModel(
+    client_kwargs: dict = {}
+    if http_client is not None:
+        client_kwargs['http_client'] = http_client
+    if not retry:
+        client_kwargs['max_retries'] = 0
+    model = smolagents.OpenAIServerModel(
         model_id=model_id,
         api_base=api_base,
-        api_key=api_key
+        api_key=api_key,
+        client_kwargs=client_kwargs or None,
+        retry=retry,
+        **(model_parameters or {})
     )
+    if prompt_cache_stats_recorder is not None:
+        add_chat_completion_usage_handler(model.client, prompt_cache_stats_recorder.record)
+    return model
 
 
 def get_default_model_config() -> ModelConfig:
@@ -42,11 +73,27 @@ def get_default_model_config() -> ModelConfig:
     )
 
 
-def get_model_for_config(model_config: ModelConfig) -> smolagents.Model:
+def get_model_parameters_for_config(model_config: ModelConfig) -> Mapping[str, Any]:
+    if model_config.temperature is None:
+        return {}
+    return {'temperature': model_config.temperature}
+
+
+def get_model_for_config(
+    model_config: ModelConfig,
+    http_client: Optional[httpx2.Client] = None,
+    prompt_cache_stats_recorder: Optional[PromptCacheStatsRecorder] = None
+) -> smolagents.Model:
     return get_model(
         model_id=model_config.model_name,
         api_base=model_config.base_url,
-        api_key=model_config.api_key
+        api_key=model_config.api_key,
+        http_client=http_client,
+        # failing over to the fallback models at once, rather than retrying,
+        # and letting the rate limiter see (back off on, and retry) rate limit errors
+        retry=not (model_config.fallback_model_names or model_config.rate_limit),
+        model_parameters=get_model_parameters_for_config(model_config),
+        prompt_cache_stats_recorder=prompt_cache_stats_recorder
     )
 
 
@@ -54,6 +101,16 @@ def get_model_for_config(model_config: ModelConfig) -> smolagents.Model:
 class SmolAgentsModelRegistry:
     model_config_list: Sequence[ModelConfig]
     model_instance_by_model_name: dict[str, smolagents.Model] = field(default_factory=dict)
+    http_client_pool: ModelHttpClientPool = field(
+        default_factory=ModelHttpClientPool, repr=False, compare=False
+    )
+    admission_controller_by_model_name: dict[str, ModelAdmissionController] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    prompt_cache_stats_recorder_by_model_name: dict[str, PromptCacheStatsRecorder] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
 
     def get_model_config(self, model_name: str) -> ModelConfig:
         for model_config in self.model_config_list:
@@ -67,10 +124,165 @@ class SmolAgentsModelRegistry:
         model_instance = self.model_instance_by_model_name.get(model_name)
         if model_instance is not None:
             return model_instance
+        with self.lock:
+            model_instance = self.model_instance_by_model_name.get(model_name)
+            if model_instance is not None:
+                return model_instance
+            model_config = self.get_model_config(model_name)
+            prompt_cache_stats_recorder = PromptCacheStatsRecorder()
+            self.prompt_cache_stats_recorder_by_model_name[model_name] = (
+                prompt_cache_stats_recorder
+            )
+            model_instance = get_model_for_config(
+                model_config,
+                http_client=self.http_client_pool.get_http_client(model_config.base_url),
+                prompt_cache_stats_recorder=prompt_cache_stats_recorder
+            )
+            if model_config.rate_limit is not None:
+                admission_controller = ModelAdmissionController(
+                    model_config.rate_limit,
+                    name=model_name
+                )
+                self.admission_controller_by_model_name[model_name] = admission_controller
+                model_instance = RateLimitedModel(
+                    model_instance,
+                    admission_controller,
+                    # failing over to the fallback models at once, rather than retrying
+                    retry_on_overload=not model_config.fallback_model_names
+                )
+            if model_config.fallback_model_names:
+                model_instance = FallbackModel(
+                    [
+                        model_instance,
+                        *map(self._get_fallback_model, model_config.fallback_model_names)
+                    ],
+                    hedging_config=model_config.hedging
+                )
+            if model_config.response_cache is not None:
+                model_instance = CachingModel(
+                    model_instance,
+                    ModelResponseCache(model_config.response_cache),
+                    model_parameters=get_model_parameters_for_config(model_config)
+                )
+            self.model_instance_by_model_name[model_name] = model_instance
+            return model_instance
+
+    def _get_fallback_model(self, model_name: str) -> smolagents.Model:
+        if self.get_model_config(model_name).fallback_model_names:
+            raise ValueError(f'fallback model must not have fallback models: {model_name}')
+        return self.get_model(model_name)
+
+    def get_model_configs_with_fallbacks(self, model_name: str) -> Sequence[ModelConfig]:
         model_config = self.get_model_config(model_name)
-        model_instance = get_model_for_config(model_config)
-        self.model_instance_by_model_name[model_name] = model_instance
-        return model_instance
+        return [
+            model_config,
+            *map(self.get_model_config, model_config.fallback_model_names)
+        ]
+
+    def get_configured_model_configs(self) -> Sequence[ModelConfig]:
+        model_configs = list(self.model_config_list)
+        if not any(c.model_name == DEFAULT_MODEL_NAME for c in model_configs):
+            try:
+                model_configs.append(self.get_model_config(DEFAULT_MODEL_NAME))
+            except KeyError:
+                LOGGER.info('Default model not configured')
+        return model_configs
+
+    def warm_up(self) -> int:
+        # creating the models and opening one connection per base url, concurrently
+        api_key_by_base_url: dict[str, str] = {}
+        for model_config in self.get_configured_model_configs():
+            self.get_model(model_config.model_name)
+            api_key_by_base_url.setdefault(model_config.base_url, model_config.api_key)
+        if not api_key_by_base_url:
+            return 0
+        with ThreadPoolExecutor(max_workers=len(api_key_by_base_url)) as executor:
+            return sum(executor.map(
+                self.http_client_pool.warm_up,
+                api_key_by_base_url.keys(),
+                api_key_by_base_url.values()
+            ))
+
+    def get_http_client_stats(self) -> Sequence[ModelHttpClientStats]:
+        return self.http_client_pool.get_stats()
+
+    def log_http_client_stats(self):
+        for stats in self.get_http_client_stats():
+            LOGGER.info('Model HTTP client stats: %r', stats)
+
+    def get_admission_stats_by_model_name(self) -> Mapping[str, ModelAdmissionStats]:
+        with self.lock:
+            admission_controller_by_model_name = dict(self.admission_controller_by_model_name)
+        return {
+            model_name: admission_controller.get_stats()
+            for model_name, admission_controller in admission_controller_by_model_name.items()
+        }
+
+    def log_admission_stats(self):
+        for model_name, stats in self.get_admission_stats_by_model_name().items():
+            LOGGER.info(
+                'Model admission stats (%s): %r (average queue wait: %.3f seconds)',
+                model_name, stats, stats.average_queue_wait_seconds
+            )
+
+    def get_prompt_cache_stats_by_model_name(self) -> Mapping[str, PromptCacheStats]:
+        with self.lock:
+            prompt_cache_stats_recorder_by_model_name = dict(
+                self.prompt_cache_stats_recorder_by_model_name
+            )
+        return {
+            model_name: prompt_cache_stats_recorder.get_stats()
+            for model_name, prompt_cache_stats_recorder
+            in prompt_cache_stats_recorder_by_model_name.items()
+        }
+
+    def log_prompt_cache_stats(self):
+        for model_name, stats in self.get_prompt_cache_stats_by_model_name().items():
+            LOGGER.info(
+                'Model prompt cache stats (%s): %r (hit rate: %.3f, cached token ratio: %.3f)',
+                model_name, stats, stats.hit_rate, stats.cached_token_ratio
+            )
+
+    def log_stats(self):
+        self.log_http_client_stats()
+        self.log_admission_stats()
+        self.log_prompt_cache_stats()
+
+    def get_reloaded_model_registry(
+        self,
+        model_config_list: Sequence[ModelConfig]
+    ) -> 'SmolAgentsModelRegistry':
+        # reusing the model instances whose config didn't change, and the HTTP clients
+        reloaded_model_registry = SmolAgentsModelRegistry(
+            model_config_list,
+            http_client_pool=self.http_client_pool
+        )
+        with self.lock:
+            model_instance_by_model_name = dict(self.model_instance_by_model_name)
+            admission_controller_by_model_name = dict(self.admission_controller_by_model_name)
+            prompt_cache_stats_recorder_by_model_name = dict(
+                self.prompt_cache_stats_recorder_by_model_name
+            )
+        for model_name, model_instance in model_instance_by_model_name.items():
+            try:
+                if (
+                    reloaded_model_registry.get_model_configs_with_fallbacks(model_name)
+                    == self.get_model_configs_with_fallbacks(model_name)
+                ):
+                    reloaded_model_registry.model_instance_by_model_name[model_name] = (
+                        model_instance
+                    )
+                    if model_name in admission_controller_by_model_name:
+                        reloaded_model_registry.admission_controller_by_model_name[
+                            model_name
+                        ] = admission_controller_by_model_name[model_name]
+                    if model_name in prompt_cache_stats_recorder_by_model_name:
+                        reloaded_model_registry.prompt_cache_stats_recorder_by_model_name[
+                            model_name
+                        ] = prompt_cache_stats_recorder_by_model_name[model_name]
+            except (KeyError, ValueError):
+                LOGGER.info('Model no longer configured: %r', model_name)
+        return reloaded_model_registry
 
     def get_model_or_default_model(
         self,
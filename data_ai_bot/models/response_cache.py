@@ -0,0 +1,334 @@
+import copy
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Iterator, Mapping, Optional, Sequence
+
+from cachetools import TTLCache  # type: ignore
+import smolagents  # type: ignore
+from smolagents.models import (  # type: ignore
+    ChatMessageToolCallStreamDelta,
+    agglomerate_stream_deltas,
+    get_dict_from_nested_dataclasses,
+    get_tool_json_schema
+)
+
+from data_ai_bot.config import ModelResponseCacheConfig
+from data_ai_bot.models.streaming import is_streaming_supported_by_model
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_json_value(value: Any) -> Any:
+    return get_dict_from_nested_dataclasses(value, ignore_key='raw')
+
+
+def get_model_request_key(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    model_id: Optional[str],
+    messages: Sequence[Any],
+    stop_sequences: Optional[Sequence[str]] = None,
+    response_format: Optional[Mapping[str, Any]] = None,
+    tools_to_call_from: Optional[Sequence[smolagents.Tool]] = None,
+    parameters: Optional[Mapping[str, Any]] = None
+) -> str:
+    # the parameters include sampling parameters, such as the temperature
+    request_json = json.dumps(
+        {
+            'model_id': model_id,
+            'messages': [get_json_value(message) for message in messages],
+            'stop_sequences': stop_sequences,
+            'response_format': response_format,
+            'tools': [get_tool_json_schema(tool) for tool in tools_to_call_from or []],
+            'parameters': parameters or {}
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(request_json.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class ModelResponseCacheStats:
+    hit_count: int = 0
+    miss_count: int = 0
+
+
+class ModelResponseCache:
+    '''
+    In-memory (and optionally on-disk) cache of model responses, by request key.
+    '''
+
+    def __init__(self, config: ModelResponseCacheConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.memory_cache: TTLCache = TTLCache(maxsize=config.max_entry_count, ttl=config.ttl)
+        self.stats_by_agent_name: dict[Optional[str], ModelResponseCacheStats] = {}
+        self.disk_entry_count: Optional[int] = None
+
+    def _get_file_path(self, key: str) -> Optional[Path]:
+        if not self.config.cache_dir:
+            return None
+        return Path(self.config.cache_dir) / key[:2] / f'{key}.json'
+
+    def _load_from_disk(self, key: str) -> Optional[dict]:
+        file_path = self._get_file_path(key)
+        if file_path is None:
+            return None
+        try:
+            entry = json.loads(file_path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            LOGGER.warning('Failed to load model response from %r: %r', str(file_path), exc)
+            return None
+        if time.time() - entry['created'] > self.config.ttl:
+            return None
+        return entry['chat_message']
+
+    def _get_disk_file_paths(self) -> Sequence[Path]:
+        assert self.config.cache_dir
+        return list(Path(self.config.cache_dir).glob('*/*.json'))
+
+    def _prune_disk(self):
+        file_paths = sorted(self._get_disk_file_paths(), key=lambda path: path.stat().st_mtime)
+        # removing the oldest entries, to leave some room before the next pruning
+        remove_count = len(file_paths) - int(self.config.max_disk_entry_count * 0.9)
+        for file_path in file_paths[:max(remove_count, 0)]:
+            file_path.unlink(missing_ok=True)
+        self.disk_entry_count = len(file_paths) - max(remove_count, 0)
+
+    def _save_to_disk(self, key: str, chat_message_dict: dict):
+        file_path = self._get_file_path(key)
+        if file_path is None:
+            return
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file_path = file_path.with_suffix(f'.{os.getpid()}.tmp')
+            temp_file_path.write_text(
+                json.dumps({'created': time.time(), 'chat_message': chat_message_dict}),
+                encoding='utf-8'
+            )
+            temp_file_path.replace(file_path)
+            with self.lock:
+                if self.disk_entry_count is None:
+                    self.disk_entry_count = len(self._get_disk_file_paths())
+                else:
+                    self.disk_entry_count += 1
+                if self.disk_entry_count > self.config.max_disk_entry_count:
+                    self._prune_disk()
+        except OSError as exc:
+            LOGGER.warning('Failed to save model response to %r: %r', str(file_path), exc)
+
+    def get(self, key: str) -> Optional[smolagents.ChatMessage]:
+        with self.lock:
+            chat_message_dict = self.memory_cache.get(key)
+        if chat_message_dict is None:
+            chat_message_dict = self._load_from_disk(key)
+            if chat_message_dict is None:
+                return None
+            with self.lock:
+                self.memory_cache[key] = chat_message_dict
+        # a cached response doesn't use any tokens
+        return smolagents.ChatMessage.from_dict(
+            # copying, as the dict is modified
+            copy.deepcopy(chat_message_dict),
+            token_usage=smolagents.TokenUsage(input_tokens=0, output_tokens=0)
+        )
+
+    def set(self, key: str, chat_message: smolagents.ChatMessage):
+        chat_message_dict = get_json_value(chat_message)
+        chat_message_dict.pop('token_usage', None)
+        with self.lock:
+            self.memory_cache[key] = chat_message_dict
+        self._save_to_disk(key, chat_message_dict)
+
+    def record(self, agent_name: Optional[str], is_hit: bool):
+        with self.lock:
+            stats = self.stats_by_agent_name.setdefault(agent_name, ModelResponseCacheStats())
+            if is_hit:
+                stats.hit_count += 1
+            else:
+                stats.miss_count += 1
+
+    def get_stats_by_agent_name(self) -> Mapping[Optional[str], ModelResponseCacheStats]:
+        with self.lock:
+            return {
+                agent_name: ModelResponseCacheStats(stats.hit_count, stats.miss_count)
+                for agent_name, stats in self.stats_by_agent_name.items()
+            }
+
+
+def get_stream_delta_for_chat_message(
+    chat_message: smolagents.ChatMessage
+) -> smolagents.ChatMessageStreamDelta:
+    return smolagents.ChatMessageStreamDelta(
+        content=chat_message.content if isinstance(chat_message.content, str) else None,
+        tool_calls=[
+            ChatMessageToolCallStreamDelta(
+                index=index,
+                id=tool_call.id,
+                type=tool_call.type,
+                function=tool_call.function
+            )
+            for index, tool_call in enumerate(chat_message.tool_calls or [])
+        ] or None,
+        token_usage=chat_message.token_usage
+    )
+
+
+class CachingModel(smolagents.Model):
+    '''
+    Returns cached responses for identical requests, at temperature zero
+    (or for any request, if always enabled).
+    Streamed responses are cached too, and replayed as a single delta.
+    '''
+
+    def __init__(
+        self,
+        model: smolagents.Model,
+        response_cache: ModelResponseCache,
+        agent_name: Optional[str] = None,
+        model_parameters: Optional[Mapping[str, Any]] = None,
+        model_by_agent_name: Optional[dict[Optional[str], 'CachingModel']] = None
+    ):
+        super().__init__(model_id=model.model_id)
+        self.model = model
+        self.response_cache = response_cache
+        # the parameters the model was created with (e.g. temperature)
+        self.model_parameters = model_parameters or {}
+        self.agent_name = agent_name
+        # shared, to return the same model instance for an agent
+        self.model_by_agent_name = model_by_agent_name if model_by_agent_name is not None else {}
+        self.model_by_agent_name.setdefault(agent_name, self)
+
+    @property
+    def supports_stop_parameter(self) -> bool:
+        return self.model.supports_stop_parameter
+
+    @property
+    def supports_streaming(self) -> bool:
+        return is_streaming_supported_by_model(self.model)
+
+    def get_model_for_agent(self, agent_name: str) -> 'CachingModel':
+        with self.response_cache.lock:
+            model = self.model_by_agent_name.get(agent_name)
+            if model is None:
+                model = CachingModel(
+                    self.model,
+                    self.response_cache,
+                    agent_name=agent_name,
+                    model_parameters=self.model_parameters,
+                    model_by_agent_name=self.model_by_agent_name
+                )
+            return model
+
+    def is_cacheable(self, parameters: Mapping[str, Any]) -> bool:
+        if self.response_cache.config.always_enabled:
+            return True
+        return parameters.get('temperature') == 0
+
+    def _get_cached_chat_message(
+        self,
+        key: Optional[str]
+    ) -> Optional[smolagents.ChatMessage]:
+        if key is None:
+            return None
+        chat_message = self.response_cache.get(key)
+        self.response_cache.record(self.agent_name, is_hit=chat_message is not None)
+        if chat_message is not None:
+            LOGGER.info(
+                'Model response cache hit (agent: %r, model: %r)',
+                self.agent_name, self.model_id
+            )
+        return chat_message
+
+    def _get_key(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        messages: list,
+        stop_sequences: Optional[list[str]],
+        response_format: Optional[dict[str, str]],
+        tools_to_call_from: Optional[list[smolagents.Tool]],
+        kwargs: Mapping[str, Any]
+    ) -> Optional[str]:
+        parameters = {**self.model_parameters, **kwargs}
+        if not self.is_cacheable(parameters):
+            return None
+        return get_model_request_key(
+            model_id=self.model_id,
+            messages=messages,
+            stop_sequences=stop_sequences,
+            response_format=response_format,
+            tools_to_call_from=tools_to_call_from,
+            parameters=parameters
+        )
+
+    def generate(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        messages: list,
+        stop_sequences: Optional[list[str]] = None,
+        response_format: Optional[dict[str, str]] = None,
+        tools_to_call_from: Optional[list[smolagents.Tool]] = None,
+        **kwargs
+    ) -> smolagents.ChatMessage:
+        key = self._get_key(
+            messages, stop_sequences, response_format, tools_to_call_from, kwargs
+        )
+        chat_message = self._get_cached_chat_message(key)
+        if chat_message is not None:
+            return chat_message
+        chat_message = self.model.generate(
+            messages,
+            stop_sequences=stop_sequences,
+            response_format=response_format,
+            tools_to_call_from=tools_to_call_from,
+            **kwargs
+        )
+        if key is not None:
+            self.response_cache.set(key, chat_message)
+        return chat_message
+
+    def generate_stream(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        messages: list,
+        stop_sequences: Optional[list[str]] = None,
+        response_format: Optional[dict[str, str]] = None,
+        tools_to_call_from: Optional[list[smolagents.Tool]] = None,
+        **kwargs
+    ) -> Iterator[smolagents.ChatMessageStreamDelta]:
+        key = self._get_key(
+            messages, stop_sequences, response_format, tools_to_call_from, kwargs
+        )
+        chat_message = self._get_cached_chat_message(key)
+        if chat_message is not None:
+            yield get_stream_delta_for_chat_message(chat_message)
+            return
+        stream_deltas = []
+        for stream_delta in self.model.generate_stream(
+            messages,
+            stop_sequences=stop_sequences,
+            response_format=response_format,
+            tools_to_call_from=tools_to_call_from,
+            **kwargs
+        ):
+            stream_deltas.append(stream_delta)
+            yield stream_delta
+        if key is not None:
+            self.response_cache.set(key, agglomerate_stream_deltas(stream_deltas))
+
+    def parse_tool_calls(self, message: smolagents.ChatMessage) -> smolagents.ChatMessage:
+        return self.model.parse_tool_calls(message)
+
+    def to_dict(self) -> dict:
+        return self.model.to_dict()
+
+
+def get_model_for_agent(model: smolagents.Model, agent_name: str) -> smolagents.Model:
+    if isinstance(model, CachingModel):
+        return model.get_model_for_agent(agent_name)
+    return model
@@ -0,0 +1,9 @@
+from typing import Any
+
+
+def is_streaming_supported_by_model(model: Any) -> bool:
+    # wrapper models (e.g. for caching) define `generate_stream`, but delegate to their models
+    supports_streaming = getattr(model, 'supports_streaming', None)
+    if isinstance(supports_streaming, bool):
+        return supports_streaming
+    return hasattr(model, 'generate_stream')
@@ -0,0 +1,100 @@
+import argparse
+import logging
+import statistics
+import subprocess
+import sys
+import time
+from typing import Optional, Sequence
+
+from data_ai_bot.config import (
+    AppConfig,
+    get_eager_tool_definitions_config,
+    load_app_config_from_file
+)
+from data_ai_bot.tools.resolver import ConfigToolResolver
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+STARTUP_MODES = ['lazy', 'eager']
+
+
+def get_all_tool_names(app_config: AppConfig) -> Sequence[str]:
+    return list(dict.fromkeys(
+        tool_name
+        for agent_config in [app_config.agent, *app_config.managed_agents]
+        for tool_name in agent_config.tools
+    ))
+
+
+def resolve_all_tools(config_file: str, startup_mode: str):
+    # tool collections are excluded, as they depend on the MCP servers
+    app_config = load_app_config_from_file(config_file)
+    tool_definitions_config = app_config.tool_definitions
+    if startup_mode == 'eager':
+        tool_definitions_config = get_eager_tool_definitions_config(tool_definitions_config)
+    with ConfigToolResolver(tool_definitions_config=tool_definitions_config) as tool_resolver:
+        tool_resolver.get_tools_by_name(get_all_tool_names(app_config))
+
+
+def measure_startup_seconds(config_file: str, startup_mode: str) -> float:
+    # using a new process each time, so that every run includes the module imports
+    start_time = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable, '-m', __spec__.name,  # type: ignore[name-defined]
+            '--config-file', config_file,
+            '--startup-mode', startup_mode
+        ],
+        check=True
+    )
+    return time.perf_counter() - start_time
+
+
+def run_benchmark(config_file: str, repeat: int) -> dict[str, float]:
+    median_seconds_by_startup_mode: dict[str, float] = {}
+    for startup_mode in STARTUP_MODES:
+        seconds_list = [
+            measure_startup_seconds(config_file, startup_mode)
+            for _ in range(repeat)
+        ]
+        median_seconds_by_startup_mode[startup_mode] = statistics.median(seconds_list)
+        LOGGER.info(
+            'Startup (%s): median %.3f seconds, all: %r',
+            startup_mode, median_seconds_by_startup_mode[startup_mode], seconds_list
+        )
+    return median_seconds_by_startup_mode
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compares the time it takes to start and resolve the tools of all agents,'
+            ' with lazy tools (as configured) and with all tools created eagerly.'
+        )
+    )
+    parser.add_argument('--config-file', required=True)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--startup-mode',
+        choices=STARTUP_MODES,
+        help='Resolve the tools once using the given mode (used by the benchmark itself).'
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    args = parse_args(argv)
+    if args.startup_mode:
+        logging.getLogger().setLevel('WARNING')
+        resolve_all_tools(args.config_file, args.startup_mode)
+        return
+    median_seconds_by_startup_mode = run_benchmark(args.config_file, repeat=args.repeat)
+    for startup_mode, median_seconds in median_seconds_by_startup_mode.items():
+        print(f'{startup_mode}: {median_seconds:.3f}s')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level='INFO')
+    main()
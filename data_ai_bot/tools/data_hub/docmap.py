@@ -2,17 +2,57 @@
 
 import json
 import logging
-import re
-from typing import Mapping
-
-import requests
+from typing import Any, Mapping
 
 import smolagents  # type: ignore
 
+from data_ai_bot.tools.sources.web_api import (
+    get_async_client,
+    get_batch_values,
+    is_regex_full_match
+)
+from data_ai_bot.utils.concurrency import (
+    DEFAULT_MAX_CONCURRENCY,
+    get_gathered_with_max_concurrency,
+    run_coroutine_sync
+)
+
 
 LOGGER = logging.getLogger(__name__)
 
 
+MANUSCRIPT_ID_REGEX = r'\d{5,6}'
+
+
+def get_docmap_url_for_manuscript_id(manuscript_id: str) -> str:
+    return (
+        'https://data-hub-api.elifesciences.org/enhanced-preprints/docmaps'
+        f'/v2/by-publisher/elife/get-by-manuscript-id?manuscript_id={manuscript_id}'
+    )
+
+
+def validate_manuscript_id(manuscript_id: str):
+    if not is_regex_full_match(MANUSCRIPT_ID_REGEX, manuscript_id):
+        raise ValueError(f'Invalid manuscript id (must be 5 or 6 digits): {manuscript_id}')
+
+
+async def get_docmap_json_by_manuscript_id(
+    manuscript_id: str,
+    headers: Mapping[str, str],
+    timeout: int
+) -> dict:
+    validate_manuscript_id(manuscript_id)
+    url = get_docmap_url_for_manuscript_id(manuscript_id)
+    LOGGER.info('url: %r', url)
+
+    response = await get_async_client().get(url, timeout=timeout, headers=headers)
+    response.raise_for_status()
+
+    docmap_json = response.json()
+    LOGGER.info('docmap_json: %r', docmap_json)
+    return docmap_json
+
+
 class DocMapTool(smolagents.Tool):
     name = 'data_hub_docmap'
     description = 'Fetches a DocMap as JSON from the Data Hub DocMaps API.'
@@ -29,22 +69,73 @@ class DocMapTool(smolagents.Tool):
         self.headers = headers
         self.timeout = timeout
 
+    async def async_forward(self, manuscript_id: str) -> Any:
+        # errors are raised, e.g. to let the agent see them as a failed tool call
+        docmap_json = await get_docmap_json_by_manuscript_id(
+            manuscript_id,
+            headers=self.headers,
+            timeout=self.timeout
+        )
+        return json.dumps(docmap_json)
+
     def forward(self, manuscript_id: str):  # pylint: disable=arguments-differ
-        try:
-            if not re.match(r'\d{5,6}', manuscript_id):
-                return r'Invalid manuscript id (must be 5 or 6 digits): {manuscript_id}'
-            url = (
-                'https://data-hub-api.elifesciences.org/enhanced-preprints/docmaps'
-                f'/v2/by-publisher/elife/get-by-manuscript-id?manuscript_id={manuscript_id}'
-            )
-            LOGGER.info('url: %r', url)
+        return run_coroutine_sync(self.async_forward(manuscript_id))
 
-            response = requests.get(url, timeout=self.timeout, headers=self.headers)
-            response.raise_for_status()
 
-            docmap_json = response.json()
-            LOGGER.info('docmap_json: %r', docmap_json)
+class DocMapBatchTool(smolagents.Tool):
+    name = 'data_hub_docmaps'
+    description = (
+        'Fetches multiple DocMaps as JSON from the Data Hub DocMaps API.'
+        ' Returns a JSON object by manuscript id.'
+    )
+    inputs = {
+        'manuscript_ids': {
+            'type': 'array',
+            'items': {'type': 'string'},
+            'description': 'The list of 5 or 6 digit eLife manuscript ids'
+        }
+    }
+    output_type = 'string'
+
+    def __init__(
+        self,
+        headers: Mapping[str, str],
+        timeout: int = 30,
+        max_batch_size: int = 20,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ):
+        super().__init__()
+        self.headers = headers
+        self.timeout = timeout
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
 
-            return json.dumps(docmap_json)
+    async def _get_docmap_json_or_error(self, manuscript_id: str) -> dict:
+        try:
+            return await get_docmap_json_by_manuscript_id(
+                manuscript_id,
+                headers=self.headers,
+                timeout=self.timeout
+            )
         except Exception as e:  # pylint: disable=broad-exception-caught
-            return f'Error fetching DocMap: {str(e)}'
+            LOGGER.warning('Failed to fetch DocMap for %r: %r', manuscript_id, e)
+            return {'error': f'Error fetching DocMap: {str(e)}'}
+
+    async def async_forward(self, manuscript_ids: list[str]) -> Any:
+        unique_manuscript_ids = get_batch_values(manuscript_ids)
+        if len(unique_manuscript_ids) > self.max_batch_size:
+            raise ValueError(
+                f'Too many manuscript ids: {len(unique_manuscript_ids)}'
+                f' (max: {self.max_batch_size})'
+            )
+        docmap_json_list = await get_gathered_with_max_concurrency(
+            [
+                self._get_docmap_json_or_error(manuscript_id)
+                for manuscript_id in unique_manuscript_ids
+            ],
+            max_concurrency=self.max_concurrency
+        )
+        return json.dumps(dict(zip(unique_manuscript_ids, docmap_json_list)))
+
+    def forward(self, manuscript_ids: list[str]):  # pylint: disable=arguments-differ
+        return run_coroutine_sync(self.async_forward(manuscript_ids))
@@ -0,0 +1,60 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Mapping
+
+from smolagents import Tool  # type: ignore
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_memoized_tool_factory(create_tool: Callable[[], Tool]) -> Callable[[], Tool]:
+    lock = threading.Lock()
+    created_tools: list[Tool] = []
+
+    def get_tool() -> Tool:
+        with lock:
+            if not created_tools:
+                start_time = time.monotonic()
+                created_tools.append(create_tool())
+                LOGGER.info(
+                    'Created tool %r in %.3f seconds',
+                    created_tools[0].name, time.monotonic() - start_time
+                )
+            return created_tools[0]
+
+    return get_tool
+
+
+class LazyTool(Tool):
+    '''
+    Tool with the name, description and inputs known upfront (e.g. from the config),
+    which only creates the actual tool (importing its module) when first called.
+    '''
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        name: str,
+        description: str,
+        inputs: Mapping[str, dict],
+        output_type: str,
+        create_tool: Callable[[], Tool]
+    ):
+        super().__init__()
+        self.name = name
+        self.description = description
+        self.inputs = dict(inputs)
+        self.output_type = output_type
+        # a plain function, which will be shared rather than copied by `deepcopy`
+        self.get_tool = get_memoized_tool_factory(create_tool)
+        self.skip_forward_signature_validation = True
+
+    def forward(self, *args, **kwargs) -> Any:
+        return self.get_tool().forward(*args, **kwargs)
+
+
+def get_resolved_tool(tool: Tool) -> Tool:
+    if isinstance(tool, LazyTool):
+        return tool.get_tool()
+    return tool
@@ -0,0 +1,402 @@
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, replace
+import hashlib
+import json
+import logging
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Mapping, Optional, Protocol, Sequence
+
+from smolagents import Tool, ToolCollection  # type: ignore
+
+from data_ai_bot.config import FromMcpConfig
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+DEFAULT_MCP_CONNECT_TIMEOUT = 60.0
+
+DEFAULT_MCP_RECONNECT_INITIAL_DELAY = 0.5
+DEFAULT_MCP_RECONNECT_MAX_DELAY = 30.0
+
+
+@dataclass(frozen=True)
+class McpToolSchema:
+    name: str
+    description: str
+    inputs: Mapping[str, Any]
+    output_type: str
+
+    @staticmethod
+    def from_tool(tool: Tool) -> 'McpToolSchema':
+        return McpToolSchema(
+            name=tool.name,
+            description=tool.description,
+            inputs=tool.inputs,
+            output_type=tool.output_type
+        )
+
+    @staticmethod
+    def from_dict(tool_schema_dict: Mapping[str, Any]) -> 'McpToolSchema':
+        return McpToolSchema(**tool_schema_dict)
+
+
+class McpToolSchemaStore(Protocol):
+    def load(self, from_mcp_config: FromMcpConfig) -> Optional[Sequence[McpToolSchema]]:
+        pass
+
+    def save(self, from_mcp_config: FromMcpConfig, tool_schemas: Sequence[McpToolSchema]):
+        pass
+
+
+@dataclass(frozen=True)
+class StaticMcpToolSchemaStore(McpToolSchemaStore):
+    # e.g. from the config snapshot
+    tool_schemas_by_name: Mapping[str, Sequence[McpToolSchema]]
+
+    def load(self, from_mcp_config: FromMcpConfig) -> Optional[Sequence[McpToolSchema]]:
+        return self.tool_schemas_by_name.get(from_mcp_config.name)
+
+    def save(self, from_mcp_config: FromMcpConfig, tool_schemas: Sequence[McpToolSchema]):
+        pass
+
+
+@dataclass(frozen=True)
+class McpToolSchemaCache(McpToolSchemaStore):
+    cache_dir: str
+
+    def get_cache_file_path(self, from_mcp_config: FromMcpConfig) -> Path:
+        server_hash = hashlib.sha256(
+            f'{from_mcp_config.url} {from_mcp_config.transport}'.encode('utf-8')
+        ).hexdigest()[:16]
+        return Path(self.cache_dir) / f'{from_mcp_config.name}-{server_hash}.json'
+
+    def load(self, from_mcp_config: FromMcpConfig) -> Optional[Sequence[McpToolSchema]]:
+        cache_file_path = self.get_cache_file_path(from_mcp_config)
+        try:
+            return [
+                McpToolSchema.from_dict(tool_schema_dict)
+                for tool_schema_dict in json.loads(cache_file_path.read_text(encoding='utf-8'))
+            ]
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as exc:
+            LOGGER.warning('Ignoring invalid MCP tool schema cache %r: %r', cache_file_path, exc)
+            return None
+
+    def save(self, from_mcp_config: FromMcpConfig, tool_schemas: Sequence[McpToolSchema]):
+        cache_file_path = self.get_cache_file_path(from_mcp_config)
+        cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_cache_file_path = cache_file_path.with_suffix('.tmp')
+        temp_cache_file_path.write_text(
+            json.dumps([asdict(tool_schema) for tool_schema in tool_schemas], indent=2),
+            encoding='utf-8'
+        )
+        temp_cache_file_path.replace(cache_file_path)
+
+
+@dataclass
+class McpServerStats:
+    call_count: int = 0
+    error_count: int = 0
+    total_call_seconds: float = 0.0
+    connection_count: int = 0
+    reconnect_count: int = 0
+
+    @property
+    def average_call_seconds(self) -> float:
+        return self.total_call_seconds / self.call_count if self.call_count else 0.0
+
+
+MCP_CONNECTION_ERROR_TYPE_NAMES = {
+    'BrokenResourceError',
+    'ClosedResourceError',
+    'ConnectError',
+    'ConnectTimeout',
+    'EndOfStream',
+    'ReadError',
+    'RemoteProtocolError',
+    'WriteError'
+}
+
+
+def is_mcp_connection_error(exc: BaseException) -> bool:
+    # the MCP client libraries (anyio, httpx) don't share a common base class
+    if isinstance(exc, (ConnectionError, EOFError)):
+        return True
+    return any(
+        exc_type.__name__ in MCP_CONNECTION_ERROR_TYPE_NAMES
+        for exc_type in type(exc).__mro__
+    )
+
+
+class McpSession:
+    def __init__(self, from_mcp_config: FromMcpConfig):
+        self.from_mcp_config = from_mcp_config
+        self.exit_stack: Optional[ExitStack] = None
+        self.tool_by_name: Mapping[str, Tool] = {}
+        self.is_healthy = False
+        self.connect_failure_count = 0
+        self.active_call_count = 0
+
+    def connect(self) -> Sequence[Tool]:
+        with ExitStack() as exit_stack:
+            tool_collection = exit_stack.enter_context(ToolCollection.from_mcp({
+                'url': self.from_mcp_config.url,
+                'transport': self.from_mcp_config.transport
+            }, trust_remote_code=True))
+            tools: Sequence[Tool] = tool_collection.tools
+            # keep the connection open, until the session is closed
+            self.exit_stack = exit_stack.pop_all()
+        self.tool_by_name = {tool.name: tool for tool in tools}
+        return tools
+
+    def close(self):
+        exit_stack, self.exit_stack = self.exit_stack, None
+        if exit_stack is None:
+            return
+        try:
+            exit_stack.close()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            LOGGER.warning('Failed to close MCP session %r: %r', self.from_mcp_config.name, exc)
+
+
+class McpSessionPool:  # pylint: disable=too-many-instance-attributes
+    '''
+    Maintains one or more sessions to an MCP server (connected in background threads).
+    Calls are made using the least busy healthy session. A session failing with
+    a connection error is reconnected in the background (with exponential backoff).
+    The call is only retried using another (or the reconnected) session, if enabled
+    for the tool collection (the call may already have reached the server).
+    '''
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        from_mcp_config: FromMcpConfig,
+        on_connected: Optional[Callable[[Sequence[Tool]], None]] = None,
+        reconnect_initial_delay: float = DEFAULT_MCP_RECONNECT_INITIAL_DELAY,
+        reconnect_max_delay: float = DEFAULT_MCP_RECONNECT_MAX_DELAY,
+        connect_timeout: float = DEFAULT_MCP_CONNECT_TIMEOUT
+    ):
+        self.from_mcp_config = from_mcp_config
+        self.on_connected = on_connected
+        self.reconnect_initial_delay = reconnect_initial_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.connect_timeout = connect_timeout
+        self.sessions = [
+            McpSession(from_mcp_config)
+            for _ in range(max(1, from_mcp_config.session_count))
+        ]
+        self.tools: Optional[Sequence[Tool]] = None
+        self.is_connected_once = False
+        self.last_connection_error: Optional[Exception] = None
+        self.stats = McpServerStats()
+        self.condition = threading.Condition()
+        self.closed_event = threading.Event()
+
+    @property
+    def name(self) -> str:
+        return self.from_mcp_config.name
+
+    def get_stats(self) -> McpServerStats:
+        with self.condition:
+            return replace(self.stats)
+
+    def _connect_session(self, session: McpSession) -> bool:
+        start_time = time.monotonic()
+        try:
+            tools = session.connect()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            LOGGER.warning('Failed to connect to MCP server %r: %r', self.name, exc)
+            with self.condition:
+                session.connect_failure_count += 1
+                self.last_connection_error = exc
+                self.condition.notify_all()
+            return False
+        LOGGER.info(
+            'Connected to MCP server %r in %.3f seconds',
+            self.name, time.monotonic() - start_time
+        )
+        with self.condition:
+            session.is_healthy = True
+            session.connect_failure_count = 0
+            self.stats.connection_count += 1
+            is_first_connection = not self.is_connected_once
+            self.is_connected_once = True
+            self.condition.notify_all()
+        if is_first_connection:
+            self._publish_tools(tools)
+        return True
+
+    def _publish_tools(self, tools: Sequence[Tool]):
+        # calling `on_connected` (e.g. saving the schemas) without holding the lock,
+        # but before publishing the tools, so that callers of `get_tools` see its effects
+        if self.on_connected is not None:
+            try:
+                self.on_connected(tools)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                LOGGER.warning('Failed to handle MCP connection %r: %r', self.name, exc)
+        with self.condition:
+            self.tools = tools
+            self.condition.notify_all()
+
+    def _keep_connecting(self, session: McpSession):
+        attempt_index = 0
+        while not self.closed_event.is_set():
+            if self._connect_session(session):
+                return
+            delay = min(
+                self.reconnect_max_delay,
+                self.reconnect_initial_delay * (2 ** attempt_index)
+            )
+            attempt_index += 1
+            LOGGER.info('Reconnecting to MCP server %r in %.1f seconds', self.name, delay)
+            self.closed_event.wait(delay)
+
+    def _start_connecting(self, session: McpSession):
+        threading.Thread(
+            target=self._keep_connecting,
+            args=(session,),
+            name=f'mcp-connect-{self.name}',
+            daemon=True
+        ).start()
+
+    def start(self):
+        for session in self.sessions:
+            self._start_connecting(session)
+
+    def _reconnect(self, session: McpSession):
+        session.close()
+        self._keep_connecting(session)
+
+    def _mark_unhealthy(self, session: McpSession):
+        with self.condition:
+            if not session.is_healthy:
+                return
+            session.is_healthy = False
+            self.stats.reconnect_count += 1
+        threading.Thread(
+            target=self._reconnect,
+            args=(session,),
+            name=f'mcp-reconnect-{self.name}',
+            daemon=True
+        ).start()
+
+    def _is_connecting_failed(self) -> bool:
+        # expects the condition lock to be held
+        return all(
+            session.connect_failure_count and not session.is_healthy
+            for session in self.sessions
+        )
+
+    def get_tools(self) -> Sequence[Tool]:
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.tools is not None or self._is_connecting_failed(),
+                timeout=self.connect_timeout
+            )
+            if self.tools is None:
+                raise ConnectionError(
+                    f'Not connected to MCP server {repr(self.name)}:'
+                    f' {repr(self.last_connection_error)}'
+                )
+            return self.tools
+
+    def _acquire_session(self) -> McpSession:
+        with self.condition:
+            self.condition.wait_for(
+                lambda: any(session.is_healthy for session in self.sessions),
+                timeout=self.connect_timeout
+            )
+            healthy_sessions = [session for session in self.sessions if session.is_healthy]
+            if not healthy_sessions:
+                raise ConnectionError(f'No healthy session for MCP server {repr(self.name)}')
+            session = min(healthy_sessions, key=lambda session: session.active_call_count)
+            session.active_call_count += 1
+            return session
+
+    def _release_session(self, session: McpSession):
+        with self.condition:
+            session.active_call_count -= 1
+
+    def _call_tool_once(self, tool_name: str, *args, **kwargs) -> Any:
+        session = self._acquire_session()
+        try:
+            tool = session.tool_by_name.get(tool_name)
+            if tool is None:
+                raise KeyError(f'Tool not found on MCP server: {repr(tool_name)}')
+            return tool.forward(*args, **kwargs)
+        except Exception as exc:
+            if is_mcp_connection_error(exc):
+                LOGGER.warning('MCP connection error (server: %r): %r', self.name, exc)
+                self._mark_unhealthy(session)
+            raise
+        finally:
+            self._release_session(session)
+
+    def call_tool(self, tool_name: str, *args, **kwargs) -> Any:
+        start_time = time.monotonic()
+        is_error = True
+        try:
+            try:
+                result = self._call_tool_once(tool_name, *args, **kwargs)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                if not (
+                    self.from_mcp_config.retry_tool_calls
+                    and is_mcp_connection_error(exc)
+                ):
+                    raise
+                LOGGER.info('Retrying MCP tool call: %r', tool_name)
+                result = self._call_tool_once(tool_name, *args, **kwargs)
+            is_error = False
+            return result
+        finally:
+            with self.condition:
+                self.stats.call_count += 1
+                self.stats.total_call_seconds += time.monotonic() - start_time
+                if is_error:
+                    self.stats.error_count += 1
+
+    def close(self):
+        self.closed_event.set()
+        for session in self.sessions:
+            session.close()
+
+
+class McpToolProxy(Tool):
+    '''
+    Tool created from an MCP tool schema (possibly cached),
+    delegating calls to the session pool (waiting for the connection if necessary).
+    '''
+
+    def __init__(
+        self,
+        tool_schema: McpToolSchema,
+        call_tool: Callable[..., Any]
+    ):
+        super().__init__()
+        self.name = tool_schema.name
+        self.description = tool_schema.description
+        self.inputs = dict(tool_schema.inputs)
+        self.output_type = tool_schema.output_type
+        # a plain function, which will be shared rather than copied by `deepcopy`
+        self.call_tool = call_tool
+        self.skip_forward_signature_validation = True
+
+    def forward(self, *args, **kwargs) -> Any:
+        return self.call_tool(*args, **kwargs)
+
+
+def get_mcp_tool_proxies(
+    tool_schemas: Sequence[McpToolSchema],
+    session_pool: McpSessionPool
+) -> Sequence[Tool]:
+    def get_call_tool(tool_name: str) -> Callable[..., Any]:
+        return lambda *args, **kwargs: session_pool.call_tool(tool_name, *args, **kwargs)
+
+    return [
+        McpToolProxy(tool_schema, call_tool=get_call_tool(tool_schema.name))
+        for tool_schema in tool_schemas
+    ]
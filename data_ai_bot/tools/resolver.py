@@ -1,12 +1,15 @@
 from abc import ABC, abstractmethod
 from contextlib import ExitStack
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from functools import cached_property
 import importlib
 import inspect
 import logging
-from typing import Any, Mapping, Optional, Sequence
+import threading
+import time
+from typing import Any, Callable, Mapping, Optional, Sequence
 
-from smolagents import Tool, ToolCollection  # type: ignore
+from smolagents import Tool  # type: ignore
 
 from data_ai_bot.config import (
     FromMcpConfig,
@@ -15,6 +18,14 @@ from data_ai_bot.config import (
     ToolCollectionDefinitionsConfig,
     ToolDefinitionsConfig
 )
+from data_ai_bot.tools.lazy import LazyTool
+from data_ai_bot.tools.mcp import (
+    McpServerStats,
+    McpSessionPool,
+    McpToolSchema,
+    McpToolSchemaStore,
+    get_mcp_tool_proxies
+)
 
 
 LOGGER = logging.getLogger(__name__)
@@ -29,11 +40,17 @@ class ToolResolver(ABC):
     def get_tools_by_collection_name(self, tool_collection_name: str) -> Sequence[Tool]:
         pass
 
+    def start_tool_collections(self, tool_collection_names: Sequence[str]):
+        # optional hook, to allow tool collections to be loaded concurrently
+        pass
+
     def get_tools_by_name(
         self,
         tool_names: Sequence[str],
         tool_collection_names: Optional[Sequence[str]] = None
     ) -> Sequence[Tool]:
+        if tool_collection_names:
+            self.start_tool_collections(tool_collection_names)
         result = [
             self.get_tool_by_name(tool_name)
             for tool_name in tool_names
@@ -111,8 +128,39 @@ def get_tool_from_python_tool_class(
     return get_updated_tool(tool, tool_name=config.name, description=config.description)
 
 
+def get_lazy_tool_from_python_tool_class(
+    config: FromPythonToolClassConfig,
+    create_tool: Callable[[], Tool]
+) -> Tool:
+    # the tool schema needs to be known without importing the module
+    description = config.description or config.init_parameters.get('description')
+    if not description:
+        raise ValueError(f'Lazy tool requires a description: {repr(config.name)}')
+    return LazyTool(
+        name=config.name,
+        description=description,
+        inputs=config.init_parameters.get('inputs') or {},
+        output_type=config.init_parameters.get('output_type', 'string'),
+        create_tool=create_tool
+    )
+
+
+@dataclass
+class ToolResolutionStats:
+    creation_count: int = 0
+    creation_seconds: float = 0.0
+    reuse_count: int = 0
+
+
+ToolConfig = FromPythonToolInstanceConfig | FromPythonToolClassConfig
+
+
+def is_per_agent_tool_config(tool_config: ToolConfig) -> bool:
+    return isinstance(tool_config, FromPythonToolClassConfig) and tool_config.per_agent
+
+
 @dataclass(frozen=True)
-class ConfigToolResolver(ToolResolver):
+class ConfigToolResolver(ToolResolver):  # pylint: disable=too-many-instance-attributes
     tool_definitions_config: ToolDefinitionsConfig = (
         ToolDefinitionsConfig()
     )
@@ -121,6 +169,28 @@ class ConfigToolResolver(ToolResolver):
     )
     headers: Mapping[str, str] = field(default_factory=dict)
     exit_stack: ExitStack = field(default_factory=ExitStack)
+    tool_by_name: dict[str, Tool] = field(default_factory=dict, repr=False, compare=False)
+    stats_by_tool_name: dict[str, ToolResolutionStats] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    # re-entrant, as tools may resolve other tools while being created
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+    # separate lock, as lazy tools are created outside of the resolution lock
+    stats_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    mcp_tool_schema_cache: Optional[McpToolSchemaStore] = None
+    # without connecting to the MCP servers, i.e. requiring the (cached) tool schemas
+    start_mcp_sessions: bool = True
+    mcp_session_pool_by_name: dict[str, McpSessionPool] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    tools_by_collection_name: dict[str, Sequence[Tool]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    # the tools resolved by other tools while being created (e.g. composite tools)
+    dependency_tool_names_by_tool_name: dict[str, set[str]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    creating_tool_names: list[str] = field(default_factory=list, repr=False, compare=False)
 
     def __enter__(self):
         self.exit_stack.__enter__()
@@ -130,36 +200,225 @@ class ConfigToolResolver(ToolResolver):
         self.exit_stack.__exit__(exc_type, exc_val, exc_tb)
         return False
 
-    def get_tool_by_name(self, tool_name: str) -> Tool:
+    @cached_property
+    def tool_config_by_name(self) -> Mapping[str, ToolConfig]:
+        return self.tool_definitions_config.get_tool_config_by_name()
+
+    def _create_tool(self, tool_config: ToolConfig) -> Tool:
+        if isinstance(tool_config, FromPythonToolInstanceConfig):
+            return get_tool_from_python_tool_instance(tool_config)
         available_kwargs = {
-            'name': tool_name,
-            'headers': self.headers
+            'name': tool_config.name,
+            'headers': self.headers,
+            'tool_resolver': self
         }
-        for from_python_tool_instance_config in (
-            self.tool_definitions_config.from_python_tool_instance
+        return get_tool_from_python_tool_class(
+            tool_config,
+            available_kwargs=available_kwargs
+        )
+
+    def _get_stats_for_update(self, tool_name: str) -> ToolResolutionStats:
+        # expects the stats lock to be held
+        return self.stats_by_tool_name.setdefault(tool_name, ToolResolutionStats())
+
+    def _create_tool_and_record_stats(self, tool_config: ToolConfig) -> Tool:
+        start_time = time.monotonic()
+        tool = self._create_tool(tool_config)
+        with self.stats_lock:
+            stats = self._get_stats_for_update(tool_config.name)
+            stats.creation_count += 1
+            stats.creation_seconds += time.monotonic() - start_time
+        return tool
+
+    def _create_tool_or_lazy_tool(self, tool_config: ToolConfig) -> Tool:
+        if isinstance(tool_config, FromPythonToolClassConfig) and tool_config.lazy:
+            return get_lazy_tool_from_python_tool_class(
+                tool_config,
+                create_tool=lambda: self._create_tool_and_record_stats(tool_config)
+            )
+        return self._create_tool_and_record_stats(tool_config)
+
+    def get_tool_by_name(self, tool_name: str) -> Tool:
+        tool_config = self.tool_config_by_name.get(tool_name)
+        if tool_config is None:
+            raise InvalidToolNameError(f'Unrecognised tool: {repr(tool_name)}')
+        with self.lock:
+            if self.creating_tool_names:
+                self.dependency_tool_names_by_tool_name.setdefault(
+                    self.creating_tool_names[-1], set()
+                ).add(tool_name)
+            tool = self.tool_by_name.get(tool_name)
+            if tool is not None:
+                with self.stats_lock:
+                    self._get_stats_for_update(tool_name).reuse_count += 1
+                return tool
+            self.creating_tool_names.append(tool_name)
+            try:
+                tool = self._create_tool_or_lazy_tool(tool_config)
+            finally:
+                self.creating_tool_names.pop()
+            if not is_per_agent_tool_config(tool_config):
+                self.tool_by_name[tool_name] = tool
+            return tool
+
+    def _is_tool_reusable_by(
+        self,
+        tool_name: str,
+        other_tool_resolver: 'ConfigToolResolver'
+    ) -> bool:
+        # expects the lock to be held
+        if (
+            self.tool_config_by_name.get(tool_name)
+            != other_tool_resolver.tool_config_by_name.get(tool_name)
         ):
-            if from_python_tool_instance_config.name == tool_name:
-                return get_tool_from_python_tool_instance(from_python_tool_instance_config)
-        for from_python_tool_class_config in (
-            self.tool_definitions_config.from_python_tool_class
+            return False
+        return all(
+            self._is_tool_reusable_by(dependency_tool_name, other_tool_resolver)
+            for dependency_tool_name in self.dependency_tool_names_by_tool_name.get(tool_name, [])
+        )
+
+    def get_reloaded_tool_resolver(
+        self,
+        tool_definitions_config: ToolDefinitionsConfig,
+        tool_collection_definitions_config: ToolCollectionDefinitionsConfig
+    ) -> 'ConfigToolResolver':
+        '''
+        Returns a resolver for the updated config, reusing the tools and MCP session pools
+        whose config didn't change.
+        The exit stack is shared, i.e. exiting this resolver will close the new one as well.
+        '''
+        reloaded_tool_resolver = ConfigToolResolver(
+            tool_definitions_config=tool_definitions_config,
+            tool_collection_definitions_config=tool_collection_definitions_config,
+            headers=self.headers,
+            exit_stack=self.exit_stack,
+            mcp_tool_schema_cache=self.mcp_tool_schema_cache,
+            start_mcp_sessions=self.start_mcp_sessions
+        )
+        from_mcp_config_by_name = {
+            from_mcp_config.name: from_mcp_config
+            for from_mcp_config in tool_collection_definitions_config.from_mcp
+        }
+        with self.lock:
+            for tool_name, tool in self.tool_by_name.items():
+                if self._is_tool_reusable_by(tool_name, reloaded_tool_resolver):
+                    reloaded_tool_resolver.tool_by_name[tool_name] = tool
+                    reloaded_tool_resolver.dependency_tool_names_by_tool_name[tool_name] = (
+                        self.dependency_tool_names_by_tool_name.get(tool_name, set())
+                    )
+            for name, session_pool in self.mcp_session_pool_by_name.items():
+                if from_mcp_config_by_name.get(name) != session_pool.from_mcp_config:
+                    continue
+                reloaded_tool_resolver.mcp_session_pool_by_name[name] = session_pool
+                if name in self.tools_by_collection_name:
+                    reloaded_tool_resolver.tools_by_collection_name[name] = (
+                        self.tools_by_collection_name[name]
+                    )
+        LOGGER.info(
+            'Reusing tools: %r, MCP session pools: %r',
+            list(reloaded_tool_resolver.tool_by_name.keys()),
+            list(reloaded_tool_resolver.mcp_session_pool_by_name.keys())
+        )
+        return reloaded_tool_resolver
+
+    def get_mcp_session_pools_not_used_by(
+        self,
+        other_tool_resolver: 'ConfigToolResolver'
+    ) -> Sequence[McpSessionPool]:
+        with self.lock:
+            return [
+                session_pool
+                for name, session_pool in self.mcp_session_pool_by_name.items()
+                if other_tool_resolver.mcp_session_pool_by_name.get(name) is not session_pool
+            ]
+
+    def get_stats(self) -> Mapping[str, ToolResolutionStats]:
+        with self.stats_lock:
+            return {
+                tool_name: replace(stats)
+                for tool_name, stats in self.stats_by_tool_name.items()
+            }
+
+    def get_mcp_server_stats(self) -> Mapping[str, McpServerStats]:
+        with self.lock:
+            session_pools = list(self.mcp_session_pool_by_name.values())
+        return {
+            session_pool.name: session_pool.get_stats()
+            for session_pool in session_pools
+        }
+
+    def log_stats(self):
+        for tool_name, stats in self.get_stats().items():
+            LOGGER.info('Tool resolution stats (tool: %r): %r', tool_name, stats)
+        for server_name, mcp_server_stats in self.get_mcp_server_stats().items():
+            LOGGER.info('MCP server stats (server: %r): %r', server_name, mcp_server_stats)
+
+    def _get_from_mcp_config(self, tool_collection_name: str) -> FromMcpConfig:
+        for from_mcp in (
+            self.tool_collection_definitions_config.from_mcp
         ):
-            if from_python_tool_class_config.name == tool_name:
-                return get_tool_from_python_tool_class(
-                    from_python_tool_class_config,
-                    available_kwargs=available_kwargs
+            if from_mcp.name == tool_collection_name:
+                return from_mcp
+        raise InvalidToolCollectionNameError(f'Unrecognised tool: {repr(tool_collection_name)}')
+
+    def _save_mcp_tool_schemas(self, from_mcp_config: FromMcpConfig, tools: Sequence[Tool]):
+        if self.mcp_tool_schema_cache is None:
+            return
+        try:
+            self.mcp_tool_schema_cache.save(
+                from_mcp_config,
+                [McpToolSchema.from_tool(tool) for tool in tools]
+            )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            LOGGER.warning('Failed to save MCP tool schemas: %r', exc)
+
+    def _get_or_start_mcp_session_pool(
+        self,
+        from_mcp_config: FromMcpConfig
+    ) -> McpSessionPool:
+        with self.lock:
+            session_pool = self.mcp_session_pool_by_name.get(from_mcp_config.name)
+            if session_pool is None:
+                session_pool = McpSessionPool(
+                    from_mcp_config,
+                    on_connected=lambda tools: self._save_mcp_tool_schemas(
+                        from_mcp_config,
+                        tools
+                    )
                 )
-        raise InvalidToolNameError(f'Unrecognised tool: {repr(tool_name)}')
+                self.mcp_session_pool_by_name[from_mcp_config.name] = session_pool
+                self.exit_stack.callback(session_pool.close)
+                if self.start_mcp_sessions:
+                    session_pool.start()
+            return session_pool
+
+    def start_tool_collections(self, tool_collection_names: Sequence[str]):
+        for tool_collection_name in tool_collection_names:
+            self._get_or_start_mcp_session_pool(
+                self._get_from_mcp_config(tool_collection_name)
+            )
 
     def _get_tools_from_mcp_config(
         self,
         from_mcp_config: FromMcpConfig
     ) -> Sequence[Tool]:
-        tool_collection_cm = ToolCollection.from_mcp({
-            'url': from_mcp_config.url,
-            'transport': from_mcp_config.transport
-        }, trust_remote_code=True)
-        tool_collection = self.exit_stack.enter_context(tool_collection_cm)
-        tools: Sequence[Tool] = tool_collection.tools
+        session_pool = self._get_or_start_mcp_session_pool(from_mcp_config)
+        tool_schemas = (
+            self.mcp_tool_schema_cache.load(from_mcp_config)
+            if self.mcp_tool_schema_cache is not None
+            else None
+        )
+        if tool_schemas is not None:
+            # allows us to start without waiting for the connection
+            LOGGER.info('Using cached MCP tool schemas for %r', from_mcp_config.name)
+        elif not self.start_mcp_sessions:
+            raise ConnectionError(
+                f'No cached tool schemas for MCP server {repr(from_mcp_config.name)}'
+                ' (without starting MCP sessions)'
+            )
+        else:
+            tool_schemas = [McpToolSchema.from_tool(tool) for tool in session_pool.get_tools()]
+        tools = get_mcp_tool_proxies(tool_schemas, session_pool=session_pool)
         if from_mcp_config.tools:
             tools = [
                 tool
@@ -169,9 +428,11 @@ class ConfigToolResolver(ToolResolver):
         return tools
 
     def get_tools_by_collection_name(self, tool_collection_name: str) -> Sequence[Tool]:
-        for from_mcp in (
-            self.tool_collection_definitions_config.from_mcp
-        ):
-            if from_mcp.name == tool_collection_name:
-                return self._get_tools_from_mcp_config(from_mcp)
-        raise InvalidToolCollectionNameError(f'Unrecognised tool: {repr(tool_collection_name)}')
+        from_mcp_config = self._get_from_mcp_config(tool_collection_name)
+        with self.lock:
+            tools = self.tools_by_collection_name.get(tool_collection_name)
+        if tools is None:
+            tools = self._get_tools_from_mcp_config(from_mcp_config)
+            with self.lock:
+                tools = self.tools_by_collection_name.setdefault(tool_collection_name, tools)
+        return tools
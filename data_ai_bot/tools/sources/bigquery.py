@@ -1,49 +1,393 @@
 # Mostly copied from smolagents examples
 
+from dataclasses import asdict, dataclass, field
+from functools import cache
+import json
 import logging
-from typing import Any, Iterable, Mapping, Optional, Sequence
+import threading
+import time
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
 
-from google.cloud import bigquery
+from google.cloud import bigquery, bigquery_storage
 from google.cloud.bigquery.table import RowIterator
 
+from opentelemetry import trace
+
+import pyarrow  # type: ignore
+
 import smolagents  # type: ignore
 
-from data_ai_bot.utils.json import get_json_as_csv_lines
+from data_ai_bot.tools.lazy import get_resolved_tool
+from data_ai_bot.tools.resolver import ToolResolver
+from data_ai_bot.tools.sources.web_api import validate_tool_parameters
+from data_ai_bot.utils.arrow import (
+    DEFAULT_PREVIEW_ROW_COUNT,
+    iter_csv_lines_from_arrow_record_batches,
+    iter_dict_from_arrow_record_batches,
+    iter_logged_arrow_record_batches
+)
+from data_ai_bot.utils.cache import RefreshingCache
+from data_ai_bot.utils.concurrency import get_mapped_concurrently
+from data_ai_bot.utils.json import get_csv_with_limits, get_formatted_json_list
+from data_ai_bot.utils.text import get_truncated_with_ellipsis
 
 
 LOGGER = logging.getLogger(__name__)
 
 
-def get_bq_client(project_name: str) -> bigquery.Client:
+BQ_TYPE_BY_INPUT_TYPE: Mapping[str, str] = {
+    'string': 'STRING',
+    'integer': 'INT64',
+    'number': 'FLOAT64',
+    'boolean': 'BOOL'
+}
+
+
+BQ_QUERY_RESULT_CACHE: RefreshingCache[tuple, Any] = RefreshingCache(max_size=100)
+
+BQ_DRY_RUN_CACHE: RefreshingCache[tuple, int] = RefreshingCache(max_size=1000)
+
+DEFAULT_DRY_RUN_CACHE_TTL = 3600.0
+
+# the formatted results are passed to the model, roughly 25k tokens
+DEFAULT_MAX_OUTPUT_BYTES = 100_000
+
+
+class BigQueryBytesLimitExceededError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class BigQueryQueryLimits:
+    max_bytes_processed: Optional[int] = None
+    maximum_bytes_billed: Optional[int] = None
+    job_timeout: Optional[float] = None
+    max_rows: Optional[int] = None
+    # the output stops at this limit, rather than formatting all of the rows (None to disable)
+    max_output_bytes: Optional[int] = DEFAULT_MAX_OUTPUT_BYTES
+
+    @staticmethod
+    def from_dict(query_limits_dict: Mapping[str, Any]) -> 'BigQueryQueryLimits':
+        return BigQueryQueryLimits(**query_limits_dict)
+
+    def get_job_config_kwargs(self) -> Mapping[str, Any]:
+        job_config_kwargs: dict[str, Any] = {}
+        if self.maximum_bytes_billed is not None:
+            job_config_kwargs['maximum_bytes_billed'] = self.maximum_bytes_billed
+        if self.job_timeout is not None:
+            job_config_kwargs['job_timeout_ms'] = int(self.job_timeout * 1000)
+        return job_config_kwargs
+
+    def get_result_kwargs(self) -> Mapping[str, Any]:
+        result_kwargs: dict[str, Any] = {}
+        if self.max_rows is not None:
+            result_kwargs['max_results'] = self.max_rows
+        if self.job_timeout is not None:
+            result_kwargs['timeout'] = self.job_timeout
+        return result_kwargs
+
+
+DEFAULT_BQ_QUERY_LIMITS = BigQueryQueryLimits()
+
+
+@dataclass(frozen=True)
+class BigQueryJobMetadata:
+    job_id: Optional[str] = None
+    cache_hit: Optional[bool] = None
+    total_bytes_processed: Optional[int] = None
+    total_bytes_billed: Optional[int] = None
+    slot_millis: Optional[int] = None
+    duration_seconds: Optional[float] = None
+
+    @staticmethod
+    def from_query_job(query_job: bigquery.QueryJob) -> 'BigQueryJobMetadata':
+        return BigQueryJobMetadata(
+            job_id=query_job.job_id,
+            cache_hit=query_job.cache_hit,
+            total_bytes_processed=query_job.total_bytes_processed,
+            total_bytes_billed=query_job.total_bytes_billed,
+            slot_millis=query_job.slot_millis,
+            duration_seconds=(
+                (query_job.ended - query_job.started).total_seconds()
+                if query_job.started and query_job.ended
+                else None
+            )
+        )
+
+
+def record_bq_job_metadata(job_metadata: BigQueryJobMetadata):
+    LOGGER.info('BigQuery job metadata: %r', job_metadata)
+    # attached to the current (tool call) span, if tracing is configured
+    trace.get_current_span().add_event('bigquery_job', attributes={
+        key: value
+        for key, value in asdict(job_metadata).items()
+        if value is not None
+    })
+
+
+def get_new_bq_client(project_name: str) -> bigquery.Client:
     return bigquery.Client(project=project_name)
 
 
-def get_bq_result_from_bq_query(
+@dataclass
+class BigQueryClientStats:
+    client_creation_count: int = 0
+    client_creation_seconds: float = 0.0
+    client_reuse_count: int = 0
+
+
+@dataclass(frozen=True)
+class BigQueryClientRegistry:
+    client_by_project_name: dict[str, bigquery.Client] = field(default_factory=dict)
+    stats_by_project_name: dict[str, BigQueryClientStats] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get_client(self, project_name: str) -> bigquery.Client:
+        with self.lock:
+            stats = self.stats_by_project_name.setdefault(project_name, BigQueryClientStats())
+            client = self.client_by_project_name.get(project_name)
+            if client is not None:
+                stats.client_reuse_count += 1
+                return client
+            start_time = time.monotonic()
+            client = get_new_bq_client(project_name=project_name)
+            stats.client_creation_count += 1
+            stats.client_creation_seconds += time.monotonic() - start_time
+            LOGGER.info('Created BigQuery client (project: %r, stats: %r)', project_name, stats)
+            self.client_by_project_name[project_name] = client
+            return client
+
+    def get_stats(self) -> Mapping[str, BigQueryClientStats]:
+        with self.lock:
+            return dict(self.stats_by_project_name)
+
+    def clear(self):
+        with self.lock:
+            self.client_by_project_name.clear()
+            self.stats_by_project_name.clear()
+
+
+BQ_CLIENT_REGISTRY = BigQueryClientRegistry()
+
+
+def get_bq_client(project_name: str) -> bigquery.Client:
+    return BQ_CLIENT_REGISTRY.get_client(project_name=project_name)
+
+
+@cache
+def get_bq_storage_client() -> bigquery_storage.BigQueryReadClient:
+    return bigquery_storage.BigQueryReadClient()
+
+
+def warm_up_bq_client(project_name: str, query: str):
+    # a dry run is free, but will authenticate and open a connection
+    try:
+        client = get_bq_client(project_name=project_name)
+        query_job = client.query(
+            query,
+            job_config=bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+        )
+        LOGGER.info(
+            'Warmed up BigQuery client (project: %r, estimated bytes: %r)',
+            project_name, query_job.total_bytes_processed
+        )
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        LOGGER.warning('Failed to warm up BigQuery client: %r', exc)
+
+
+def get_bq_estimated_bytes_processed(
     project_name: str,
     query: str,
     query_parameters: Optional[Sequence[Any]] = tuple()
-) -> RowIterator:
+) -> int:
     client = get_bq_client(project_name=project_name)
-    job_config = bigquery.QueryJobConfig(query_parameters=query_parameters)
-    query_job = client.query(query, job_config=job_config)  # Make an API request.
-    bq_result = query_job.result()  # Waits for query to finish
+    query_job = client.query(
+        query,
+        job_config=bigquery.QueryJobConfig(
+            dry_run=True,
+            use_query_cache=False,
+            query_parameters=query_parameters
+        )
+    )
+    return query_job.total_bytes_processed or 0
+
+
+def get_cached_bq_estimated_bytes_processed(
+    project_name: str,
+    query: str,
+    query_parameters: Optional[Sequence[Any]] = tuple()
+) -> int:
+    # cached by SQL text only, parameter values rarely change the estimate much
+    return BQ_DRY_RUN_CACHE.get_or_load(
+        (project_name, query),
+        loader=lambda: get_bq_estimated_bytes_processed(
+            project_name=project_name,
+            query=query,
+            query_parameters=query_parameters
+        ),
+        ttl=DEFAULT_DRY_RUN_CACHE_TTL
+    )
+
+
+def validate_bq_estimated_bytes_processed(
+    project_name: str,
+    query: str,
+    query_parameters: Optional[Sequence[Any]],
+    max_bytes_processed: int
+):
+    estimated_bytes_processed = get_cached_bq_estimated_bytes_processed(
+        project_name=project_name,
+        query=query,
+        query_parameters=query_parameters
+    )
+    LOGGER.info(
+        'Estimated bytes processed: %d (max: %d)',
+        estimated_bytes_processed, max_bytes_processed
+    )
+    if estimated_bytes_processed > max_bytes_processed:
+        raise BigQueryBytesLimitExceededError(
+            f'Query would process {estimated_bytes_processed} bytes'
+            f' (max: {max_bytes_processed})'
+        )
+
+
+def submit_bq_query_job(
+    project_name: str,
+    query: str,
+    query_parameters: Optional[Sequence[Any]] = tuple(),
+    query_limits: BigQueryQueryLimits = DEFAULT_BQ_QUERY_LIMITS
+) -> bigquery.QueryJob:
+    client = get_bq_client(project_name=project_name)
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=query_parameters,
+        **query_limits.get_job_config_kwargs()
+    )
+    # Make an API request (starts the query job, without waiting for it to finish)
+    return client.query(query, job_config=job_config)
+
+
+def get_bq_result_from_bq_query_job(
+    query_job: bigquery.QueryJob,
+    query_limits: BigQueryQueryLimits = DEFAULT_BQ_QUERY_LIMITS
+) -> RowIterator:
+    # Waits for query to finish
+    bq_result = query_job.result(**query_limits.get_result_kwargs())
     LOGGER.debug('bq_result: %r', bq_result)
+    record_bq_job_metadata(BigQueryJobMetadata.from_query_job(query_job))
+    if query_limits.max_rows is not None and (bq_result.total_rows or 0) > query_limits.max_rows:
+        LOGGER.warning(
+            'Query results truncated: %r rows (max: %d)',
+            bq_result.total_rows, query_limits.max_rows
+        )
     return bq_result
 
 
+def get_bq_result_from_bq_query(
+    project_name: str,
+    query: str,
+    query_parameters: Optional[Sequence[Any]] = tuple(),
+    query_limits: BigQueryQueryLimits = DEFAULT_BQ_QUERY_LIMITS
+) -> RowIterator:
+    query_job = submit_bq_query_job(
+        project_name=project_name,
+        query=query,
+        query_parameters=query_parameters,
+        query_limits=query_limits
+    )
+    return get_bq_result_from_bq_query_job(query_job, query_limits=query_limits)
+
+
+def get_bq_result_fieldnames(bq_result: RowIterator) -> Sequence[str]:
+    return [schema_field.name for schema_field in bq_result.schema]
+
+
+def iter_dict_from_bq_result(bq_result: RowIterator) -> Iterable[dict]:
+    for row_index, row in enumerate(bq_result):
+        if row_index < DEFAULT_PREVIEW_ROW_COUNT:
+            LOGGER.debug('row: %r', row)
+        yield dict(row.items())
+
+
 def iter_dict_from_bq_query(
     project_name: str,
     query: str,
-    query_parameters: Optional[Sequence[Any]] = tuple()
+    query_parameters: Optional[Sequence[Any]] = tuple(),
+    query_limits: BigQueryQueryLimits = DEFAULT_BQ_QUERY_LIMITS
 ) -> Iterable[dict]:
     bq_result = get_bq_result_from_bq_query(
         project_name=project_name,
         query=query,
-        query_parameters=query_parameters
+        query_parameters=query_parameters,
+        query_limits=query_limits
     )
-    for row in bq_result:
-        LOGGER.debug('row: %r', row)
-        yield dict(row.items())
+    return iter_dict_from_bq_result(bq_result)
+
+
+def iter_arrow_record_batches_from_bq_result(
+    bq_result: RowIterator,
+    use_bq_storage_api: bool = False
+) -> Iterable[pyarrow.RecordBatch]:
+    return iter_logged_arrow_record_batches(bq_result.to_arrow_iterable(
+        bqstorage_client=(
+            get_bq_storage_client()
+            if use_bq_storage_api
+            else None
+        )
+    ))
+
+
+def iter_arrow_record_batches_from_bq_query(
+    project_name: str,
+    query: str,
+    query_parameters: Optional[Sequence[Any]] = tuple(),
+    query_limits: BigQueryQueryLimits = DEFAULT_BQ_QUERY_LIMITS,
+    use_bq_storage_api: bool = False
+) -> Iterable[pyarrow.RecordBatch]:
+    bq_result = get_bq_result_from_bq_query(
+        project_name=project_name,
+        query=query,
+        query_parameters=query_parameters,
+        query_limits=query_limits
+    )
+    return iter_arrow_record_batches_from_bq_result(
+        bq_result,
+        use_bq_storage_api=use_bq_storage_api
+    )
+
+
+def get_bq_type_for_input_config(input_config: Mapping[str, Any]) -> str:
+    bq_type = input_config.get('bigquery_type')
+    if bq_type:
+        return bq_type
+    return BQ_TYPE_BY_INPUT_TYPE[input_config['type']]
+
+
+def get_bq_query_parameters(
+    tool_parameters: Mapping[str, Any],
+    inputs: Mapping[str, dict]
+) -> Sequence[bigquery.ScalarQueryParameter]:
+    return [
+        bigquery.ScalarQueryParameter(
+            key,
+            get_bq_type_for_input_config(inputs[key]),
+            value
+        )
+        for key, value in tool_parameters.items()
+    ]
+
+
+def get_query_results_preview(result: Any) -> Any:
+    if isinstance(result, str):
+        return get_truncated_with_ellipsis(result, max_length=1000)
+    return result[:DEFAULT_PREVIEW_ROW_COUNT]
+
+
+def get_bq_query_result_cache_key(
+    project_name: str,
+    query: str,
+    tool_parameters: Mapping[str, Any]
+) -> tuple:
+    return (project_name, query, tuple(sorted(tool_parameters.items())))
 
 
 class BigQueryTool(smolagents.Tool):  # pylint: disable=too-many-instance-attributes
@@ -54,7 +398,14 @@ class BigQueryTool(smolagents.Tool):  # pylint: disable=too-many-instance-attrib
         project_name: str,
         sql_query: str,
         output_type: str = 'string',
-        output_format: str = 'json'
+        output_format: str = 'json',
+        warm_up: bool = False,
+        inputs: Optional[Mapping[str, dict]] = None,
+        cache_ttl: Optional[float] = None,
+        cache_refresh_after: Optional[float] = None,
+        columnar_fetch: bool = False,
+        use_bq_storage_api: bool = False,
+        query_limits: Optional[Mapping[str, Any]] = None
     ):
         super().__init__()
         self.name = name
@@ -63,15 +414,193 @@ class BigQueryTool(smolagents.Tool):  # pylint: disable=too-many-instance-attrib
         self.output_format = output_format
         self.project_name = project_name
         self.sql_query = sql_query
-        self.inputs: Mapping[str, dict] = {}
+        self.inputs: Mapping[str, dict] = inputs or {}
+        self.cache_ttl = cache_ttl
+        self.cache_refresh_after = cache_refresh_after
+        self.columnar_fetch = columnar_fetch
+        self.use_bq_storage_api = use_bq_storage_api
+        self.query_limits = BigQueryQueryLimits.from_dict(query_limits or {})
         self.skip_forward_signature_validation = True
+        if warm_up:
+            warm_up_bq_client(project_name=project_name, query=sql_query)
 
-    def forward(self) -> Any:  # pylint: disable=arguments-differ
-        result: Any = list(iter_dict_from_bq_query(
-            project_name=self.project_name,
-            query=self.sql_query
-        ))
+    def _get_formatted_record_batches(
+        self,
+        record_batches: Iterable[pyarrow.RecordBatch],
+        total_row_count: Optional[int] = None
+    ) -> Any:
         if self.output_format == 'csv':
-            result = '\n'.join(get_json_as_csv_lines(result))
-        LOGGER.info('query results: %r', result)
+            return get_csv_with_limits(
+                iter_csv_lines_from_arrow_record_batches(record_batches),
+                max_bytes=self.query_limits.max_output_bytes,
+                total_row_count=total_row_count
+            )
+        return get_formatted_json_list(
+            iter_dict_from_arrow_record_batches(record_batches),
+            max_bytes=self.query_limits.max_output_bytes,
+            total_row_count=total_row_count
+        )
+
+    def _get_checked_query_parameters(
+        self,
+        tool_parameters: Mapping[str, Any]
+    ) -> Sequence[bigquery.ScalarQueryParameter]:
+        query_parameters = get_bq_query_parameters(tool_parameters, self.inputs)
+        if self.query_limits.max_bytes_processed is not None:
+            validate_bq_estimated_bytes_processed(
+                project_name=self.project_name,
+                query=self.sql_query,
+                query_parameters=query_parameters,
+                max_bytes_processed=self.query_limits.max_bytes_processed
+            )
+        return query_parameters
+
+    def _submit_query_job(self, tool_parameters: Mapping[str, Any]) -> bigquery.QueryJob:
+        return submit_bq_query_job(
+            project_name=self.project_name,
+            query=self.sql_query,
+            query_parameters=self._get_checked_query_parameters(tool_parameters),
+            query_limits=self.query_limits
+        )
+
+    def _get_formatted_query_job_results(self, query_job: bigquery.QueryJob) -> Any:
+        bq_result = get_bq_result_from_bq_query_job(query_job, query_limits=self.query_limits)
+        if self.columnar_fetch:
+            return self._get_formatted_record_batches(
+                iter_arrow_record_batches_from_bq_result(
+                    bq_result,
+                    use_bq_storage_api=self.use_bq_storage_api
+                ),
+                total_row_count=bq_result.total_rows
+            )
+        return get_formatted_json_list(
+            iter_dict_from_bq_result(bq_result),
+            output_format=self.output_format,
+            fieldnames=get_bq_result_fieldnames(bq_result),
+            max_bytes=self.query_limits.max_output_bytes,
+            total_row_count=bq_result.total_rows
+        )
+
+    def _get_cache_key(self, tool_parameters: Mapping[str, Any]) -> tuple:
+        return get_bq_query_result_cache_key(
+            project_name=self.project_name,
+            query=self.sql_query,
+            tool_parameters=tool_parameters
+        )
+
+    def _start_query_job(self, tool_parameters: Mapping[str, Any]) -> Callable[[], Any]:
+        query_job = self._submit_query_job(tool_parameters)
+        return lambda: self._get_formatted_query_job_results(query_job)
+
+    def submit(self, **kwargs) -> Callable[[], Any]:
+        '''
+        Starts the query job without waiting for it to finish (unless cached, or already running).
+        The returned function waits for the job and returns the formatted query results.
+        '''
+        validate_tool_parameters(kwargs, self.inputs)
+        if not self.cache_ttl:
+            return self._start_query_job(kwargs)
+        return BQ_QUERY_RESULT_CACHE.get_or_start_load(
+            self._get_cache_key(kwargs),
+            start_load=lambda: self._start_query_job(kwargs),
+            ttl=self.cache_ttl,
+            refresh_after=self.cache_refresh_after
+        )
+
+    def forward(self, **kwargs) -> Any:  # pylint: disable=arguments-differ
+        result = self.submit(**kwargs)()
+        LOGGER.info('query results (preview): %r', get_query_results_preview(result))
         return result
+
+
+def get_bq_multi_query_tool_description(
+    description: str,
+    tools: Iterable[BigQueryTool]
+) -> str:
+    return '\n'.join([
+        description,
+        'Available tools (with their arguments):'
+    ] + [
+        f'- {tool.name}: {tool.description.strip()} (arguments: {json.dumps(tool.inputs)})'
+        for tool in tools
+    ])
+
+
+class BigQueryMultiQueryTool(smolagents.Tool):
+    '''
+    Runs queries of other BigQuery tools in a single step.
+    All of the query jobs are submitted before waiting for any of them,
+    so that the queries run concurrently (on BigQuery), as do the downloads of the results.
+    '''
+    inputs = {
+        'queries': {
+            'type': 'array',
+            'items': {'type': 'object'},
+            'description': (
+                'The queries to run. Each query is an object with the "tool_name"'
+                ' and the "arguments" object (if any).'
+            )
+        }
+    }
+    output_type = 'array'
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        name: str,
+        description: str,
+        tool_names: Sequence[str],
+        tool_resolver: ToolResolver,
+        max_queries: int = 10
+    ):
+        super().__init__()
+        self.name = name
+        self.tool_by_name: Mapping[str, BigQueryTool] = {
+            tool_name: get_resolved_tool(tool_resolver.get_tool_by_name(tool_name))
+            for tool_name in tool_names
+        }
+        for tool_name, tool in self.tool_by_name.items():
+            if not isinstance(tool, BigQueryTool):
+                raise TypeError(f'Not a BigQuery tool: {repr(tool_name)}')
+        self.description = get_bq_multi_query_tool_description(
+            description,
+            self.tool_by_name.values()
+        )
+        self.max_queries = max_queries
+
+    def _submit_query(self, query: Mapping[str, Any]) -> Callable[[], dict]:
+        tool_name = query.get('tool_name')
+        try:
+            tool = self.tool_by_name.get(str(tool_name))
+            if tool is None:
+                raise ValueError(f'Unrecognised tool: {repr(tool_name)}')
+            get_result = tool.submit(**(query.get('arguments') or {}))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            LOGGER.warning('Failed to submit query for %r: %r', tool_name, exc)
+            error = str(exc)
+            return lambda: {'tool_name': tool_name, 'error': error}
+
+        def get_result_or_error() -> dict:
+            try:
+                return {'tool_name': tool_name, 'result': get_result()}
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                LOGGER.warning('Query failed for %r: %r', tool_name, exc)
+                return {'tool_name': tool_name, 'error': str(exc)}
+
+        return get_result_or_error
+
+    def forward(self, queries: list[dict]) -> Any:  # pylint: disable=arguments-differ
+        if len(queries) > self.max_queries:
+            raise ValueError(f'Too many queries: {len(queries)} (max: {self.max_queries})')
+        start_time = time.monotonic()
+        # submitting all of the jobs first, before waiting for (and downloading) the results
+        result_getters = [self._submit_query(query) for query in queries]
+        results = get_mapped_concurrently(
+            lambda get_result: get_result(),
+            result_getters,
+            max_concurrency=len(result_getters)
+        )
+        LOGGER.info(
+            'Ran %d queries in %.3f seconds',
+            len(queries), time.monotonic() - start_time
+        )
+        return results
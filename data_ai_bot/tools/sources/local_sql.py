@@ -0,0 +1,176 @@
+from contextlib import closing
+from dataclasses import dataclass
+import logging
+import os
+from pathlib import Path
+import sqlite3
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+import pyarrow  # type: ignore
+
+import smolagents  # type: ignore
+
+from data_ai_bot.tools.sources.web_api import validate_tool_parameters
+from data_ai_bot.utils.arrow import get_arrow_record_batch_with_nested_columns_as_string
+from data_ai_bot.utils.json import get_formatted_json_list
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+SQLITE_PRIMITIVE_TYPES = (str, int, float, bytes)
+
+
+def get_quoted_sqlite_identifier(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def get_sqlite_type_for_arrow_type(arrow_type: pyarrow.DataType) -> str:
+    if pyarrow.types.is_integer(arrow_type) or pyarrow.types.is_boolean(arrow_type):
+        return 'INTEGER'
+    if pyarrow.types.is_floating(arrow_type):
+        return 'REAL'
+    if pyarrow.types.is_binary(arrow_type):
+        return 'BLOB'
+    return 'TEXT'
+
+
+def get_sqlite_value(value: Any) -> Any:
+    # e.g. dates, timestamps and decimals are stored as text
+    if value is None or isinstance(value, SQLITE_PRIMITIVE_TYPES):
+        return value
+    return str(value)
+
+
+def get_readonly_sqlite_connection(database_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(
+        Path(database_path).resolve().as_uri() + '?mode=ro',
+        uri=True
+    )
+
+
+def write_arrow_record_batches_to_sqlite_table(
+    connection: sqlite3.Connection,
+    table_name: str,
+    record_batches: Iterable[pyarrow.RecordBatch]
+) -> int:
+    quoted_table_name = get_quoted_sqlite_identifier(table_name)
+    row_count = 0
+    is_table_created = False
+    for record_batch in record_batches:
+        record_batch = get_arrow_record_batch_with_nested_columns_as_string(record_batch)
+        if not is_table_created:
+            connection.execute(f'DROP TABLE IF EXISTS {quoted_table_name}')
+            connection.execute(f'CREATE TABLE {quoted_table_name} (' + ', '.join(
+                f'{get_quoted_sqlite_identifier(field.name)}'
+                f' {get_sqlite_type_for_arrow_type(field.type)}'
+                for field in record_batch.schema
+            ) + ')')
+            is_table_created = True
+        placeholders = ', '.join(['?'] * record_batch.num_columns)
+        connection.executemany(
+            f'INSERT INTO {quoted_table_name} VALUES ({placeholders})',
+            (
+                [get_sqlite_value(value) for value in row.values()]
+                for row in record_batch.to_pylist()
+            )
+        )
+        row_count += record_batch.num_rows
+    if not is_table_created:
+        raise ValueError(f'No record batches (and schema) for table: {repr(table_name)}')
+    return row_count
+
+
+def write_arrow_record_batches_to_sqlite_file(
+    database_path: str,
+    table_name: str,
+    record_batches: Iterable[pyarrow.RecordBatch]
+) -> int:
+    # writing to a temporary file first, so that readers never see a partial extract
+    temp_database_path = database_path + '.tmp'
+    if os.path.exists(temp_database_path):
+        os.remove(temp_database_path)
+    if os.path.exists(database_path):
+        with closing(sqlite3.connect(database_path)) as source_connection:
+            with closing(sqlite3.connect(temp_database_path)) as temp_connection:
+                source_connection.backup(temp_connection)
+    with closing(sqlite3.connect(temp_database_path)) as connection:
+        with connection:
+            row_count = write_arrow_record_batches_to_sqlite_table(
+                connection,
+                table_name=table_name,
+                record_batches=record_batches
+            )
+    os.replace(temp_database_path, database_path)
+    LOGGER.info('Wrote %d rows to %r (table: %r)', row_count, database_path, table_name)
+    return row_count
+
+
+def iter_dict_from_sqlite_cursor(
+    cursor: sqlite3.Cursor,
+    fieldnames: Sequence[str]
+) -> Iterable[dict]:
+    for row in cursor:
+        yield dict(zip(fieldnames, row))
+
+
+@dataclass(frozen=True)
+class LocalSqlExtractConfig:
+    project_name: str
+    sql_query: str
+    database_path: str
+    table_name: str
+
+    @staticmethod
+    def from_dict(local_sql_extract_config_dict: Mapping[str, Any]) -> 'LocalSqlExtractConfig':
+        return LocalSqlExtractConfig(
+            project_name=local_sql_extract_config_dict['project_name'],
+            sql_query=local_sql_extract_config_dict['sql_query'],
+            database_path=local_sql_extract_config_dict['database_path'],
+            table_name=local_sql_extract_config_dict['table_name']
+        )
+
+
+class LocalSqlTool(smolagents.Tool):  # pylint: disable=too-many-instance-attributes
+    '''
+    Like the BigQueryTool (with the same `sql_query` and `inputs`),
+    but runs the query against a local SQLite extract.
+    '''
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        name: str,
+        description: str,
+        database_path: str,
+        sql_query: str,
+        output_type: str = 'string',
+        output_format: str = 'json',
+        inputs: Optional[Mapping[str, dict]] = None,
+        max_rows: Optional[int] = None,
+        max_output_bytes: Optional[int] = None
+    ):
+        super().__init__()
+        self.name = name
+        self.description = description
+        self.output_type = output_type
+        self.database_path = database_path
+        self.sql_query = sql_query
+        self.output_format = output_format
+        self.inputs: Mapping[str, dict] = inputs or {}
+        self.max_rows = max_rows
+        self.max_output_bytes = max_output_bytes
+        self.skip_forward_signature_validation = True
+
+    def forward(self, **kwargs) -> Any:  # pylint: disable=arguments-differ
+        validate_tool_parameters(kwargs, self.inputs)
+        with closing(get_readonly_sqlite_connection(self.database_path)) as connection:
+            # SQLite supports the same `@name` parameters as BigQuery
+            cursor = connection.execute(self.sql_query, kwargs)
+            fieldnames = [column_description[0] for column_description in cursor.description]
+            return get_formatted_json_list(
+                iter_dict_from_sqlite_cursor(cursor, fieldnames),
+                output_format=self.output_format,
+                fieldnames=fieldnames,
+                max_rows=self.max_rows,
+                max_bytes=self.max_output_bytes
+            )
@@ -0,0 +1,79 @@
+import argparse
+import logging
+import os
+import time
+from typing import Optional, Sequence
+
+from data_ai_bot.config import load_yaml_file
+from data_ai_bot.tools.sources.bigquery import iter_arrow_record_batches_from_bq_query
+from data_ai_bot.tools.sources.local_sql import (
+    LocalSqlExtractConfig,
+    write_arrow_record_batches_to_sqlite_file
+)
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def load_local_sql_extract_configs(config_file: str) -> Sequence[LocalSqlExtractConfig]:
+    config_dict = load_yaml_file(config_file)
+    return [
+        LocalSqlExtractConfig.from_dict(extract_config_dict)
+        for extract_config_dict in config_dict['extracts']
+    ]
+
+
+def refresh_local_sql_extract(extract_config: LocalSqlExtractConfig) -> int:
+    LOGGER.info('Refreshing extract: %r', extract_config)
+    database_dir = os.path.dirname(extract_config.database_path)
+    if database_dir:
+        os.makedirs(database_dir, exist_ok=True)
+    return write_arrow_record_batches_to_sqlite_file(
+        database_path=extract_config.database_path,
+        table_name=extract_config.table_name,
+        record_batches=iter_arrow_record_batches_from_bq_query(
+            project_name=extract_config.project_name,
+            query=extract_config.sql_query
+        )
+    )
+
+
+def refresh_local_sql_extracts(extract_configs: Sequence[LocalSqlExtractConfig]) -> bool:
+    is_success = True
+    for extract_config in extract_configs:
+        try:
+            refresh_local_sql_extract(extract_config)
+        except Exception:  # pylint: disable=broad-exception-caught
+            LOGGER.exception('Failed to refresh extract: %r', extract_config)
+            is_success = False
+    return is_success
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Refreshes the local SQL extracts (used by LocalSqlTool) from BigQuery.'
+    )
+    parser.add_argument('--config-file', required=True)
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=0,
+        help='Refresh every given number of seconds (refresh only once if not set).'
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> bool:
+    args = parse_args(argv)
+    extract_configs = load_local_sql_extract_configs(args.config_file)
+    while True:
+        is_success = refresh_local_sql_extracts(extract_configs)
+        if not args.interval:
+            return is_success
+        LOGGER.info('Next refresh in %.1f seconds', args.interval)
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level='INFO')
+    raise SystemExit(0 if main() else 1)
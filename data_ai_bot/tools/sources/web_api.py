@@ -1,24 +1,58 @@
 # Mostly copied from smolagents examples
 
+from dataclasses import dataclass
+from functools import cache
 import logging
+import math
 import re
-from typing import Any, Mapping, Optional
+from typing import Any, Literal, Mapping, Optional, Sequence
 
-import jinja2
-import requests
+import httpx2
 import smolagents  # type: ignore
 
+from data_ai_bot.utils.concurrency import (
+    DEFAULT_MAX_CONCURRENCY,
+    get_gathered_with_max_concurrency,
+    run_coroutine_sync
+)
+from data_ai_bot.utils.template import get_compiled_template
+
 
 LOGGER = logging.getLogger(__name__)
 
 
-def get_requests_session() -> requests.Session:
-    return requests.Session()
+DEFAULT_MAX_CONNECTIONS = 20
+
+DEFAULT_TIMEOUT = 30.0
+
+
+@cache
+def get_async_client() -> httpx2.AsyncClient:
+    # shared across tools, only to be used on the shared event loop
+    # (HTTP/2 allows concurrent requests to the same host over a single connection)
+    return httpx2.AsyncClient(
+        http2=True,
+        limits=httpx2.Limits(
+            max_connections=DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections=DEFAULT_MAX_CONNECTIONS
+        )
+    )
 
 
 def get_evaluated_template(template: str, variables: Mapping[str, Any]) -> Any:
-    compiled_template = jinja2.Template(template)
-    return compiled_template.render(variables)
+    return get_compiled_template(template).render(variables)
+
+
+def get_batch_values(value: Any) -> Sequence[Any]:
+    if isinstance(value, (list, tuple)):
+        # removing duplicates while preserving the order
+        return list(dict.fromkeys(value))
+    return [value]
+
+
+def is_regex_full_match(regex: str, value: str) -> bool:
+    # the whole value needs to match, e.g. `\d{5,6}` should not accept 7 digits
+    return re.fullmatch(regex, value) is not None
 
 
 def validate_tool_parameters(
@@ -29,7 +63,7 @@ def validate_tool_parameters(
         input_config = inputs[key]
         regex = input_config.get('regex')
         if regex:
-            if not re.match(regex, value):
+            if not is_regex_full_match(regex, str(value)):
                 raise ValueError(
                     f'Tool parameter value {repr(value)} for {repr(key)}'
                     f' does not match {repr(regex)}'
@@ -54,6 +88,76 @@ def get_query_parameters_without_empty_values(params: Mapping[str, Any]) -> Mapp
     }
 
 
+@dataclass(frozen=True)
+class WebApiPaginationConfig:  # pylint: disable=too-many-instance-attributes
+    type: Literal['page', 'offset', 'cursor'] = 'page'
+    page_size: int = 10
+    page_size_parameter_name: str = 'per-page'
+    page_parameter_name: str = 'page'
+    first_page: int = 1
+    offset_parameter_name: str = 'offset'
+    cursor_parameter_name: str = 'cursor'
+    next_cursor_field: str = 'next_cursor'
+    items_field: str = 'items'
+    total_field: Optional[str] = 'total'
+    max_items: int = 100
+    max_pages: int = 10
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+
+    @staticmethod
+    def from_dict(pagination_config_dict: Mapping[str, Any]) -> 'WebApiPaginationConfig':
+        return WebApiPaginationConfig(**pagination_config_dict)
+
+    def get_page_query_parameters(
+        self,
+        page_index: int,
+        cursor: Optional[str] = None
+    ) -> Mapping[str, Any]:
+        params: dict[str, Any] = {
+            self.page_size_parameter_name: self.page_size
+        }
+        if self.type == 'page':
+            params[self.page_parameter_name] = self.first_page + page_index
+        elif self.type == 'offset':
+            params[self.offset_parameter_name] = page_index * self.page_size
+        elif self.type == 'cursor':
+            if cursor is not None:
+                params[self.cursor_parameter_name] = cursor
+        else:
+            raise ValueError(f'Unsupported pagination type: {repr(self.type)}')
+        return params
+
+    def get_page_count_for_total(self, total: int) -> int:
+        item_count = min(total, self.max_items)
+        return min(math.ceil(item_count / self.page_size), self.max_pages)
+
+    def is_next_page_required(self, response_json_list: Sequence[dict]) -> bool:
+        if len(response_json_list) >= self.max_pages:
+            return False
+        if len(response_json_list[-1].get(self.items_field, [])) < self.page_size:
+            return False
+        return len(response_json_list) * self.page_size < self.max_items
+
+
+def get_merged_paginated_response_json(
+    response_json_list: Sequence[dict],
+    pagination_config: WebApiPaginationConfig
+) -> dict:
+    items_field = pagination_config.items_field
+    items = [
+        item
+        for response_json in response_json_list
+        for item in response_json.get(items_field, [])
+    ][:pagination_config.max_items]
+    merged_response_json = {
+        **response_json_list[0],
+        items_field: items
+    }
+    if pagination_config.type == 'cursor':
+        merged_response_json.pop(pagination_config.next_cursor_field, None)
+    return merged_response_json
+
+
 class WebApiTool(smolagents.Tool):  # pylint: disable=too-many-instance-attributes
     def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
         self,
@@ -65,7 +169,12 @@ class WebApiTool(smolagents.Tool):  # pylint: disable=too-many-instance-attribut
         inputs: Optional[Mapping[str, dict]] = None,
         method: str = 'GET',
         remove_empty_query_parameters: bool = True,
-        output_type: str = 'string'
+        output_type: str = 'string',
+        pagination: Optional[Mapping[str, Any]] = None,
+        batch_input_name: Optional[str] = None,
+        max_batch_size: int = 20,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT
     ):
         super().__init__()
         self.name = name
@@ -77,26 +186,137 @@ class WebApiTool(smolagents.Tool):  # pylint: disable=too-many-instance-attribut
         self.query_parameters = query_parameters or {}
         self.headers = headers
         self.remove_empty_query_parameters = remove_empty_query_parameters
+        self.pagination_config = (
+            WebApiPaginationConfig.from_dict(pagination)
+            if pagination is not None
+            else None
+        )
+        self.batch_input_name = batch_input_name
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
         self.skip_forward_signature_validation = True
 
-    def forward(self, **kwargs):  # pylint: disable=arguments-differ
-        validate_tool_parameters(kwargs, self.inputs)
-        session = get_requests_session()
-        url = get_evaluated_template(self.url, kwargs)
-        params = get_evaluated_query_parameters(
-            self.query_parameters,
-            kwargs
-        )
-        if self.remove_empty_query_parameters:
-            params = get_query_parameters_without_empty_values(params)
+    async def _get_response_json(
+        self,
+        url: str,
+        params: Mapping[str, Any]
+    ) -> Any:
         LOGGER.info('url: %r (method: %r, params: %r)', url, self.method, params)
-        response = session.request(
+        response = await get_async_client().request(
             method=self.method,
             url=url,
             params=params,
-            headers=self.headers
+            headers=self.headers,
+            timeout=self.timeout
         )
         response.raise_for_status()
-        response_json = response.json()
+        return response.json()
+
+    async def _get_paginated_response_json(
+        self,
+        url: str,
+        params: Mapping[str, Any],
+        pagination_config: WebApiPaginationConfig
+    ) -> dict:
+        async def get_page_response_json(
+            page_index: int,
+            cursor: Optional[str] = None
+        ) -> dict:
+            return await self._get_response_json(url, {
+                **params,
+                **pagination_config.get_page_query_parameters(page_index, cursor=cursor)
+            })
+
+        response_json_list = [await get_page_response_json(0)]
+        if pagination_config.type == 'cursor':
+            # each page depends on the cursor of the previous one
+            while pagination_config.is_next_page_required(response_json_list):
+                cursor = response_json_list[-1].get(pagination_config.next_cursor_field)
+                if not cursor:
+                    break
+                response_json_list.append(
+                    await get_page_response_json(len(response_json_list), cursor=cursor)
+                )
+        elif not pagination_config.total_field:
+            # without a total, we can only stop once we received an incomplete page
+            while pagination_config.is_next_page_required(response_json_list):
+                response_json_list.append(
+                    await get_page_response_json(len(response_json_list))
+                )
+        else:
+            total = response_json_list[0].get(pagination_config.total_field) or 0
+            page_count = pagination_config.get_page_count_for_total(total)
+            LOGGER.info('Fetching pages (total: %r, page_count: %r)', total, page_count)
+            response_json_list.extend(await get_gathered_with_max_concurrency(
+                [get_page_response_json(page_index) for page_index in range(1, page_count)],
+                max_concurrency=pagination_config.max_concurrency
+            ))
+        return get_merged_paginated_response_json(
+            response_json_list,
+            pagination_config=pagination_config
+        )
+
+    async def _get_response_json_for_tool_parameters(
+        self,
+        tool_parameters: Mapping[str, Any]
+    ) -> Any:
+        validate_tool_parameters(tool_parameters, self.inputs)
+        url = get_evaluated_template(self.url, tool_parameters)
+        params = get_evaluated_query_parameters(
+            self.query_parameters,
+            tool_parameters
+        )
+        if self.remove_empty_query_parameters:
+            params = get_query_parameters_without_empty_values(params)
+        if self.pagination_config is not None:
+            return await self._get_paginated_response_json(
+                url=url,
+                params=params,
+                pagination_config=self.pagination_config
+            )
+        return await self._get_response_json(url=url, params=params)
+
+    async def _get_batch_response_json(
+        self,
+        tool_parameters: Mapping[str, Any],
+        batch_input_name: str
+    ) -> dict:
+        batch_values = get_batch_values(tool_parameters[batch_input_name])
+        if len(batch_values) > self.max_batch_size:
+            raise ValueError(
+                f'Too many values for {repr(batch_input_name)}:'
+                f' {len(batch_values)} (max: {self.max_batch_size})'
+            )
+
+        async def get_batch_item_response_json(batch_value: Any) -> Any:
+            try:
+                return await self._get_response_json_for_tool_parameters({
+                    **tool_parameters,
+                    batch_input_name: batch_value
+                })
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                LOGGER.warning('Failed to fetch %r: %r', batch_value, exc)
+                return {'error': str(exc)}
+
+        return dict(zip(
+            batch_values,
+            await get_gathered_with_max_concurrency(
+                [get_batch_item_response_json(batch_value) for batch_value in batch_values],
+                max_concurrency=self.max_concurrency
+            )
+        ))
+
+    async def async_forward(self, **kwargs) -> Any:
+        if self.batch_input_name:
+            response_json = await self._get_batch_response_json(
+                tool_parameters=kwargs,
+                batch_input_name=self.batch_input_name
+            )
+        else:
+            response_json = await self._get_response_json_for_tool_parameters(kwargs)
         LOGGER.info('response_json: %r', response_json)
         return response_json
+
+    def forward(self, **kwargs):  # pylint: disable=arguments-differ
+        return run_coroutine_sync(self.async_forward(**kwargs))
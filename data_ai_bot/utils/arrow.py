@@ -0,0 +1,126 @@
+from io import BytesIO
+import logging
+from typing import Iterable
+
+import pyarrow  # type: ignore
+import pyarrow.csv  # type: ignore
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+DEFAULT_PREVIEW_ROW_COUNT = 5
+
+DEFAULT_SLICE_ROW_COUNT = 1000
+
+
+def is_nested_arrow_type(arrow_type: pyarrow.DataType) -> bool:
+    return pyarrow.types.is_nested(arrow_type)
+
+
+def get_arrow_array_as_string_array(array: pyarrow.Array) -> pyarrow.Array:
+    return pyarrow.array(
+        [
+            str(value) if value is not None else None
+            for value in array.to_pylist()
+        ],
+        type=pyarrow.string()
+    )
+
+
+def get_arrow_record_batch_with_nested_columns_as_string(
+    record_batch: pyarrow.RecordBatch
+) -> pyarrow.RecordBatch:
+    # the Arrow CSV writer doesn't support nested types (e.g. struct or list)
+    if not any(is_nested_arrow_type(field.type) for field in record_batch.schema):
+        return record_batch
+    return pyarrow.RecordBatch.from_arrays(
+        [
+            (
+                get_arrow_array_as_string_array(column)
+                if is_nested_arrow_type(column.type)
+                else column
+            )
+            for column in record_batch.columns
+        ],
+        names=record_batch.schema.names
+    )
+
+
+def iter_logged_arrow_record_batches(
+    record_batches: Iterable[pyarrow.RecordBatch],
+    preview_row_count: int = DEFAULT_PREVIEW_ROW_COUNT
+) -> Iterable[pyarrow.RecordBatch]:
+    row_count = 0
+    for record_batch in record_batches:
+        if row_count < preview_row_count and LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                'rows preview: %r',
+                record_batch.slice(0, preview_row_count - row_count).to_pylist()
+            )
+        row_count += record_batch.num_rows
+        yield record_batch
+    LOGGER.info('row count: %d', row_count)
+
+
+def iter_arrow_record_batch_slices(
+    record_batches: Iterable[pyarrow.RecordBatch],
+    slice_row_count: int = DEFAULT_SLICE_ROW_COUNT
+) -> Iterable[pyarrow.RecordBatch]:
+    # zero-copy slices, allowing consumers to stop early (e.g. at an output limit),
+    # without converting the remaining rows of a large record batch
+    for record_batch in record_batches:
+        for offset in range(0, record_batch.num_rows, slice_row_count):
+            yield record_batch.slice(offset, slice_row_count)
+
+
+def iter_dict_from_arrow_record_batches(
+    record_batches: Iterable[pyarrow.RecordBatch],
+    slice_row_count: int = DEFAULT_SLICE_ROW_COUNT
+) -> Iterable[dict]:
+    for record_batch_slice in iter_arrow_record_batch_slices(
+        record_batches,
+        slice_row_count=slice_row_count
+    ):
+        yield from record_batch_slice.to_pylist()
+
+
+def iter_csv_records_from_csv_text(csv_text: str) -> Iterable[str]:
+    # splitting on the line terminator only, unless it is within a quoted (multi-line) value
+    record_lines: list[str] = []
+    quote_count = 0
+    for line in csv_text.removesuffix('\n').split('\n'):
+        record_lines.append(line)
+        quote_count += line.count('"')
+        if quote_count % 2 == 0:
+            yield '\n'.join(record_lines)
+            record_lines = []
+            quote_count = 0
+    if record_lines:
+        yield '\n'.join(record_lines)
+
+
+def iter_csv_lines_from_arrow_record_batches(
+    record_batches: Iterable[pyarrow.RecordBatch],
+    slice_row_count: int = DEFAULT_SLICE_ROW_COUNT
+) -> Iterable[str]:
+    '''
+    Yields the header, followed by one CSV record per row
+    (which may span multiple lines, if a value contains a line break).
+    '''
+    include_header = True
+    for record_batch in iter_arrow_record_batch_slices(
+        record_batches,
+        slice_row_count=slice_row_count
+    ):
+        buffer = BytesIO()
+        pyarrow.csv.write_csv(
+            get_arrow_record_batch_with_nested_columns_as_string(record_batch),
+            buffer,
+            write_options=pyarrow.csv.WriteOptions(
+                include_header=include_header,
+                quoting_style='needed'
+            )
+        )
+        include_header = False
+        yield from iter_csv_records_from_csv_text(buffer.getvalue().decode('utf-8'))
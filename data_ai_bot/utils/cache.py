@@ -0,0 +1,203 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CacheEntry[V]:
+    value: V
+    created_at: float
+
+
+@dataclass
+class CacheStats:
+    hit_count: int = 0
+    miss_count: int = 0
+    refresh_count: int = 0
+    # misses waiting for the load already in flight, rather than loading again
+    shared_load_count: int = 0
+
+
+class SharedLoad[V]:
+    '''
+    A load in flight (e.g. a submitted query job), waited for by all of the callers.
+    The value is only retrieved once, by whichever caller needs it first.
+    '''
+
+    def __init__(self, on_loaded: Callable[[V], None], on_done: Callable[[], None]):
+        # held while starting the load, and while retrieving the value
+        self.lock = threading.Lock()
+        self._on_loaded = on_loaded
+        self._on_done = on_done
+        self._get_value: Optional[Callable[[], V]] = None
+        self._future: Future[V] = Future()
+
+    def start(self, start_load: Callable[[], Callable[[], V]]):
+        # expects the lock to be held
+        try:
+            self._get_value = start_load()
+        except BaseException as exc:
+            self._set_exception(exc)
+            raise
+
+    def _set_exception(self, exc: BaseException):
+        self._future.set_exception(exc)
+        self._on_done()
+
+    def __call__(self) -> V:
+        with self.lock:
+            if not self._future.done():
+                assert self._get_value is not None
+                try:
+                    value = self._get_value()
+                except BaseException as exc:
+                    self._set_exception(exc)
+                    raise
+                self._on_loaded(value)
+                self._future.set_result(value)
+                self._on_done()
+        return self._future.result()
+
+
+class RefreshingCache[K: Hashable, V]:
+    '''
+    Thread-safe in-memory LRU cache with a TTL provided on lookup.
+    Entries older than `refresh_after` (but not yet expired) are returned
+    immediately and reloaded in the background.
+    Concurrent misses for the same key share a single load.
+    '''
+
+    def __init__(
+        self,
+        max_size: int = 100,
+        timer: Callable[[], float] = time.monotonic
+    ):
+        self.max_size = max_size
+        self.timer = timer
+        self.stats = CacheStats()
+        self._entry_by_key: OrderedDict[K, CacheEntry[V]] = OrderedDict()
+        self._refreshing_keys: set[K] = set()
+        self._shared_load_by_key: dict[K, SharedLoad[V]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entry_by_key)
+
+    def clear(self):
+        with self._lock:
+            self._entry_by_key.clear()
+            self.stats = CacheStats()
+
+    def invalidate(self, predicate: Callable[[K], bool]):
+        with self._lock:
+            for key in [key for key in self._entry_by_key if predicate(key)]:
+                del self._entry_by_key[key]
+
+    def put(self, key: K, value: V):
+        with self._lock:
+            self._entry_by_key[key] = CacheEntry(value=value, created_at=self.timer())
+            self._entry_by_key.move_to_end(key)
+            while len(self._entry_by_key) > self.max_size:
+                self._entry_by_key.popitem(last=False)
+
+    def _refresh(self, key: K, loader: Callable[[], V]):
+        try:
+            self.put(key, loader())
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            LOGGER.warning('Failed to refresh cache entry %r: %r', key, exc)
+        finally:
+            with self._lock:
+                self._refreshing_keys.discard(key)
+
+    def _start_refresh(self, key: K, loader: Callable[[], V]):
+        # expects the lock to be held
+        if key in self._refreshing_keys:
+            return
+        self._refreshing_keys.add(key)
+        self.stats.refresh_count += 1
+        threading.Thread(
+            target=self._refresh,
+            args=(key, loader),
+            name='cache-refresh',
+            daemon=True
+        ).start()
+
+    def get(self, key: K, ttl: float) -> Optional[V]:
+        with self._lock:
+            entry = self._entry_by_key.get(key)
+            if entry is None or self.timer() - entry.created_at >= ttl:
+                self.stats.miss_count += 1
+                return None
+            self.stats.hit_count += 1
+            self._entry_by_key.move_to_end(key)
+            return entry.value
+
+    def _remove_shared_load(self, key: K, shared_load: SharedLoad[V]):
+        with self._lock:
+            if self._shared_load_by_key.get(key) is shared_load:
+                del self._shared_load_by_key[key]
+
+    def get_or_start_load(
+        self,
+        key: K,
+        start_load: Callable[[], Callable[[], V]],
+        ttl: float,
+        refresh_after: Optional[float] = None
+    ) -> Callable[[], V]:
+        '''
+        Like `get_or_load`, with the loading split into starting it (e.g. submitting a job),
+        and the returned function, waiting for the value.
+        '''
+        with self._lock:
+            entry = self._entry_by_key.get(key)
+            if entry is not None:
+                age = self.timer() - entry.created_at
+                if age < ttl:
+                    self.stats.hit_count += 1
+                    self._entry_by_key.move_to_end(key)
+                    if refresh_after is not None and age >= refresh_after:
+                        self._start_refresh(
+                            key,
+                            lambda: start_load()()  # pylint: disable=unnecessary-lambda
+                        )
+                    value = entry.value
+                    return lambda: value
+            self.stats.miss_count += 1
+            shared_load = self._shared_load_by_key.get(key)
+            if shared_load is not None:
+                self.stats.shared_load_count += 1
+                return shared_load
+            new_shared_load: SharedLoad[V] = SharedLoad(
+                on_loaded=lambda value: self.put(key, value),
+                on_done=lambda: self._remove_shared_load(key, new_shared_load)
+            )
+            self._shared_load_by_key[key] = new_shared_load
+            # other callers will wait for the load to be started
+            new_shared_load.lock.acquire()  # pylint: disable=consider-using-with
+        try:
+            new_shared_load.start(start_load)
+        finally:
+            new_shared_load.lock.release()
+        return new_shared_load
+
+    def get_or_load(
+        self,
+        key: K,
+        loader: Callable[[], V],
+        ttl: float,
+        refresh_after: Optional[float] = None
+    ) -> V:
+        return self.get_or_start_load(
+            key,
+            start_load=lambda: loader,
+            ttl=ttl,
+            refresh_after=refresh_after
+        )()
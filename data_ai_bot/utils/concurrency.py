@@ -0,0 +1,71 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from typing import Awaitable, Callable, Coroutine, Iterable, Optional, Sequence, TypeVar
+
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+_SHARED_EVENT_LOOP_LOCK = threading.Lock()
+_SHARED_EVENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_mapped_concurrently(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+) -> Sequence[R]:
+    '''
+    Like `list(map(fn, items))`, but with up to `max_concurrency` calls in flight.
+    Results are returned in the order of `items`.
+    '''
+    items = list(items)
+    if len(items) <= 1 or max_concurrency <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(items))) as executor:
+        return list(executor.map(fn, items))
+
+
+async def get_gathered_with_max_concurrency(
+    awaitables: Iterable[Awaitable[T]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+) -> Sequence[T]:
+    '''
+    Like `asyncio.gather`, but with up to `max_concurrency` awaitables in flight.
+    '''
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def get_result(awaitable: Awaitable[T]) -> T:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*[get_result(awaitable) for awaitable in awaitables])
+
+
+def get_shared_event_loop() -> asyncio.AbstractEventLoop:
+    '''
+    Returns an event loop running in a background thread, shared across the process.
+    '''
+    global _SHARED_EVENT_LOOP  # pylint: disable=global-statement
+    with _SHARED_EVENT_LOOP_LOCK:
+        if _SHARED_EVENT_LOOP is None:
+            event_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=event_loop.run_forever,
+                name='shared-event-loop',
+                daemon=True
+            ).start()
+            _SHARED_EVENT_LOOP = event_loop
+        return _SHARED_EVENT_LOOP
+
+
+def run_coroutine_sync(coroutine: Coroutine[None, None, T]) -> T:
+    '''
+    Runs the coroutine on the shared event loop and waits for its result.
+    '''
+    return asyncio.run_coroutine_threadsafe(coroutine, get_shared_event_loop()).result()
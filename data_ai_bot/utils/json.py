@@ -1,19 +1,237 @@
 import csv
+from dataclasses import dataclass
+import json
 from io import StringIO
-from typing import Iterable
+from itertools import chain, islice
+import logging
+from typing import Any, Iterable, Optional, Sequence, TypeVar
 
 
-def get_json_as_csv_lines(json_list: Iterable[dict]) -> Iterable[str]:
-    json_list = list(json_list)
-    if not json_list:
-        return []
-    fieldnames = list({
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+DEFAULT_FIELDNAMES_SAMPLE_SIZE = 1000
+
+
+@dataclass
+class ItemCounter:
+    count: int = 0
+
+    def iter_counted(self, items: Iterable[T]) -> Iterable[T]:
+        for item in items:
+            self.count += 1
+            yield item
+
+
+def get_truncation_note(row_count: int, total_row_count: Optional[int] = None) -> str:
+    if total_row_count is None:
+        return f'[truncated: showing the first {row_count} rows]'
+    return f'[truncated: showing the first {row_count} of {total_row_count} rows]'
+
+
+def get_truncation_marker(row_count: int, total_row_count: Optional[int] = None) -> dict:
+    truncation_marker: dict[str, Any] = {'truncated': True, 'row_count': row_count}
+    if total_row_count is not None:
+        truncation_marker['total_rows'] = total_row_count
+    return truncation_marker
+
+
+def is_truncated(
+    row_count: int,
+    source_row_count: int,
+    total_row_count: Optional[int] = None
+) -> bool:
+    # either rows were dropped by the limits, or the source itself was limited
+    return source_row_count > row_count or (
+        total_row_count is not None and total_row_count > row_count
+    )
+
+
+def get_fieldnames_in_first_seen_order(json_list: Iterable[dict]) -> Sequence[str]:
+    return list(dict.fromkeys(
         key
         for row in json_list
         for key in row.keys()
-    })
+    ))
+
+
+def iter_csv_lines_with_limits(
+    csv_lines: Iterable[str],
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> Iterable[str]:
+    '''
+    Passes through the CSV lines (the first one being the header),
+    until either the number of rows or the (UTF-8 encoded) size would exceed the limit.
+    '''
+    byte_count = 0
+    for line_index, line in enumerate(csv_lines):
+        if max_rows is not None and line_index > max_rows:
+            LOGGER.info('CSV output truncated: max_rows=%d', max_rows)
+            return
+        byte_count += len(line.encode('utf-8')) + (1 if line_index else 0)
+        if max_bytes is not None and byte_count > max_bytes:
+            LOGGER.info('CSV output truncated: max_bytes=%d', max_bytes)
+            return
+        yield line
+
+
+def iter_json_with_limits(
+    json_list: Iterable[dict],
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> Iterable[dict]:
+    '''
+    Passes through the rows, until either the number of rows or the (UTF-8 encoded) size
+    of the JSON list would exceed the limit.
+    '''
+    # the enclosing brackets of the list
+    byte_count = 2
+    for row_index, row in enumerate(json_list):
+        if max_rows is not None and row_index >= max_rows:
+            LOGGER.info('JSON output truncated: max_rows=%d', max_rows)
+            return
+        if max_bytes is not None:
+            byte_count += (
+                len(json.dumps(row, default=str).encode('utf-8'))
+                + (2 if row_index else 0)
+            )
+            if byte_count > max_bytes:
+                LOGGER.info('JSON output truncated: max_bytes=%d', max_bytes)
+                return
+        yield row
+
+
+def _iter_csv_lines_for_fieldnames(
+    json_list: Iterable[dict],
+    fieldnames: Sequence[str]
+) -> Iterable[str]:
+    # encoding one row at a time, reusing the same buffer
     buffer = StringIO()
-    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer = csv.DictWriter(
+        buffer,
+        fieldnames=fieldnames,
+        extrasaction='ignore',
+        lineterminator='\n'
+    )
+
+    def get_and_clear_buffer() -> str:
+        line = buffer.getvalue()[:-1]
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
     writer.writeheader()
-    writer.writerows(json_list)
-    return buffer.getvalue().splitlines()
+    yield get_and_clear_buffer()
+    for row in json_list:
+        writer.writerow(row)
+        yield get_and_clear_buffer()
+
+
+def iter_json_as_csv_lines(
+    json_list: Iterable[dict],
+    fieldnames: Optional[Sequence[str]] = None,
+    fieldnames_sample_size: int = DEFAULT_FIELDNAMES_SAMPLE_SIZE,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> Iterable[str]:
+    '''
+    Lazily encodes the rows as CSV lines (one per row, after the header).
+    Without `fieldnames` (e.g. from the schema), the columns are taken in first-seen order
+    from the first `fieldnames_sample_size` rows (keys only found in later rows are ignored).
+    '''
+    json_iterator = iter(json_list)
+    sample_json_list: Sequence[dict] = []
+    if fieldnames is None:
+        sample_json_list = list(islice(json_iterator, fieldnames_sample_size))
+        fieldnames = get_fieldnames_in_first_seen_order(sample_json_list)
+    if not fieldnames:
+        return
+    yield from iter_csv_lines_with_limits(
+        _iter_csv_lines_for_fieldnames(
+            chain(sample_json_list, json_iterator),
+            fieldnames=fieldnames
+        ),
+        max_rows=max_rows,
+        max_bytes=max_bytes
+    )
+
+
+def get_json_as_csv_lines(json_list: Iterable[dict]) -> Sequence[str]:
+    return list(iter_json_as_csv_lines(json_list))
+
+
+def get_csv_with_limits(
+    csv_lines: Iterable[str],
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    total_row_count: Optional[int] = None
+) -> str:
+    '''
+    Joins the CSV lines (the first one being the header) within the limits,
+    followed by a note, if any rows are missing.
+    '''
+    line_counter = ItemCounter()
+    limited_csv_lines = list(iter_csv_lines_with_limits(
+        line_counter.iter_counted(csv_lines),
+        max_rows=max_rows,
+        max_bytes=max_bytes
+    ))
+    row_count = max(0, len(limited_csv_lines) - 1)
+    if not is_truncated(row_count, max(0, line_counter.count - 1), total_row_count):
+        return '\n'.join(limited_csv_lines)
+    return '\n'.join([
+        *limited_csv_lines,
+        '',
+        get_truncation_note(row_count, total_row_count)
+    ])
+
+
+def get_json_list_with_limits(
+    json_list: Iterable[dict],
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    total_row_count: Optional[int] = None
+) -> Sequence[dict]:
+    '''
+    Returns the rows within the limits,
+    followed by a truncation marker (e.g. `{"truncated": true, ...}`), if any rows are missing.
+    '''
+    row_counter = ItemCounter()
+    rows = list(iter_json_with_limits(
+        row_counter.iter_counted(json_list),
+        max_rows=max_rows,
+        max_bytes=max_bytes
+    ))
+    if not is_truncated(len(rows), row_counter.count, total_row_count):
+        return rows
+    return [*rows, get_truncation_marker(len(rows), total_row_count)]
+
+
+def get_formatted_json_list(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    json_list: Iterable[dict],
+    output_format: str = 'json',
+    fieldnames: Optional[Sequence[str]] = None,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    total_row_count: Optional[int] = None
+) -> Any:
+    '''
+    Formats the rows as CSV or JSON, within the limits. If any rows are missing
+    (because of the limits, or `total_row_count` exceeding the rows), the output says so.
+    '''
+    if output_format == 'csv':
+        return get_csv_with_limits(
+            iter_json_as_csv_lines(json_list, fieldnames=fieldnames),
+            max_rows=max_rows,
+            max_bytes=max_bytes,
+            total_row_count=total_row_count
+        )
+    return get_json_list_with_limits(
+        json_list,
+        max_rows=max_rows,
+        max_bytes=max_bytes,
+        total_row_count=total_row_count
+    )
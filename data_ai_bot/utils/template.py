@@ -0,0 +1,17 @@
+from functools import cache, lru_cache
+
+import jinja2
+
+
+DEFAULT_COMPILED_TEMPLATE_CACHE_SIZE = 1024
+
+
+@cache
+def get_template_environment() -> jinja2.Environment:
+    # shared, rather than creating a new environment for every template
+    return jinja2.Environment()
+
+
+@lru_cache(maxsize=DEFAULT_COMPILED_TEMPLATE_CACHE_SIZE)
+def get_compiled_template(template: str) -> jinja2.Template:
+    return get_template_environment().from_string(template)
@@ -1,3 +1,4 @@
+import dataclasses
 from typing import Iterator
 from unittest.mock import MagicMock, call, patch
 
@@ -6,14 +7,18 @@ import smolagents  # type: ignore
 
 import data_ai_bot.agent_factory as agent_factory_module
 from data_ai_bot.agent_factory import (
+    ReloadableAgentFactory,
     SmolAgentsAgentFactory,
     SmolAgentsManagedAgentFactory,
     ToolCall,
     ToolCallEvent,
     get_chained_tool_call_event_handlers,
+    get_resolved_agent_config,
     get_wrapped_smolagents_tool,
     get_wrapped_smolagents_tools
 )
+from data_ai_bot.config import ModelRateLimitConfig
+from data_ai_bot.models.admission import ModelAdmissionController, RateLimitedModel
 
 
 TEST_TOOL_NAME = 'test_tool_1'
@@ -211,6 +216,84 @@ class TestSmolAgentsAgentFactory:
         assert isinstance(agent, smolagents.ToolCallingAgent)
         assert agent.model == agent_factory.model
         assert agent.tools
+        assert agent.stream_outputs is True
+
+    def test_should_not_stream_outputs_if_not_supported_by_model(
+        self,
+        test_tool: TestTool
+    ):
+        agent_factory = SmolAgentsAgentFactory(
+            model=smolagents.Model(model_id='model_1'),
+            tools=[test_tool]
+        )
+        assert agent_factory().stream_outputs is False
+
+    def test_should_not_stream_outputs_if_not_supported_by_wrapped_model(
+        self,
+        test_tool: TestTool
+    ):
+        agent_factory = SmolAgentsAgentFactory(
+            model=RateLimitedModel(
+                smolagents.Model(model_id='model_1'),
+                ModelAdmissionController(ModelRateLimitConfig(), name='model_1')
+            ),
+            tools=[test_tool]
+        )
+        assert agent_factory().stream_outputs is False
+
+    def test_should_order_tools_by_name_and_include_system_prompt(
+        self,
+        test_tool: TestTool
+    ):
+        other_tool = TestTool()
+        other_tool.name = 'other_tool_1'
+        agent = SmolAgentsAgentFactory(
+            model=MagicMock(name='model'),
+            tools=[test_tool, other_tool],
+            system_prompt='System prompt 1'
+        )()
+        assert list(agent.tools.keys())[:2] == ['other_tool_1', TEST_TOOL_NAME]
+        assert 'System prompt 1' in agent.system_prompt
+        assert agent.system_prompt.rstrip().endswith('Now Begin!')
+
+    def test_should_use_rendered_system_prompt_of_resolved_agent(
+        self,
+        test_tool: TestTool
+    ):
+        agent_factory = SmolAgentsAgentFactory(
+            model=MagicMock(name='model'),
+            tools=[test_tool],
+            system_prompt='System prompt 1'
+        )
+        resolved_agent_config = dataclasses.replace(
+            get_resolved_agent_config(agent_factory()),
+            rendered_system_prompt='Rendered system prompt 1'
+        )
+        agent = dataclasses.replace(
+            agent_factory,
+            resolved_agent_config=resolved_agent_config
+        )(tool_call_event_handler=MagicMock(name='tool_call_event_handler'))
+        assert agent.system_prompt == 'Rendered system prompt 1'
+
+    def test_should_render_system_prompt_if_tools_changed(
+        self,
+        test_tool: TestTool
+    ):
+        agent_factory = SmolAgentsAgentFactory(
+            model=MagicMock(name='model'),
+            tools=[test_tool],
+            system_prompt='System prompt 1'
+        )
+        resolved_agent_config = dataclasses.replace(
+            get_resolved_agent_config(agent_factory()),
+            rendered_system_prompt='Rendered system prompt 1'
+        )
+        test_tool.description = 'Changed description'
+        agent = dataclasses.replace(
+            agent_factory,
+            resolved_agent_config=resolved_agent_config
+        )()
+        assert 'Changed description' in agent.system_prompt
 
     def test_should_create_agent_with_managed_agents_using_code_agent(
         self,
@@ -254,3 +337,18 @@ class TestSmolAgentsManagedAgentFactory:
         assert isinstance(agent, smolagents.ToolCallingAgent)
         assert agent.name == 'managed_agent_1'
         assert agent.description == 'Managed Agent 1'
+
+
+class TestReloadableAgentFactory:
+    def test_should_delegate_to_current_agent_factory(self):
+        agent_factory_1 = MagicMock(name='agent_factory_1')
+        agent_factory_2 = MagicMock(name='agent_factory_2')
+        tool_call_event_handler = MagicMock(name='tool_call_event_handler')
+        agent_factory = ReloadableAgentFactory(agent_factory_1)
+        assert agent_factory(
+            tool_call_event_handler=tool_call_event_handler
+        ) == agent_factory_1.return_value
+        agent_factory_1.assert_called_once_with(tool_call_event_handler=tool_call_event_handler)
+        agent_factory.set_agent_factory(agent_factory_2)
+        assert agent_factory() == agent_factory_2.return_value
+        assert agent_factory.get_agent_factory() == agent_factory_2
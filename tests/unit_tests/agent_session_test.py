@@ -0,0 +1,252 @@
+from unittest.mock import MagicMock
+
+import smolagents  # type: ignore[import-untyped]
+from smolagents.agents import ToolOutput  # type: ignore[import-untyped]
+from smolagents.memory import FinalAnswerStep, ToolCall  # type: ignore[import-untyped]
+from smolagents.monitoring import Timing  # type: ignore[import-untyped]
+
+from data_ai_bot.agent_factory import ToolCall as AgentFactoryToolCall, ToolCallEvent
+from data_ai_bot.agent_session import (
+    AgentFinalAnswerEvent,
+    AgentStepStartedEvent,
+    AgentTokenDeltaEvent,
+    AgentToolCallEvent,
+    AgentToolResultEvent,
+    SmolAgentsAgentSession,
+    iter_agent_events_for_smolagents_events
+)
+from data_ai_bot.answer_cache import AnswerCache
+from data_ai_bot.config import AnswerCacheConfig, IntentConfig, ModelTierConfig
+from data_ai_bot.intents import Intent, IntentAgentFactory
+from data_ai_bot.model_routing import ModelTier, TieredAgentFactory
+
+
+TOOL_CALL_1 = ToolCall(name='tool_1', arguments={'query': 'query_1'}, id='call_1')
+
+
+def get_action_step(step_number: int) -> smolagents.ActionStep:
+    return smolagents.ActionStep(step_number=step_number, timing=Timing(start_time=0.0))
+
+
+SMOLAGENTS_EVENTS_1 = [
+    smolagents.ChatMessageStreamDelta(content='Calling'),
+    smolagents.ChatMessageStreamDelta(content=None),
+    TOOL_CALL_1,
+    ToolOutput(
+        id='call_1',
+        output='output_1',
+        is_final_answer=False,
+        observation='observation_1',
+        tool_call=TOOL_CALL_1
+    ),
+    get_action_step(1),
+    smolagents.ChatMessageStreamDelta(content='Answer'),
+    get_action_step(2),
+    FinalAnswerStep(output='Answer 1')
+]
+
+
+class TestIterAgentEventsForSmolagentsEvents:
+    def test_should_convert_smolagents_events(self):
+        assert list(iter_agent_events_for_smolagents_events(iter(SMOLAGENTS_EVENTS_1))) == [
+            AgentStepStartedEvent(step_number=1),
+            AgentTokenDeltaEvent(text='Calling'),
+            AgentToolCallEvent(
+                tool_call_id='call_1',
+                tool_name='tool_1',
+                arguments={'query': 'query_1'}
+            ),
+            AgentToolResultEvent(
+                tool_call_id='call_1',
+                tool_name='tool_1',
+                observation='observation_1'
+            ),
+            AgentStepStartedEvent(step_number=2),
+            AgentTokenDeltaEvent(text='Answer'),
+            AgentFinalAnswerEvent(text='Answer 1')
+        ]
+
+
+class TestSmolAgentsAgentSession:
+    def test_should_return_final_answer(self):
+        agent_factory = MagicMock(name='agent_factory')
+        agent_factory.return_value.run.return_value = 'Answer 1'
+        agent_response = SmolAgentsAgentSession(agent_factory=agent_factory).run(
+            message='Question 1',
+            previous_messages=['Previous 1']
+        )
+        assert agent_response.text == 'Answer 1'
+
+    def test_should_escalate_if_small_model_tier_runs_out_of_steps(self):
+        small_agent_factory = MagicMock(name='small_agent_factory')
+        small_agent_factory.return_value.run.return_value = MagicMock(
+            name='run_result',
+            state='max_steps_error'
+        )
+        default_agent_factory = MagicMock(name='default_agent_factory')
+        default_agent_factory.return_value.run.return_value = 'Answer 1'
+        agent_response = SmolAgentsAgentSession(agent_factory=TieredAgentFactory(
+            default_agent_factory=default_agent_factory,
+            model_tiers=[ModelTier(
+                config=ModelTierConfig(model_name='small_model_1'),
+                agent_factory=small_agent_factory
+            )]
+        )).run(
+            message='Question 1',
+            previous_messages=[]
+        )
+        assert agent_response.text == 'Answer 1'
+        small_agent_factory.return_value.run.assert_called_once()
+
+    def test_should_pass_tool_results_of_small_model_tier_to_next_tier(self):
+        action_step = get_action_step(1)
+        action_step.tool_calls = [TOOL_CALL_1]
+        action_step.observations = 'Result 1'
+        small_agent_factory = MagicMock(name='small_agent_factory')
+        small_agent_factory.return_value.memory.steps = [action_step]
+        small_agent_factory.return_value.run.return_value = MagicMock(
+            name='run_result',
+            state='max_steps_error'
+        )
+        default_agent_factory = MagicMock(name='default_agent_factory')
+        default_agent_factory.return_value.run.return_value = 'Answer 1'
+        SmolAgentsAgentSession(agent_factory=TieredAgentFactory(
+            default_agent_factory=default_agent_factory,
+            model_tiers=[ModelTier(
+                config=ModelTierConfig(model_name='small_model_1'),
+                agent_factory=small_agent_factory
+            )]
+        )).run(
+            message='Question 1',
+            previous_messages=[]
+        )
+        default_agent_factory.return_value.run.assert_called_once_with(
+            'Question 1',
+            additional_args={
+                'previous_messages': [],
+                'previous_tool_results': [{
+                    'tool_calls': [{'name': 'tool_1', 'arguments': {'query': 'query_1'}}],
+                    'observations': 'Result 1'
+                }]
+            }
+        )
+
+    def test_should_return_answer_of_small_model_tier_if_successful(self):
+        small_agent_factory = MagicMock(name='small_agent_factory')
+        small_agent_factory.return_value.run.return_value = MagicMock(
+            name='run_result',
+            state='success',
+            output='Answer 1'
+        )
+        default_agent_factory = MagicMock(name='default_agent_factory')
+        agent_response = SmolAgentsAgentSession(agent_factory=TieredAgentFactory(
+            default_agent_factory=default_agent_factory,
+            model_tiers=[ModelTier(
+                config=ModelTierConfig(model_name='small_model_1'),
+                agent_factory=small_agent_factory
+            )]
+        )).run(
+            message='Question 1',
+            previous_messages=[]
+        )
+        assert agent_response.text == 'Answer 1'
+        default_agent_factory.assert_not_called()
+
+    def test_should_answer_matching_intent_without_agent(self):
+        agent_factory = MagicMock(name='agent_factory')
+        agent_response = SmolAgentsAgentSession(agent_factory=IntentAgentFactory(
+            agent_factory=agent_factory,
+            intents=[Intent(IntentConfig(
+                name='help',
+                patterns=['help'],
+                response_template='Answer 1'
+            ))]
+        )).run(
+            message='Help\n',
+            previous_messages=[]
+        )
+        assert agent_response.text == 'Answer 1'
+        agent_factory.assert_not_called()
+
+    def test_should_return_cached_answer_of_repeated_question(self):
+        agent_factory = MagicMock(name='agent_factory')
+        agent_factory.return_value.run.return_value = 'Answer 1'
+        agent_session = SmolAgentsAgentSession(
+            agent_factory=agent_factory,
+            answer_cache=AnswerCache(AnswerCacheConfig())
+        )
+        agent_session.run(message='How many reviews does 101859 have?', previous_messages=[])
+        agent_response = agent_session.run(
+            message='how many reviews does 101859 have',
+            previous_messages=[]
+        )
+        assert agent_response.text == 'Answer 1'
+        agent_factory.return_value.run.assert_called_once()
+
+    def test_should_not_use_cached_answer_if_fresh_answer_requested(self):
+        agent_factory = MagicMock(name='agent_factory')
+        agent_factory.return_value.run.side_effect = ['Answer 1', 'Answer 2']
+        answer_cache = AnswerCache(AnswerCacheConfig())
+        agent_session = SmolAgentsAgentSession(
+            agent_factory=agent_factory,
+            answer_cache=answer_cache
+        )
+        agent_session.run(message='Question 1', previous_messages=[])
+        agent_response = agent_session.run(message='Question 1 !fresh', previous_messages=[])
+        assert agent_response.text == 'Answer 2'
+        assert agent_factory.return_value.run.call_args.args[0] == 'Question 1'
+        answer_cache_match = answer_cache.get('Question 1')
+        assert answer_cache_match is not None
+        assert answer_cache_match.entry.answer == 'Answer 2'
+
+    def test_should_not_use_answer_cache_for_follow_up_questions(self):
+        agent_factory = MagicMock(name='agent_factory')
+        agent_factory.return_value.run.return_value = 'Answer 1'
+        answer_cache = AnswerCache(AnswerCacheConfig())
+        agent_session = SmolAgentsAgentSession(
+            agent_factory=agent_factory,
+            answer_cache=answer_cache
+        )
+        agent_session.run(message='Question 1', previous_messages=['Previous 1'])
+        assert answer_cache.get_stats().entry_count == 0
+
+    def test_should_record_called_tool_names_in_answer_cache(self):
+        agent_factory = MagicMock(name='agent_factory')
+        answer_cache = AnswerCache(AnswerCacheConfig())
+
+        def run(*_args, **_kwargs):
+            tool_call_event_handler = agent_factory.call_args.kwargs['tool_call_event_handler']
+            tool_call_event_handler(ToolCallEvent(
+                event_name='success',
+                tool_call=AgentFactoryToolCall(
+                    tool_name='tool_1',
+                    tool=MagicMock(name='tool_1'),
+                    args=[],
+                    kwargs={}
+                )
+            ))
+            return 'Answer 1'
+
+        agent_factory.return_value.run.side_effect = run
+        SmolAgentsAgentSession(
+            agent_factory=agent_factory,
+            answer_cache=answer_cache
+        ).run(message='Question 1', previous_messages=[])
+        assert answer_cache.invalidate_tool_name('tool_1') == 1
+
+    def test_should_stream_agent_events(self):
+        agent_factory = MagicMock(name='agent_factory')
+        tool_call_event_handler = MagicMock(name='tool_call_event_handler')
+        agent_factory.return_value.run.return_value = iter(SMOLAGENTS_EVENTS_1)
+        agent_events = list(SmolAgentsAgentSession(agent_factory=agent_factory).run_stream(
+            message='Question 1',
+            previous_messages=['Previous 1'],
+            tool_call_event_handler=tool_call_event_handler
+        ))
+        assert agent_events[-1] == AgentFinalAnswerEvent(text='Answer 1')
+        agent_factory.assert_called_once()
+        agent_factory.return_value.run.assert_called_once_with(
+            'Question 1',
+            stream=True,
+            additional_args={'previous_messages': ['Previous 1']}
+        )
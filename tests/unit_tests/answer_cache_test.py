@@ -0,0 +1,140 @@
+import pytest
+
+from data_ai_bot.answer_cache import (
+    AnswerCache,
+    get_hashed_question_vector,
+    get_key_tokens,
+    get_question_tokens
+)
+from data_ai_bot.config import AnswerCacheConfig
+
+
+QUESTION_1 = 'How many reviews does 101859 have?'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def get_answer_cache(
+    clock: FakeClock | None = None,
+    **kwargs
+) -> AnswerCache:
+    return AnswerCache(
+        AnswerCacheConfig(max_entry_count=3, feature_count=256, **kwargs),
+        clock=clock or FakeClock()
+    )
+
+
+class TestGetQuestionTokens:
+    def test_should_remove_user_mentions_and_punctuation(self):
+        assert get_question_tokens('<@U123> How many reviews, 101859?') == [
+            'how', 'many', 'reviews', '101859'
+        ]
+
+
+class TestGetKeyTokens:
+    def test_should_return_tokens_with_digits(self):
+        assert get_key_tokens(['reviews', '101859', 'v2']) == {'101859', 'v2'}
+
+
+class TestGetHashedQuestionVector:
+    def test_should_return_normalised_vector(self):
+        vector = get_hashed_question_vector(['how', 'many', 'reviews'], 256)
+        assert float(vector @ vector) == pytest.approx(1.0)
+
+    def test_should_return_zero_vector_without_tokens(self):
+        assert not get_hashed_question_vector([], 256).any()
+
+
+class TestAnswerCache:
+    def test_should_return_answer_of_near_identical_question(self):
+        answer_cache = get_answer_cache()
+        answer_cache.set(QUESTION_1, 'Answer 1')
+        answer_cache_match = answer_cache.get('<@U123> how many reviews does 101859 have')
+        assert answer_cache_match is not None
+        assert answer_cache_match.entry.answer == 'Answer 1'
+
+    def test_should_not_return_answer_of_dissimilar_question(self):
+        answer_cache = get_answer_cache()
+        answer_cache.set(QUESTION_1, 'Answer 1')
+        assert answer_cache.get('How many authors does 101859 have?') is None
+
+    def test_should_not_return_answer_for_different_id(self):
+        answer_cache = get_answer_cache()
+        answer_cache.set(QUESTION_1, 'Answer 1')
+        assert answer_cache.get('How many reviews does 101860 have?') is None
+
+    def test_should_expire_answer_after_ttl(self):
+        clock = FakeClock()
+        answer_cache = get_answer_cache(clock=clock, ttl=60)
+        answer_cache.set(QUESTION_1, 'Answer 1')
+        clock.now += 61
+        assert answer_cache.get(QUESTION_1) is None
+
+    def test_should_use_shorter_ttl_of_tool(self):
+        clock = FakeClock()
+        answer_cache = get_answer_cache(clock=clock, ttl=60, ttl_by_tool_name={'tool_1': 10})
+        answer_cache.set(QUESTION_1, 'Answer 1', tool_names={'tool_1'})
+        clock.now += 11
+        assert answer_cache.get(QUESTION_1) is None
+
+    def test_should_not_cache_answer_using_tool_with_zero_ttl(self):
+        answer_cache = get_answer_cache(ttl_by_tool_name={'tool_1': 0})
+        answer_cache.set(QUESTION_1, 'Answer 1', tool_names={'tool_1'})
+        assert answer_cache.get_stats().entry_count == 0
+
+    def test_should_invalidate_answers_using_tool(self):
+        answer_cache = get_answer_cache()
+        answer_cache.set(QUESTION_1, 'Answer 1', tool_names={'tool_1'})
+        answer_cache.set('What is the DocMap of 101859?', 'Answer 2', tool_names={'tool_2'})
+        assert answer_cache.invalidate_tool_name('tool_1') == 1
+        assert answer_cache.get(QUESTION_1) is None
+        assert answer_cache.get('What is the DocMap of 101859?') is not None
+
+    def test_should_clear_all_answers(self):
+        answer_cache = get_answer_cache()
+        answer_cache.set(QUESTION_1, 'Answer 1', tool_names={'tool_1'})
+        answer_cache.set('What is the DocMap of 101859?', 'Answer 2')
+        assert answer_cache.clear() == 2
+        assert answer_cache.get_stats().entry_count == 0
+        assert answer_cache.get_stats().invalidated_count == 2
+
+    def test_should_replace_answer_of_same_question(self):
+        answer_cache = get_answer_cache()
+        answer_cache.set(QUESTION_1, 'Answer 1')
+        answer_cache.set(QUESTION_1, 'Answer 2')
+        answer_cache_match = answer_cache.get(QUESTION_1)
+        assert answer_cache_match is not None
+        assert answer_cache_match.entry.answer == 'Answer 2'
+        assert answer_cache.get_stats().entry_count == 1
+
+    def test_should_evict_oldest_answer_if_full(self):
+        clock = FakeClock()
+        answer_cache = get_answer_cache(clock=clock)
+        for index in range(4):
+            clock.now += 1
+            answer_cache.set(f'What is the DocMap of {index}?', f'Answer {index}')
+        assert answer_cache.get('What is the DocMap of 0?') is None
+        assert answer_cache.get('What is the DocMap of 3?') is not None
+        assert answer_cache.get_stats().entry_count == 3
+
+    def test_should_detect_and_remove_fresh_answer_keyword(self):
+        answer_cache = get_answer_cache()
+        assert answer_cache.is_fresh_answer_requested(f'{QUESTION_1} !fresh')
+        assert not answer_cache.is_fresh_answer_requested(QUESTION_1)
+        assert answer_cache.get_question_without_fresh_answer_keywords(
+            f'!fresh {QUESTION_1}'
+        ) == QUESTION_1
+
+    def test_should_count_hits_and_misses(self):
+        answer_cache = get_answer_cache()
+        answer_cache.set(QUESTION_1, 'Answer 1')
+        answer_cache.get(QUESTION_1)
+        answer_cache.get('Something else')
+        stats = answer_cache.get_stats()
+        assert (stats.hit_count, stats.miss_count) == (1, 1)
@@ -0,0 +1,299 @@
+import dataclasses
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+
+from smolagents import ToolCollection, tool as smolagents_tool  # type: ignore[import-untyped]
+import smolagents.agents as smolagents_agents  # type: ignore[import-untyped]
+
+from data_ai_bot.cli import get_agent_factory_for_app_config
+
+from data_ai_bot.compile_config import (
+    ConfigValidationError,
+    compile_config_snapshot,
+    get_app_config_validation_errors,
+    get_placeholder_model_registry,
+    main
+)
+from data_ai_bot.config import (
+    AppConfig,
+    BaseAgentConfig,
+    FromPythonToolClassConfig,
+    IntentConfig,
+    ModelConfig,
+    ModelRoutingConfig,
+    ModelTierConfig,
+    ToolCollectionDefinitionsConfig,
+    ToolDefinitionsConfig
+)
+from data_ai_bot.config_reload import MAIN_AGENT_NAME
+from data_ai_bot.config_snapshot import load_config_snapshot
+from data_ai_bot.tools.resolver import ConfigToolResolver
+
+
+FROM_PYTHON_TOOL_CLASS_CONFIG_1 = FromPythonToolClassConfig(
+    name='tool_1',
+    module='data_ai_bot.tools.sources.static',
+    class_name='StaticContentTool',
+    description='Description of tool 1',
+    init_parameters={'content': 'Content 1'}
+)
+
+APP_CONFIG_1 = AppConfig(
+    tool_definitions=ToolDefinitionsConfig(
+        from_python_tool_class=[FROM_PYTHON_TOOL_CLASS_CONFIG_1]
+    ),
+    tool_collection_definitions=ToolCollectionDefinitionsConfig(),
+    models=[],
+    agent=BaseAgentConfig(tools=['tool_1'], tool_collections=[]),
+    managed_agents=[]
+)
+
+FROM_MCP_CONFIG_DICT_1 = {'name': 'mcp_1', 'url': 'http://localhost:8080/mcp'}
+
+APP_CONFIG_DICT_1 = {
+    'toolDefinitions': {
+        'fromPythonToolClass': [{
+            'name': 'tool_1',
+            'module': 'data_ai_bot.tools.sources.static',
+            'className': 'StaticContentTool',
+            'description': 'Description of tool 1',
+            'initParameters': {'content': 'Content 1'}
+        }]
+    },
+    'toolCollectionDefinitions': {
+        'fromMcp': [FROM_MCP_CONFIG_DICT_1]
+    },
+    'agent': {
+        'tools': ['tool_1'],
+        'toolCollections': ['mcp_1'],
+        'systemPrompt': 'System prompt 1'
+    }
+}
+
+
+@smolagents_tool
+def _mcp_tool_1() -> str:
+    """
+    Description of MCP tool 1
+    """
+    return 'MCP tool 1'
+
+
+@pytest.fixture(name='tool_collection_from_mcp_mock', autouse=True)
+def _tool_collection_from_mcp_mock() -> Iterator[MagicMock]:
+    with patch.object(ToolCollection, 'from_mcp') as mock:
+        mock.return_value.__enter__.return_value.tools = [_mcp_tool_1]
+        yield mock
+
+
+@pytest.fixture(name='config_file')
+def _config_file(tmp_path: Path) -> Path:
+    config_file = tmp_path / 'config.yaml'
+    config_file.write_text(yaml.safe_dump(APP_CONFIG_DICT_1), encoding='utf-8')
+    return config_file
+
+
+class TestGetAppConfigValidationErrors:
+    def test_should_return_no_errors_for_valid_config(self):
+        assert not get_app_config_validation_errors(APP_CONFIG_1)
+
+    def test_should_report_unknown_references(self):
+        errors = get_app_config_validation_errors(dataclasses.replace(
+            APP_CONFIG_1,
+            agent=BaseAgentConfig(
+                tools=['unknown_tool'],
+                tool_collections=['unknown_collection'],
+                managed_agent_names=['unknown_agent'],
+                model_name='unknown_model'
+            )
+        ))
+        assert len(errors) == 4
+        assert 'unknown_tool' in errors[0]
+
+    def test_should_report_unknown_fallback_model(self):
+        errors = get_app_config_validation_errors(dataclasses.replace(
+            APP_CONFIG_1,
+            models=[ModelConfig(
+                model_name='model_1',
+                base_url='base_url_1',
+                api_key='api_key_1',
+                fallback_model_names=['unknown_model']
+            )]
+        ))
+        assert errors == ["Model 'model_1': unknown fallback model: 'unknown_model'"]
+
+    def test_should_report_invalid_intents(self):
+        errors = get_app_config_validation_errors(dataclasses.replace(
+            APP_CONFIG_1,
+            agent=dataclasses.replace(
+                APP_CONFIG_1.agent,
+                intents=[
+                    IntentConfig(name='intent_1', patterns=['('], tool='unknown_tool'),
+                    IntentConfig(name='intent_2', patterns=['help'])
+                ]
+            )
+        ))
+        assert errors[0] == "Intent 'intent_1': unknown tool: 'unknown_tool'"
+        assert errors[1].startswith("Intent 'intent_1': invalid pattern '(': ")
+        assert errors[2] == "Intent 'intent_2': requires a tool or a response template"
+
+    def test_should_report_unknown_routing_model(self):
+        errors = get_app_config_validation_errors(dataclasses.replace(
+            APP_CONFIG_1,
+            agent=dataclasses.replace(
+                APP_CONFIG_1.agent,
+                model_routing=ModelRoutingConfig(
+                    tiers=[ModelTierConfig(model_name='unknown_model')]
+                )
+            )
+        ))
+        assert errors == ["Agent '__main__': unknown routing model: 'unknown_model'"]
+
+    def test_should_report_invalid_init_parameters(self):
+        errors = get_app_config_validation_errors(dataclasses.replace(
+            APP_CONFIG_1,
+            tool_definitions=ToolDefinitionsConfig(from_python_tool_class=[
+                dataclasses.replace(
+                    FROM_PYTHON_TOOL_CLASS_CONFIG_1,
+                    init_parameters={'other': 'value'}
+                )
+            ])
+        ))
+        assert errors == [
+            "Tool 'tool_1': unknown init parameter: 'other'",
+            "Tool 'tool_1': missing init parameter: 'content'"
+        ]
+
+    def test_should_report_unknown_module(self):
+        errors = get_app_config_validation_errors(dataclasses.replace(
+            APP_CONFIG_1,
+            tool_definitions=ToolDefinitionsConfig(from_python_tool_class=[
+                dataclasses.replace(FROM_PYTHON_TOOL_CLASS_CONFIG_1, module='unknown_module')
+            ])
+        ))
+        assert len(errors) == 1
+        assert 'failed to import module' in errors[0]
+
+
+class TestCompileConfigSnapshot:
+    def test_should_include_mcp_tool_schemas(
+        self,
+        config_file: Path,
+        tool_collection_from_mcp_mock: MagicMock
+    ):
+        config_snapshot = compile_config_snapshot(str(config_file))
+        assert config_snapshot.app_config_dict == APP_CONFIG_DICT_1
+        assert [
+            tool_schema.name
+            for tool_schema in config_snapshot.mcp_tool_schemas_by_name['mcp_1']
+        ] == ['_mcp_tool_1']
+        # only connecting once, to fetch the tool schemas (not to create the agents)
+        tool_collection_from_mcp_mock.assert_called_once()
+
+    def test_should_include_resolved_agents_with_rendered_system_prompts(
+        self,
+        config_file: Path
+    ):
+        config_snapshot = compile_config_snapshot(str(config_file))
+        resolved_agent_config = config_snapshot.resolved_agent_config_by_name[MAIN_AGENT_NAME]
+        assert set(resolved_agent_config.tool_names) >= {'tool_1', '_mcp_tool_1'}
+        assert not resolved_agent_config.managed_agent_names
+        assert 'System prompt 1' in resolved_agent_config.rendered_system_prompt
+        assert 'Description of MCP tool 1' in resolved_agent_config.rendered_system_prompt
+
+    def test_should_boot_from_snapshot_using_rendered_system_prompts(
+        self,
+        config_file: Path
+    ):
+        config_snapshot = compile_config_snapshot(str(config_file))
+        app_config = config_snapshot.get_app_config()
+        with ConfigToolResolver(
+            tool_definitions_config=app_config.tool_definitions,
+            tool_collection_definitions_config=app_config.tool_collection_definitions,
+            mcp_tool_schema_cache=config_snapshot.get_mcp_tool_schema_store(),
+            start_mcp_sessions=False
+        ) as tool_resolver:
+            agent = get_agent_factory_for_app_config(
+                app_config,
+                tool_resolver,
+                get_placeholder_model_registry(app_config)
+            )()
+        with patch.object(smolagents_agents, 'populate_template') as populate_template_mock:
+            assert agent.system_prompt == (
+                config_snapshot.resolved_agent_config_by_name[MAIN_AGENT_NAME]
+                .rendered_system_prompt
+            )
+        populate_template_mock.assert_not_called()
+
+    def test_should_skip_mcp_tool_schemas_without_connecting(
+        self,
+        config_file: Path,
+        tool_collection_from_mcp_mock: MagicMock
+    ):
+        config_snapshot = compile_config_snapshot(
+            str(config_file),
+            fetch_mcp_tool_schemas_enabled=False
+        )
+        assert not config_snapshot.mcp_tool_schemas_by_name
+        tool_collection_from_mcp_mock.assert_not_called()
+
+    def test_should_report_agent_creation_error(self, tmp_path: Path):
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text(yaml.safe_dump({
+            'toolDefinitions': {
+                'fromPythonToolClass': [{
+                    'name': 'tool_1',
+                    'module': 'data_ai_bot.tools.sources.static',
+                    'className': 'StaticContentTool',
+                    'description': 'Description of tool 1',
+                    'initParameters': {'content': 'Content 1', 'output_type': 'invalid_type'}
+                }]
+            },
+            'agent': {'tools': ['tool_1']}
+        }), encoding='utf-8')
+        with pytest.raises(ConfigValidationError) as exc_info:
+            compile_config_snapshot(str(config_file))
+        assert exc_info.value.errors[0].startswith('Failed to create agents')
+
+    def test_should_raise_error_for_unknown_mcp_tool(self, tmp_path: Path):
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text(yaml.safe_dump({
+            **APP_CONFIG_DICT_1,
+            'toolCollectionDefinitions': {'fromMcp': [{
+                **FROM_MCP_CONFIG_DICT_1,
+                'tools': ['unknown_mcp_tool']
+            }]}
+        }), encoding='utf-8')
+        with pytest.raises(ConfigValidationError):
+            compile_config_snapshot(str(config_file))
+
+    def test_should_report_mcp_connection_error(
+        self,
+        config_file: Path,
+        tool_collection_from_mcp_mock: MagicMock
+    ):
+        tool_collection_from_mcp_mock.side_effect = OSError('failed')
+        with pytest.raises(ConfigValidationError) as exc_info:
+            compile_config_snapshot(str(config_file), mcp_connect_timeout=1)
+        assert exc_info.value.errors[0].startswith("Tool collection 'mcp_1'")
+
+
+class TestMain:
+    def test_should_save_config_snapshot(self, config_file: Path, tmp_path: Path):
+        output_file = tmp_path / 'snapshot.json'
+        assert main(['--config-file', str(config_file), '--output-file', str(output_file)])
+        assert load_config_snapshot(str(output_file)).get_app_config().agent.tools == ['tool_1']
+
+    def test_should_fail_for_invalid_config(self, tmp_path: Path):
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text(yaml.safe_dump({
+            **APP_CONFIG_DICT_1,
+            'agent': {'tools': ['unknown_tool']}
+        }), encoding='utf-8')
+        output_file = tmp_path / 'snapshot.json'
+        assert not main(['--config-file', str(config_file), '--output-file', str(output_file)])
+        assert not output_file.exists()
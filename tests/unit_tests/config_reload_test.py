@@ -0,0 +1,211 @@
+import dataclasses
+import os
+from pathlib import Path
+from typing import Optional
+from unittest.mock import MagicMock
+
+from data_ai_bot.agent_factory import ReloadableAgentFactory
+from data_ai_bot.answer_cache import AnswerCache
+from data_ai_bot.config import (
+    AnswerCacheConfig,
+    AppConfig,
+    BaseAgentConfig,
+    FromPythonToolClassConfig,
+    ManagedAgentConfig,
+    ModelConfig,
+    ToolCollectionDefinitionsConfig,
+    ToolDefinitionsConfig
+)
+from data_ai_bot.config_reload import (
+    MAIN_AGENT_NAME,
+    AppConfigChanges,
+    AppConfigReloader,
+    ConfigFileWatcher,
+    get_app_config_changes
+)
+from data_ai_bot.models.registry import SmolAgentsModelRegistry
+from data_ai_bot.tools.resolver import ConfigToolResolver
+
+
+FROM_PYTHON_TOOL_CLASS_CONFIG_1 = FromPythonToolClassConfig(
+    name='tool_1',
+    module='data_ai_bot.tools.sources.static',
+    class_name='StaticContentTool',
+    description='Description 1',
+    init_parameters={'content': 'Content 1'}
+)
+
+MODEL_CONFIG_1 = ModelConfig(
+    model_name='model_1',
+    base_url='base_url_1',
+    api_key='api_key_1'
+)
+
+MANAGED_AGENT_CONFIG_1 = ManagedAgentConfig(
+    name='managed_agent_1',
+    description='Managed agent 1',
+    tools=['tool_1'],
+    tool_collections=[]
+)
+
+APP_CONFIG_1 = AppConfig(
+    tool_definitions=ToolDefinitionsConfig(
+        from_python_tool_class=[FROM_PYTHON_TOOL_CLASS_CONFIG_1]
+    ),
+    tool_collection_definitions=ToolCollectionDefinitionsConfig(),
+    models=[MODEL_CONFIG_1],
+    agent=BaseAgentConfig(tools=['tool_1'], tool_collections=[]),
+    managed_agents=[MANAGED_AGENT_CONFIG_1]
+)
+
+APP_CONFIG_WITH_CHANGED_TOOL_1 = dataclasses.replace(
+    APP_CONFIG_1,
+    tool_definitions=ToolDefinitionsConfig(
+        from_python_tool_class=[
+            dataclasses.replace(FROM_PYTHON_TOOL_CLASS_CONFIG_1, description='Description 2')
+        ]
+    )
+)
+
+
+def get_tool_agent_factory(
+    app_config: AppConfig,
+    tool_resolver: ConfigToolResolver,
+    model_registry: SmolAgentsModelRegistry
+) -> MagicMock:
+    agent_factory = MagicMock(name='agent_factory')
+    agent_factory.tools = tool_resolver.get_tools_by_name(app_config.agent.tools)
+    agent_factory.model_registry = model_registry
+    return agent_factory
+
+
+def get_app_config_reloader(
+    load_app_config_fn: MagicMock,
+    agent_factory: ReloadableAgentFactory,
+    answer_cache: Optional[AnswerCache] = None
+) -> AppConfigReloader:
+    return AppConfigReloader(
+        app_config=APP_CONFIG_1,
+        tool_resolver=ConfigToolResolver(
+            tool_definitions_config=APP_CONFIG_1.tool_definitions
+        ),
+        model_registry=SmolAgentsModelRegistry(APP_CONFIG_1.models),
+        agent_factory=agent_factory,
+        get_agent_factory_for_config=get_tool_agent_factory,
+        load_app_config_fn=load_app_config_fn,
+        unused_mcp_session_pool_close_delay=0,
+        answer_cache=answer_cache
+    )
+
+
+class TestGetAppConfigChanges:
+    def test_should_return_no_changes_for_same_config(self):
+        changes = get_app_config_changes(APP_CONFIG_1, dataclasses.replace(APP_CONFIG_1))
+        assert not changes
+        assert changes == AppConfigChanges()
+
+    def test_should_return_changed_tool_names(self):
+        changes = get_app_config_changes(APP_CONFIG_1, APP_CONFIG_WITH_CHANGED_TOOL_1)
+        assert changes == AppConfigChanges(tool_names=['tool_1'])
+
+    def test_should_return_changed_model_and_agent_names(self):
+        changes = get_app_config_changes(APP_CONFIG_1, dataclasses.replace(
+            APP_CONFIG_1,
+            models=[dataclasses.replace(MODEL_CONFIG_1, base_url='base_url_2')],
+            agent=BaseAgentConfig(tools=[], tool_collections=[]),
+            managed_agents=[]
+        ))
+        assert changes == AppConfigChanges(
+            model_names=['model_1'],
+            agent_names=[MAIN_AGENT_NAME, 'managed_agent_1']
+        )
+
+
+class TestAppConfigReloader:
+    def test_should_not_replace_agent_factory_if_config_unchanged(self):
+        initial_agent_factory = MagicMock(name='initial_agent_factory')
+        agent_factory = ReloadableAgentFactory(initial_agent_factory)
+        reloader = get_app_config_reloader(
+            MagicMock(name='load_app_config', return_value=APP_CONFIG_1),
+            agent_factory
+        )
+        assert reloader.reload() is False
+        assert agent_factory.get_agent_factory() is initial_agent_factory
+
+    def test_should_replace_agent_factory_and_reuse_unchanged_models(self):
+        agent_factory = ReloadableAgentFactory(MagicMock(name='initial_agent_factory'))
+        reloader = get_app_config_reloader(
+            MagicMock(name='load_app_config', return_value=APP_CONFIG_WITH_CHANGED_TOOL_1),
+            agent_factory
+        )
+        model = reloader.model_registry.get_model('model_1')
+        assert reloader.reload() is True
+        reloaded_agent_factory = agent_factory.get_agent_factory()
+        assert isinstance(reloaded_agent_factory, MagicMock)
+        assert reloaded_agent_factory.tools[0].description == 'Description 2'
+        assert reloaded_agent_factory.model_registry.get_model('model_1') is model
+        assert reloader.app_config == APP_CONFIG_WITH_CHANGED_TOOL_1
+
+    def test_should_invalidate_cached_answers_using_changed_tools(self):
+        answer_cache = AnswerCache(AnswerCacheConfig())
+        answer_cache.set('Question 1', 'Answer 1', tool_names=['tool_1'])
+        answer_cache.set('Question 2', 'Answer 2', tool_names=['tool_2'])
+        reloader = get_app_config_reloader(
+            MagicMock(name='load_app_config', return_value=APP_CONFIG_WITH_CHANGED_TOOL_1),
+            ReloadableAgentFactory(MagicMock(name='initial_agent_factory')),
+            answer_cache=answer_cache
+        )
+        assert reloader.reload() is True
+        assert answer_cache.get('Question 1') is None
+        assert answer_cache.get('Question 2') is not None
+
+    def test_should_clear_cached_answers_if_agent_changed(self):
+        answer_cache = AnswerCache(AnswerCacheConfig())
+        answer_cache.set('Question 1', 'Answer 1')
+        reloader = get_app_config_reloader(
+            MagicMock(name='load_app_config', return_value=dataclasses.replace(
+                APP_CONFIG_1,
+                agent=BaseAgentConfig(tools=[], tool_collections=[])
+            )),
+            ReloadableAgentFactory(MagicMock(name='initial_agent_factory')),
+            answer_cache=answer_cache
+        )
+        assert reloader.reload() is True
+        assert answer_cache.get('Question 1') is None
+        assert answer_cache.get_stats().invalidated_count == 1
+
+    def test_should_keep_agent_factory_if_reload_failed(self):
+        initial_agent_factory = MagicMock(name='initial_agent_factory')
+        agent_factory = ReloadableAgentFactory(initial_agent_factory)
+        reloader = get_app_config_reloader(
+            MagicMock(name='load_app_config', side_effect=ValueError('invalid config')),
+            agent_factory
+        )
+        assert reloader.reload() is False
+        assert agent_factory.get_agent_factory() is initial_agent_factory
+        assert reloader.app_config == APP_CONFIG_1
+
+
+class TestConfigFileWatcher:
+    def test_should_call_on_change_if_file_was_modified(self, tmp_path: Path):
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text('version: 1', encoding='utf-8')
+        on_change = MagicMock(name='on_change')
+        watcher = ConfigFileWatcher(str(config_file), on_change=on_change)
+        assert watcher.check_once() is False
+        modified_time_ns = config_file.stat().st_mtime_ns + 1_000_000_000
+        config_file.write_text('version: 2', encoding='utf-8')
+        # making sure the modified time changes, even on file systems with a low resolution
+        os.utime(config_file, ns=(modified_time_ns, modified_time_ns))
+        assert watcher.check_once() is True
+        on_change.assert_called_once()
+        assert watcher.check_once() is False
+
+    def test_should_call_on_change_if_reload_was_requested(self, tmp_path: Path):
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text('version: 1', encoding='utf-8')
+        on_change = MagicMock(name='on_change')
+        watcher = ConfigFileWatcher(str(config_file), on_change=on_change)
+        watcher.request_reload()
+        assert watcher.check_once() is True
+        on_change.assert_called_once()
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+
+from data_ai_bot.config import FromMcpConfig, ResolvedAgentConfig
+from data_ai_bot.config_snapshot import (
+    ConfigSnapshot,
+    get_file_sha256,
+    load_config_snapshot,
+    save_config_snapshot
+)
+from data_ai_bot.tools.mcp import McpToolSchema
+
+
+TOOL_SCHEMA_1 = McpToolSchema(
+    name='tool_1',
+    description='Description 1',
+    inputs={'query': {'type': 'string', 'description': 'The query'}},
+    output_type='string'
+)
+
+RESOLVED_AGENT_CONFIG_1 = ResolvedAgentConfig(
+    tool_names=['tool_1', 'final_answer'],
+    managed_agent_names=[],
+    rendered_system_prompt='Rendered system prompt 1',
+    system_prompt_inputs_sha256='sha256_2'
+)
+
+CONFIG_SNAPSHOT_1 = ConfigSnapshot(
+    app_config_dict={'agent': {'tools': ['tool_1']}},
+    config_sha256='sha256_1',
+    mcp_tool_schemas_by_name={'mcp_1': [TOOL_SCHEMA_1]},
+    resolved_agent_config_by_name={'__main__': RESOLVED_AGENT_CONFIG_1}
+)
+
+
+class TestConfigSnapshot:
+    def test_should_convert_to_and_from_dict(self):
+        assert ConfigSnapshot.from_dict(CONFIG_SNAPSHOT_1.to_dict()) == CONFIG_SNAPSHOT_1
+
+    def test_should_ignore_system_prompts_of_previous_snapshots(self):
+        assert ConfigSnapshot.from_dict({
+            **CONFIG_SNAPSHOT_1.to_dict(),
+            'systemPrompts': {'__main__': 'System prompt 1'}
+        }) == CONFIG_SNAPSHOT_1
+
+    def test_should_reject_unsupported_version(self):
+        with pytest.raises(ValueError):
+            ConfigSnapshot.from_dict({**CONFIG_SNAPSHOT_1.to_dict(), 'version': -1})
+
+    def test_should_load_app_config(self):
+        assert CONFIG_SNAPSHOT_1.get_app_config().agent.tools == ['tool_1']
+
+    def test_should_load_app_config_with_resolved_agents(self):
+        assert CONFIG_SNAPSHOT_1.get_app_config().resolved_agent_config_by_name == {
+            '__main__': RESOLVED_AGENT_CONFIG_1
+        }
+
+    def test_should_provide_mcp_tool_schemas(self):
+        mcp_tool_schema_store = CONFIG_SNAPSHOT_1.get_mcp_tool_schema_store()
+        assert mcp_tool_schema_store.load(
+            FromMcpConfig(name='mcp_1', url='url_1', transport='sse')
+        ) == [TOOL_SCHEMA_1]
+
+    def test_should_check_whether_up_to_date(self, tmp_path: Path):
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text('agent: {}', encoding='utf-8')
+        config_snapshot = ConfigSnapshot(
+            app_config_dict=CONFIG_SNAPSHOT_1.app_config_dict,
+            config_sha256=get_file_sha256(str(config_file))
+        )
+        assert config_snapshot.is_up_to_date(str(config_file))
+        config_file.write_text('agent: {tools: []}', encoding='utf-8')
+        assert not config_snapshot.is_up_to_date(str(config_file))
+
+
+class TestSaveAndLoadConfigSnapshot:
+    def test_should_save_and_load_config_snapshot(self, tmp_path: Path):
+        config_snapshot_file = str(tmp_path / 'snapshot.json')
+        save_config_snapshot(CONFIG_SNAPSHOT_1, config_snapshot_file)
+        assert load_config_snapshot(config_snapshot_file) == CONFIG_SNAPSHOT_1
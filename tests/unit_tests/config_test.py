@@ -3,16 +3,24 @@ from pathlib import Path
 import yaml
 
 from data_ai_bot.config import (
+    AnswerCacheConfig,
     BaseAgentConfig,
     AppConfig,
     EnvironmentVariables,
     FromMcpConfig,
     FromPythonToolClassConfig,
     FromPythonToolInstanceConfig,
+    IntentConfig,
     ManagedAgentConfig,
     ModelConfig,
+    ModelHedgingConfig,
+    ModelRateLimitConfig,
+    ModelResponseCacheConfig,
+    ModelRoutingConfig,
+    ModelTierConfig,
     ToolCollectionDefinitionsConfig,
     ToolDefinitionsConfig,
+    get_eager_tool_definitions_config,
     load_app_config
 )
 from data_ai_bot.config_typing import (
@@ -123,6 +131,24 @@ class TestFromPythonToolClassConfig:
         })
         assert tool_config.description == 'Description 1'
 
+    def test_should_load_per_agent_flag(self):
+        assert not FromPythonToolClassConfig.from_dict(
+            FROM_PYTHON_TOOL_CLASS_CONFIG_DICT_1
+        ).per_agent
+        assert FromPythonToolClassConfig.from_dict({
+            **FROM_PYTHON_TOOL_CLASS_CONFIG_DICT_1,
+            'perAgent': True
+        }).per_agent
+
+    def test_should_load_lazy_flag(self):
+        assert not FromPythonToolClassConfig.from_dict(
+            FROM_PYTHON_TOOL_CLASS_CONFIG_DICT_1
+        ).lazy
+        assert FromPythonToolClassConfig.from_dict({
+            **FROM_PYTHON_TOOL_CLASS_CONFIG_DICT_1,
+            'lazy': True
+        }).lazy
+
 
 class TestToolDefinitionsConfig:
     def test_should_be_falsy_if_empty(self):
@@ -152,6 +178,20 @@ class TestToolDefinitionsConfig:
         assert bool(tool_config) is True
 
 
+class TestGetEagerToolDefinitionsConfig:
+    def test_should_disable_lazy_tools(self):
+        tool_definitions_config = get_eager_tool_definitions_config(ToolDefinitionsConfig(
+            from_python_tool_class=[FromPythonToolClassConfig.from_dict({
+                **FROM_PYTHON_TOOL_CLASS_CONFIG_DICT_1,
+                'lazy': True
+            })]
+        ))
+        assert [
+            tool_config.lazy
+            for tool_config in tool_definitions_config.from_python_tool_class
+        ] == [False]
+
+
 class TestFromMcpConfig:
     def test_should_load_mcp_config(self):
         mcp_config = FromMcpConfig.from_dict(
@@ -167,6 +207,28 @@ class TestFromMcpConfig:
         })
         assert mcp_config.tools == ['tool_1']
 
+    def test_should_default_to_one_session(self):
+        mcp_config = FromMcpConfig.from_dict(FROM_MCP_CONFIG_DICT_1)
+        assert mcp_config.session_count == 1
+
+    def test_should_load_session_count(self):
+        mcp_config = FromMcpConfig.from_dict({
+            **FROM_MCP_CONFIG_DICT_1,
+            'sessionCount': 2
+        })
+        assert mcp_config.session_count == 2
+
+    def test_should_not_retry_tool_calls_by_default(self):
+        mcp_config = FromMcpConfig.from_dict(FROM_MCP_CONFIG_DICT_1)
+        assert mcp_config.retry_tool_calls is False
+
+    def test_should_load_retry_tool_calls(self):
+        mcp_config = FromMcpConfig.from_dict({
+            **FROM_MCP_CONFIG_DICT_1,
+            'retryToolCalls': True
+        })
+        assert mcp_config.retry_tool_calls is True
+
 
 class TestToolCollectionDefinitionsConfig:
     def test_should_be_falsy_if_empty(self):
@@ -225,6 +287,42 @@ class TestModelConfig:
         })
         assert model_config.api_key == 'api_key_1'
 
+    def test_should_not_have_fallback_models_or_hedging_by_default(self):
+        model_config = ModelConfig.from_dict(MODEL_CONFIG_DICT_1)
+        assert model_config.fallback_model_names == []
+        assert model_config.hedging is None
+
+    def test_should_load_fallback_model_names_and_hedging(self):
+        model_config = ModelConfig.from_dict({
+            **MODEL_CONFIG_DICT_1,
+            'fallback_model_names': ['model_2'],
+            'hedging': {'delay_percentile': 90}
+        })
+        assert model_config.fallback_model_names == ['model_2']
+        assert model_config.hedging == ModelHedgingConfig(delay_percentile=90)
+
+    def test_should_load_rate_limit(self):
+        model_config = ModelConfig.from_dict({
+            **MODEL_CONFIG_DICT_1,
+            'rate_limit': {'requests_per_minute': 60, 'max_concurrency': 4}
+        })
+        assert model_config.rate_limit == ModelRateLimitConfig(
+            requests_per_minute=60,
+            max_concurrency=4
+        )
+
+    def test_should_load_temperature_and_response_cache(self):
+        model_config = ModelConfig.from_dict({
+            **MODEL_CONFIG_DICT_1,
+            'temperature': 0,
+            'response_cache': {'ttl': 60, 'cache_dir': 'cache_dir_1'}
+        })
+        assert model_config.temperature == 0
+        assert model_config.response_cache == ModelResponseCacheConfig(
+            ttl=60,
+            cache_dir='cache_dir_1'
+        )
+
 
 class TestBaseAgentConfig:
     def test_should_load_tools(self):
@@ -263,6 +361,70 @@ class TestBaseAgentConfig:
         })
         assert agent_config.model_name == 'model_1'
 
+    def test_should_load_model_routing(self):
+        agent_config = BaseAgentConfig.from_dict({
+            **BASE_AGENT_CONFIG_DICT_1,
+            'model': 'large_model_1',
+            'modelRouting': {
+                'tiers': [{
+                    'model': 'small_model_1',
+                    'description': 'Simple questions',
+                    'maxMessageLength': 200,
+                    'maxPreviousMessageCount': 2
+                }],
+                'classifierModel': 'small_model_1'
+            }
+        })
+        assert agent_config.model_routing == ModelRoutingConfig(
+            tiers=[ModelTierConfig(
+                model_name='small_model_1',
+                description='Simple questions',
+                max_message_length=200,
+                max_previous_message_count=2
+            )],
+            classifier_model_name='small_model_1'
+        )
+
+    def test_should_load_intents(self):
+        agent_config = BaseAgentConfig.from_dict({
+            **BASE_AGENT_CONFIG_DICT_1,
+            'intents': [{
+                'name': 'docmap',
+                'patterns': [r'docmap of (?P<id>\d+)'],
+                'tool': 'get_docmap_by_manuscript_id',
+                'toolArguments': {'manuscript_id': '{{ id }}'},
+                'responseTemplate': '{{ result }}'
+            }]
+        })
+        assert agent_config.intents == [IntentConfig(
+            name='docmap',
+            patterns=[r'docmap of (?P<id>\d+)'],
+            tool='get_docmap_by_manuscript_id',
+            tool_arguments={'manuscript_id': '{{ id }}'},
+            response_template='{{ result }}'
+        )]
+
+    def test_should_load_answer_cache(self):
+        agent_config = BaseAgentConfig.from_dict({
+            **BASE_AGENT_CONFIG_DICT_1,
+            'answerCache': {
+                'similarityThreshold': 0.8,
+                'ttl': 600,
+                'ttlByToolName': {'tool_1': 60},
+                'freshAnswerKeywords': ['!refresh']
+            }
+        })
+        assert agent_config.answer_cache == AnswerCacheConfig(
+            similarity_threshold=0.8,
+            ttl=600,
+            ttl_by_tool_name={'tool_1': 60},
+            fresh_answer_keywords=['!refresh']
+        )
+
+    def test_should_not_use_model_routing_by_default(self):
+        agent_config = BaseAgentConfig.from_dict(BASE_AGENT_CONFIG_DICT_1)
+        assert agent_config.model_routing is None
+
 
 class TestManagedAgentConfig:
     def test_should_load_name_and_description(self):
@@ -0,0 +1,171 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+import smolagents  # type: ignore[import-untyped]
+
+from data_ai_bot.agent_factory import ReloadableAgentFactory
+from data_ai_bot.config import IntentConfig
+from data_ai_bot.intents import (
+    Intent,
+    IntentAgentFactory,
+    get_intent_response_for_message,
+    get_normalized_intent_message
+)
+
+
+class DocMapTool(smolagents.Tool):
+    __test__ = False
+
+    skip_forward_signature_validation = True
+    name = 'get_docmap_by_manuscript_id'
+    description = 'Get DocMap'
+    inputs = {
+        'manuscript_id': {
+            'type': 'integer',
+            'description': 'Manuscript id'
+        }
+    }
+    output_type = 'string'
+
+    def __init__(self):
+        super().__init__()
+        self.forward_mock = MagicMock(name='forward_mock', return_value='DocMap 1')
+
+    def forward(self, *args, **kwargs):
+        return self.forward_mock(*args, **kwargs)
+
+
+DOCMAP_INTENT_CONFIG = IntentConfig(
+    name='docmap',
+    patterns=[r'docmap (?:of|for) (?P<manuscript_id>\d+)']
+)
+
+HELP_INTENT_CONFIG = IntentConfig(
+    name='help',
+    patterns=[r'how (?:do I |to )use this( bot)?\??'],
+    response_template='Just ask a question.'
+)
+
+
+def get_intent_agent_factory(intents: list[Intent]) -> IntentAgentFactory:
+    return IntentAgentFactory(
+        agent_factory=MagicMock(name='agent_factory'),
+        intents=intents
+    )
+
+
+class TestGetNormalizedIntentMessage:
+    def test_should_remove_user_mentions_and_whitespace(self):
+        assert get_normalized_intent_message('<@U123> DocMap of 101859\n') == 'DocMap of 101859'
+
+
+class TestIntent:
+    def test_should_return_named_groups_of_matching_pattern(self):
+        assert Intent(DOCMAP_INTENT_CONFIG).get_variables('DocMap of 101859') == {
+            'manuscript_id': '101859'
+        }
+
+    def test_should_only_match_whole_message(self):
+        assert Intent(DOCMAP_INTENT_CONFIG).get_variables(
+            'What is the DocMap of 101859 about?'
+        ) is None
+
+    def test_should_call_tool_with_converted_named_groups(self):
+        tool = DocMapTool()
+        response = Intent(DOCMAP_INTENT_CONFIG, tool=tool).get_response({
+            'manuscript_id': '101859'
+        })
+        assert response == 'DocMap 1'
+        tool.forward_mock.assert_called_once_with(manuscript_id=101859)
+
+    def test_should_format_non_string_tool_result_as_json(self):
+        tool = DocMapTool()
+        tool.forward_mock.return_value = {'manuscript_id': 101859, 'steps': [1]}
+        intent = Intent(DOCMAP_INTENT_CONFIG, tool=tool)
+        assert intent.get_response({'manuscript_id': '101859'}) == json.dumps(
+            {'manuscript_id': 101859, 'steps': [1]},
+            indent=2
+        )
+
+    def test_should_raise_tool_error(self):
+        tool = DocMapTool()
+        tool.forward_mock.side_effect = RuntimeError('not found')
+        intent = Intent(DOCMAP_INTENT_CONFIG, tool=tool)
+        with pytest.raises(RuntimeError):
+            intent.get_response({'manuscript_id': '101859'})
+
+    def test_should_return_tool_result_starting_with_error(self):
+        tool = DocMapTool()
+        tool.forward_mock.return_value = 'Error codes: none'
+        intent = Intent(DOCMAP_INTENT_CONFIG, tool=tool)
+        assert intent.get_response({'manuscript_id': '101859'}) == 'Error codes: none'
+
+    def test_should_render_tool_arguments_and_response_template(self):
+        tool = DocMapTool()
+        intent = Intent(
+            IntentConfig(
+                name='docmap',
+                patterns=[r'docmap (?:of|for) (?P<id>\d+)'],
+                tool_arguments={'manuscript_id': '{{ id }}'},
+                response_template='DocMap of {{ id }}: {{ result }}'
+            ),
+            tool=tool
+        )
+        assert intent.get_response({'id': '101859'}) == 'DocMap of 101859: DocMap 1'
+        tool.forward_mock.assert_called_once_with(manuscript_id=101859)
+
+    def test_should_notify_tool_call_event_handler(self):
+        tool_call_event_handler = MagicMock(name='tool_call_event_handler')
+        Intent(DOCMAP_INTENT_CONFIG, tool=DocMapTool()).get_response(
+            {'manuscript_id': '101859'},
+            tool_call_event_handler=tool_call_event_handler
+        )
+        event_names = [
+            call.args[0].event_name
+            for call in tool_call_event_handler.call_args_list
+        ]
+        assert event_names == ['before_call', 'success']
+
+
+class TestIntentAgentFactory:
+    def test_should_return_response_of_matching_intent(self):
+        agent_factory = get_intent_agent_factory([
+            Intent(DOCMAP_INTENT_CONFIG, tool=DocMapTool()),
+            Intent(HELP_INTENT_CONFIG)
+        ])
+        assert agent_factory.get_intent_response_for_message(
+            'How do I use this bot?'
+        ) == 'Just ask a question.'
+
+    def test_should_return_none_if_no_intent_matches(self):
+        agent_factory = get_intent_agent_factory([Intent(HELP_INTENT_CONFIG)])
+        assert agent_factory.get_intent_response_for_message('Something else') is None
+
+    def test_should_return_none_if_tool_fails(self):
+        tool = DocMapTool()
+        tool.forward_mock.side_effect = RuntimeError('tool failed')
+        agent_factory = get_intent_agent_factory([Intent(DOCMAP_INTENT_CONFIG, tool=tool)])
+        assert agent_factory.get_intent_response_for_message('DocMap of 101859') is None
+
+    def test_should_return_none_if_tool_raises_validation_error(self):
+        tool = DocMapTool()
+        tool.forward_mock.side_effect = ValueError('Invalid manuscript id')
+        agent_factory = get_intent_agent_factory([Intent(DOCMAP_INTENT_CONFIG, tool=tool)])
+        assert agent_factory.get_intent_response_for_message('DocMap of 1') is None
+
+
+class TestGetIntentResponseForMessage:
+    def test_should_return_none_without_intents(self):
+        assert get_intent_response_for_message(
+            MagicMock(name='agent_factory'),
+            'How do I use this bot?'
+        ) is None
+
+    def test_should_use_current_agent_factory_of_reloadable_agent_factory(self):
+        agent_factory = get_intent_agent_factory([Intent(HELP_INTENT_CONFIG)])
+        assert get_intent_response_for_message(
+            ReloadableAgentFactory(agent_factory),
+            'How to use this?'
+        ) == 'Just ask a question.'
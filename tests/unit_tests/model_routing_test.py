@@ -0,0 +1,134 @@
+from unittest.mock import MagicMock
+
+import smolagents  # type: ignore[import-untyped]
+
+from data_ai_bot.agent_factory import ReloadableAgentFactory
+from data_ai_bot.config import ModelTierConfig
+from data_ai_bot.model_routing import (
+    ModelTier,
+    TieredAgentFactory,
+    get_agent_factories_for_message,
+    is_model_tier_applicable
+)
+
+
+SMALL_MODEL_TIER_CONFIG = ModelTierConfig(
+    model_name='small_model_1',
+    description='Simple questions',
+    max_message_length=20,
+    max_previous_message_count=0
+)
+
+
+def get_tiered_agent_factory(
+    classifier_model: smolagents.Model | None = None
+) -> TieredAgentFactory:
+    return TieredAgentFactory(
+        default_agent_factory=MagicMock(name='default_agent_factory'),
+        model_tiers=[ModelTier(
+            config=SMALL_MODEL_TIER_CONFIG,
+            agent_factory=MagicMock(name='small_agent_factory')
+        )],
+        classifier_model=classifier_model
+    )
+
+
+def get_classifier_model_mock(content: str) -> MagicMock:
+    classifier_model = MagicMock(name='classifier_model')
+    classifier_model.generate.return_value = smolagents.ChatMessage(
+        role='assistant',
+        content=content
+    )
+    return classifier_model
+
+
+class TestIsModelTierApplicable:
+    def test_should_return_true_within_limits(self):
+        assert is_model_tier_applicable(SMALL_MODEL_TIER_CONFIG, 'Short question', [])
+
+    def test_should_return_false_for_long_message(self):
+        assert not is_model_tier_applicable(SMALL_MODEL_TIER_CONFIG, 'Long question ' * 10, [])
+
+    def test_should_return_false_for_too_many_previous_messages(self):
+        assert not is_model_tier_applicable(
+            SMALL_MODEL_TIER_CONFIG,
+            'Short question',
+            ['Previous 1']
+        )
+
+    def test_should_return_true_without_limits(self):
+        assert is_model_tier_applicable(
+            ModelTierConfig(model_name='small_model_1'),
+            'Long question ' * 10,
+            ['Previous 1']
+        )
+
+
+class TestTieredAgentFactory:
+    def test_should_use_default_agent_factory_if_called_directly(self):
+        default_agent_factory = MagicMock(name='default_agent_factory')
+        agent_factory = TieredAgentFactory(
+            default_agent_factory=default_agent_factory,
+            model_tiers=[]
+        )
+        tool_call_event_handler = MagicMock(name='tool_call_event_handler')
+        agent = agent_factory(tool_call_event_handler=tool_call_event_handler)
+        assert agent == default_agent_factory.return_value
+        default_agent_factory.assert_called_once_with(
+            tool_call_event_handler=tool_call_event_handler
+        )
+
+    def test_should_route_simple_request_to_small_model_tier_and_escalate(self):
+        agent_factory = get_tiered_agent_factory()
+        assert agent_factory.get_agent_factories_for_message('Short question', []) == [
+            agent_factory.model_tiers[0].agent_factory,
+            agent_factory.default_agent_factory
+        ]
+
+    def test_should_route_complex_request_to_default_agent_factory(self):
+        agent_factory = get_tiered_agent_factory()
+        assert agent_factory.get_agent_factories_for_message('Long question ' * 10, []) == [
+            agent_factory.default_agent_factory
+        ]
+
+    def test_should_use_model_tier_chosen_by_classifier(self):
+        classifier_model = get_classifier_model_mock('small_model_1')
+        agent_factory = get_tiered_agent_factory(classifier_model=classifier_model)
+        assert agent_factory.get_model_tier('Short question', []) == agent_factory.model_tiers[0]
+        messages = classifier_model.generate.call_args.args[0]
+        assert 'small_model_1: Simple questions' in messages[0].content
+        assert messages[1].content == 'Short question'
+
+    def test_should_use_default_if_chosen_by_classifier(self):
+        agent_factory = get_tiered_agent_factory(
+            classifier_model=get_classifier_model_mock('default')
+        )
+        assert agent_factory.get_model_tier('Short question', []) is None
+
+    def test_should_use_default_if_classifier_fails(self):
+        classifier_model = MagicMock(name='classifier_model')
+        classifier_model.generate.side_effect = RuntimeError('classifier failed')
+        agent_factory = get_tiered_agent_factory(classifier_model=classifier_model)
+        assert agent_factory.get_model_tier('Short question', []) is None
+
+    def test_should_not_call_classifier_if_no_model_tier_applicable(self):
+        classifier_model = get_classifier_model_mock('small_model_1')
+        agent_factory = get_tiered_agent_factory(classifier_model=classifier_model)
+        assert agent_factory.get_model_tier('Long question ' * 10, []) is None
+        classifier_model.generate.assert_not_called()
+
+
+class TestGetAgentFactoriesForMessage:
+    def test_should_return_agent_factory_without_routing(self):
+        agent_factory = MagicMock(name='agent_factory')
+        assert get_agent_factories_for_message(agent_factory, 'Question 1', []) == [
+            agent_factory
+        ]
+
+    def test_should_use_current_agent_factory_of_reloadable_agent_factory(self):
+        agent_factory = get_tiered_agent_factory()
+        assert get_agent_factories_for_message(
+            ReloadableAgentFactory(agent_factory),
+            'Short question',
+            []
+        ) == agent_factory.get_agent_factories_for_message('Short question', [])
@@ -0,0 +1,216 @@
+import threading
+from unittest.mock import MagicMock
+
+import httpx2
+import openai
+import pytest
+
+import smolagents  # type: ignore[import-untyped]
+
+from data_ai_bot.config import ModelRateLimitConfig
+from data_ai_bot.models.admission import (
+    ModelAdmissionController,
+    ModelAdmissionTimeoutError,
+    RateLimitedModel,
+    TokenBucket,
+    is_model_overload_error
+)
+
+
+MESSAGES_1 = [smolagents.ChatMessage(role='user', content='Question 1')]
+
+CHAT_MESSAGE_1 = smolagents.ChatMessage(
+    role='assistant',
+    content='Answer 1',
+    token_usage=smolagents.TokenUsage(input_tokens=100, output_tokens=100)
+)
+
+
+def get_rate_limit_error() -> openai.RateLimitError:
+    request = httpx2.Request('POST', 'http://localhost/v1/chat/completions')
+    return openai.RateLimitError(
+        'Too Many Requests',
+        response=httpx2.Response(429, request=request),
+        body=None
+    )
+
+
+def get_model_mock() -> MagicMock:
+    model = MagicMock(name='model')
+    model.model_id = 'model_1'
+    model.generate.return_value = CHAT_MESSAGE_1
+    return model
+
+
+class TestIsModelOverloadError:
+    def test_should_return_true_for_rate_limit_and_timeout_errors(self):
+        assert is_model_overload_error(get_rate_limit_error())
+        assert is_model_overload_error(TimeoutError())
+
+    def test_should_return_false_for_other_errors(self):
+        assert not is_model_overload_error(ValueError('invalid'))
+        assert not is_model_overload_error(ModelAdmissionTimeoutError())
+
+
+class TestTokenBucket:
+    def test_should_not_wait_if_tokens_available(self):
+        token_bucket = TokenBucket(rate_per_minute=60)
+        assert token_bucket.get_wait_seconds(10, now=token_bucket.updated_time) == 0
+
+    def test_should_wait_for_missing_tokens(self):
+        token_bucket = TokenBucket(rate_per_minute=60)
+        now = token_bucket.updated_time
+        token_bucket.consume(60, now)
+        assert token_bucket.get_wait_seconds(2, now) == pytest.approx(2)
+        assert token_bucket.get_wait_seconds(2, now + 2) == 0
+
+    def test_should_admit_request_larger_than_capacity_when_full(self):
+        token_bucket = TokenBucket(rate_per_minute=60)
+        assert token_bucket.get_wait_seconds(1000, now=token_bucket.updated_time) == 0
+
+
+class TestModelAdmissionController:
+    def test_should_fail_after_queue_timeout_if_requests_per_minute_exceeded(self):
+        controller = ModelAdmissionController(
+            ModelRateLimitConfig(requests_per_minute=1, queue_timeout=0.01),
+            name='model_1'
+        )
+        controller.acquire()
+        controller.release()
+        with pytest.raises(ModelAdmissionTimeoutError):
+            controller.acquire()
+        stats = controller.get_stats()
+        assert stats.admitted_count == 1
+        assert stats.rejected_count == 1
+        assert stats.waiting_count == 0
+
+    def test_should_wait_for_concurrency_slot(self):
+        controller = ModelAdmissionController(
+            ModelRateLimitConfig(max_concurrency=1),
+            name='model_1'
+        )
+        controller.acquire()
+        timer = threading.Timer(0.05, controller.release)
+        timer.start()
+        controller.acquire(timeout=5)
+        timer.join()
+        stats = controller.get_stats()
+        assert stats.admitted_count == 2
+        assert stats.active_count == 1
+        assert stats.max_queue_wait_seconds >= 0.04
+        assert stats.average_queue_wait_seconds > 0
+
+    def test_should_decrease_concurrency_limit_on_overload_and_increase_on_success(self):
+        controller = ModelAdmissionController(
+            ModelRateLimitConfig(max_concurrency=8, min_concurrency=2),
+            name='model_1'
+        )
+        for _ in range(3):
+            controller.acquire()
+            controller.release(is_overloaded=True)
+        assert controller.get_stats().concurrency_limit == 2
+        assert controller.get_stats().overload_count == 3
+        controller.acquire()
+        controller.release()
+        assert controller.get_stats().concurrency_limit == 2.5
+
+    def test_should_account_actual_token_usage(self):
+        controller = ModelAdmissionController(
+            ModelRateLimitConfig(tokens_per_minute=100, queue_timeout=0.01),
+            name='model_1'
+        )
+        controller.acquire(estimated_token_count=10)
+        controller.release(additional_token_count=90)
+        with pytest.raises(ModelAdmissionTimeoutError):
+            controller.acquire(estimated_token_count=10)
+
+
+class TestRateLimitedModel:
+    def test_should_delegate_and_release(self):
+        model = get_model_mock()
+        controller = ModelAdmissionController(ModelRateLimitConfig(), name='model_1')
+        rate_limited_model = RateLimitedModel(model, controller)
+        assert rate_limited_model.generate(MESSAGES_1, stop_sequences=['stop']) == CHAT_MESSAGE_1
+        model.generate.assert_called_once_with(MESSAGES_1, stop_sequences=['stop'])
+        stats = controller.get_stats()
+        assert stats.admitted_count == 1
+        assert stats.active_count == 0
+
+    def test_should_back_off_on_rate_limit_error(self):
+        model = get_model_mock()
+        model.generate.side_effect = get_rate_limit_error()
+        controller = ModelAdmissionController(
+            ModelRateLimitConfig(max_concurrency=4),
+            name='model_1'
+        )
+        rate_limited_model = RateLimitedModel(model, controller, retry_on_overload=False)
+        with pytest.raises(openai.RateLimitError):
+            rate_limited_model.generate(MESSAGES_1)
+        model.generate.assert_called_once()
+        stats = controller.get_stats()
+        assert stats.concurrency_limit == 2
+        assert stats.active_count == 0
+
+    def test_should_retry_after_rate_limit_error(self):
+        model = get_model_mock()
+        model.generate.side_effect = [get_rate_limit_error(), CHAT_MESSAGE_1]
+        controller = ModelAdmissionController(
+            ModelRateLimitConfig(max_concurrency=4),
+            name='model_1'
+        )
+        rate_limited_model = RateLimitedModel(model, controller, overload_retry_delay=0)
+        assert rate_limited_model.generate(MESSAGES_1) == CHAT_MESSAGE_1
+        assert model.generate.call_count == 2
+        stats = controller.get_stats()
+        assert stats.overload_count == 1
+        assert stats.admitted_count == 2
+        assert stats.active_count == 0
+
+    def test_should_fail_if_rate_limit_error_persists_until_queue_timeout(self):
+        model = get_model_mock()
+        model.generate.side_effect = get_rate_limit_error()
+        controller = ModelAdmissionController(
+            ModelRateLimitConfig(queue_timeout=0.05),
+            name='model_1'
+        )
+        rate_limited_model = RateLimitedModel(model, controller, overload_retry_delay=0.01)
+        with pytest.raises(openai.RateLimitError):
+            rate_limited_model.generate(MESSAGES_1)
+        assert model.generate.call_count > 1
+        assert controller.get_stats().active_count == 0
+
+    def test_should_not_retry_other_errors(self):
+        model = get_model_mock()
+        model.generate.side_effect = RuntimeError('other error')
+        controller = ModelAdmissionController(ModelRateLimitConfig(), name='model_1')
+        rate_limited_model = RateLimitedModel(model, controller, overload_retry_delay=0)
+        with pytest.raises(RuntimeError):
+            rate_limited_model.generate(MESSAGES_1)
+        model.generate.assert_called_once()
+        assert controller.get_stats().overload_count == 0
+
+    def test_should_retry_stream_after_rate_limit_error_before_first_chunk(self):
+        model = get_model_mock()
+        model.generate_stream.side_effect = [get_rate_limit_error(), iter(['chunk 1'])]
+        controller = ModelAdmissionController(ModelRateLimitConfig(), name='model_1')
+        rate_limited_model = RateLimitedModel(model, controller, overload_retry_delay=0)
+        assert list(rate_limited_model.generate_stream(MESSAGES_1)) == ['chunk 1']
+        assert model.generate_stream.call_count == 2
+        assert controller.get_stats().active_count == 0
+
+    def test_should_not_retry_stream_after_first_chunk(self):
+        def _generate_stream(*_args, **_kwargs):
+            yield 'chunk 1'
+            raise get_rate_limit_error()
+
+        model = get_model_mock()
+        model.generate_stream.side_effect = _generate_stream
+        controller = ModelAdmissionController(ModelRateLimitConfig(), name='model_1')
+        rate_limited_model = RateLimitedModel(model, controller, overload_retry_delay=0)
+        chunks = []
+        with pytest.raises(openai.RateLimitError):
+            for chunk in rate_limited_model.generate_stream(MESSAGES_1):
+                chunks.append(chunk)
+        assert chunks == ['chunk 1']
+        model.generate_stream.assert_called_once()
+        assert controller.get_stats().active_count == 0
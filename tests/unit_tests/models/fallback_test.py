@@ -0,0 +1,139 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+import smolagents  # type: ignore[import-untyped]
+
+from data_ai_bot.config import ModelHedgingConfig
+from data_ai_bot.models.fallback import FallbackModel, LatencyTracker, get_hedging_delay
+
+
+MESSAGES_1 = [smolagents.ChatMessage(role='user', content='Question 1')]
+
+CHAT_MESSAGE_1 = smolagents.ChatMessage(role='assistant', content='Answer 1')
+CHAT_MESSAGE_2 = smolagents.ChatMessage(role='assistant', content='Answer 2')
+
+HEDGING_CONFIG_1 = ModelHedgingConfig(
+    initial_delay=0.01,
+    min_delay=0.01,
+    min_sample_count=10
+)
+
+
+def get_model_mock(model_id: str, return_value: smolagents.ChatMessage) -> MagicMock:
+    model = MagicMock(name=model_id)
+    model.model_id = model_id
+    model.generate.return_value = return_value
+    return model
+
+
+class TestLatencyTracker:
+    def test_should_return_none_without_samples(self):
+        assert LatencyTracker().get_percentile(95) is None
+
+    def test_should_return_percentile(self):
+        latency_tracker = LatencyTracker()
+        for seconds in range(1, 101):
+            latency_tracker.add(float(seconds))
+        assert latency_tracker.get_percentile(95) == 95.0
+        assert latency_tracker.get_percentile(100) == 100.0
+
+    def test_should_only_keep_latest_samples(self):
+        latency_tracker = LatencyTracker(max_sample_count=2)
+        for seconds in [100.0, 1.0, 2.0]:
+            latency_tracker.add(seconds)
+        assert latency_tracker.get_percentile(100) == 2.0
+
+
+class TestGetHedgingDelay:
+    def test_should_use_initial_delay_without_enough_samples(self):
+        latency_tracker = LatencyTracker()
+        latency_tracker.add(100.0)
+        assert get_hedging_delay(HEDGING_CONFIG_1, latency_tracker) == 0.01
+
+    def test_should_use_percentile_with_min_delay(self):
+        latency_tracker = LatencyTracker()
+        for _ in range(10):
+            latency_tracker.add(0.001)
+        assert get_hedging_delay(HEDGING_CONFIG_1, latency_tracker) == 0.01
+        for _ in range(10):
+            latency_tracker.add(2.0)
+        assert get_hedging_delay(HEDGING_CONFIG_1, latency_tracker) == 2.0
+
+
+class TestFallbackModel:
+    def test_should_return_primary_model_response(self):
+        primary_model = get_model_mock('model_1', CHAT_MESSAGE_1)
+        fallback_model = get_model_mock('model_2', CHAT_MESSAGE_2)
+        model = FallbackModel([primary_model, fallback_model])
+        assert model.model_id == 'model_1'
+        assert model.generate(MESSAGES_1) == CHAT_MESSAGE_1
+        primary_model.generate.assert_called_once_with(MESSAGES_1)
+        fallback_model.generate.assert_not_called()
+
+    def test_should_fail_over_on_error(self):
+        primary_model = get_model_mock('model_1', CHAT_MESSAGE_1)
+        primary_model.generate.side_effect = RuntimeError('429 Too Many Requests')
+        fallback_model = get_model_mock('model_2', CHAT_MESSAGE_2)
+        model = FallbackModel([primary_model, fallback_model])
+        assert model.generate(MESSAGES_1, stop_sequences=['stop']) == CHAT_MESSAGE_2
+        fallback_model.generate.assert_called_once_with(MESSAGES_1, stop_sequences=['stop'])
+
+    def test_should_raise_last_error_if_all_models_failed(self):
+        primary_model = get_model_mock('model_1', CHAT_MESSAGE_1)
+        primary_model.generate.side_effect = RuntimeError('error 1')
+        fallback_model = get_model_mock('model_2', CHAT_MESSAGE_2)
+        fallback_model.generate.side_effect = RuntimeError('error 2')
+        model = FallbackModel([primary_model, fallback_model])
+        with pytest.raises(RuntimeError, match='error 2'):
+            model.generate(MESSAGES_1)
+
+    def test_should_not_hedge_if_primary_model_responds_in_time(self):
+        primary_model = get_model_mock('model_1', CHAT_MESSAGE_1)
+        fallback_model = get_model_mock('model_2', CHAT_MESSAGE_2)
+        model = FallbackModel(
+            [primary_model, fallback_model],
+            hedging_config=ModelHedgingConfig(initial_delay=10.0)
+        )
+        assert model.generate(MESSAGES_1) == CHAT_MESSAGE_1
+        fallback_model.generate.assert_not_called()
+        assert model.latency_tracker.get_sample_count() == 1
+
+    def test_should_hedge_and_use_first_response(self):
+        release_primary_model = threading.Event()
+        primary_model = get_model_mock('model_1', CHAT_MESSAGE_1)
+        primary_model.generate.side_effect = lambda *_args, **_kwargs: (
+            release_primary_model.wait(10) and CHAT_MESSAGE_1
+        )
+        fallback_model = get_model_mock('model_2', CHAT_MESSAGE_2)
+        model = FallbackModel([primary_model, fallback_model], hedging_config=HEDGING_CONFIG_1)
+        try:
+            assert model.generate(MESSAGES_1) == CHAT_MESSAGE_2
+            fallback_model.generate.assert_called_once_with(MESSAGES_1)
+        finally:
+            release_primary_model.set()
+
+    def test_should_wait_for_primary_model_if_hedged_request_failed(self):
+        release_primary_model = threading.Event()
+        primary_model = get_model_mock('model_1', CHAT_MESSAGE_1)
+        primary_model.generate.side_effect = lambda *_args, **_kwargs: (
+            release_primary_model.wait(10) and CHAT_MESSAGE_1
+        )
+        fallback_model = get_model_mock('model_2', CHAT_MESSAGE_2)
+
+        def fail_and_release_primary_model(*_args, **_kwargs):
+            release_primary_model.set()
+            raise RuntimeError('error 2')
+
+        fallback_model.generate.side_effect = fail_and_release_primary_model
+        model = FallbackModel([primary_model, fallback_model], hedging_config=HEDGING_CONFIG_1)
+        assert model.generate(MESSAGES_1) == CHAT_MESSAGE_1
+
+    def test_should_fail_over_stream_before_first_event(self):
+        primary_model = get_model_mock('model_1', CHAT_MESSAGE_1)
+        primary_model.generate_stream.side_effect = RuntimeError('error 1')
+        fallback_model = get_model_mock('model_2', CHAT_MESSAGE_2)
+        fallback_model.generate_stream.return_value = iter(['event_1', 'event_2'])
+        model = FallbackModel([primary_model, fallback_model])
+        assert list(model.generate_stream(MESSAGES_1)) == ['event_1', 'event_2']
@@ -0,0 +1,86 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+from typing import Iterator
+
+import pytest
+
+from data_ai_bot.models.http_client import ModelHttpClientPool
+
+
+class _ModelsRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = b'{"data": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture(name='base_url')
+def _base_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ModelsRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/v1'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(name='http_client_pool')
+def _http_client_pool() -> Iterator[ModelHttpClientPool]:
+    http_client_pool = ModelHttpClientPool()
+    yield http_client_pool
+    http_client_pool.close()
+
+
+class TestModelHttpClientPool:
+    def test_should_share_http_client_per_base_url(self, http_client_pool: ModelHttpClientPool):
+        http_client_1 = http_client_pool.get_http_client('http://host_1/v1')
+        assert http_client_pool.get_http_client('http://host_1/v1') is http_client_1
+        assert http_client_pool.get_http_client('http://host_2/v1') is not http_client_1
+
+    def test_should_create_single_http_client_concurrently(
+        self,
+        http_client_pool: ModelHttpClientPool
+    ):
+        http_clients = []
+        threads = [
+            threading.Thread(
+                target=lambda: http_clients.append(
+                    http_client_pool.get_http_client('http://host_1/v1')
+                )
+            )
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(http_client) for http_client in http_clients}) == 1
+        assert len(http_client_pool.get_stats()) == 1
+
+    def test_should_warm_up_and_keep_connection_alive(
+        self,
+        http_client_pool: ModelHttpClientPool,
+        base_url: str
+    ):
+        assert http_client_pool.warm_up(base_url, api_key='api_key_1') is True
+        assert http_client_pool.warm_up(base_url, api_key='api_key_1') is True
+        stats = http_client_pool.get_stats()
+        assert len(stats) == 1
+        assert stats[0].base_url == base_url
+        assert stats[0].request_count == 2
+        assert stats[0].connection_count == 1
+        assert stats[0].idle_connection_count == 1
+
+    def test_should_not_fail_warm_up_if_server_unavailable(
+        self,
+        http_client_pool: ModelHttpClientPool
+    ):
+        assert http_client_pool.warm_up('http://127.0.0.1:1/v1', timeout=1) is False
@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock
+
+import openai
+from openai.types.completion_usage import CompletionUsage, PromptTokensDetails
+
+from data_ai_bot.models.prompt_cache import (
+    PromptCacheStatsRecorder,
+    add_chat_completion_usage_handler,
+    get_cached_token_count
+)
+
+
+USAGE_WITH_CACHE_HIT = CompletionUsage(
+    prompt_tokens=1000,
+    completion_tokens=10,
+    total_tokens=1010,
+    prompt_tokens_details=PromptTokensDetails(cached_tokens=800)
+)
+
+USAGE_WITH_CACHE_MISS = CompletionUsage(
+    prompt_tokens=1000,
+    completion_tokens=10,
+    total_tokens=1010,
+    prompt_tokens_details=PromptTokensDetails(cached_tokens=0)
+)
+
+USAGE_WITHOUT_DETAILS = CompletionUsage(
+    prompt_tokens=1000,
+    completion_tokens=10,
+    total_tokens=1010
+)
+
+
+class TestGetCachedTokenCount:
+    def test_should_return_cached_tokens(self):
+        assert get_cached_token_count(USAGE_WITH_CACHE_HIT) == 800
+
+    def test_should_return_none_if_not_reported(self):
+        assert get_cached_token_count(USAGE_WITHOUT_DETAILS) is None
+
+
+class TestPromptCacheStatsRecorder:
+    def test_should_calculate_hit_rate_and_cached_token_ratio(self):
+        recorder = PromptCacheStatsRecorder()
+        recorder.record(USAGE_WITH_CACHE_HIT)
+        recorder.record(USAGE_WITH_CACHE_MISS)
+        recorder.record(USAGE_WITHOUT_DETAILS)
+        stats = recorder.get_stats()
+        assert stats.request_count == 3
+        assert stats.reported_request_count == 2
+        assert stats.hit_count == 1
+        assert stats.hit_rate == 0.5
+        assert stats.cached_token_ratio == 0.4
+
+    def test_should_return_zero_rates_without_requests(self):
+        stats = PromptCacheStatsRecorder().get_stats()
+        assert stats.hit_rate == 0.0
+        assert stats.cached_token_ratio == 0.0
+
+
+class TestAddChatCompletionUsageHandler:
+    def test_should_handle_usage_of_response(self):
+        client = openai.OpenAI(api_key='api_key_1', base_url='http://localhost/v1')
+        response = MagicMock(name='response', usage=USAGE_WITH_CACHE_HIT)
+        client.chat.completions.create = MagicMock(  # type: ignore[method-assign]
+            return_value=response
+        )
+        usage_handler = MagicMock(name='usage_handler')
+        add_chat_completion_usage_handler(client, usage_handler)
+        assert client.chat.completions.create(model='model_1', messages=[]) is response
+        usage_handler.assert_called_once_with(USAGE_WITH_CACHE_HIT)
+
+    def test_should_handle_usage_of_last_stream_event(self):
+        client = openai.OpenAI(api_key='api_key_1', base_url='http://localhost/v1')
+        stream_events = [
+            MagicMock(name='event_1', usage=None),
+            MagicMock(name='event_2', usage=USAGE_WITH_CACHE_HIT)
+        ]
+        client.chat.completions.create = MagicMock(  # type: ignore[method-assign]
+            return_value=iter(stream_events)
+        )
+        usage_handler = MagicMock(name='usage_handler')
+        add_chat_completion_usage_handler(client, usage_handler)
+        assert list(client.chat.completions.create(
+            model='model_1',
+            messages=[],
+            stream=True
+        )) == stream_events
+        usage_handler.assert_called_once_with(USAGE_WITH_CACHE_HIT)
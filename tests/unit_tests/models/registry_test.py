@@ -1,12 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+import dataclasses
 from typing import Iterator
 from unittest.mock import MagicMock, patch
+
+import httpx2
+import openai
+from openai.types.chat import ChatCompletion
 import pytest
 
 import smolagents  # type: ignore[import-untyped]
 
-from data_ai_bot.config import ModelConfig
+from data_ai_bot.config import ModelConfig, ModelRateLimitConfig, ModelResponseCacheConfig
+import data_ai_bot.models.admission as admission_module
 import data_ai_bot.models.registry as registry_model
+from data_ai_bot.models.admission import RateLimitedModel
+from data_ai_bot.models.fallback import FallbackModel
 from data_ai_bot.models.registry import SmolAgentsModelRegistry
+from data_ai_bot.models.response_cache import CachingModel
 
 
 MODEL_NAME_1 = 'model_1'
@@ -54,6 +64,32 @@ class TestSmolAgentsModelRegistry:
             model_2 = registry.get_model(MODEL_CONFIG_1.model_name)
             assert id(model_1) == id(model_2)
 
+        def test_should_share_http_client_for_same_base_url(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[
+                    MODEL_CONFIG_1,
+                    dataclasses.replace(MODEL_CONFIG_1, model_name='model_2')
+                ]
+            )
+            model_1 = registry.get_model(MODEL_CONFIG_1.model_name)
+            model_2 = registry.get_model('model_2')
+            assert model_1 is not model_2
+            assert model_1.client_kwargs['http_client'] is model_2.client_kwargs['http_client']
+            assert [stats.base_url for stats in registry.get_http_client_stats()] == [
+                BASE_URL_1
+            ]
+
+        def test_should_create_single_model_instance_concurrently(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[MODEL_CONFIG_1]
+            )
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                models = list(executor.map(
+                    lambda _: registry.get_model(MODEL_CONFIG_1.model_name),
+                    range(10)
+                ))
+            assert len({id(model) for model in models}) == 1
+
     class TestGetModelOrDefaultModel:
         def test_should_return_default_model(
             self,
@@ -85,3 +121,220 @@ class TestSmolAgentsModelRegistry:
             )
             model = registry.get_model_or_default_model(MODEL_CONFIG_1.model_name)
             assert model.model_id == MODEL_CONFIG_1.model_name
+
+    class TestGetModelWithFallbacks:
+        def test_should_create_fallback_model(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[
+                    dataclasses.replace(MODEL_CONFIG_1, fallback_model_names=['model_2']),
+                    dataclasses.replace(MODEL_CONFIG_1, model_name='model_2')
+                ]
+            )
+            model = registry.get_model(MODEL_NAME_1)
+            assert isinstance(model, FallbackModel)
+            assert model.model_id == MODEL_NAME_1
+            assert model.models[1] is registry.get_model('model_2')
+            assert model.primary_model.client_kwargs['max_retries'] == 0
+            assert 'max_retries' not in model.models[1].client_kwargs
+
+        def test_should_fail_for_nested_fallback_models(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[
+                    dataclasses.replace(MODEL_CONFIG_1, fallback_model_names=['model_2']),
+                    dataclasses.replace(
+                        MODEL_CONFIG_1,
+                        model_name='model_2',
+                        fallback_model_names=[MODEL_NAME_1]
+                    )
+                ]
+            )
+            with pytest.raises(ValueError):
+                registry.get_model(MODEL_NAME_1)
+
+        def test_should_not_reuse_model_if_fallback_model_config_changed(self):
+            model_config_list = [
+                dataclasses.replace(MODEL_CONFIG_1, fallback_model_names=['model_2']),
+                dataclasses.replace(MODEL_CONFIG_1, model_name='model_2')
+            ]
+            registry = SmolAgentsModelRegistry(model_config_list=model_config_list)
+            model = registry.get_model(MODEL_NAME_1)
+            reloaded_registry = registry.get_reloaded_model_registry([
+                model_config_list[0],
+                dataclasses.replace(model_config_list[1], base_url='base_url_2')
+            ])
+            assert reloaded_registry.get_model(MODEL_NAME_1) is not model
+
+    class TestGetModelWithResponseCache:
+        def test_should_create_caching_model_with_temperature(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[dataclasses.replace(
+                    MODEL_CONFIG_1,
+                    temperature=0,
+                    response_cache=ModelResponseCacheConfig()
+                )]
+            )
+            model = registry.get_model(MODEL_NAME_1)
+            assert isinstance(model, CachingModel)
+            assert model.model_parameters == {'temperature': 0}
+            assert model.model.kwargs['temperature'] == 0
+
+    class TestGetModelWithRateLimit:
+        def test_should_create_rate_limited_model_and_expose_stats(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[dataclasses.replace(
+                    MODEL_CONFIG_1,
+                    rate_limit=ModelRateLimitConfig(requests_per_minute=60)
+                )]
+            )
+            model = registry.get_model(MODEL_NAME_1)
+            assert isinstance(model, RateLimitedModel)
+            assert list(registry.get_admission_stats_by_model_name().keys()) == [MODEL_NAME_1]
+
+        def test_should_back_off_and_retry_on_rate_limit_error(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[dataclasses.replace(
+                    MODEL_CONFIG_1,
+                    rate_limit=ModelRateLimitConfig(max_concurrency=4)
+                )]
+            )
+            model = registry.get_model(MODEL_NAME_1)
+            assert isinstance(model, RateLimitedModel)
+            assert model.retry_on_overload
+            assert model.model.client_kwargs['max_retries'] == 0
+            request = httpx2.Request('POST', 'http://localhost/v1/chat/completions')
+            create_mock = MagicMock(name='create', side_effect=[
+                openai.RateLimitError(
+                    'Too Many Requests',
+                    response=httpx2.Response(429, request=request),
+                    body=None
+                ),
+                ChatCompletion.model_validate({
+                    'id': 'chat_completion_1',
+                    'object': 'chat.completion',
+                    'created': 0,
+                    'model': MODEL_NAME_1,
+                    'choices': [{
+                        'index': 0,
+                        'finish_reason': 'stop',
+                        'message': {'role': 'assistant', 'content': 'Answer 1'}
+                    }],
+                    'usage': {'prompt_tokens': 10, 'completion_tokens': 5, 'total_tokens': 15}
+                })
+            ])
+            model.model.client.chat.completions.create = create_mock
+            with patch.object(admission_module.time, 'sleep') as sleep_mock:
+                chat_message = model.generate(
+                    [smolagents.ChatMessage(role='user', content='Question 1')]
+                )
+            assert chat_message.content == 'Answer 1'
+            assert create_mock.call_count == 2
+            sleep_mock.assert_called_once()
+            stats = registry.get_admission_stats_by_model_name()[MODEL_NAME_1]
+            assert stats.overload_count == 1
+            assert stats.concurrency_limit < 4
+
+        def test_should_not_retry_rate_limited_model_with_fallback_models(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[
+                    dataclasses.replace(
+                        MODEL_CONFIG_1,
+                        rate_limit=ModelRateLimitConfig(),
+                        fallback_model_names=['model_2']
+                    ),
+                    dataclasses.replace(MODEL_CONFIG_1, model_name='model_2')
+                ]
+            )
+            model = registry.get_model(MODEL_NAME_1)
+            assert isinstance(model, FallbackModel)
+            assert isinstance(model.models[0], RateLimitedModel)
+            assert not model.models[0].retry_on_overload
+
+        def test_should_keep_admission_controller_on_reload(self):
+            model_config = dataclasses.replace(
+                MODEL_CONFIG_1,
+                rate_limit=ModelRateLimitConfig(requests_per_minute=60)
+            )
+            registry = SmolAgentsModelRegistry(model_config_list=[model_config])
+            registry.get_model(MODEL_NAME_1)
+            reloaded_registry = registry.get_reloaded_model_registry([model_config])
+            assert (
+                reloaded_registry.admission_controller_by_model_name[MODEL_NAME_1]
+                is registry.admission_controller_by_model_name[MODEL_NAME_1]
+            )
+
+    class TestGetModelWithPromptCacheStats:
+        def test_should_record_prompt_cache_stats_by_model_name(self):
+            registry = SmolAgentsModelRegistry(model_config_list=[MODEL_CONFIG_1])
+            registry.get_model(MODEL_NAME_1)
+            registry.prompt_cache_stats_recorder_by_model_name[MODEL_NAME_1].record(
+                MagicMock(prompt_tokens=100, prompt_tokens_details=MagicMock(cached_tokens=80))
+            )
+            stats = registry.get_prompt_cache_stats_by_model_name()[MODEL_NAME_1]
+            assert stats.hit_count == 1
+            assert stats.cached_token_count == 80
+
+        def test_should_keep_prompt_cache_stats_on_reload(self):
+            registry = SmolAgentsModelRegistry(model_config_list=[MODEL_CONFIG_1])
+            registry.get_model(MODEL_NAME_1)
+            reloaded_registry = registry.get_reloaded_model_registry([MODEL_CONFIG_1])
+            assert (
+                reloaded_registry.prompt_cache_stats_recorder_by_model_name[MODEL_NAME_1]
+                is registry.prompt_cache_stats_recorder_by_model_name[MODEL_NAME_1]
+            )
+
+    class TestWarmUp:
+        def test_should_create_models_and_warm_up_each_base_url_once(
+            self,
+            get_default_model_config_mock: MagicMock
+        ):
+            get_default_model_config_mock.side_effect = KeyError('OPENAI_MODEL_ID')
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[
+                    MODEL_CONFIG_1,
+                    dataclasses.replace(MODEL_CONFIG_1, model_name='model_2')
+                ]
+            )
+            with patch.object(registry.http_client_pool, 'warm_up') as warm_up_mock:
+                warm_up_mock.return_value = True
+                assert registry.warm_up() == 1
+            warm_up_mock.assert_called_once_with(BASE_URL_1, API_KEY_1)
+            assert set(registry.model_instance_by_model_name.keys()) == {
+                MODEL_NAME_1, 'model_2'
+            }
+
+    class TestGetReloadedModelRegistry:
+        def test_should_reuse_model_instance_if_config_unchanged(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[MODEL_CONFIG_1]
+            )
+            model = registry.get_model(MODEL_CONFIG_1.model_name)
+            reloaded_registry = registry.get_reloaded_model_registry([MODEL_CONFIG_1])
+            assert reloaded_registry.get_model(MODEL_CONFIG_1.model_name) is model
+
+        def test_should_create_new_model_instance_if_config_changed(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[MODEL_CONFIG_1]
+            )
+            model = registry.get_model(MODEL_CONFIG_1.model_name)
+            reloaded_registry = registry.get_reloaded_model_registry([
+                dataclasses.replace(MODEL_CONFIG_1, base_url='base_url_2')
+            ])
+            reloaded_model = reloaded_registry.get_model(MODEL_CONFIG_1.model_name)
+            assert reloaded_model is not model
+            assert reloaded_model.client_kwargs['base_url'] == 'base_url_2'
+
+        def test_should_share_http_client_pool(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[MODEL_CONFIG_1]
+            )
+            reloaded_registry = registry.get_reloaded_model_registry([MODEL_CONFIG_1])
+            assert reloaded_registry.http_client_pool is registry.http_client_pool
+
+        def test_should_not_keep_removed_model(self):
+            registry = SmolAgentsModelRegistry(
+                model_config_list=[MODEL_CONFIG_1]
+            )
+            registry.get_model(MODEL_CONFIG_1.model_name)
+            reloaded_registry = registry.get_reloaded_model_registry([])
+            with pytest.raises(ValueError):
+                reloaded_registry.get_model(MODEL_CONFIG_1.model_name)
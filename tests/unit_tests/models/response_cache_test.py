@@ -0,0 +1,155 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import smolagents  # type: ignore[import-untyped]
+
+from data_ai_bot.config import ModelResponseCacheConfig
+from data_ai_bot.models.response_cache import (
+    CachingModel,
+    ModelResponseCache,
+    ModelResponseCacheStats,
+    get_model_for_agent,
+    get_model_request_key
+)
+
+
+MESSAGES_1 = [smolagents.ChatMessage(role='user', content='Question 1')]
+MESSAGES_2 = [smolagents.ChatMessage(role='user', content='Question 2')]
+
+CHAT_MESSAGE_1 = smolagents.ChatMessage(
+    role='assistant',
+    content='Answer 1',
+    token_usage=smolagents.TokenUsage(input_tokens=10, output_tokens=20)
+)
+
+
+def get_model_mock() -> MagicMock:
+    model = MagicMock(name='model')
+    model.model_id = 'model_1'
+    model.generate.return_value = CHAT_MESSAGE_1
+    return model
+
+
+def get_caching_model(
+    model: MagicMock,
+    config: ModelResponseCacheConfig = ModelResponseCacheConfig(),
+    temperature: float = 0
+) -> CachingModel:
+    return CachingModel(
+        model,
+        ModelResponseCache(config),
+        model_parameters={'temperature': temperature}
+    )
+
+
+class TestGetModelRequestKey:
+    def test_should_return_same_key_for_same_request(self):
+        assert get_model_request_key('model_1', MESSAGES_1) == get_model_request_key(
+            'model_1',
+            [smolagents.ChatMessage(role='user', content='Question 1')]
+        )
+
+    def test_should_return_different_key_for_different_request(self):
+        key = get_model_request_key('model_1', MESSAGES_1, parameters={'temperature': 0})
+        assert key != get_model_request_key('model_2', MESSAGES_1, parameters={'temperature': 0})
+        assert key != get_model_request_key('model_1', MESSAGES_2, parameters={'temperature': 0})
+        assert key != get_model_request_key('model_1', MESSAGES_1, parameters={'temperature': 1})
+        assert key != get_model_request_key(
+            'model_1', MESSAGES_1, stop_sequences=['stop'], parameters={'temperature': 0}
+        )
+
+
+class TestCachingModel:
+    def test_should_return_cached_response_for_same_request(self):
+        model = get_model_mock()
+        caching_model = get_caching_model(model)
+        assert caching_model.generate(MESSAGES_1).content == 'Answer 1'
+        chat_message = caching_model.generate(MESSAGES_1)
+        assert chat_message.content == 'Answer 1'
+        assert chat_message.token_usage.total_tokens == 0
+        model.generate.assert_called_once()
+
+    def test_should_not_return_cached_response_for_different_request(self):
+        model = get_model_mock()
+        caching_model = get_caching_model(model)
+        caching_model.generate(MESSAGES_1)
+        caching_model.generate(MESSAGES_2)
+        assert model.generate.call_count == 2
+
+    def test_should_not_cache_non_zero_temperature_by_default(self):
+        model = get_model_mock()
+        caching_model = get_caching_model(model, temperature=0.7)
+        caching_model.generate(MESSAGES_1)
+        caching_model.generate(MESSAGES_1)
+        assert model.generate.call_count == 2
+        assert not caching_model.response_cache.get_stats_by_agent_name()
+
+    def test_should_cache_non_zero_temperature_if_always_enabled(self):
+        model = get_model_mock()
+        caching_model = get_caching_model(
+            model,
+            config=ModelResponseCacheConfig(always_enabled=True),
+            temperature=0.7
+        )
+        caching_model.generate(MESSAGES_1)
+        caching_model.generate(MESSAGES_1)
+        model.generate.assert_called_once()
+
+    def test_should_load_cached_response_from_disk(self, tmp_path: Path):
+        config = ModelResponseCacheConfig(cache_dir=str(tmp_path))
+        model = get_model_mock()
+        get_caching_model(model, config=config).generate(MESSAGES_1)
+        chat_message = get_caching_model(model, config=config).generate(MESSAGES_1)
+        assert chat_message.content == 'Answer 1'
+        model.generate.assert_called_once()
+
+    def test_should_not_load_expired_response_from_disk(self, tmp_path: Path):
+        config = ModelResponseCacheConfig(cache_dir=str(tmp_path), ttl=-1)
+        model = get_model_mock()
+        get_caching_model(model, config=config).generate(MESSAGES_1)
+        get_caching_model(model, config=config).generate(MESSAGES_1)
+        assert model.generate.call_count == 2
+
+    def test_should_limit_disk_entry_count(self, tmp_path: Path):
+        config = ModelResponseCacheConfig(cache_dir=str(tmp_path), max_disk_entry_count=10)
+        caching_model = get_caching_model(get_model_mock(), config=config)
+        for index in range(20):
+            caching_model.generate([smolagents.ChatMessage(role='user', content=str(index))])
+        assert len(list(tmp_path.glob('*/*.json'))) <= 10
+
+    def test_should_cache_streamed_response(self):
+        model = get_model_mock()
+        model.generate_stream.return_value = iter([
+            smolagents.ChatMessageStreamDelta(content='Answer'),
+            smolagents.ChatMessageStreamDelta(content=' 1')
+        ])
+        caching_model = get_caching_model(model)
+        assert [
+            stream_delta.content
+            for stream_delta in caching_model.generate_stream(MESSAGES_1)
+        ] == ['Answer', ' 1']
+        assert [
+            stream_delta.content
+            for stream_delta in caching_model.generate_stream(MESSAGES_1)
+        ] == ['Answer 1']
+        assert caching_model.generate(MESSAGES_1).content == 'Answer 1'
+        model.generate_stream.assert_called_once()
+        model.generate.assert_not_called()
+
+    def test_should_record_hits_and_misses_by_agent(self):
+        caching_model = get_caching_model(get_model_mock())
+        agent_model = get_model_for_agent(caching_model, 'agent_1')
+        assert get_model_for_agent(caching_model, 'agent_1') is agent_model
+        caching_model.generate(MESSAGES_1)
+        agent_model.generate(MESSAGES_1)
+        agent_model.generate(MESSAGES_1)
+        assert caching_model.response_cache.get_stats_by_agent_name() == {
+            None: ModelResponseCacheStats(hit_count=0, miss_count=1),
+            'agent_1': ModelResponseCacheStats(hit_count=2, miss_count=0)
+        }
+
+
+class TestGetModelForAgent:
+    def test_should_return_other_models_unchanged(self):
+        model = get_model_mock()
+        assert get_model_for_agent(model, 'agent_1') is model
@@ -0,0 +1,39 @@
+import smolagents  # type: ignore[import-untyped]
+
+from data_ai_bot.config import ModelResponseCacheConfig
+from data_ai_bot.models.fallback import FallbackModel
+from data_ai_bot.models.response_cache import CachingModel, ModelResponseCache
+from data_ai_bot.models.streaming import is_streaming_supported_by_model
+
+
+def get_streaming_model() -> smolagents.Model:
+    return smolagents.OpenAIServerModel(model_id='model_1', api_key='api_key_1')
+
+
+def get_non_streaming_model() -> smolagents.Model:
+    return smolagents.Model(model_id='model_1')
+
+
+class TestIsStreamingSupportedByModel:
+    def test_should_return_true_for_streaming_model(self):
+        assert is_streaming_supported_by_model(get_streaming_model())
+
+    def test_should_return_false_for_non_streaming_model(self):
+        assert not is_streaming_supported_by_model(get_non_streaming_model())
+
+    def test_should_delegate_to_model_of_caching_model(self):
+        response_cache = ModelResponseCache(ModelResponseCacheConfig())
+        assert is_streaming_supported_by_model(
+            CachingModel(get_streaming_model(), response_cache)
+        )
+        assert not is_streaming_supported_by_model(
+            CachingModel(get_non_streaming_model(), response_cache)
+        )
+
+    def test_should_require_all_models_of_fallback_model(self):
+        assert is_streaming_supported_by_model(
+            FallbackModel([get_streaming_model(), get_streaming_model()])
+        )
+        assert not is_streaming_supported_by_model(
+            FallbackModel([get_streaming_model(), get_non_streaming_model()])
+        )
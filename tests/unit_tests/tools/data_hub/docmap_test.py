@@ -0,0 +1,82 @@
+import json
+from typing import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx2
+import pytest
+
+from data_ai_bot.tools.data_hub import docmap
+from data_ai_bot.tools.data_hub.docmap import DocMapBatchTool, DocMapTool
+
+
+HEADERS_1 = {'User-Agent': 'Test/1'}
+
+
+@pytest.fixture(name='async_client_mock', autouse=True)
+def _async_client_mock() -> Iterator[MagicMock]:
+    async_client_mock = MagicMock(spec=httpx2.AsyncClient)
+    async_client_mock.get = AsyncMock(return_value=MagicMock(spec=httpx2.Response))
+    with patch.object(docmap, 'get_async_client') as mock:
+        mock.return_value = async_client_mock
+        yield async_client_mock
+
+
+class TestDocMapTool:
+    def test_should_return_docmap_json(
+        self,
+        async_client_mock: MagicMock
+    ):
+        async_client_mock.get.return_value.json.return_value = {'docmap': 1}
+        tool = DocMapTool(headers=HEADERS_1)
+        assert json.loads(tool.forward('12345')) == {'docmap': 1}
+
+    @pytest.mark.parametrize('manuscript_id', ['1234', '1234567', 'invalid'])
+    def test_should_raise_error_for_invalid_manuscript_id(
+        self,
+        async_client_mock: MagicMock,
+        manuscript_id: str
+    ):
+        tool = DocMapTool(headers=HEADERS_1)
+        with pytest.raises(ValueError, match=f'Invalid manuscript id.*: {manuscript_id}'):
+            tool.forward(manuscript_id)
+        async_client_mock.get.assert_not_called()
+
+    def test_should_raise_fetch_error(
+        self,
+        async_client_mock: MagicMock
+    ):
+        async_client_mock.get.return_value.raise_for_status.side_effect = RuntimeError('failed')
+        tool = DocMapTool(headers=HEADERS_1)
+        with pytest.raises(RuntimeError):
+            tool.forward('12345')
+
+
+class TestDocMapBatchTool:
+    def test_should_return_docmap_by_manuscript_id(
+        self,
+        async_client_mock: MagicMock
+    ):
+        async_client_mock.get.return_value.json.side_effect = lambda: {
+            'url': async_client_mock.get.call_args.args[0]
+        }
+        tool = DocMapBatchTool(headers=HEADERS_1, max_concurrency=1)
+        result = json.loads(tool.forward(['12345', '23456']))
+        assert list(result.keys()) == ['12345', '23456']
+        assert result['12345']['url'].endswith('manuscript_id=12345')
+        assert result['23456']['url'].endswith('manuscript_id=23456')
+
+    def test_should_return_error_for_invalid_manuscript_id(
+        self,
+        async_client_mock: MagicMock
+    ):
+        async_client_mock.get.return_value.json.return_value = {'docmap': 1}
+        tool = DocMapBatchTool(headers=HEADERS_1)
+        result = json.loads(tool.forward(['12345', 'invalid']))
+        assert result['12345'] == {'docmap': 1}
+        assert 'Invalid manuscript id' in result['invalid']['error']
+        async_client_mock.get.assert_called_once()
+
+    def test_should_raise_error_for_too_many_manuscript_ids(self):
+        tool = DocMapBatchTool(headers=HEADERS_1, max_batch_size=1)
+        with pytest.raises(ValueError, match='Too many manuscript ids'):
+            tool.forward(['12345', '23456'])
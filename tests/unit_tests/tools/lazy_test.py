@@ -0,0 +1,54 @@
+from copy import deepcopy
+from unittest.mock import MagicMock
+
+from data_ai_bot.tools.lazy import LazyTool, get_resolved_tool
+
+
+INPUTS_1 = {'query': {'type': 'string', 'description': 'The query'}}
+
+
+def get_lazy_tool(create_tool: MagicMock) -> LazyTool:
+    return LazyTool(
+        name='tool_1',
+        description='Description 1',
+        inputs=INPUTS_1,
+        output_type='string',
+        create_tool=create_tool
+    )
+
+
+class TestLazyTool:
+    def test_should_use_provided_schema_without_creating_tool(self):
+        create_tool = MagicMock(name='create_tool')
+        tool = get_lazy_tool(create_tool)
+        assert tool.name == 'tool_1'
+        assert tool.description == 'Description 1'
+        assert tool.inputs == INPUTS_1
+        assert tool.output_type == 'string'
+        create_tool.assert_not_called()
+
+    def test_should_create_tool_once_and_delegate_calls(self):
+        create_tool = MagicMock(name='create_tool')
+        tool = get_lazy_tool(create_tool)
+        assert tool(query='query_1') == create_tool.return_value.forward.return_value
+        tool(query='query_2')
+        create_tool.assert_called_once()
+        create_tool.return_value.forward.assert_called_with(query='query_2')
+
+    def test_should_share_created_tool_with_copies(self):
+        create_tool = MagicMock(name='create_tool')
+        tool = get_lazy_tool(create_tool)
+        copied_tool = deepcopy(tool)
+        tool(query='query_1')
+        copied_tool(query='query_1')
+        create_tool.assert_called_once()
+
+
+class TestGetResolvedTool:
+    def test_should_return_created_tool_of_lazy_tool(self):
+        create_tool = MagicMock(name='create_tool')
+        assert get_resolved_tool(get_lazy_tool(create_tool)) == create_tool.return_value
+
+    def test_should_return_other_tools_unchanged(self):
+        tool = MagicMock(name='tool')
+        assert get_resolved_tool(tool) == tool
@@ -0,0 +1,270 @@
+from copy import deepcopy
+import dataclasses
+import threading
+import time
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from smolagents import ToolCollection  # type: ignore[import-untyped]
+
+from data_ai_bot.config import FromMcpConfig
+from data_ai_bot.tools.mcp import (
+    McpSessionPool,
+    McpToolProxy,
+    McpToolSchema,
+    McpToolSchemaCache,
+    StaticMcpToolSchemaStore,
+    get_mcp_tool_proxies,
+    is_mcp_connection_error
+)
+
+
+FROM_MCP_CONFIG_1 = FromMcpConfig(
+    name='mcp_1',
+    url='http://localhost:8080/mcp',
+    transport='streamable-http'
+)
+
+TOOL_SCHEMA_1 = McpToolSchema(
+    name='tool_1',
+    description='Description 1',
+    inputs={'query': {'type': 'string', 'description': 'Query'}},
+    output_type='string'
+)
+
+
+@pytest.fixture(name='tool_collection_from_mcp_mock', autouse=True)
+def _tool_collection_from_mcp_mock() -> Iterator[MagicMock]:
+    with patch.object(ToolCollection, 'from_mcp') as mock:
+        yield mock
+
+
+@pytest.fixture(name='tool_collection_mock')
+def _tool_collection_mock(
+    tool_collection_from_mcp_mock: MagicMock
+) -> MagicMock:
+    return tool_collection_from_mcp_mock.return_value.__enter__.return_value
+
+
+def get_tool_mock(name: str) -> MagicMock:
+    tool_mock = MagicMock(name=name)
+    tool_mock.name = name
+    return tool_mock
+
+
+class TestMcpToolSchemaCache:
+    def test_should_return_none_if_not_cached(self, tmp_path):
+        assert McpToolSchemaCache(str(tmp_path)).load(FROM_MCP_CONFIG_1) is None
+
+    def test_should_save_and_load_tool_schemas(self, tmp_path):
+        cache = McpToolSchemaCache(str(tmp_path))
+        cache.save(FROM_MCP_CONFIG_1, [TOOL_SCHEMA_1])
+        assert cache.load(FROM_MCP_CONFIG_1) == [TOOL_SCHEMA_1]
+
+    def test_should_ignore_invalid_cache_file(self, tmp_path):
+        cache = McpToolSchemaCache(str(tmp_path))
+        cache.get_cache_file_path(FROM_MCP_CONFIG_1).write_text('invalid', encoding='utf-8')
+        assert cache.load(FROM_MCP_CONFIG_1) is None
+
+
+class ClosedResourceError(Exception):
+    pass
+
+
+def get_tool_collection_cm_mock(tools: list[MagicMock]) -> MagicMock:
+    tool_collection_cm_mock = MagicMock(name='tool_collection_cm')
+    tool_collection_cm_mock.__enter__.return_value.tools = tools
+    return tool_collection_cm_mock
+
+
+def get_session_pool(from_mcp_config: FromMcpConfig = FROM_MCP_CONFIG_1, **kwargs):
+    return McpSessionPool(
+        from_mcp_config,
+        reconnect_initial_delay=0.01,
+        connect_timeout=5,
+        **kwargs
+    )
+
+
+def wait_for_connection_count(session_pool: McpSessionPool, connection_count: int):
+    deadline = time.monotonic() + 5
+    while session_pool.get_stats().connection_count < connection_count:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class TestStaticMcpToolSchemaStore:
+    def test_should_load_tool_schemas_by_name(self):
+        store = StaticMcpToolSchemaStore({FROM_MCP_CONFIG_1.name: [TOOL_SCHEMA_1]})
+        assert store.load(FROM_MCP_CONFIG_1) == [TOOL_SCHEMA_1]
+
+    def test_should_return_none_for_unknown_name(self):
+        assert StaticMcpToolSchemaStore({}).load(FROM_MCP_CONFIG_1) is None
+
+
+class TestIsMcpConnectionError:
+    def test_should_detect_connection_errors(self):
+        assert is_mcp_connection_error(ConnectionError())
+        assert is_mcp_connection_error(ClosedResourceError())
+
+    def test_should_not_detect_other_errors(self):
+        assert not is_mcp_connection_error(ValueError())
+
+
+class TestMcpSessionPool:
+    def test_should_connect_sessions_and_close_them(
+        self,
+        tool_collection_from_mcp_mock: MagicMock,
+        tool_collection_mock: MagicMock
+    ):
+        tool_collection_mock.tools = [get_tool_mock('tool_1')]
+        on_connected = MagicMock(name='on_connected')
+        session_pool = get_session_pool(
+            dataclasses.replace(FROM_MCP_CONFIG_1, session_count=2),
+            on_connected=on_connected
+        )
+        session_pool.start()
+        assert session_pool.get_tools() == tool_collection_mock.tools
+        on_connected.assert_called_once_with(tool_collection_mock.tools)
+        wait_for_connection_count(session_pool, 2)
+        assert tool_collection_from_mcp_mock.call_count == 2
+        session_pool.close()
+        assert tool_collection_from_mcp_mock.return_value.__exit__.call_count == 2
+
+    def test_should_call_on_connected_without_holding_lock(
+        self,
+        tool_collection_mock: MagicMock
+    ):
+        tool_collection_mock.tools = [get_tool_mock('tool_1')]
+        is_lock_available_list: list[bool] = []
+
+        def on_connected(_tools):
+            # acquiring the lock from another thread, which would block if held
+            thread = threading.Thread(target=session_pool.get_stats)
+            thread.start()
+            thread.join(timeout=1)
+            is_lock_available_list.append(not thread.is_alive())
+
+        session_pool = get_session_pool(on_connected=on_connected)
+        session_pool.start()
+        session_pool.get_tools()
+        assert is_lock_available_list == [True]
+        session_pool.close()
+
+    def test_should_raise_connection_error_when_getting_tools(
+        self,
+        tool_collection_from_mcp_mock: MagicMock
+    ):
+        tool_collection_from_mcp_mock.side_effect = OSError('failed')
+        session_pool = get_session_pool()
+        session_pool.start()
+        with pytest.raises(ConnectionError):
+            session_pool.get_tools()
+        session_pool.close()
+
+    def test_should_call_live_tool_and_record_stats(
+        self,
+        tool_collection_mock: MagicMock
+    ):
+        tool_mock = get_tool_mock('tool_1')
+        tool_collection_mock.tools = [tool_mock]
+        session_pool = get_session_pool()
+        session_pool.start()
+        assert session_pool.call_tool('tool_1', query='query_1') == tool_mock.forward.return_value
+        tool_mock.forward.assert_called_once_with(query='query_1')
+        stats = session_pool.get_stats()
+        assert stats.call_count == 1
+        assert stats.error_count == 0
+        session_pool.close()
+
+    def test_should_not_retry_or_reconnect_on_tool_error(
+        self,
+        tool_collection_from_mcp_mock: MagicMock,
+        tool_collection_mock: MagicMock
+    ):
+        tool_mock = get_tool_mock('tool_1')
+        tool_mock.forward.side_effect = ValueError('invalid')
+        tool_collection_mock.tools = [tool_mock]
+        session_pool = get_session_pool()
+        session_pool.start()
+        with pytest.raises(ValueError):
+            session_pool.call_tool('tool_1')
+        tool_mock.forward.assert_called_once()
+        assert session_pool.get_stats().error_count == 1
+        assert session_pool.get_stats().reconnect_count == 0
+        tool_collection_from_mcp_mock.assert_called_once()
+        session_pool.close()
+
+    def test_should_reconnect_without_retrying_on_connection_error_by_default(
+        self,
+        tool_collection_from_mcp_mock: MagicMock
+    ):
+        broken_tool_mock = get_tool_mock('tool_1')
+        broken_tool_mock.forward.side_effect = ClosedResourceError()
+        reconnected_tool_mock = get_tool_mock('tool_1')
+        tool_collection_from_mcp_mock.side_effect = [
+            get_tool_collection_cm_mock([broken_tool_mock]),
+            get_tool_collection_cm_mock([reconnected_tool_mock])
+        ]
+        session_pool = get_session_pool()
+        session_pool.start()
+        session_pool.get_tools()
+        with pytest.raises(ClosedResourceError):
+            session_pool.call_tool('tool_1')
+        broken_tool_mock.forward.assert_called_once()
+        wait_for_connection_count(session_pool, 2)
+        reconnected_tool_mock.forward.assert_not_called()
+        stats = session_pool.get_stats()
+        assert stats.reconnect_count == 1
+        assert stats.error_count == 1
+        session_pool.close()
+
+    def test_should_reconnect_and_retry_on_connection_error_if_enabled(
+        self,
+        tool_collection_from_mcp_mock: MagicMock
+    ):
+        broken_tool_mock = get_tool_mock('tool_1')
+        broken_tool_mock.forward.side_effect = ClosedResourceError()
+        reconnected_tool_mock = get_tool_mock('tool_1')
+        tool_collection_from_mcp_mock.side_effect = [
+            get_tool_collection_cm_mock([broken_tool_mock]),
+            get_tool_collection_cm_mock([reconnected_tool_mock])
+        ]
+        session_pool = get_session_pool(
+            dataclasses.replace(FROM_MCP_CONFIG_1, retry_tool_calls=True)
+        )
+        session_pool.start()
+        session_pool.get_tools()
+        assert session_pool.call_tool('tool_1') == reconnected_tool_mock.forward.return_value
+        assert tool_collection_from_mcp_mock.call_count == 2
+        stats = session_pool.get_stats()
+        assert stats.reconnect_count == 1
+        assert stats.error_count == 0
+        session_pool.close()
+
+
+class TestMcpToolProxy:
+    def test_should_use_tool_schema(self):
+        tool = McpToolProxy(TOOL_SCHEMA_1, call_tool=MagicMock())
+        assert McpToolSchema.from_tool(tool) == TOOL_SCHEMA_1
+
+    def test_should_delegate_calls(self):
+        call_tool_mock = MagicMock(name='call_tool')
+        tool = McpToolProxy(TOOL_SCHEMA_1, call_tool=call_tool_mock)
+        assert tool(query='query_1') == call_tool_mock.return_value
+        call_tool_mock.assert_called_once_with(query='query_1')
+
+    def test_should_delegate_to_session_pool_after_deepcopy(
+        self,
+        tool_collection_mock: MagicMock
+    ):
+        live_tool_mock = get_tool_mock('tool_1')
+        tool_collection_mock.tools = [live_tool_mock]
+        session_pool = get_session_pool()
+        tools = get_mcp_tool_proxies([TOOL_SCHEMA_1], session_pool=session_pool)
+        copied_tool = deepcopy(tools[0])
+        session_pool.start()
+        assert copied_tool(query='query_1') == live_tool_mock.forward.return_value
+        session_pool.close()
@@ -1,5 +1,6 @@
 # pylint: disable=duplicate-code
 import dataclasses
+import threading
 from typing import Iterator
 from unittest.mock import MagicMock, patch
 
@@ -19,6 +20,13 @@ from data_ai_bot.config import (
 )
 from data_ai_bot.tools.data_hub.docmap import DocMapTool
 from data_ai_bot.tools.example.joke import get_joke
+from data_ai_bot.tools.lazy import LazyTool
+from data_ai_bot.tools.mcp import (
+    McpToolProxy,
+    McpToolSchema,
+    McpToolSchemaCache,
+    StaticMcpToolSchemaStore
+)
 from data_ai_bot.tools.resolver import ConfigToolResolver
 from data_ai_bot.tools.sources.static import StaticContentTool
 
@@ -159,6 +167,95 @@ class TestConfigToolResolver:
         assert tool.name == 'new_name'
         assert tool.description == 'New description'
 
+    def test_should_reuse_tool_instance_by_default(self):
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_definitions_config=DEFAULT_TOOL_DEFINITIONS_CONFIG
+        )
+        tool = resolver.get_tool_by_name('get_docmap_by_manuscript_id')
+        assert resolver.get_tool_by_name('get_docmap_by_manuscript_id') is tool
+        stats = resolver.get_stats()['get_docmap_by_manuscript_id']
+        assert stats.creation_count == 1
+        assert stats.reuse_count == 1
+
+    def test_should_create_new_tool_instance_if_per_agent(self):
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_definitions_config=ToolDefinitionsConfig(
+                from_python_tool_class=[FromPythonToolClassConfig(
+                    name='tool_1',
+                    module='data_ai_bot.tools.data_hub.docmap',
+                    class_name='DocMapTool',
+                    per_agent=True
+                )]
+            )
+        )
+        assert resolver.get_tool_by_name('tool_1') is not resolver.get_tool_by_name('tool_1')
+        assert resolver.get_stats()['tool_1'].creation_count == 2
+
+    def test_should_use_first_tool_definition_with_same_name(self):
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_definitions_config=ToolDefinitionsConfig(
+                from_python_tool_class=[
+                    FromPythonToolClassConfig(
+                        name='tool_1',
+                        module='data_ai_bot.tools.sources.static',
+                        class_name='StaticContentTool',
+                        description='Description 1',
+                        init_parameters={'content': 'Content 1'}
+                    ),
+                    FromPythonToolClassConfig(
+                        name='tool_1',
+                        module='data_ai_bot.tools.sources.static',
+                        class_name='StaticContentTool',
+                        description='Description 2',
+                        init_parameters={'content': 'Content 2'}
+                    )
+                ]
+            )
+        )
+        tool = resolver.get_tool_by_name('tool_1')
+        assert isinstance(tool, StaticContentTool)
+        assert tool.content == 'Content 1'
+
+    def test_should_create_lazy_tool_on_first_call(self):
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_definitions_config=ToolDefinitionsConfig(
+                from_python_tool_class=[FromPythonToolClassConfig(
+                    name='tool_1',
+                    module='data_ai_bot.tools.sources.static',
+                    class_name='StaticContentTool',
+                    description='Description 1',
+                    init_parameters={'content': 'Content 1'},
+                    lazy=True
+                )]
+            )
+        )
+        tool = resolver.get_tool_by_name('tool_1')
+        assert isinstance(tool, LazyTool)
+        assert tool.description == 'Description 1'
+        assert 'tool_1' not in resolver.get_stats()
+        assert tool() == 'Content 1'
+        assert tool() == 'Content 1'
+        assert resolver.get_stats()['tool_1'].creation_count == 1
+
+    def test_should_raise_error_if_lazy_tool_has_no_description(self):
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_definitions_config=ToolDefinitionsConfig(
+                from_python_tool_class=[FromPythonToolClassConfig(
+                    name='tool_1',
+                    module='data_ai_bot.tools.data_hub.docmap',
+                    class_name='DocMapTool',
+                    lazy=True
+                )]
+            )
+        )
+        with pytest.raises(ValueError):
+            resolver.get_tool_by_name('tool_1')
+
     def test_should_load_tools_from_collection(
         self,
         tool_collection_from_mcp_mock: MagicMock,
@@ -170,8 +267,10 @@ class TestConfigToolResolver:
                 from_mcp=[FROM_MCP_CONFIG_1]
             )
         )
+        tool_collection_mock.tools = [_test_tool_1]
         tools = resolver.get_tools_by_collection_name(FROM_MCP_CONFIG_1.name)
-        assert tools == tool_collection_mock.tools
+        assert [tool.name for tool in tools] == [_test_tool_1.name]
+        assert tools[0]() == 'Tool 1'
         tool_collection_from_mcp_mock.assert_called_once_with(
             {
                 'url': FROM_MCP_CONFIG_1.url,
@@ -200,4 +299,194 @@ class TestConfigToolResolver:
             _test_tool_2
         ]
         tools = resolver.get_tools_by_collection_name(FROM_MCP_CONFIG_1.name)
-        assert tools == [_test_tool_1]
+        assert [tool.name for tool in tools] == [_test_tool_1.name]
+
+    def test_should_connect_to_collection_once(
+        self,
+        tool_collection_from_mcp_mock: MagicMock,
+        tool_collection_mock: MagicMock
+    ):
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_collection_definitions_config=TOOL_COLLECTION_DEFINITIONS_CONFIG_1
+        )
+        tool_collection_mock.tools = [_test_tool_1]
+        resolver.start_tool_collections([FROM_MCP_CONFIG_1.name])
+        tools = resolver.get_tools_by_name([], [FROM_MCP_CONFIG_1.name])
+        assert resolver.get_tools_by_name([], [FROM_MCP_CONFIG_1.name]) == tools
+        assert [tool.name for tool in tools] == [_test_tool_1.name]
+        tool_collection_from_mcp_mock.assert_called_once()
+
+    def test_should_save_tool_schemas_to_cache(
+        self,
+        tmp_path,
+        tool_collection_mock: MagicMock
+    ):
+        mcp_tool_schema_cache = McpToolSchemaCache(str(tmp_path))
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_collection_definitions_config=TOOL_COLLECTION_DEFINITIONS_CONFIG_1,
+            mcp_tool_schema_cache=mcp_tool_schema_cache
+        )
+        tool_collection_mock.tools = [_test_tool_1]
+        resolver.get_tools_by_collection_name(FROM_MCP_CONFIG_1.name)
+        assert mcp_tool_schema_cache.load(FROM_MCP_CONFIG_1) == [
+            McpToolSchema.from_tool(_test_tool_1)
+        ]
+
+    def test_should_use_cached_tool_schemas_without_waiting_for_connection(
+        self,
+        tmp_path,
+        tool_collection_from_mcp_mock: MagicMock
+    ):
+        mcp_tool_schema_cache = McpToolSchemaCache(str(tmp_path))
+        mcp_tool_schema_cache.save(FROM_MCP_CONFIG_1, [McpToolSchema.from_tool(_test_tool_1)])
+        connected = threading.Event()
+        tool_collection_from_mcp_mock.side_effect = lambda *_args, **_kwargs: (
+            connected.wait(timeout=5) and MagicMock(name='tool_collection_cm')
+        )
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_collection_definitions_config=TOOL_COLLECTION_DEFINITIONS_CONFIG_1,
+            mcp_tool_schema_cache=mcp_tool_schema_cache
+        )
+        tools = resolver.get_tools_by_collection_name(FROM_MCP_CONFIG_1.name)
+        assert [tool.name for tool in tools] == [_test_tool_1.name]
+        assert isinstance(tools[0], McpToolProxy)
+        connected.set()
+
+    def test_should_use_static_tool_schemas_without_starting_mcp_sessions(
+        self,
+        tool_collection_from_mcp_mock: MagicMock
+    ):
+        with ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_collection_definitions_config=TOOL_COLLECTION_DEFINITIONS_CONFIG_1,
+            mcp_tool_schema_cache=StaticMcpToolSchemaStore({
+                FROM_MCP_CONFIG_1.name: [McpToolSchema.from_tool(_test_tool_1)]
+            }),
+            start_mcp_sessions=False
+        ) as resolver:
+            resolver.start_tool_collections([FROM_MCP_CONFIG_1.name])
+            tools = resolver.get_tools_by_collection_name(FROM_MCP_CONFIG_1.name)
+        assert [tool.name for tool in tools] == [_test_tool_1.name]
+        tool_collection_from_mcp_mock.assert_not_called()
+
+    def test_should_raise_error_without_tool_schemas_if_not_starting_mcp_sessions(self):
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_collection_definitions_config=TOOL_COLLECTION_DEFINITIONS_CONFIG_1,
+            start_mcp_sessions=False
+        )
+        with pytest.raises(ConnectionError):
+            resolver.get_tools_by_collection_name(FROM_MCP_CONFIG_1.name)
+
+
+def get_static_tool_definitions_config(
+    content_by_tool_name: dict[str, str]
+) -> ToolDefinitionsConfig:
+    return ToolDefinitionsConfig(
+        from_python_tool_class=[
+            FromPythonToolClassConfig(
+                name=tool_name,
+                module='data_ai_bot.tools.sources.static',
+                class_name='StaticContentTool',
+                description=f'Description of {tool_name}',
+                init_parameters={'content': content}
+            )
+            for tool_name, content in content_by_tool_name.items()
+        ]
+    )
+
+
+def get_bq_multi_query_tool_definitions_config(sql_query: str) -> ToolDefinitionsConfig:
+    return ToolDefinitionsConfig(
+        from_python_tool_class=[
+            FromPythonToolClassConfig(
+                name='bq_tool_1',
+                module='data_ai_bot.tools.sources.bigquery',
+                class_name='BigQueryTool',
+                description='Description 1',
+                init_parameters={'project_name': 'project_1', 'sql_query': sql_query}
+            ),
+            FromPythonToolClassConfig(
+                name='bq_multi_query_tool',
+                module='data_ai_bot.tools.sources.bigquery',
+                class_name='BigQueryMultiQueryTool',
+                description='Multi query',
+                init_parameters={'tool_names': ['bq_tool_1']}
+            )
+        ]
+    )
+
+
+class TestConfigToolResolverGetReloadedToolResolver:
+    def test_should_reuse_unchanged_and_recreate_changed_tools(self):
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_definitions_config=get_static_tool_definitions_config({
+                'tool_1': 'Content 1',
+                'tool_2': 'Content 2'
+            })
+        )
+        tool_1 = resolver.get_tool_by_name('tool_1')
+        tool_2 = resolver.get_tool_by_name('tool_2')
+        reloaded_resolver = resolver.get_reloaded_tool_resolver(
+            tool_definitions_config=get_static_tool_definitions_config({
+                'tool_1': 'Content 1',
+                'tool_2': 'Updated content 2'
+            }),
+            tool_collection_definitions_config=ToolCollectionDefinitionsConfig()
+        )
+        assert reloaded_resolver.get_tool_by_name('tool_1') is tool_1
+        reloaded_tool_2 = reloaded_resolver.get_tool_by_name('tool_2')
+        assert reloaded_tool_2 is not tool_2
+        assert reloaded_tool_2() == 'Updated content 2'
+
+    def test_should_recreate_tool_if_dependency_tool_changed(self):
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_definitions_config=get_bq_multi_query_tool_definitions_config('SELECT 1')
+        )
+        tool = resolver.get_tool_by_name('bq_multi_query_tool')
+        reloaded_resolver = resolver.get_reloaded_tool_resolver(
+            tool_definitions_config=get_bq_multi_query_tool_definitions_config('SELECT 2'),
+            tool_collection_definitions_config=ToolCollectionDefinitionsConfig()
+        )
+        reloaded_tool = reloaded_resolver.get_tool_by_name('bq_multi_query_tool')
+        assert reloaded_tool is not tool
+        assert reloaded_tool.tool_by_name['bq_tool_1'].sql_query == 'SELECT 2'
+
+    def test_should_reuse_unchanged_mcp_session_pool(
+        self,
+        tool_collection_from_mcp_mock: MagicMock
+    ):
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_collection_definitions_config=TOOL_COLLECTION_DEFINITIONS_CONFIG_1
+        )
+        resolver.start_tool_collections([FROM_MCP_CONFIG_1.name])
+        reloaded_resolver = resolver.get_reloaded_tool_resolver(
+            tool_definitions_config=ToolDefinitionsConfig(),
+            tool_collection_definitions_config=TOOL_COLLECTION_DEFINITIONS_CONFIG_1
+        )
+        reloaded_resolver.start_tool_collections([FROM_MCP_CONFIG_1.name])
+        assert not resolver.get_mcp_session_pools_not_used_by(reloaded_resolver)
+        tool_collection_from_mcp_mock.assert_called_once()
+
+    def test_should_not_reuse_changed_mcp_session_pool(self):
+        resolver = ConfigToolResolver(
+            headers=DEFAULT_HEADERS,
+            tool_collection_definitions_config=TOOL_COLLECTION_DEFINITIONS_CONFIG_1
+        )
+        resolver.start_tool_collections([FROM_MCP_CONFIG_1.name])
+        reloaded_resolver = resolver.get_reloaded_tool_resolver(
+            tool_definitions_config=ToolDefinitionsConfig(),
+            tool_collection_definitions_config=ToolCollectionDefinitionsConfig(
+                from_mcp=[dataclasses.replace(FROM_MCP_CONFIG_1, session_count=2)]
+            )
+        )
+        assert [
+            session_pool.name
+            for session_pool in resolver.get_mcp_session_pools_not_used_by(reloaded_resolver)
+        ] == [FROM_MCP_CONFIG_1.name]
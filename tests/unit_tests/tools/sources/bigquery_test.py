@@ -1,16 +1,31 @@
+import csv
+import threading
 from typing import Iterator
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
+import pyarrow  # type: ignore
 import pytest
 
+from data_ai_bot.tools.resolver import ToolResolver
 from data_ai_bot.tools.sources import bigquery
-from data_ai_bot.tools.sources.bigquery import BigQueryTool
+from data_ai_bot.tools.sources.bigquery import (
+    BigQueryBytesLimitExceededError,
+    BigQueryClientRegistry,
+    BigQueryJobMetadata,
+    BigQueryMultiQueryTool,
+    BigQueryQueryLimits,
+    BigQueryTool,
+    DEFAULT_MAX_OUTPUT_BYTES
+)
+from data_ai_bot.utils.cache import RefreshingCache
 from data_ai_bot.utils.json import get_json_as_csv_lines
 
 
 PROJECT_NAME_1 = 'project_name_1'
+PROJECT_NAME_2 = 'project_name_2'
 
 SQL_QUERY_1 = 'sql_query_1'
+SQL_QUERY_2 = 'sql_query_2'
 
 ROW_1 = {'column_1': 'value_1'}
 
@@ -18,26 +33,138 @@ ROW_1 = {'column_1': 'value_1'}
 @pytest.fixture(name='bigquery_mock', autouse=True)
 def _bigquery_mock() -> Iterator[MagicMock]:
     with patch.object(bigquery, 'bigquery') as mock:
+        mock.Client.return_value.query.return_value.result.return_value.total_rows = 0
         yield mock
 
 
-@pytest.fixture(name='iter_dict_from_bq_query_mock')
-def _iter_dict_from_bq_query_mock() -> Iterator[MagicMock]:
-    with patch.object(bigquery, 'iter_dict_from_bq_query') as mock:
+@pytest.fixture(name='submit_bq_query_job_mock')
+def _submit_bq_query_job_mock() -> Iterator[MagicMock]:
+    with patch.object(bigquery, 'submit_bq_query_job') as mock:
+        mock.return_value.result.return_value.total_rows = 0
         yield mock
 
 
-@pytest.fixture(name='get_json_as_csv_lines_mock')
-def _get_json_as_csv_lines_mock() -> Iterator[MagicMock]:
-    with patch.object(bigquery, 'get_json_as_csv_lines') as mock:
+@pytest.fixture(name='get_bq_result_from_bq_query_job_mock')
+def _get_bq_result_from_bq_query_job_mock() -> Iterator[MagicMock]:
+    with patch.object(bigquery, 'get_bq_result_from_bq_query_job') as mock:
         yield mock
 
 
+@pytest.fixture(name='bq_result_mock')
+def _bq_result_mock(get_bq_result_from_bq_query_job_mock: MagicMock) -> MagicMock:
+    bq_result_mock = get_bq_result_from_bq_query_job_mock.return_value
+    bq_result_mock.total_rows = 0
+    return bq_result_mock
+
+
+@pytest.fixture(name='bq_query_result_cache', autouse=True)
+def _bq_query_result_cache() -> Iterator[RefreshingCache]:
+    bigquery.BQ_QUERY_RESULT_CACHE.clear()
+    yield bigquery.BQ_QUERY_RESULT_CACHE
+    bigquery.BQ_QUERY_RESULT_CACHE.clear()
+
+
+@pytest.fixture(name='bq_dry_run_cache', autouse=True)
+def _bq_dry_run_cache() -> Iterator[RefreshingCache]:
+    bigquery.BQ_DRY_RUN_CACHE.clear()
+    yield bigquery.BQ_DRY_RUN_CACHE
+    bigquery.BQ_DRY_RUN_CACHE.clear()
+
+
+@pytest.fixture(name='bq_client_registry', autouse=True)
+def _bq_client_registry() -> Iterator[BigQueryClientRegistry]:
+    bigquery.BQ_CLIENT_REGISTRY.clear()
+    yield bigquery.BQ_CLIENT_REGISTRY
+    bigquery.BQ_CLIENT_REGISTRY.clear()
+
+
+def get_bq_tool(name: str, sql_query: str, **kwargs) -> BigQueryTool:
+    return BigQueryTool(
+        name=name,
+        description=f'description of {name}',
+        project_name=PROJECT_NAME_1,
+        sql_query=sql_query,
+        **kwargs
+    )
+
+
+def get_row_mock(row: dict) -> MagicMock:
+    row_mock = MagicMock(name='row')
+    row_mock.items.side_effect = row.items
+    return row_mock
+
+
+def set_bq_result_rows(bq_result_mock: MagicMock, rows: list[dict]):
+    schema_field_mocks = [MagicMock(name=key) for key in rows[0].keys()]
+    for schema_field_mock, key in zip(schema_field_mocks, rows[0].keys()):
+        schema_field_mock.name = key
+    bq_result_mock.schema = schema_field_mocks
+    bq_result_mock.total_rows = len(rows)
+    bq_result_mock.__iter__.side_effect = lambda: iter([get_row_mock(row) for row in rows])
+
+
+def get_bq_result_mock(rows: list[dict]) -> MagicMock:
+    bq_result_mock = MagicMock(name='bq_result')
+    set_bq_result_rows(bq_result_mock, rows)
+    return bq_result_mock
+
+
+def get_tool_resolver_mock(tools: list[BigQueryTool]) -> MagicMock:
+    tool_by_name = {tool.name: tool for tool in tools}
+    tool_resolver_mock = MagicMock(ToolResolver)
+    tool_resolver_mock.get_tool_by_name.side_effect = tool_by_name.__getitem__
+    return tool_resolver_mock
+
+
+class TestBigQueryJobMetadata:
+    def test_should_extract_metadata_from_query_job(self):
+        query_job_mock = MagicMock(name='query_job')
+        query_job_mock.job_id = 'job_1'
+        query_job_mock.cache_hit = True
+        query_job_mock.total_bytes_processed = 100
+        query_job_mock.total_bytes_billed = 200
+        query_job_mock.slot_millis = 300
+        query_job_mock.started = None
+        assert BigQueryJobMetadata.from_query_job(query_job_mock) == BigQueryJobMetadata(
+            job_id='job_1',
+            cache_hit=True,
+            total_bytes_processed=100,
+            total_bytes_billed=200,
+            slot_millis=300
+        )
+
+
+class TestBigQueryClientRegistry:
+    def test_should_create_client_for_project(self, bigquery_mock: MagicMock):
+        registry = BigQueryClientRegistry()
+        client = registry.get_client(PROJECT_NAME_1)
+        assert client == bigquery_mock.Client.return_value
+        bigquery_mock.Client.assert_called_once_with(project=PROJECT_NAME_1)
+
+    def test_should_reuse_client_for_same_project(self, bigquery_mock: MagicMock):
+        registry = BigQueryClientRegistry()
+        registry.get_client(PROJECT_NAME_1)
+        registry.get_client(PROJECT_NAME_1)
+        bigquery_mock.Client.assert_called_once()
+        stats = registry.get_stats()[PROJECT_NAME_1]
+        assert stats.client_creation_count == 1
+        assert stats.client_reuse_count == 1
+
+    def test_should_create_separate_client_per_project(self, bigquery_mock: MagicMock):
+        bigquery_mock.Client.side_effect = lambda project: MagicMock(name=project)
+        registry = BigQueryClientRegistry()
+        assert registry.get_client(PROJECT_NAME_1) is not registry.get_client(PROJECT_NAME_2)
+        assert bigquery_mock.Client.call_count == 2
+
+
 class TestBigQueryTool:
-    def test_should_call_iter_dict_from_bq_query(
+    def test_should_submit_query_job_and_get_its_result(
         self,
-        iter_dict_from_bq_query_mock: MagicMock
+        submit_bq_query_job_mock: MagicMock,
+        get_bq_result_from_bq_query_job_mock: MagicMock,
+        bq_result_mock: MagicMock
     ):
+        set_bq_result_rows(bq_result_mock, [ROW_1])
         tool = BigQueryTool(
             name='name_1',
             description='description_1',
@@ -45,28 +172,35 @@ class TestBigQueryTool:
             sql_query=SQL_QUERY_1
         )
         tool.forward()
-        iter_dict_from_bq_query_mock.assert_called_with(
+        submit_bq_query_job_mock.assert_called_with(
             project_name=PROJECT_NAME_1,
-            query=SQL_QUERY_1
+            query=SQL_QUERY_1,
+            query_parameters=[],
+            query_limits=BigQueryQueryLimits()
+        )
+        get_bq_result_from_bq_query_job_mock.assert_called_with(
+            submit_bq_query_job_mock.return_value,
+            query_limits=BigQueryQueryLimits()
         )
 
     def test_should_return_query_results_as_json(
         self,
-        iter_dict_from_bq_query_mock: MagicMock
+        bq_result_mock: MagicMock
     ):
+        set_bq_result_rows(bq_result_mock, [ROW_1])
         tool = BigQueryTool(
             name='name_1',
             description='description_1',
             project_name=PROJECT_NAME_1,
             sql_query=SQL_QUERY_1
         )
-        iter_dict_from_bq_query_mock.return_value = iter([ROW_1])
         assert tool.forward() == [ROW_1]
 
     def test_should_return_query_results_as_csv(
         self,
-        iter_dict_from_bq_query_mock: MagicMock
+        bq_result_mock: MagicMock
     ):
+        set_bq_result_rows(bq_result_mock, [ROW_1])
         tool = BigQueryTool(
             name='name_1',
             description='description_1',
@@ -74,5 +208,426 @@ class TestBigQueryTool:
             sql_query=SQL_QUERY_1,
             output_format='csv'
         )
-        iter_dict_from_bq_query_mock.return_value = iter([ROW_1])
         assert tool.forward() == '\n'.join(list(get_json_as_csv_lines([ROW_1])))
+
+    def test_should_limit_csv_output_bytes_with_truncation_note(
+        self,
+        bq_result_mock: MagicMock
+    ):
+        set_bq_result_rows(bq_result_mock, [ROW_1, ROW_1])
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1,
+            output_format='csv',
+            query_limits={'max_output_bytes': len('column_1\nvalue_1')}
+        )
+        assert tool.forward() == (
+            'column_1\nvalue_1\n\n[truncated: showing the first 1 of 2 rows]'
+        )
+
+    def test_should_limit_json_output_bytes_by_default(
+        self,
+        bq_result_mock: MagicMock
+    ):
+        large_row = {'column_1': 'x' * (DEFAULT_MAX_OUTPUT_BYTES // 2)}
+        set_bq_result_rows(bq_result_mock, [large_row] * 3)
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1
+        )
+        assert tool.forward() == [
+            large_row,
+            {'truncated': True, 'row_count': 1, 'total_rows': 3}
+        ]
+
+    def test_should_add_truncation_marker_if_total_rows_exceed_max_rows(
+        self,
+        bq_result_mock: MagicMock
+    ):
+        set_bq_result_rows(bq_result_mock, [ROW_1])
+        bq_result_mock.total_rows = 10
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1,
+            query_limits={'max_rows': 1}
+        )
+        assert tool.forward() == [
+            ROW_1,
+            {'truncated': True, 'row_count': 1, 'total_rows': 10}
+        ]
+
+    def test_should_share_client_between_tools(
+        self,
+        bigquery_mock: MagicMock,
+        bq_client_registry: BigQueryClientRegistry
+    ):
+        for name in ['name_1', 'name_2']:
+            BigQueryTool(
+                name=name,
+                description='description_1',
+                project_name=PROJECT_NAME_1,
+                sql_query=SQL_QUERY_1
+            ).forward()
+        bigquery_mock.Client.assert_called_once_with(project=PROJECT_NAME_1)
+        assert bq_client_registry.get_stats()[PROJECT_NAME_1].client_reuse_count == 1
+
+    def test_should_warm_up_client_using_dry_run(
+        self,
+        bigquery_mock: MagicMock
+    ):
+        BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1,
+            warm_up=True
+        )
+        bigquery_mock.QueryJobConfig.assert_called_with(dry_run=True, use_query_cache=False)
+        bigquery_mock.Client.return_value.query.assert_called_once_with(
+            SQL_QUERY_1,
+            job_config=bigquery_mock.QueryJobConfig.return_value
+        )
+
+    def test_should_pass_inputs_as_query_parameters(
+        self,
+        bigquery_mock: MagicMock,
+        submit_bq_query_job_mock: MagicMock
+    ):
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query='SELECT * FROM table_1 WHERE id = @id AND count > @min_count',
+            inputs={
+                'id': {'type': 'string', 'description': 'Id'},
+                'min_count': {'type': 'integer', 'description': 'Min count'}
+            }
+        )
+        tool.forward(id='id_1', min_count=10)
+        bigquery_mock.ScalarQueryParameter.assert_has_calls([
+            call('id', 'STRING', 'id_1'),
+            call('min_count', 'INT64', 10)
+        ])
+        assert submit_bq_query_job_mock.call_args.kwargs['query_parameters'] == [
+            bigquery_mock.ScalarQueryParameter.return_value
+        ] * 2
+
+    def test_should_use_configured_bigquery_type(
+        self,
+        bigquery_mock: MagicMock
+    ):
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1,
+            inputs={
+                'start_date': {
+                    'type': 'string',
+                    'description': 'Start date',
+                    'bigquery_type': 'DATE'
+                }
+            }
+        )
+        tool.forward(start_date='2025-01-01')
+        bigquery_mock.ScalarQueryParameter.assert_called_with('start_date', 'DATE', '2025-01-01')
+
+    def test_should_validate_parameters(
+        self,
+        submit_bq_query_job_mock: MagicMock
+    ):
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1,
+            inputs={
+                'id': {'type': 'string', 'description': 'Id', 'regex': r'valid'}
+            }
+        )
+        with pytest.raises(ValueError):
+            tool.forward(id='invalid')
+        submit_bq_query_job_mock.assert_not_called()
+
+    def test_should_cache_query_results_by_parameters(
+        self,
+        submit_bq_query_job_mock: MagicMock,
+        bq_result_mock: MagicMock
+    ):
+        set_bq_result_rows(bq_result_mock, [ROW_1])
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1,
+            inputs={
+                'id': {'type': 'string', 'description': 'Id'}
+            },
+            cache_ttl=60
+        )
+        assert tool.forward(id='id_1') == [ROW_1]
+        assert tool.forward(id='id_1') == [ROW_1]
+        assert tool.forward(id='id_2') == [ROW_1]
+        assert submit_bq_query_job_mock.call_count == 2
+
+    def test_should_fetch_results_as_arrow_record_batches(
+        self,
+        bq_result_mock: MagicMock
+    ):
+        bq_result_mock.to_arrow_iterable.return_value = iter([
+            pyarrow.RecordBatch.from_pylist([ROW_1]),
+            pyarrow.RecordBatch.from_pylist([ROW_1])
+        ])
+        bq_result_mock.total_rows = 2
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1,
+            columnar_fetch=True
+        )
+        assert tool.forward() == [ROW_1, ROW_1]
+        bq_result_mock.to_arrow_iterable.assert_called_with(bqstorage_client=None)
+
+    def test_should_return_arrow_results_as_csv(
+        self,
+        bq_result_mock: MagicMock
+    ):
+        bq_result_mock.to_arrow_iterable.return_value = iter([
+            pyarrow.RecordBatch.from_pylist([ROW_1]),
+            pyarrow.RecordBatch.from_pylist([ROW_1])
+        ])
+        bq_result_mock.total_rows = 2
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1,
+            output_format='csv',
+            columnar_fetch=True
+        )
+        assert list(csv.DictReader(tool.forward().splitlines())) == [ROW_1, ROW_1]
+
+    def test_should_pass_query_limits_to_query_job(
+        self,
+        bigquery_mock: MagicMock
+    ):
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1,
+            query_limits={
+                'maximum_bytes_billed': 1000,
+                'job_timeout': 10,
+                'max_rows': 100
+            }
+        )
+        query_job_mock = bigquery_mock.Client.return_value.query.return_value
+        query_job_mock.result.return_value.total_rows = 100
+        tool.forward()
+        bigquery_mock.QueryJobConfig.assert_called_with(
+            query_parameters=[],
+            maximum_bytes_billed=1000,
+            job_timeout_ms=10000
+        )
+        query_job_mock.result.assert_called_with(max_results=100, timeout=10)
+
+    def test_should_reject_query_exceeding_max_bytes_processed(
+        self,
+        bigquery_mock: MagicMock,
+        get_bq_result_from_bq_query_job_mock: MagicMock
+    ):
+        query_job_mock = bigquery_mock.Client.return_value.query.return_value
+        query_job_mock.total_bytes_processed = 1001
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1,
+            query_limits={'max_bytes_processed': 1000}
+        )
+        with pytest.raises(BigQueryBytesLimitExceededError):
+            tool.forward()
+        get_bq_result_from_bq_query_job_mock.assert_not_called()
+
+    def test_should_run_query_within_max_bytes_processed_and_cache_dry_run(
+        self,
+        bigquery_mock: MagicMock,
+        submit_bq_query_job_mock: MagicMock
+    ):
+        query_job_mock = bigquery_mock.Client.return_value.query.return_value
+        query_job_mock.total_bytes_processed = 1000
+        tool = BigQueryTool(
+            name='name_1',
+            description='description_1',
+            project_name=PROJECT_NAME_1,
+            sql_query=SQL_QUERY_1,
+            query_limits={'max_bytes_processed': 1000}
+        )
+        tool.forward()
+        tool.forward()
+        assert submit_bq_query_job_mock.call_count == 2
+        bigquery_mock.Client.return_value.query.assert_called_once()
+
+
+class TestBigQueryMultiQueryTool:
+    def test_should_submit_all_query_jobs_before_waiting_for_results(
+        self,
+        bigquery_mock: MagicMock
+    ):
+        events: list[str] = []
+
+        def query(sql_query: str, **_kwargs) -> MagicMock:
+            events.append(f'submit {sql_query}')
+            query_job_mock = MagicMock(name=sql_query)
+
+            def result(**_kwargs) -> MagicMock:
+                events.append(f'result {sql_query}')
+                return get_bq_result_mock([{'query': sql_query}])
+
+            query_job_mock.result.side_effect = result
+            return query_job_mock
+
+        bigquery_mock.Client.return_value.query.side_effect = query
+        tools = [get_bq_tool('tool_1', SQL_QUERY_1), get_bq_tool('tool_2', SQL_QUERY_2)]
+        multi_query_tool = BigQueryMultiQueryTool(
+            name='multi_query_tool',
+            description='description_1',
+            tool_names=['tool_1', 'tool_2'],
+            tool_resolver=get_tool_resolver_mock(tools)
+        )
+        assert not events
+        assert multi_query_tool.forward([
+            {'tool_name': 'tool_1', 'arguments': {}},
+            {'tool_name': 'tool_2'}
+        ]) == [
+            {'tool_name': 'tool_1', 'result': [{'query': SQL_QUERY_1}]},
+            {'tool_name': 'tool_2', 'result': [{'query': SQL_QUERY_2}]}
+        ]
+        assert events[:2] == [f'submit {SQL_QUERY_1}', f'submit {SQL_QUERY_2}']
+        assert sorted(events[2:]) == [f'result {SQL_QUERY_1}', f'result {SQL_QUERY_2}']
+
+    def test_should_wait_for_query_results_concurrently(
+        self,
+        bigquery_mock: MagicMock
+    ):
+        # would time out, if waiting for the results one after the other
+        barrier = threading.Barrier(2, timeout=5)
+
+        def result(**_kwargs) -> MagicMock:
+            barrier.wait()
+            return get_bq_result_mock([ROW_1])
+
+        bigquery_mock.Client.return_value.query.return_value.result.side_effect = result
+        tools = [get_bq_tool('tool_1', SQL_QUERY_1), get_bq_tool('tool_2', SQL_QUERY_2)]
+        multi_query_tool = BigQueryMultiQueryTool(
+            name='multi_query_tool',
+            description='description_1',
+            tool_names=['tool_1', 'tool_2'],
+            tool_resolver=get_tool_resolver_mock(tools)
+        )
+        assert multi_query_tool.forward([
+            {'tool_name': 'tool_1'},
+            {'tool_name': 'tool_2'}
+        ]) == [
+            {'tool_name': 'tool_1', 'result': [ROW_1]},
+            {'tool_name': 'tool_2', 'result': [ROW_1]}
+        ]
+
+    def test_should_include_tool_descriptions(self):
+        multi_query_tool = BigQueryMultiQueryTool(
+            name='multi_query_tool',
+            description='description_1',
+            tool_names=['tool_1'],
+            tool_resolver=get_tool_resolver_mock([get_bq_tool('tool_1', SQL_QUERY_1)])
+        )
+        assert multi_query_tool.description.startswith('description_1')
+        assert '- tool_1: description of tool_1' in multi_query_tool.description
+
+    def test_should_reject_non_bigquery_tools(self):
+        tool_resolver_mock = MagicMock(ToolResolver)
+        with pytest.raises(TypeError):
+            BigQueryMultiQueryTool(
+                name='multi_query_tool',
+                description='description_1',
+                tool_names=['tool_1'],
+                tool_resolver=tool_resolver_mock
+            )
+
+    def test_should_return_error_for_failed_query_only(
+        self,
+        bigquery_mock: MagicMock
+    ):
+        bigquery_mock.Client.return_value.query.return_value.result.return_value = (
+            get_bq_result_mock([ROW_1])
+        )
+        multi_query_tool = BigQueryMultiQueryTool(
+            name='multi_query_tool',
+            description='description_1',
+            tool_names=['tool_1'],
+            tool_resolver=get_tool_resolver_mock([get_bq_tool('tool_1', SQL_QUERY_1)])
+        )
+        result = multi_query_tool.forward([
+            {'tool_name': 'other'},
+            {'tool_name': 'tool_1'}
+        ])
+        assert result[0]['tool_name'] == 'other'
+        assert 'Unrecognised tool' in result[0]['error']
+        assert result[1] == {'tool_name': 'tool_1', 'result': [ROW_1]}
+
+    def test_should_use_cached_results_without_submitting_query_job(
+        self,
+        bigquery_mock: MagicMock
+    ):
+        query_mock = bigquery_mock.Client.return_value.query
+        query_mock.return_value.result.return_value = get_bq_result_mock([ROW_1])
+        multi_query_tool = BigQueryMultiQueryTool(
+            name='multi_query_tool',
+            description='description_1',
+            tool_names=['tool_1'],
+            tool_resolver=get_tool_resolver_mock([
+                get_bq_tool('tool_1', SQL_QUERY_1, cache_ttl=60)
+            ])
+        )
+        expected_result = [{'tool_name': 'tool_1', 'result': [ROW_1]}]
+        assert multi_query_tool.forward([{'tool_name': 'tool_1'}]) == expected_result
+        assert multi_query_tool.forward([{'tool_name': 'tool_1'}]) == expected_result
+        query_mock.assert_called_once()
+
+    def test_should_submit_same_cached_query_only_once(
+        self,
+        bigquery_mock: MagicMock
+    ):
+        query_mock = bigquery_mock.Client.return_value.query
+        query_mock.return_value.result.return_value = get_bq_result_mock([ROW_1])
+        multi_query_tool = BigQueryMultiQueryTool(
+            name='multi_query_tool',
+            description='description_1',
+            tool_names=['tool_1'],
+            tool_resolver=get_tool_resolver_mock([
+                get_bq_tool('tool_1', SQL_QUERY_1, cache_ttl=60)
+            ])
+        )
+        assert multi_query_tool.forward([{'tool_name': 'tool_1'}] * 2) == [
+            {'tool_name': 'tool_1', 'result': [ROW_1]}
+        ] * 2
+        query_mock.assert_called_once()
+        query_mock.return_value.result.assert_called_once()
+
+    def test_should_reject_too_many_queries(self):
+        multi_query_tool = BigQueryMultiQueryTool(
+            name='multi_query_tool',
+            description='description_1',
+            tool_names=['tool_1'],
+            tool_resolver=get_tool_resolver_mock([get_bq_tool('tool_1', SQL_QUERY_1)]),
+            max_queries=1
+        )
+        with pytest.raises(ValueError):
+            multi_query_tool.forward([{'tool_name': 'tool_1'}] * 2)
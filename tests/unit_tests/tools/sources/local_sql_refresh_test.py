@@ -0,0 +1,72 @@
+from contextlib import closing
+import sqlite3
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+
+import pyarrow  # type: ignore
+import pytest
+
+from data_ai_bot.tools.sources import local_sql_refresh
+from data_ai_bot.tools.sources.local_sql import LocalSqlExtractConfig
+from data_ai_bot.tools.sources.local_sql_refresh import main
+
+
+ROW_1 = {'id': 'id_1'}
+
+
+@pytest.fixture(name='iter_arrow_record_batches_from_bq_query_mock')
+def _iter_arrow_record_batches_from_bq_query_mock() -> Iterator[MagicMock]:
+    with patch.object(local_sql_refresh, 'iter_arrow_record_batches_from_bq_query') as mock:
+        yield mock
+
+
+class TestMain:
+    def test_should_refresh_extracts_from_bigquery(
+        self,
+        tmp_path,
+        iter_arrow_record_batches_from_bq_query_mock: MagicMock
+    ):
+        database_path = str(tmp_path / 'extracts' / 'extract.sqlite')
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text(
+            '\n'.join([
+                'extracts:',
+                '  - project_name: project_1',
+                '    sql_query: sql_query_1',
+                f'    database_path: {database_path}',
+                '    table_name: table_1'
+            ]),
+            encoding='utf-8'
+        )
+        iter_arrow_record_batches_from_bq_query_mock.return_value = [
+            pyarrow.RecordBatch.from_pylist([ROW_1])
+        ]
+        assert main(['--config-file', str(config_file)])
+        iter_arrow_record_batches_from_bq_query_mock.assert_called_once_with(
+            project_name='project_1',
+            query='sql_query_1'
+        )
+        with closing(sqlite3.connect(database_path)) as connection:
+            assert connection.execute('SELECT id FROM table_1').fetchall() == [('id_1',)]
+
+    def test_should_continue_with_other_extracts_on_failure(
+        self,
+        tmp_path,
+        iter_arrow_record_batches_from_bq_query_mock: MagicMock
+    ):
+        iter_arrow_record_batches_from_bq_query_mock.side_effect = [
+            RuntimeError('failed'),
+            [pyarrow.RecordBatch.from_pylist([ROW_1])]
+        ]
+        extract_configs = [
+            LocalSqlExtractConfig(
+                project_name='project_1',
+                sql_query='sql_query_1',
+                database_path=str(tmp_path / 'extract.sqlite'),
+                table_name=table_name
+            )
+            for table_name in ['table_1', 'table_2']
+        ]
+        assert not local_sql_refresh.refresh_local_sql_extracts(extract_configs)
+        with closing(sqlite3.connect(str(tmp_path / 'extract.sqlite'))) as connection:
+            assert connection.execute('SELECT id FROM table_2').fetchall() == [('id_1',)]
@@ -0,0 +1,141 @@
+from contextlib import closing
+import csv
+import sqlite3
+
+import pyarrow  # type: ignore
+import pytest
+
+from data_ai_bot.tools.sources.local_sql import (
+    LocalSqlTool,
+    write_arrow_record_batches_to_sqlite_file
+)
+
+
+TABLE_NAME_1 = 'project_1.dataset_1.table_1'
+
+ROW_1 = {'id': 'id_1', 'count': 1}
+ROW_2 = {'id': 'id_2', 'count': 2}
+
+
+@pytest.fixture(name='database_path')
+def _database_path(tmp_path) -> str:
+    database_path = str(tmp_path / 'extract.sqlite')
+    write_arrow_record_batches_to_sqlite_file(
+        database_path,
+        table_name=TABLE_NAME_1,
+        record_batches=[pyarrow.RecordBatch.from_pylist([ROW_1, ROW_2])]
+    )
+    return database_path
+
+
+def get_local_sql_tool(database_path: str, sql_query: str, **kwargs) -> LocalSqlTool:
+    return LocalSqlTool(
+        name='name_1',
+        description='description_1',
+        database_path=database_path,
+        sql_query=sql_query,
+        **kwargs
+    )
+
+
+class TestWriteArrowRecordBatchesToSqliteFile:
+    def test_should_write_rows_with_types(self, database_path: str):
+        with closing(sqlite3.connect(database_path)) as connection:
+            assert connection.execute(
+                f'SELECT id, count, typeof(count) FROM `{TABLE_NAME_1}`'
+            ).fetchall() == [('id_1', 1, 'integer'), ('id_2', 2, 'integer')]
+
+    def test_should_replace_table_and_keep_other_tables(self, database_path: str):
+        write_arrow_record_batches_to_sqlite_file(
+            database_path,
+            table_name='other_table',
+            record_batches=[pyarrow.RecordBatch.from_pylist([ROW_1])]
+        )
+        write_arrow_record_batches_to_sqlite_file(
+            database_path,
+            table_name=TABLE_NAME_1,
+            record_batches=[pyarrow.RecordBatch.from_pylist([ROW_2])]
+        )
+        with closing(sqlite3.connect(database_path)) as connection:
+            assert connection.execute(f'SELECT id FROM `{TABLE_NAME_1}`').fetchall() == [
+                ('id_2',)
+            ]
+            assert connection.execute('SELECT id FROM other_table').fetchall() == [('id_1',)]
+
+    def test_should_store_nested_values_as_text(self, tmp_path):
+        database_path = str(tmp_path / 'nested.sqlite')
+        write_arrow_record_batches_to_sqlite_file(
+            database_path,
+            table_name='table_1',
+            record_batches=[pyarrow.RecordBatch.from_pylist([{'values': [1, 2]}])]
+        )
+        with closing(sqlite3.connect(database_path)) as connection:
+            assert connection.execute('SELECT "values" FROM table_1').fetchall() == [
+                ('[1, 2]',)
+            ]
+
+
+class TestLocalSqlTool:
+    def test_should_return_query_results_as_json(self, database_path: str):
+        tool = get_local_sql_tool(database_path, f'SELECT * FROM `{TABLE_NAME_1}`')
+        assert tool.forward() == [ROW_1, ROW_2]
+
+    def test_should_pass_inputs_as_bigquery_style_parameters(self, database_path: str):
+        tool = get_local_sql_tool(
+            database_path,
+            f'SELECT * FROM `{TABLE_NAME_1}` WHERE id = @id',
+            inputs={'id': {'type': 'string', 'description': 'Id'}}
+        )
+        assert tool.forward(id='id_2') == [ROW_2]
+
+    def test_should_validate_parameters(self, database_path: str):
+        tool = get_local_sql_tool(
+            database_path,
+            f'SELECT * FROM `{TABLE_NAME_1}` WHERE id = @id',
+            inputs={'id': {'type': 'string', 'description': 'Id', 'regex': r'valid'}}
+        )
+        with pytest.raises(ValueError):
+            tool.forward(id='invalid')
+
+    def test_should_return_query_results_as_csv_in_column_order(self, database_path: str):
+        tool = get_local_sql_tool(
+            database_path,
+            f'SELECT count, id FROM `{TABLE_NAME_1}`',
+            output_format='csv'
+        )
+        result = tool.forward()
+        assert result.splitlines()[0] == 'count,id'
+        assert list(csv.DictReader(result.splitlines())) == [
+            {'count': '1', 'id': 'id_1'},
+            {'count': '2', 'id': 'id_2'}
+        ]
+
+    def test_should_limit_rows(self, database_path: str):
+        tool = get_local_sql_tool(
+            database_path,
+            f'SELECT * FROM `{TABLE_NAME_1}`',
+            max_rows=1
+        )
+        assert tool.forward() == [ROW_1, {'truncated': True, 'row_count': 1}]
+
+    def test_should_add_truncation_note_to_csv_output(self, database_path: str):
+        tool = get_local_sql_tool(
+            database_path,
+            f'SELECT id FROM `{TABLE_NAME_1}`',
+            output_format='csv',
+            max_rows=1
+        )
+        assert tool.forward() == 'id\nid_1\n\n[truncated: showing the first 1 rows]'
+
+    def test_should_not_add_truncation_marker_within_max_rows(self, database_path: str):
+        tool = get_local_sql_tool(
+            database_path,
+            f'SELECT * FROM `{TABLE_NAME_1}`',
+            max_rows=2
+        )
+        assert len(tool.forward()) == 2
+
+    def test_should_not_modify_database(self, database_path: str):
+        tool = get_local_sql_tool(database_path, f'DELETE FROM `{TABLE_NAME_1}`')
+        with pytest.raises(sqlite3.OperationalError):
+            tool.forward()
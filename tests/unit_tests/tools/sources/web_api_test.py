@@ -1,67 +1,89 @@
 from typing import Iterator
-from unittest.mock import ANY, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
+import httpx2
 import pytest
-import requests
 
 from data_ai_bot.tools.sources import web_api
-from data_ai_bot.tools.sources.web_api import WebApiTool
+from data_ai_bot.tools.sources.web_api import DEFAULT_TIMEOUT, WebApiTool, get_async_client
 
 
 URL_1 = 'https://example/url_1'
 
 HEADERS_1 = {'User-Agent': 'Test/1'}
 
+TIMEOUT_1 = 12.3
 
-@pytest.fixture(name='requests_response_mock')
-def _requests_response_mock() -> MagicMock:
-    return MagicMock(requests.Response)
 
+@pytest.fixture(name='response_mock')
+def _response_mock() -> MagicMock:
+    return MagicMock(httpx2.Response)
 
-@pytest.fixture(name='requests_session_mock')
-def _requests_session_mock(requests_response_mock: MagicMock) -> MagicMock:
-    session_mock = MagicMock(spec=requests.Session)
-    session_mock.get.return_value = requests_response_mock
-    session_mock.post.return_value = requests_response_mock
-    session_mock.request.return_value = requests_response_mock
-    return session_mock
 
+@pytest.fixture(name='async_client_mock', autouse=True)
+def _async_client_mock(response_mock: MagicMock) -> Iterator[MagicMock]:
+    async_client_mock = MagicMock(spec=httpx2.AsyncClient)
+    async_client_mock.request = AsyncMock(return_value=response_mock)
+    with patch.object(web_api, 'get_async_client') as mock:
+        mock.return_value = async_client_mock
+        yield async_client_mock
 
-@pytest.fixture(name='requests_request_fn_mock')
-def _requests_request_fn_mock(requests_session_mock: MagicMock) -> MagicMock:
-    return requests_session_mock.request
 
+@pytest.fixture(name='request_fn_mock')
+def _request_fn_mock(async_client_mock: MagicMock) -> MagicMock:
+    return async_client_mock.request
 
-@pytest.fixture(name='requests_mock', autouse=True)
-def _requests_mock(requests_session_mock: MagicMock) -> Iterator[MagicMock]:
-    with patch.object(web_api, 'requests') as mock:
-        mock.Session.return_value = requests_session_mock
-        yield mock
+
+class TestGetAsyncClient:
+    def test_should_return_shared_http2_client(self):
+        async_client = get_async_client()
+        assert isinstance(async_client, httpx2.AsyncClient)
+        assert get_async_client() is async_client
 
 
 class TestWebApiTool:
     def test_should_pass_method_url_and_headers_to_api(
         self,
-        requests_request_fn_mock: MagicMock
+        request_fn_mock: MagicMock
     ):
         tool = WebApiTool(
             name='name_1',
             description='description_1',
             url=URL_1,
             method='POST',
-            headers=HEADERS_1
+            headers=HEADERS_1,
+            timeout=TIMEOUT_1
         )
         tool.forward()
-        requests_request_fn_mock.assert_called_with(
+        request_fn_mock.assert_called_with(
             method='POST',
             url=URL_1,
             params=ANY,
-            headers=HEADERS_1
+            headers=HEADERS_1,
+            timeout=TIMEOUT_1
+        )
+
+    def test_should_pass_default_timeout_to_api(
+        self,
+        request_fn_mock: MagicMock
+    ):
+        tool = WebApiTool(
+            name='name_1',
+            description='description_1',
+            url=URL_1
+        )
+        tool.forward()
+        request_fn_mock.assert_called_with(
+            method='GET',
+            url=URL_1,
+            params=ANY,
+            headers=ANY,
+            timeout=DEFAULT_TIMEOUT
         )
 
     def test_should_replace_placeholders_in_url(
         self,
-        requests_request_fn_mock: MagicMock
+        request_fn_mock: MagicMock
     ):
         tool = WebApiTool(
             name='name_1',
@@ -75,16 +97,17 @@ class TestWebApiTool:
             url=r'https://example/url_1?param_1={{ param_1 }}',
         )
         tool.forward(param_1='value_1')
-        requests_request_fn_mock.assert_called_with(
+        request_fn_mock.assert_called_with(
             method='GET',
             url=r'https://example/url_1?param_1=value_1',
             params=ANY,
-            headers=ANY
+            headers=ANY,
+            timeout=ANY
         )
 
     def test_should_validate_parameters(
         self,
-        requests_request_fn_mock: MagicMock
+        request_fn_mock: MagicMock
     ):
         tool = WebApiTool(
             name='name_1',
@@ -100,11 +123,31 @@ class TestWebApiTool:
         )
         with pytest.raises(ValueError):
             tool.forward(param_1='invalid')
-        requests_request_fn_mock.assert_not_called()
+        request_fn_mock.assert_not_called()
+
+    def test_should_reject_parameter_only_partially_matching_regex(
+        self,
+        request_fn_mock: MagicMock
+    ):
+        tool = WebApiTool(
+            name='name_1',
+            description='description_1',
+            inputs={
+                'param_1': {
+                    'type': 'string',
+                    'description': 'Test param 1',
+                    'regex': r'\d{5,6}'
+                }
+            },
+            url=r'https://example/url_1?param_1={{ param_1 }}',
+        )
+        with pytest.raises(ValueError):
+            tool.forward(param_1='1234567')
+        request_fn_mock.assert_not_called()
 
     def test_should_replace_placeholders_in_query_parameters(
         self,
-        requests_request_fn_mock: MagicMock
+        request_fn_mock: MagicMock
     ):
         tool = WebApiTool(
             name='name_1',
@@ -121,16 +164,17 @@ class TestWebApiTool:
             }
         )
         tool.forward(param_1='value_1')
-        requests_request_fn_mock.assert_called_with(
+        request_fn_mock.assert_called_with(
             method='GET',
             url=r'https://example/url_1',
             params={'param_1': 'value_1'},
-            headers=ANY
+            headers=ANY,
+            timeout=ANY
         )
 
     def test_should_remove_empty_query_parameters(
         self,
-        requests_request_fn_mock: MagicMock
+        request_fn_mock: MagicMock
     ):
         tool = WebApiTool(
             name='name_1',
@@ -148,17 +192,201 @@ class TestWebApiTool:
             remove_empty_query_parameters=True
         )
         tool.forward(param_1='')
-        requests_request_fn_mock.assert_called_with(
+        request_fn_mock.assert_called_with(
             method='GET',
             url=r'https://example/url_1',
             params={},
-            headers=ANY
+            headers=ANY,
+            timeout=ANY
         )
 
-    def test_should_return_response_from_api(self, requests_response_mock: MagicMock):
+    def test_should_return_response_from_api(self, response_mock: MagicMock):
         tool = WebApiTool(
             name='name_1',
             description='description_1',
             url=URL_1
         )
-        assert tool.forward() == requests_response_mock.json.return_value
+        assert tool.forward() == response_mock.json.return_value
+
+    def test_should_fetch_and_merge_all_pages_using_total(
+        self,
+        request_fn_mock: MagicMock,
+        response_mock: MagicMock
+    ):
+        response_mock.json.side_effect = lambda: {
+            'total': 5,
+            'items': [
+                f'item_{request_fn_mock.call_args.kwargs["params"]["page"]}_{i}'
+                for i in range(2)
+            ]
+        }
+        tool = WebApiTool(
+            name='name_1',
+            description='description_1',
+            url=URL_1,
+            pagination={
+                'type': 'page',
+                'page_size': 2,
+                'max_concurrency': 1
+            }
+        )
+        assert tool.forward() == {
+            'total': 5,
+            'items': ['item_1_0', 'item_1_1', 'item_2_0', 'item_2_1', 'item_3_0', 'item_3_1']
+        }
+        assert sorted(
+            call_args.kwargs['params']['page']
+            for call_args in request_fn_mock.call_args_list
+        ) == [1, 2, 3]
+
+    def test_should_limit_pages_by_max_items_and_max_pages(
+        self,
+        request_fn_mock: MagicMock,
+        response_mock: MagicMock
+    ):
+        response_mock.json.return_value = {
+            'total': 1000,
+            'items': ['item_1', 'item_2']
+        }
+        tool = WebApiTool(
+            name='name_1',
+            description='description_1',
+            url=URL_1,
+            pagination={
+                'page_size': 2,
+                'max_items': 5,
+                'max_pages': 10
+            }
+        )
+        assert len(tool.forward()['items']) == 5
+        assert request_fn_mock.call_count == 3
+
+    def test_should_use_offset_pagination(
+        self,
+        request_fn_mock: MagicMock,
+        response_mock: MagicMock
+    ):
+        response_mock.json.return_value = {
+            'total': 4,
+            'items': ['item_1', 'item_2']
+        }
+        tool = WebApiTool(
+            name='name_1',
+            description='description_1',
+            url=URL_1,
+            pagination={
+                'type': 'offset',
+                'page_size': 2,
+                'page_size_parameter_name': 'limit',
+                'max_concurrency': 1
+            }
+        )
+        tool.forward()
+        assert [
+            call_args.kwargs['params']
+            for call_args in request_fn_mock.call_args_list
+        ] == [{'limit': 2, 'offset': 0}, {'limit': 2, 'offset': 2}]
+
+    def test_should_follow_cursor_until_no_next_cursor(
+        self,
+        request_fn_mock: MagicMock,
+        response_mock: MagicMock
+    ):
+        response_mock.json.side_effect = [
+            {'items': ['item_1'], 'next_cursor': 'cursor_2'},
+            {'items': ['item_2'], 'next_cursor': None}
+        ]
+        tool = WebApiTool(
+            name='name_1',
+            description='description_1',
+            url=URL_1,
+            pagination={
+                'type': 'cursor',
+                'page_size': 1
+            }
+        )
+        assert tool.forward() == {'items': ['item_1', 'item_2']}
+        assert [
+            call_args.kwargs['params']
+            for call_args in request_fn_mock.call_args_list
+        ] == [{'per-page': 1}, {'per-page': 1, 'cursor': 'cursor_2'}]
+
+
+class TestWebApiToolBatchInput:
+    def test_should_return_response_by_batch_value(
+        self,
+        request_fn_mock: MagicMock,
+        response_mock: MagicMock
+    ):
+        response_mock.json.side_effect = lambda: {
+            'id': request_fn_mock.call_args.kwargs['params']['id']
+        }
+        tool = WebApiTool(
+            name='name_1',
+            description='description_1',
+            inputs={
+                'id': {
+                    'type': 'array',
+                    'description': 'Test ids'
+                }
+            },
+            url=URL_1,
+            query_parameters={'id': '{{ id }}'},
+            batch_input_name='id',
+            max_concurrency=1
+        )
+        assert tool.forward(id=['id_1', 'id_2']) == {
+            'id_1': {'id': 'id_1'},
+            'id_2': {'id': 'id_2'}
+        }
+
+    def test_should_return_error_for_invalid_batch_value(
+        self,
+        request_fn_mock: MagicMock,
+        response_mock: MagicMock
+    ):
+        tool = WebApiTool(
+            name='name_1',
+            description='description_1',
+            inputs={
+                'id': {
+                    'type': 'array',
+                    'description': 'Test ids',
+                    'regex': r'valid'
+                }
+            },
+            url=URL_1,
+            query_parameters={'id': '{{ id }}'},
+            batch_input_name='id'
+        )
+        result = tool.forward(id=['valid', 'invalid'])
+        assert result['valid'] == response_mock.json.return_value
+        assert 'error' in result['invalid']
+        request_fn_mock.assert_called_once_with(
+            method='GET',
+            url=URL_1,
+            params={'id': 'valid'},
+            headers=ANY,
+            timeout=ANY
+        )
+
+    def test_should_reject_too_many_batch_values(
+        self,
+        request_fn_mock: MagicMock
+    ):
+        tool = WebApiTool(
+            name='name_1',
+            description='description_1',
+            inputs={
+                'id': {
+                    'type': 'array',
+                    'description': 'Test ids'
+                }
+            },
+            url=URL_1,
+            batch_input_name='id',
+            max_batch_size=1
+        )
+        with pytest.raises(ValueError):
+            tool.forward(id=['id_1', 'id_2'])
+        request_fn_mock.assert_not_called()
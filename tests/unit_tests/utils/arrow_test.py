@@ -0,0 +1,95 @@
+import csv
+
+import pyarrow  # type: ignore
+
+from data_ai_bot.utils.arrow import (
+    iter_arrow_record_batch_slices,
+    iter_csv_lines_from_arrow_record_batches,
+    iter_csv_records_from_csv_text,
+    iter_dict_from_arrow_record_batches
+)
+
+
+class TestIterArrowRecordBatchSlices:
+    def test_should_slice_record_batches(self):
+        result = list(iter_arrow_record_batch_slices(
+            [
+                pyarrow.RecordBatch.from_pylist([{'col1': 1}, {'col1': 2}, {'col1': 3}]),
+                pyarrow.RecordBatch.from_pylist([{'col1': 4}])
+            ],
+            slice_row_count=2
+        ))
+        assert [record_batch.to_pylist() for record_batch in result] == [
+            [{'col1': 1}, {'col1': 2}],
+            [{'col1': 3}],
+            [{'col1': 4}]
+        ]
+
+
+class TestIterDictFromArrowRecordBatches:
+    def test_should_return_rows_of_all_record_batches(self):
+        assert list(iter_dict_from_arrow_record_batches([
+            pyarrow.RecordBatch.from_pylist([{'col1': 1}, {'col1': 2}]),
+            pyarrow.RecordBatch.from_pylist([{'col1': 3}])
+        ])) == [{'col1': 1}, {'col1': 2}, {'col1': 3}]
+
+
+class TestIterCsvRecordsFromCsvText:
+    def test_should_split_on_line_terminator(self):
+        assert list(iter_csv_records_from_csv_text('col1\n1\n2\n')) == ['col1', '1', '2']
+
+    def test_should_not_split_quoted_multi_line_value(self):
+        assert list(iter_csv_records_from_csv_text('col1\n"line 1\nline 2"\n2\n')) == [
+            'col1', '"line 1\nline 2"', '2'
+        ]
+
+    def test_should_not_split_on_other_line_boundaries(self):
+        assert list(iter_csv_records_from_csv_text('col1\nvalue\x1cwith\u2028separators\n')) == [
+            'col1', 'value\x1cwith\u2028separators'
+        ]
+
+
+class TestIterCsvLinesFromArrowRecordBatches:
+    def test_should_return_empty_response_for_no_rows(self):
+        assert not list(iter_csv_lines_from_arrow_record_batches([
+            pyarrow.RecordBatch.from_pylist([], schema=pyarrow.schema([('col1', pyarrow.string())]))
+        ]))
+
+    def test_should_include_header_only_once(self):
+        result = list(iter_csv_lines_from_arrow_record_batches([
+            pyarrow.RecordBatch.from_pylist([{'col1': '1.1', 'col2': '1.2'}]),
+            pyarrow.RecordBatch.from_pylist([{'col1': '2.1', 'col2': '2.2'}])
+        ]))
+        assert list(csv.DictReader(result)) == [
+            {'col1': '1.1', 'col2': '1.2'},
+            {'col1': '2.1', 'col2': '2.2'}
+        ]
+
+    def test_should_include_header_only_once_for_sliced_record_batch(self):
+        result = list(iter_csv_lines_from_arrow_record_batches(
+            [pyarrow.RecordBatch.from_pylist([{'col1': '1'}, {'col1': '2'}, {'col1': '3'}])],
+            slice_row_count=2
+        ))
+        assert len(result) == 4
+        assert list(csv.DictReader(result)) == [{'col1': '1'}, {'col1': '2'}, {'col1': '3'}]
+
+    def test_should_convert_nested_values_to_str(self):
+        result = list(iter_csv_lines_from_arrow_record_batches([
+            pyarrow.RecordBatch.from_pylist([{'parent': {'nested': 'value'}}])
+        ]))
+        assert list(csv.DictReader(result)) == [{
+            'parent': str({'nested': 'value'})
+        }]
+
+    def test_should_return_one_record_per_row_for_multi_line_values(self):
+        result = list(iter_csv_lines_from_arrow_record_batches([
+            pyarrow.RecordBatch.from_pylist([
+                {'col1': 'line 1\nline 2\r\nline 3'},
+                {'col1': 'value 2'}
+            ])
+        ]))
+        assert len(result) == 3
+        assert list(csv.DictReader(result)) == [
+            {'col1': 'line 1\nline 2\r\nline 3'},
+            {'col1': 'value 2'}
+        ]
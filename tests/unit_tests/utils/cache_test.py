@@ -0,0 +1,123 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from data_ai_bot.utils.cache import RefreshingCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRefreshingCache:
+    def test_should_load_and_cache_value(self):
+        cache: RefreshingCache[str, str] = RefreshingCache()
+        loader = MagicMock(name='loader', return_value='value_1')
+        assert cache.get_or_load('key_1', loader, ttl=10) == 'value_1'
+        assert cache.get_or_load('key_1', loader, ttl=10) == 'value_1'
+        loader.assert_called_once()
+        assert cache.stats.hit_count == 1
+        assert cache.stats.miss_count == 1
+
+    def test_should_reload_expired_value(self):
+        timer = FakeTimer()
+        cache: RefreshingCache[str, str] = RefreshingCache(timer=timer)
+        cache.get_or_load('key_1', lambda: 'value_1', ttl=10)
+        timer.now = 10
+        assert cache.get_or_load('key_1', lambda: 'value_2', ttl=10) == 'value_2'
+
+    def test_should_return_stale_value_and_refresh_in_background(self):
+        timer = FakeTimer()
+        cache: RefreshingCache[str, str] = RefreshingCache(timer=timer)
+        cache.get_or_load('key_1', lambda: 'value_1', ttl=10, refresh_after=5)
+        timer.now = 6
+        refreshed = threading.Event()
+
+        def loader() -> str:
+            refreshed.set()
+            return 'value_2'
+
+        assert cache.get_or_load('key_1', loader, ttl=10, refresh_after=5) == 'value_1'
+        assert refreshed.wait(timeout=5)
+        assert cache.stats.refresh_count == 1
+
+    def test_should_get_value_put_within_ttl(self):
+        timer = FakeTimer()
+        cache: RefreshingCache[str, str] = RefreshingCache(timer=timer)
+        assert cache.get('key_1', ttl=10) is None
+        cache.put('key_1', 'value_1')
+        assert cache.get('key_1', ttl=10) == 'value_1'
+        timer.now = 10
+        assert cache.get('key_1', ttl=10) is None
+
+    def test_should_evict_least_recently_used_entries(self):
+        cache: RefreshingCache[str, str] = RefreshingCache(max_size=2)
+        cache.get_or_load('key_1', lambda: 'value_1', ttl=10)
+        cache.get_or_load('key_2', lambda: 'value_2', ttl=10)
+        cache.get_or_load('key_1', lambda: 'value_1', ttl=10)
+        cache.get_or_load('key_3', lambda: 'value_3', ttl=10)
+        assert cache.get_or_load('key_1', lambda: 'other', ttl=10) == 'value_1'
+        assert cache.get_or_load('key_2', lambda: 'other', ttl=10) == 'other'
+
+    def test_should_invalidate_matching_entries(self):
+        cache: RefreshingCache[str, str] = RefreshingCache()
+        cache.get_or_load('key_1', lambda: 'value_1', ttl=10)
+        cache.invalidate(lambda key: key == 'key_1')
+        assert not cache
+
+    def test_should_load_only_once_for_concurrent_misses(self):
+        cache: RefreshingCache[str, str] = RefreshingCache()
+        loader_started = threading.Event()
+        release_loader = threading.Event()
+        loader = MagicMock(name='loader')
+
+        def load() -> str:
+            loader()
+            loader_started.set()
+            assert release_loader.wait(timeout=5)
+            return 'value_1'
+
+        results: list[str] = []
+
+        def get_or_load():
+            results.append(cache.get_or_load('key_1', load, ttl=10))
+
+        threads = [threading.Thread(target=get_or_load) for _ in range(2)]
+        threads[0].start()
+        assert loader_started.wait(timeout=5)
+        threads[1].start()
+        release_loader.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert results == ['value_1', 'value_1']
+        loader.assert_called_once()
+        assert cache.stats.shared_load_count == 1
+
+    def test_should_share_started_load(self):
+        cache: RefreshingCache[str, str] = RefreshingCache()
+        start_load = MagicMock(name='start_load')
+        start_load.return_value.return_value = 'value_1'
+        get_value_1 = cache.get_or_start_load('key_1', start_load, ttl=10)
+        get_value_2 = cache.get_or_start_load('key_1', start_load, ttl=10)
+        assert get_value_2() == 'value_1'
+        assert get_value_1() == 'value_1'
+        start_load.assert_called_once()
+        start_load.return_value.assert_called_once()
+        assert cache.get('key_1', ttl=10) == 'value_1'
+
+    def test_should_share_load_error_and_load_again_afterwards(self):
+        cache: RefreshingCache[str, str] = RefreshingCache()
+        start_load = MagicMock(name='start_load')
+        start_load.return_value.side_effect = RuntimeError('failed')
+        get_value_1 = cache.get_or_start_load('key_1', start_load, ttl=10)
+        get_value_2 = cache.get_or_start_load('key_1', start_load, ttl=10)
+        for get_value in [get_value_1, get_value_2]:
+            with pytest.raises(RuntimeError):
+                get_value()
+        start_load.return_value.assert_called_once()
+        assert cache.get_or_load('key_1', lambda: 'value_2', ttl=10) == 'value_2'
@@ -0,0 +1,54 @@
+import asyncio
+
+from data_ai_bot.utils.concurrency import (
+    get_gathered_with_max_concurrency,
+    get_mapped_concurrently,
+    get_shared_event_loop,
+    run_coroutine_sync
+)
+
+
+class TestGetMappedConcurrently:
+    def test_should_return_empty_list_for_no_items(self):
+        assert not get_mapped_concurrently(str, [])
+
+    def test_should_return_results_in_order_of_items(self):
+        assert get_mapped_concurrently(
+            lambda value: value * 2,
+            range(10),
+            max_concurrency=3
+        ) == [value * 2 for value in range(10)]
+
+
+class TestGetGatheredWithMaxConcurrency:
+    def test_should_return_results_in_order_and_limit_concurrency(self):
+        in_flight: list[int] = []
+        max_in_flight: list[int] = [0]
+
+        async def get_value(value: int) -> int:
+            in_flight.append(value)
+            max_in_flight[0] = max(max_in_flight[0], len(in_flight))
+            await asyncio.sleep(0.001)
+            in_flight.remove(value)
+            return value * 2
+
+        result = asyncio.run(get_gathered_with_max_concurrency(
+            [get_value(value) for value in range(10)],
+            max_concurrency=3
+        ))
+        assert result == [value * 2 for value in range(10)]
+        assert max_in_flight[0] == 3
+
+
+class TestRunCoroutineSync:
+    def test_should_return_result_of_coroutine(self):
+        async def get_value() -> str:
+            return 'value_1'
+
+        assert run_coroutine_sync(get_value()) == 'value_1'
+
+    def test_should_run_on_shared_event_loop(self):
+        async def get_running_loop() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        assert run_coroutine_sync(get_running_loop()) is get_shared_event_loop()
@@ -1,6 +1,15 @@
 import csv
+import json
 
-from data_ai_bot.utils.json import get_json_as_csv_lines
+from typing import Iterable
+
+from data_ai_bot.utils.json import (
+    get_formatted_json_list,
+    get_json_as_csv_lines,
+    iter_csv_lines_with_limits,
+    iter_json_as_csv_lines,
+    iter_json_with_limits
+)
 
 
 class TestGetJsonAsCsvLines:
@@ -64,3 +73,111 @@ class TestGetJsonAsCsvLines:
         assert csv_as_json == [{
             'parent': str({'nested': 'value'})
         }]
+
+
+class TestIterJsonAsCsvLines:
+    def test_should_use_first_seen_column_order(self):
+        result = list(iter_json_as_csv_lines([
+            {'col_b': 'b1', 'col_a': 'a1'},
+            {'col_c': 'c2', 'col_a': 'a2'}
+        ]))
+        assert result == ['col_b,col_a,col_c', 'b1,a1,', ',a2,c2']
+
+    def test_should_use_passed_in_fieldnames(self):
+        result = list(iter_json_as_csv_lines(
+            [{'col_b': 'b1', 'col_a': 'a1'}],
+            fieldnames=['col_a', 'col_b']
+        ))
+        assert result == ['col_a,col_b', 'a1,b1']
+
+    def test_should_only_consume_rows_lazily(self):
+        consumed_rows: list[dict] = []
+
+        def iter_rows() -> Iterable[dict]:
+            for index in range(100):
+                row = {'col1': str(index)}
+                consumed_rows.append(row)
+                yield row
+
+        lines = iter(iter_json_as_csv_lines(iter_rows(), fieldnames_sample_size=2))
+        assert [next(lines), next(lines)] == ['col1', '0']
+        assert len(consumed_rows) == 2
+
+    def test_should_limit_rows(self):
+        result = list(iter_json_as_csv_lines(
+            [{'col1': str(index)} for index in range(10)],
+            max_rows=2
+        ))
+        assert result == ['col1', '0', '1']
+
+    def test_should_limit_bytes_including_newlines(self):
+        result = list(iter_json_as_csv_lines(
+            [{'col1': str(index)} for index in range(10)],
+            max_bytes=len('col1\n0\n1')
+        ))
+        assert result == ['col1', '0', '1']
+
+
+class TestIterCsvLinesWithLimits:
+    def test_should_pass_through_lines_without_limits(self):
+        assert list(iter_csv_lines_with_limits(['header', 'row1'])) == ['header', 'row1']
+
+    def test_should_count_utf8_bytes(self):
+        assert list(iter_csv_lines_with_limits(['header', '\u00e9'], max_bytes=8)) == ['header']
+
+
+class TestIterJsonWithLimits:
+    def test_should_pass_through_rows_without_limits(self):
+        assert list(iter_json_with_limits([{'col1': 1}, {'col1': 2}])) == [
+            {'col1': 1}, {'col1': 2}
+        ]
+
+    def test_should_limit_rows(self):
+        result = list(iter_json_with_limits(
+            [{'col1': index} for index in range(10)],
+            max_rows=2
+        ))
+        assert result == [{'col1': 0}, {'col1': 1}]
+
+    def test_should_limit_bytes_of_json_list(self):
+        json_list = [{'col1': index} for index in range(10)]
+        result = list(iter_json_with_limits(
+            json_list,
+            max_bytes=len(json.dumps(json_list[:2]))
+        ))
+        assert result == [{'col1': 0}, {'col1': 1}]
+
+
+class TestGetFormattedJsonList:
+    def test_should_apply_limits_to_json_output(self):
+        result = get_formatted_json_list(
+            [{'col1': index} for index in range(10)],
+            output_format='json',
+            max_rows=2
+        )
+        assert result == [{'col1': 0}, {'col1': 1}, {'truncated': True, 'row_count': 2}]
+
+    def test_should_not_add_truncation_marker_within_limits(self):
+        assert get_formatted_json_list([{'col1': 0}], max_rows=1) == [{'col1': 0}]
+
+    def test_should_add_truncation_marker_if_total_row_count_exceeds_rows(self):
+        assert get_formatted_json_list([{'col1': 0}], total_row_count=5) == [
+            {'col1': 0},
+            {'truncated': True, 'row_count': 1, 'total_rows': 5}
+        ]
+
+    def test_should_apply_limits_to_csv_output(self):
+        result = get_formatted_json_list(
+            [{'col1': index} for index in range(10)],
+            output_format='csv',
+            max_rows=2
+        )
+        assert result == 'col1\n0\n1\n\n[truncated: showing the first 2 rows]'
+
+    def test_should_not_add_truncation_note_to_complete_csv_output(self):
+        assert get_formatted_json_list(
+            [{'col1': 0}],
+            output_format='csv',
+            max_rows=1,
+            total_row_count=1
+        ) == 'col1\n0'
@@ -0,0 +1,11 @@
+from data_ai_bot.utils.template import get_compiled_template
+
+
+class TestGetCompiledTemplate:
+    def test_should_render_template(self):
+        assert get_compiled_template('Hello {{ name }}').render({'name': 'World'}) == 'Hello World'
+
+    def test_should_reuse_compiled_template(self):
+        assert get_compiled_template('Hello {{ name }}') is get_compiled_template(
+            'Hello {{ name }}'
+        )